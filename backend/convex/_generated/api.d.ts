@@ -14,25 +14,43 @@ import type * as actions_knowledge from "../actions/knowledge.js";
 import type * as actions_sendEmail from "../actions/sendEmail.js";
 import type * as actions_things from "../actions/things.js";
 import type * as auth from "../auth.js";
+import type * as crons from "../crons.js";
 import type * as http from "../http.js";
+import type * as internalActions_bench from "../internalActions/bench.js";
 import type * as internalActions_events from "../internalActions/events.js";
 import type * as internalActions_search from "../internalActions/search.js";
+import type * as internalActions_usage from "../internalActions/usage.js";
 import type * as internalActions_validation from "../internalActions/validation.js";
+import type * as lib_batch from "../lib/batch.js";
+import type * as lib_cascade from "../lib/cascade.js";
 import type * as lib_emailService from "../lib/emailService.js";
+import type * as lib_embeddings from "../lib/embeddings.js";
+import type * as lib_groupClosure from "../lib/groupClosure.js";
+import type * as lib_instrumentation from "../lib/instrumentation.js";
+import type * as lib_jobs from "../lib/jobs.js";
 import type * as lib_jwt from "../lib/jwt.js";
+import type * as lib_pagination from "../lib/pagination.js";
+import type * as lib_rollups from "../lib/rollups.js";
+import type * as lib_search from "../lib/search.js";
+import type * as lib_usage from "../lib/usage.js";
 import type * as lib_validation from "../lib/validation.js";
 import type * as lib_verification from "../lib/verification.js";
 import type * as middleware_groupIsolation from "../middleware/groupIsolation.js";
 import type * as mutations_auth from "../mutations/auth.js";
 import type * as mutations_batch from "../mutations/batch.js";
+import type * as mutations_bench from "../mutations/bench.js";
 import type * as mutations_cascade from "../mutations/cascade.js";
 import type * as mutations_connections from "../mutations/connections.js";
 import type * as mutations_contact from "../mutations/contact.js";
+import type * as mutations_groupClosure from "../mutations/groupClosure.js";
 import type * as mutations_groups from "../mutations/groups.js";
 import type * as mutations_init from "../mutations/init.js";
+import type * as mutations_jobs from "../mutations/jobs.js";
 import type * as mutations_knowledge from "../mutations/knowledge.js";
+import type * as mutations_metrics from "../mutations/metrics.js";
 import type * as mutations_onboarding from "../mutations/onboarding.js";
 import type * as mutations_people from "../mutations/people.js";
+import type * as mutations_rollups from "../mutations/rollups.js";
 import type * as mutations_things from "../mutations/things.js";
 import type * as mutations_usageTracking from "../mutations/usageTracking.js";
 import type * as mutations_workspace from "../mutations/workspace.js";
@@ -42,7 +60,9 @@ import type * as queries_contact from "../queries/contact.js";
 import type * as queries_events from "../queries/events.js";
 import type * as queries_groups from "../queries/groups.js";
 import type * as queries_init from "../queries/init.js";
+import type * as queries_jobs from "../queries/jobs.js";
 import type * as queries_knowledge from "../queries/knowledge.js";
+import type * as queries_metrics from "../queries/metrics.js";
 import type * as queries_onboarding from "../queries/onboarding.js";
 import type * as queries_onboardingQueries from "../queries/onboardingQueries.js";
 import type * as queries_ontology from "../queries/ontology.js";
@@ -78,25 +98,43 @@ declare const fullApi: ApiFromModules<{
   "actions/sendEmail": typeof actions_sendEmail;
   "actions/things": typeof actions_things;
   auth: typeof auth;
+  crons: typeof crons;
   http: typeof http;
+  "internalActions/bench": typeof internalActions_bench;
   "internalActions/events": typeof internalActions_events;
   "internalActions/search": typeof internalActions_search;
+  "internalActions/usage": typeof internalActions_usage;
   "internalActions/validation": typeof internalActions_validation;
+  "lib/batch": typeof lib_batch;
+  "lib/cascade": typeof lib_cascade;
   "lib/emailService": typeof lib_emailService;
+  "lib/embeddings": typeof lib_embeddings;
+  "lib/groupClosure": typeof lib_groupClosure;
+  "lib/instrumentation": typeof lib_instrumentation;
+  "lib/jobs": typeof lib_jobs;
   "lib/jwt": typeof lib_jwt;
+  "lib/pagination": typeof lib_pagination;
+  "lib/rollups": typeof lib_rollups;
+  "lib/search": typeof lib_search;
+  "lib/usage": typeof lib_usage;
   "lib/validation": typeof lib_validation;
   "lib/verification": typeof lib_verification;
   "middleware/groupIsolation": typeof middleware_groupIsolation;
   "mutations/auth": typeof mutations_auth;
   "mutations/batch": typeof mutations_batch;
+  "mutations/bench": typeof mutations_bench;
   "mutations/cascade": typeof mutations_cascade;
   "mutations/connections": typeof mutations_connections;
   "mutations/contact": typeof mutations_contact;
+  "mutations/groupClosure": typeof mutations_groupClosure;
   "mutations/groups": typeof mutations_groups;
   "mutations/init": typeof mutations_init;
+  "mutations/jobs": typeof mutations_jobs;
   "mutations/knowledge": typeof mutations_knowledge;
+  "mutations/metrics": typeof mutations_metrics;
   "mutations/onboarding": typeof mutations_onboarding;
   "mutations/people": typeof mutations_people;
+  "mutations/rollups": typeof mutations_rollups;
   "mutations/things": typeof mutations_things;
   "mutations/usageTracking": typeof mutations_usageTracking;
   "mutations/workspace": typeof mutations_workspace;
@@ -106,7 +144,9 @@ declare const fullApi: ApiFromModules<{
   "queries/events": typeof queries_events;
   "queries/groups": typeof queries_groups;
   "queries/init": typeof queries_init;
+  "queries/jobs": typeof queries_jobs;
   "queries/knowledge": typeof queries_knowledge;
+  "queries/metrics": typeof queries_metrics;
   "queries/onboarding": typeof queries_onboarding;
   "queries/onboardingQueries": typeof queries_onboardingQueries;
   "queries/ontology": typeof queries_ontology;
@@ -1,7 +1,11 @@
 "use node";
 
-import { action } from "../_generated/server";
+import { action, internalAction } from "../_generated/server";
+import { internal } from "../_generated/api";
+import type { Id } from "../_generated/dataModel";
 import { v } from "convex/values";
+import { EMBEDDING_BATCH_SIZE, embedInBatches, getEmbedder } from "../lib/embeddings";
+import { hybridKnowledgeSearch } from "../lib/search";
 
 /**
  * DIMENSION 6: KNOWLEDGE - Actions
@@ -14,40 +18,86 @@ import { v } from "convex/values";
  * - External knowledge sources
  */
 
+/** Row returned by queries/knowledge.getForEmbedding */
+type EmbeddingSource = {
+  id: Id<"knowledge">;
+  groupId: Id<"groups">;
+  text: string;
+  textHash: string;
+};
+
 /**
- * Generate vector embeddings for knowledge items
- * Creates embeddings for semantic search and RAG
+ * Generate vector embeddings for a knowledge item
+ * Embeds the item's STORED text with the configured provider
+ * (lib/embeddings.ts), so callers can refresh an embedding but never
+ * choose the vector; the item must belong to groupId
  */
 export const generateKnowledgeEmbeddings = action({
   args: {
     knowledgeId: v.id("knowledge"),
     groupId: v.id("groups"),
-    text: v.string(),
     embeddingModel: v.optional(v.string()),
   },
   handler: async (ctx, args) => {
-    console.log(
-      `[ACTION] Generating embeddings for knowledge ${args.knowledgeId} using ${args.embeddingModel || "default"}`
+    const [item]: Array<EmbeddingSource> = await ctx.runQuery(
+      internal.queries.knowledge.getForEmbedding,
+      { ids: [args.knowledgeId] }
     );
+    if (!item || item.groupId !== args.groupId) {
+      throw new Error("Knowledge item not found or has no text to embed");
+    }
 
-    // In production: call OpenAI, Cohere, or HuggingFace embedding service
-    const mockEmbedding = Array(1536)
-      .fill(0)
-      .map(() => Math.random());
+    const embedder = getEmbedder();
+    const [embedding] = await embedInBatches(embedder, [item.text]);
+
+    await ctx.runMutation(internal.mutations.knowledge.setEmbeddings, {
+      items: [{ id: item.id, embedding, textHash: item.textHash }],
+      embeddingModel: embedder.model,
+    });
 
     return {
       success: true,
       knowledgeId: args.knowledgeId,
-      embeddingModel: args.embeddingModel || "text-embedding-ada-002",
-      embeddingDim: 1536,
-      embedding: mockEmbedding,
-      textLength: args.text.length,
-      tokensEstimated: Math.ceil(args.text.length / 4),
+      embeddingModel: embedder.model,
+      embeddingDim: embedder.dimensions,
+      embedding,
+      textLength: item.text.length,
+      tokensEstimated: Math.ceil(item.text.length / 4),
       generatedAt: Date.now(),
     };
   },
 });
 
+/**
+ * Embed a batch of knowledge items (scheduled by mutations/knowledge.ts)
+ * Texts are sent to the provider EMBEDDING_BATCH_SIZE at a time and
+ * written back in one mutation per provider batch
+ */
+export const embedKnowledge = internalAction({
+  args: {
+    knowledgeIds: v.array(v.id("knowledge")),
+  },
+  handler: async (ctx, args): Promise<{ embedded: number; embeddingModel: string }> => {
+    const embedder = getEmbedder();
+    const pending: Array<EmbeddingSource> = await ctx.runQuery(
+      internal.queries.knowledge.getForEmbedding,
+      { ids: args.knowledgeIds }
+    );
+
+    for (let i = 0; i < pending.length; i += EMBEDDING_BATCH_SIZE) {
+      const batch = pending.slice(i, i + EMBEDDING_BATCH_SIZE);
+      const vectors = await embedInBatches(embedder, batch.map((k) => k.text));
+
+      await ctx.runMutation(internal.mutations.knowledge.setEmbeddings, {
+        items: batch.map((k, j) => ({ id: k.id, embedding: vectors[j], textHash: k.textHash })),
+        embeddingModel: embedder.model,
+      });
+    }
+
+    return { embedded: pending.length, embeddingModel: embedder.model };
+  },
+});
+
 /**
  * Process document for knowledge ingestion
  * Extract text, images, metadata from various document formats
@@ -182,7 +232,8 @@ export const indexKnowledgeVectors = action({
 
 /**
  * Search knowledge via semantic similarity
- * Finds relevant knowledge using embeddings
+ * Hybrid top-k: vector similarity fused with full-text rank (lib/search.ts)
+ * alpha = 1 for pure vector search, 0 for pure text search
  */
 export const semanticSearch = action({
   args: {
@@ -190,39 +241,39 @@ export const semanticSearch = action({
     query: v.string(),
     limit: v.optional(v.number()),
     threshold: v.optional(v.number()),
+    alpha: v.optional(v.number()),
+    knowledgeType: v.optional(v.union(
+      v.literal("label"),
+      v.literal("document"),
+      v.literal("chunk"),
+      v.literal("vector_only")
+    )),
   },
   handler: async (ctx, args) => {
-    console.log(
-      `[ACTION] Semantic search in group ${args.groupId}: "${args.query}"`
-    );
+    const { model, hits } = await hybridKnowledgeSearch(ctx, {
+      groupId: args.groupId,
+      query: args.query,
+      limit: args.limit,
+      threshold: args.threshold,
+      alpha: args.alpha,
+      knowledgeType: args.knowledgeType,
+    });
 
-    // In production: embed query, search vector database, return results
     return {
       success: true,
       query: args.query,
-      resultsCount: 3,
-      results: [
-        {
-          knowledgeId: "knowledge_1",
-          similarity: 0.97,
-          text: "Most relevant knowledge item...",
-          source: "blog_post_1",
-        },
-        {
-          knowledgeId: "knowledge_2",
-          similarity: 0.89,
-          text: "Second most relevant...",
-          source: "documentation",
-        },
-        {
-          knowledgeId: "knowledge_3",
-          similarity: 0.76,
-          text: "Also relevant...",
-          source: "wiki",
-        },
-      ],
+      resultsCount: hits.length,
+      results: hits.map((hit) => ({
+        knowledgeId: hit.knowledge._id,
+        similarity: hit.similarity ?? 0,
+        score: hit.score,
+        vectorRank: hit.vectorRank,
+        textRank: hit.textRank,
+        text: hit.knowledge.text ?? "",
+        source: hit.knowledge.sourceThingId ?? null,
+      })),
       searchedAt: Date.now(),
-      searchModel: "text-embedding-ada-002",
+      searchModel: model,
     };
   },
 });
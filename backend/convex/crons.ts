@@ -0,0 +1,28 @@
+import { cronJobs } from "convex/server";
+import { internal } from "./_generated/api";
+
+/**
+ * SCHEDULED JOBS
+ *
+ * usage compaction: fold closed-hour usage shards into hourly/daily/monthly
+ * buckets (lib/usage.ts). Runs a few minutes past the hour so the previous
+ * hour is closed.
+ *
+ * metrics pruning: delete functionMetrics samples older than
+ * METRICS_RETENTION_MS (lib/instrumentation.ts).
+ */
+const crons = cronJobs();
+
+crons.hourly(
+  "compact usage shards",
+  { minuteUTC: 5 },
+  internal.internalActions.usage.compactUsage
+);
+
+crons.daily(
+  "prune function metrics",
+  { hourUTC: 3, minuteUTC: 15 },
+  internal.mutations.metrics.prune
+);
+
+export default crons;
@@ -0,0 +1,230 @@
+import { internalAction } from "../_generated/server";
+import { internal, api } from "../_generated/api";
+import { v } from "convex/values";
+import type { FunctionReference } from "convex/server";
+import type { Id } from "../_generated/dataModel";
+import { percentile, resultBytes, type FunctionMetric } from "../lib/instrumentation";
+
+/**
+ * INTERNAL ACTIONS: Query Benchmark
+ *
+ * Seeds one tenant per size (mutations/bench.ts: <size> entities and
+ * <size> events each) and times the hot dashboard queries against each:
+ *
+ *   npx convex dev                      # local or dev deployment
+ *   npm run bench:queries               # sizes 1k, 10k, 100k
+ *   npx convex run internalActions/bench:run '{"sizes": [1000], "iterations": 50}'
+ *
+ * Seeding is resumable: a run that hits SEED_BUDGET_MS stops and asks to
+ * be re-run (100k tenants take several runs on a fresh deployment).
+ *
+ * Per query and size it records, with label "bench:<size>":
+ * - latency of every call, measured here (Convex freezes the clock inside
+ *   queries). Convex caches query results by args, so each iteration
+ *   passes different args where the query has one that barely changes
+ *   the work (things:list limit, events:stats startTime). Queries that
+ *   only take groupId are timed once. The first call is also reported as
+ *   coldMs. A re-run with unchanged tenant data can still hit results
+ *   cached by the previous run
+ * - documents read (queries/metrics:countReads) and result size
+ * - failures (e.g. read limits exceeded) as ok: false
+ *
+ * Results: returned, logged as "[BENCH] ..." and queryable with
+ *   npx convex run queries/metrics:report '{"label": "bench:10000"}'
+ */
+
+const DEFAULT_SIZES = [1000, 10000, 100000];
+const DEFAULT_ITERATIONS = 20;
+
+/** Samples per mutations/metrics:record call */
+const RECORD_BATCH_SIZE = 500;
+
+/** Stop seeding before the action time limit */
+const SEED_BUDGET_MS = 7 * 60 * 1000;
+
+type HotQuery = {
+  name: string; // Instrumented function name (countReads)
+  ref: FunctionReference<"query">;
+  // Args for one iteration: vary with iteration to bypass the query cache
+  args: (groupId: Id<"groups">, iteration: number) => Record<string, unknown>;
+};
+
+const HOT_QUERIES: HotQuery[] = [
+  {
+    name: "queries/things:list",
+    ref: api.queries.things.list,
+    args: (groupId, iteration) => ({ groupId, type: "product", limit: 100 + iteration }),
+  },
+  {
+    name: "queries/things:countByType",
+    ref: api.queries.things.countByType,
+    args: (groupId) => ({ groupId }),
+  },
+  {
+    name: "queries/events:stats",
+    ref: api.queries.events.stats,
+    // Any startTime before the seeded window (EVENT_WINDOW_DAYS) keeps every event
+    args: (groupId, iteration) => ({ groupId, startTime: iteration + 1 }),
+  },
+  {
+    name: "queries/quotas:getGroupQuotas",
+    ref: api.queries.quotas.getGroupQuotas,
+    args: (groupId) => ({ groupId }),
+  },
+  {
+    name: "queries/groups:getStats",
+    ref: api.queries.groups.getStats,
+    args: (groupId) => ({ groupId }),
+  },
+  {
+    name: "queries/computed:getGroupMetrics",
+    ref: api.queries.computed.getGroupMetrics,
+    args: (groupId) => ({ groupId }),
+  },
+];
+
+type BenchResult = {
+  size: number;
+  functionName: string;
+  ok: boolean;
+  error?: string;
+  coldMs: number;
+  p50Ms: number | null;
+  p95Ms: number | null;
+  docsRead: number | null;
+  resultBytes: number;
+};
+
+function errorMessage(error: unknown): string {
+  return (error instanceof Error ? error.message : String(error)).slice(0, 500);
+}
+
+export const run = internalAction({
+  args: {
+    sizes: v.optional(v.array(v.number())), // Default [1000, 10000, 100000]
+    iterations: v.optional(v.number()), // Calls per query and size (default 20; 1 for groupId-only queries)
+  },
+  handler: async (ctx, args): Promise<{ seeded: boolean; message?: string; results: BenchResult[] }> => {
+    const sizes = args.sizes ?? DEFAULT_SIZES;
+    const iterations = Math.max(1, args.iterations ?? DEFAULT_ITERATIONS);
+    const started = Date.now();
+
+    // 1. SEED TENANTS (resumable)
+    const tenants: { size: number; groupId: Id<"groups"> }[] = [];
+    for (const size of sizes) {
+      const tenant: { groupId: Id<"groups">; entities: number; events: number } =
+        await ctx.runMutation(internal.mutations.bench.ensureTenant, { size });
+      let done = tenant.entities >= size && tenant.events >= size;
+
+      while (!done) {
+        if (Date.now() - started > SEED_BUDGET_MS) {
+          const message = `Seeding bench-${size} incomplete; re-run to continue`;
+          console.log(`[BENCH] ${message}`);
+          return { seeded: false, message, results: [] };
+        }
+        const progress: { done: boolean } = await ctx.runMutation(
+          internal.mutations.bench.seedChunk,
+          { groupId: tenant.groupId, size }
+        );
+        done = progress.done;
+      }
+
+      tenants.push({ size, groupId: tenant.groupId });
+    }
+
+    // 2. TIME EACH HOT QUERY PER TENANT
+    const results: BenchResult[] = [];
+    for (const { size, groupId } of tenants) {
+      const label = `bench:${size}`;
+      const samples: FunctionMetric[] = [];
+
+      for (const hot of HOT_QUERIES) {
+        // Reads barely depend on the varied args: count once
+        let docsRead: number | null = null;
+        try {
+          const measured: { docsRead: number } = await ctx.runQuery(
+            internal.queries.metrics.countReads,
+            { functionName: hot.name, args: hot.args(groupId, 0) }
+          );
+          docsRead = measured.docsRead;
+        } catch {
+          // Reported by the timed calls below
+        }
+
+        const latencies: number[] = [];
+        const argsSeen = new Set<string>();
+        let bytes = 0;
+        let error: string | undefined;
+        for (let i = 0; i < iterations && !error; i++) {
+          // Repeated args would be served from the query cache: stop
+          const queryArgs = hot.args(groupId, i);
+          const argsKey = JSON.stringify(queryArgs);
+          if (argsSeen.has(argsKey)) break;
+          argsSeen.add(argsKey);
+
+          const callStarted = Date.now();
+          try {
+            const result = await ctx.runQuery(hot.ref, queryArgs);
+            const durationMs = Date.now() - callStarted;
+            bytes = resultBytes(result);
+            latencies.push(durationMs);
+            samples.push({
+              functionName: hot.name,
+              kind: "query",
+              durationMs,
+              docsRead: docsRead ?? undefined,
+              resultBytes: bytes,
+              ok: true,
+              label,
+              timestamp: callStarted,
+            });
+          } catch (e) {
+            // Failures are deterministic here (limits): stop after the first
+            error = errorMessage(e);
+            samples.push({
+              functionName: hot.name,
+              kind: "query",
+              durationMs: Date.now() - callStarted,
+              resultBytes: 0,
+              ok: false,
+              error,
+              label,
+              timestamp: callStarted,
+            });
+          }
+        }
+
+        const coldMs = latencies[0] ?? samples[samples.length - 1].durationMs ?? 0;
+        const sorted = [...latencies].sort((a, b) => a - b);
+        const result: BenchResult = {
+          size,
+          functionName: hot.name,
+          ok: !error,
+          error,
+          coldMs,
+          p50Ms: percentile(sorted, 0.5),
+          p95Ms: percentile(sorted, 0.95),
+          docsRead,
+          resultBytes: bytes,
+        };
+        console.log(
+          `[BENCH] size=${size} ${hot.name} ` +
+            (error
+              ? `FAILED: ${error}`
+              : `cold=${coldMs}ms p50=${result.p50Ms}ms p95=${result.p95Ms}ms ` +
+                `docsRead=${docsRead ?? "?"} bytes=${bytes}`)
+        );
+        results.push(result);
+      }
+
+      // 3. RECORD SAMPLES (label "bench:<size>")
+      for (let i = 0; i < samples.length; i += RECORD_BATCH_SIZE) {
+        await ctx.runMutation(internal.mutations.metrics.record, {
+          samples: samples.slice(i, i + RECORD_BATCH_SIZE),
+        });
+      }
+    }
+
+    return { seeded: true, results };
+  },
+});
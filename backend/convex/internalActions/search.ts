@@ -1,5 +1,8 @@
 import { internalAction } from "../_generated/server";
+import { api } from "../_generated/api";
+import type { Doc } from "../_generated/dataModel";
 import { v } from "convex/values";
+import { hybridKnowledgeSearch } from "../lib/search";
 
 /**
  * INTERNAL ACTIONS: Search Utilities
@@ -10,7 +13,7 @@ import { v } from "convex/values";
 
 /**
  * Full-text search entities by name
- * Case-insensitive substring search
+ * Uses the entities.search_name index (relevance ordered)
  */
 export const searchEntitiesByName = internalAction({
   args: {
@@ -21,47 +24,34 @@ export const searchEntitiesByName = internalAction({
   },
   handler: async (ctx, args) => {
     const limit = args.limit || 20;
-    const queryLower = args.query.toLowerCase();
 
-    console.log(
-      `[SEARCH] Entities in ${args.groupId}: "${queryLower}" (limit: ${limit})`
-    );
+    const entities: Doc<"entities">[] = await ctx.runQuery(api.queries.things.search, {
+      groupId: args.groupId,
+      query: args.query,
+      type: args.entityType,
+      limit,
+    });
 
-    // In production: use full-text search index
     return {
       success: true,
       query: args.query,
       groupId: args.groupId,
       entityType: args.entityType,
-      resultsCount: 3,
-      results: [
-        {
-          entityId: "entity_1",
-          name: "Matching Entity 1",
-          type: args.entityType || "unknown",
-          score: 0.99,
-        },
-        {
-          entityId: "entity_2",
-          name: "Matching Entity 2",
-          type: args.entityType || "unknown",
-          score: 0.87,
-        },
-        {
-          entityId: "entity_3",
-          name: "Matching Entity 3",
-          type: args.entityType || "unknown",
-          score: 0.72,
-        },
-      ],
+      resultsCount: entities.length,
+      results: entities.map((e, rank) => ({
+        entityId: e._id,
+        name: e.name,
+        type: e.type,
+        score: 1 / (rank + 1), // Search index returns relevance order, not scores
+      })),
       searchedAt: Date.now(),
     };
   },
 });
 
 /**
- * Full-text search knowledge items
- * Search by content and labels
+ * Hybrid search knowledge items (vector similarity + full text)
+ * See lib/search.ts for the ranking pipeline
  */
 export const searchKnowledgeItems = internalAction({
   args: {
@@ -72,51 +62,27 @@ export const searchKnowledgeItems = internalAction({
   },
   handler: async (ctx, args) => {
     const limit = args.limit || 20;
-    const queryLower = args.query.toLowerCase();
 
-    console.log(
-      `[SEARCH] Knowledge in ${args.groupId}: "${queryLower}" with labels ${args.labels?.join(", ") || "any"}`
-    );
+    const { hits } = await hybridKnowledgeSearch(ctx, {
+      groupId: args.groupId,
+      query: args.query,
+      labels: args.labels,
+      limit,
+    });
 
-    // In production: search vector database for semantic similarity
     return {
       success: true,
       query: args.query,
       groupId: args.groupId,
       labels: args.labels,
-      resultsCount: 5,
-      results: [
-        {
-          knowledgeId: "knowledge_1",
-          text: "Most relevant knowledge item...",
-          labels: ["important", "reference"],
-          similarity: 0.98,
-        },
-        {
-          knowledgeId: "knowledge_2",
-          text: "Second most relevant...",
-          labels: ["documentation"],
-          similarity: 0.91,
-        },
-        {
-          knowledgeId: "knowledge_3",
-          text: "Also relevant...",
-          labels: ["important"],
-          similarity: 0.84,
-        },
-        {
-          knowledgeId: "knowledge_4",
-          text: "Somewhat relevant...",
-          labels: ["reference"],
-          similarity: 0.76,
-        },
-        {
-          knowledgeId: "knowledge_5",
-          text: "Tangentially relevant...",
-          labels: ["documentation"],
-          similarity: 0.68,
-        },
-      ],
+      resultsCount: hits.length,
+      results: hits.map((hit) => ({
+        knowledgeId: hit.knowledge._id,
+        text: hit.knowledge.text ?? "",
+        labels: hit.knowledge.labels ?? [],
+        similarity: hit.similarity ?? 0,
+        score: hit.score,
+      })),
       searchedAt: Date.now(),
     };
   },
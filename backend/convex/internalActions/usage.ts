@@ -0,0 +1,119 @@
+import { internalAction } from "../_generated/server";
+import { internal, api } from "../_generated/api";
+import { v } from "convex/values";
+
+/**
+ * INTERNAL ACTIONS: Usage Metering
+ *
+ * compactUsage: hourly cron (crons.ts). Folds closed-hour usage shards into
+ * hourly/daily/monthly buckets, one bounded mutation at a time, so a backlog
+ * never turns into one oversized transaction.
+ *
+ * loadTest: hammers recordUsage from hundreds of concurrent writers for ONE
+ * group and compares shard counts (1 shard = the old single-row
+ * read-modify-write). Run it against a dev deployment:
+ *
+ *   npx convex run internalActions/usage:loadTest '{"groupId": "<id>"}'
+ */
+
+type LoadTestResult = {
+  shards: number;
+  writes: number;
+  counted: number;
+  elapsedMs: number;
+  writesPerSecond: number;
+  p50Ms: number;
+  p99Ms: number;
+};
+
+/** Upper bound on compaction batches per run (500 shard rows each) */
+const MAX_COMPACTION_BATCHES = 200;
+
+export const compactUsage = internalAction({
+  args: {},
+  handler: async (ctx): Promise<{ compacted: number; batches: number; done: boolean }> => {
+    let compacted = 0;
+    let batches = 0;
+
+    while (batches < MAX_COMPACTION_BATCHES) {
+      const result: { compacted: number; done: boolean } = await ctx.runMutation(
+        internal.mutations.usageTracking.compactShards,
+        {}
+      );
+      compacted += result.compacted;
+      batches++;
+
+      if (result.done) {
+        return { compacted, batches, done: true };
+      }
+    }
+
+    // Backlog left over: the next hourly run continues
+    console.log(`[USAGE] compaction stopped after ${batches} batches (${compacted} shards)`);
+    return { compacted, batches, done: false };
+  },
+});
+
+export const loadTest = internalAction({
+  args: {
+    groupId: v.id("groups"),
+    writers: v.optional(v.number()), // Concurrent writers (default 200)
+    writesPerWriter: v.optional(v.number()), // Sequential writes each (default 10)
+    shardCounts: v.optional(v.array(v.number())), // Default [1, 16, 64]
+  },
+  handler: async (ctx, args): Promise<LoadTestResult[]> => {
+    const writers = args.writers ?? 200;
+    const writesPerWriter = args.writesPerWriter ?? 10;
+    const shardCounts = args.shardCounts ?? [1, 16, 64];
+    const expected = writers * writesPerWriter;
+
+    const results: LoadTestResult[] = [];
+    for (const shards of shardCounts) {
+      // Fresh metric per run so runs never share rows
+      const metric = `loadtest_${Date.now()}_${shards}`;
+      const latencies: number[] = [];
+
+      const started = Date.now();
+      await Promise.all(
+        Array.from({ length: writers }, async () => {
+          for (let i = 0; i < writesPerWriter; i++) {
+            const writeStarted = Date.now();
+            await ctx.runMutation(internal.mutations.usageTracking.recordUsage, {
+              groupId: args.groupId,
+              metric,
+              amount: 1,
+              shards,
+            });
+            latencies.push(Date.now() - writeStarted);
+          }
+        })
+      );
+      const elapsedMs = Date.now() - started;
+
+      // Every write must be counted exactly once
+      const usage: { current: number } = await ctx.runQuery(api.queries.quotas.getMeteredUsage, {
+        groupId: args.groupId,
+        metric,
+        period: "annual", // Exact even if the hour rolls over or compaction runs mid-test
+      });
+
+      latencies.sort((a, b) => a - b);
+      const result: LoadTestResult = {
+        shards,
+        writes: expected,
+        counted: usage.current,
+        elapsedMs,
+        writesPerSecond: Math.round((expected / elapsedMs) * 1000),
+        p50Ms: latencies[Math.floor(latencies.length * 0.5)],
+        p99Ms: latencies[Math.min(latencies.length - 1, Math.floor(latencies.length * 0.99))],
+      };
+      console.log(
+        `[USAGE] shards=${shards} writers=${writers} ${result.writesPerSecond} writes/s ` +
+          `p50=${result.p50Ms}ms p99=${result.p99Ms}ms counted=${result.counted}/${expected}`
+      );
+      results.push(result);
+    }
+
+    return results;
+  },
+});
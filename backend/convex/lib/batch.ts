@@ -0,0 +1,196 @@
+/**
+ * Per-item batch operations
+ *
+ * One validated write per call, shared by the synchronous batch mutations
+ * (mutations/batch.ts, small batches in one transaction) and the chunked job
+ * engine (lib/jobs.ts, large imports spread over many transactions).
+ *
+ * Each function throws an Error with a user-facing message when the item is
+ * invalid; callers record it against the item index and keep going.
+ */
+
+import { v, type Infer } from "convex/values";
+import type { MutationCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+import { THING_TYPES, isThingType } from "../types/ontology";
+import { insertEntity, insertConnection, insertEvent, patchEntity } from "./rollups";
+
+// ============================================================================
+// VALIDATORS
+// ============================================================================
+
+export const thingStatusValidator = v.union(
+  v.literal("draft"),
+  v.literal("active"),
+  v.literal("published"),
+  v.literal("archived"),
+  v.literal("inactive")
+);
+
+export const importThingValidator = v.object({
+  type: v.string(),
+  name: v.string(),
+  properties: v.optional(v.any()),
+  status: v.optional(thingStatusValidator)
+});
+
+export const importConnectionValidator = v.object({
+  fromEntityId: v.id("entities"),
+  toEntityId: v.id("entities"),
+  relationshipType: v.string(),
+  metadata: v.optional(v.any()),
+  validFrom: v.optional(v.number()),
+  validTo: v.optional(v.number())
+});
+
+export const thingUpdateValidator = v.object({
+  entityId: v.id("entities"),
+  name: v.optional(v.string()),
+  properties: v.optional(v.any()),
+  status: v.optional(thingStatusValidator)
+});
+
+export type ThingStatus = Infer<typeof thingStatusValidator>;
+export type ImportThing = Infer<typeof importThingValidator>;
+export type ImportConnection = Infer<typeof importConnectionValidator>;
+export type ThingUpdate = Infer<typeof thingUpdateValidator>;
+
+export type BatchItemError = { index: number; error: string };
+
+// ============================================================================
+// ITEM OPERATIONS
+// ============================================================================
+
+/**
+ * Validate and insert one thing
+ */
+export async function importThing(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  thing: ImportThing,
+  options: { skipValidation?: boolean; defaultStatus?: ThingStatus; now: number }
+): Promise<Id<"entities">> {
+  if (!options.skipValidation && !isThingType(thing.type)) {
+    throw new Error(`Invalid type "${thing.type}". Must be one of: ${THING_TYPES.join(", ")}`);
+  }
+
+  if (!thing.name || thing.name.trim().length === 0) {
+    throw new Error("Name cannot be empty");
+  }
+
+  return await insertEntity(ctx, {
+    groupId,
+    type: thing.type as any,
+    name: thing.name.trim(),
+    properties: thing.properties || {},
+    status: thing.status || options.defaultStatus || "draft",
+    schemaVersion: 1,
+    createdAt: options.now,
+    updatedAt: options.now
+  });
+}
+
+/**
+ * Validate and insert one connection (both ends in the group, no duplicate)
+ */
+export async function importConnection(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  conn: ImportConnection,
+  options: { now: number }
+): Promise<Id<"connections">> {
+  const fromEntity = await ctx.db.get(conn.fromEntityId);
+  if (!fromEntity) {
+    throw new Error(`From entity not found: ${conn.fromEntityId}`);
+  }
+
+  const toEntity = await ctx.db.get(conn.toEntityId);
+  if (!toEntity) {
+    throw new Error(`To entity not found: ${conn.toEntityId}`);
+  }
+
+  if (fromEntity.groupId !== groupId || toEntity.groupId !== groupId) {
+    throw new Error("Both entities must belong to specified group");
+  }
+
+  const existing = await ctx.db
+    .query("connections")
+    .withIndex("bidirectional", (q) =>
+      q.eq("fromEntityId", conn.fromEntityId)
+        .eq("toEntityId", conn.toEntityId)
+        .eq("relationshipType", conn.relationshipType as any)
+    )
+    .first();
+  if (existing) {
+    throw new Error("Connection already exists");
+  }
+
+  return await insertConnection(ctx, {
+    groupId,
+    fromEntityId: conn.fromEntityId,
+    toEntityId: conn.toEntityId,
+    relationshipType: conn.relationshipType as any,
+    metadata: conn.metadata,
+    validFrom: conn.validFrom || options.now,
+    validTo: conn.validTo,
+    createdAt: options.now,
+    updatedAt: options.now
+  });
+}
+
+/**
+ * Apply one update and log a thing_updated event for it
+ *
+ * Returns the changed field names (empty when nothing changed)
+ */
+export async function applyThingUpdate(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  update: ThingUpdate,
+  options: { actorId?: Id<"entities">; now: number }
+): Promise<string[]> {
+  const entity = await ctx.db.get(update.entityId);
+  if (!entity) {
+    throw new Error(`Entity not found: ${update.entityId}`);
+  }
+  if (entity.groupId !== groupId) {
+    throw new Error("Entity does not belong to specified group");
+  }
+
+  const patch: Partial<Doc<"entities">> = { updatedAt: options.now };
+  const changes: string[] = [];
+
+  if (update.name !== undefined && update.name !== entity.name) {
+    patch.name = update.name;
+    changes.push("name");
+  }
+
+  if (update.properties !== undefined) {
+    patch.properties = update.properties;
+    changes.push("properties");
+  }
+
+  if (update.status !== undefined && update.status !== entity.status) {
+    patch.status = update.status;
+    changes.push("status");
+  }
+
+  if (changes.length === 0) {
+    return changes;
+  }
+
+  await patchEntity(ctx, entity, patch);
+  await insertEvent(ctx, {
+    groupId,
+    type: "thing_updated",
+    actorId: options.actorId,
+    targetId: update.entityId,
+    timestamp: options.now,
+    metadata: {
+      changes,
+      values: patch
+    }
+  });
+
+  return changes;
+}
@@ -0,0 +1,252 @@
+/**
+ * Cascade cleanup steps for a deleted thing
+ *
+ * Each step touches at most `numItems` rows and reports whether its phase
+ * is finished, so a cascade on a popular thing (100K connections) runs as
+ * many small transactions instead of one that collects everything:
+ *
+ *   connections_from → connections_to → events_actor → events_target → knowledge
+ *
+ * Deleting phases (connections, knowledge links) always read from the start
+ * of the index range because processed rows disappear. Archiving phases
+ * (events) keep rows in place and resume from a pagination cursor.
+ *
+ * Driven by the job engine (lib/jobs.ts, kind "cascade_delete").
+ */
+
+import type { MutationCtx } from "../_generated/server";
+import type { Id } from "../_generated/dataModel";
+import { deleteConnection, insertEvent } from "./rollups";
+
+// ============================================================================
+// TYPES
+// ============================================================================
+
+export const CASCADE_PHASES = [
+  "connections_from",
+  "connections_to",
+  "events_actor",
+  "events_target",
+  "knowledge",
+] as const;
+
+export type CascadePhase = (typeof CASCADE_PHASES)[number];
+
+export type CascadeCounts = {
+  connectionCount: number;
+  eventCount: number;
+  associationCount: number;
+};
+
+export const EMPTY_CASCADE_COUNTS: CascadeCounts = {
+  connectionCount: 0,
+  eventCount: 0,
+  associationCount: 0,
+};
+
+export type CascadeStepInput = {
+  thingId: Id<"entities">;
+  groupId: Id<"groups">;
+  cursor: string | null;
+  numItems: number;
+};
+
+export type CascadeStepResult = {
+  touched: number; // Rows deleted/archived in this step
+  cursor: string | null; // Resume point within the phase
+  done: boolean; // Phase finished
+};
+
+// ============================================================================
+// STEPS
+// ============================================================================
+
+/**
+ * Run one bounded step of a cascade phase
+ */
+export async function runCascadeStep(
+  ctx: MutationCtx,
+  phase: CascadePhase,
+  input: CascadeStepInput
+): Promise<CascadeStepResult> {
+  switch (phase) {
+    case "connections_from":
+      return await deleteConnectionsStep(ctx, input, "group_from");
+    case "connections_to":
+      return await deleteConnectionsStep(ctx, input, "group_to");
+    case "events_actor":
+      return await archiveEventsStep(ctx, input, "actor_type");
+    case "events_target":
+      return await archiveEventsStep(ctx, input, "by_target");
+    case "knowledge":
+      return await removeKnowledgeStep(ctx, input);
+  }
+}
+
+/**
+ * Add a step's rows to the counter its phase reports under
+ */
+export function addCascadeCounts(
+  counts: CascadeCounts,
+  phase: CascadePhase,
+  touched: number
+): CascadeCounts {
+  if (phase === "connections_from" || phase === "connections_to") {
+    return { ...counts, connectionCount: counts.connectionCount + touched };
+  }
+  if (phase === "events_actor" || phase === "events_target") {
+    return { ...counts, eventCount: counts.eventCount + touched };
+  }
+  return { ...counts, associationCount: counts.associationCount + touched };
+}
+
+/**
+ * Delete connections where the thing is source (group_from) or target (group_to)
+ * GROUP ISOLATION: index is prefixed by groupId
+ */
+async function deleteConnectionsStep(
+  ctx: MutationCtx,
+  input: CascadeStepInput,
+  index: "group_from" | "group_to"
+): Promise<CascadeStepResult> {
+  const connections =
+    index === "group_from"
+      ? await ctx.db
+          .query("connections")
+          .withIndex("group_from", (q) =>
+            q.eq("groupId", input.groupId).eq("fromEntityId", input.thingId)
+          )
+          .take(input.numItems)
+      : await ctx.db
+          .query("connections")
+          .withIndex("group_to", (q) =>
+            q.eq("groupId", input.groupId).eq("toEntityId", input.thingId)
+          )
+          .take(input.numItems);
+
+  for (const conn of connections) {
+    await deleteConnection(ctx, conn);
+  }
+
+  return {
+    touched: connections.length,
+    cursor: null,
+    done: connections.length < input.numItems,
+  };
+}
+
+/**
+ * Archive the thing's own thing_deleted events as actor (actor_type) and
+ * every event where it is target (by_target)
+ * Events are never deleted: they stay queryable for the audit trail.
+ * Other events the thing acted in stay live in the group's history.
+ * GROUP ISOLATION: rows from other groups are skipped
+ */
+async function archiveEventsStep(
+  ctx: MutationCtx,
+  input: CascadeStepInput,
+  index: "actor_type" | "by_target"
+): Promise<CascadeStepResult> {
+  const result =
+    index === "actor_type"
+      ? await ctx.db
+          .query("events")
+          .withIndex("actor_type", (q) =>
+            q.eq("actorId", input.thingId).eq("type", "thing_deleted")
+          )
+          .paginate({ cursor: input.cursor, numItems: input.numItems })
+      : await ctx.db
+          .query("events")
+          .withIndex("by_target", (q) => q.eq("targetId", input.thingId))
+          .paginate({ cursor: input.cursor, numItems: input.numItems });
+
+  let touched = 0;
+  for (const event of result.page) {
+    if (event.groupId === input.groupId && !event.archived) {
+      await ctx.db.patch(event._id, { archived: true });
+      touched++;
+    }
+  }
+
+  return {
+    touched,
+    cursor: result.isDone ? null : result.continueCursor,
+    done: result.isDone,
+  };
+}
+
+/**
+ * Remove thingKnowledge links; soft-delete knowledge left with no links
+ */
+async function removeKnowledgeStep(
+  ctx: MutationCtx,
+  input: CascadeStepInput
+): Promise<CascadeStepResult> {
+  const associations = await ctx.db
+    .query("thingKnowledge")
+    .withIndex("by_thing", (q) => q.eq("thingId", input.thingId))
+    .take(input.numItems);
+
+  for (const assoc of associations) {
+    await ctx.db.delete(assoc._id);
+
+    // Only existence matters: one row is enough
+    const otherAssoc = await ctx.db
+      .query("thingKnowledge")
+      .withIndex("by_knowledge", (q) => q.eq("knowledgeId", assoc.knowledgeId))
+      .first();
+
+    if (!otherAssoc) {
+      const knowledge = await ctx.db.get(assoc.knowledgeId);
+      if (knowledge && knowledge.groupId === input.groupId && !knowledge.deletedAt) {
+        await ctx.db.patch(assoc.knowledgeId, { deletedAt: Date.now() });
+      }
+    }
+  }
+
+  return {
+    touched: associations.length,
+    cursor: null,
+    done: associations.length < input.numItems,
+  };
+}
+
+// ============================================================================
+// COMPLETION
+// ============================================================================
+
+/**
+ * Log the cascade_cleanup_completed event for a finished cascade
+ *
+ * Attributed to the group's system creator when one exists, otherwise to
+ * whoever deleted the thing.
+ */
+export async function logCascadeCompletion(
+  ctx: MutationCtx,
+  input: {
+    thingId: Id<"entities">;
+    groupId: Id<"groups">;
+    counts: CascadeCounts;
+    actorId?: Id<"entities">;
+  }
+): Promise<void> {
+  const system = await ctx.db
+    .query("entities")
+    .withIndex("group_type", (q) =>
+      q.eq("groupId", input.groupId).eq("type", "creator" as any)
+    )
+    .filter((q) => q.eq(q.field("properties.isSystem"), true))
+    .first();
+
+  await insertEvent(ctx, {
+    groupId: input.groupId,
+    type: "thing_deleted", // Reuse thing_deleted but mark as cleanup
+    actorId: system?._id ?? input.actorId,
+    targetId: input.thingId,
+    timestamp: Date.now(),
+    metadata: {
+      action: "cascade_cleanup_completed",
+      ...input.counts,
+    },
+  });
+}
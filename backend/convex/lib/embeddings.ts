@@ -0,0 +1,207 @@
+/**
+ * Embedding providers for knowledge (Dimension 6)
+ *
+ * Pluggable behind the Embedder interface:
+ * - "hash":   deterministic local embedder (feature hashing). No network,
+ *             same text always gives the same vector. Used in tests,
+ *             benchmarks and deployments without an API key.
+ * - "openai": OpenAI embeddings API (text-embedding-3-small by default)
+ *
+ * Selected by EMBEDDING_PROVIDER (defaults to "openai" when OPENAI_API_KEY
+ * is set, otherwise "hash"). All providers return EMBEDDING_DIMENSIONS-long,
+ * L2-normalized vectors so they fit the knowledge.by_embedding vector index.
+ */
+
+// ============================================================================
+// CONSTANTS
+// ============================================================================
+
+/** Must match the knowledge.by_embedding vector index in schema.ts */
+export const EMBEDDING_DIMENSIONS = 1536;
+
+/** Texts per provider call (OpenAI accepts up to 2048 inputs per request) */
+export const EMBEDDING_BATCH_SIZE = 96;
+
+// ============================================================================
+// INTERFACE
+// ============================================================================
+
+export interface Embedder {
+  readonly model: string;
+  readonly dimensions: number;
+  embed(texts: string[]): Promise<number[][]>;
+}
+
+// ============================================================================
+// DETERMINISTIC LOCAL EMBEDDER
+// ============================================================================
+
+/**
+ * Tokenize text into lowercase word tokens
+ */
+export function tokenize(text: string): string[] {
+  return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) ?? [];
+}
+
+/**
+ * 32-bit FNV-1a hash
+ */
+function fnv1a(value: string, seed = 0x811c9dc5): number {
+  let hash = seed;
+  for (let i = 0; i < value.length; i++) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+/**
+ * Embed one text by hashing tokens (and adjacent token pairs) into buckets
+ * Signed hashing keeps unrelated tokens from systematically adding up
+ */
+export function hashEmbed(text: string, dimensions = EMBEDDING_DIMENSIONS): number[] {
+  const vector = new Array<number>(dimensions).fill(0);
+  const tokens = tokenize(text);
+
+  const features = [...tokens];
+  for (let i = 0; i < tokens.length - 1; i++) {
+    features.push(`${tokens[i]} ${tokens[i + 1]}`);
+  }
+
+  for (const feature of features) {
+    const hash = fnv1a(feature);
+    const sign = fnv1a(feature, 0x9747b28c) & 1 ? 1 : -1;
+    vector[hash % dimensions] += sign;
+  }
+
+  return normalize(vector);
+}
+
+/**
+ * Fingerprint of the text an embedding is computed from
+ * Sent along with the vector so setEmbeddings can drop it if the stored
+ * text changed while the embedding was in flight
+ */
+export function embeddingTextHash(text: string): string {
+  return `${text.length}:${fnv1a(text).toString(36)}:${fnv1a(text, 0x9747b28c).toString(36)}`;
+}
+
+export function createHashEmbedder(dimensions = EMBEDDING_DIMENSIONS): Embedder {
+  return {
+    model: `hash-${dimensions}`,
+    dimensions,
+    embed: async (texts) => texts.map((t) => hashEmbed(t, dimensions)),
+  };
+}
+
+// ============================================================================
+// OPENAI EMBEDDER
+// ============================================================================
+
+export function createOpenAIEmbedder(
+  apiKey: string,
+  model = "text-embedding-3-small",
+  dimensions = EMBEDDING_DIMENSIONS
+): Embedder {
+  return {
+    model,
+    dimensions,
+    embed: async (texts) => {
+      if (texts.length === 0) {
+        return [];
+      }
+
+      const response = await fetch("https://api.openai.com/v1/embeddings", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          Authorization: `Bearer ${apiKey}`,
+        },
+        body: JSON.stringify({ model, input: texts, dimensions }),
+      });
+
+      if (!response.ok) {
+        throw new Error(
+          `Embedding request failed: ${response.status} ${await response.text()}`
+        );
+      }
+
+      const json = (await response.json()) as {
+        data: Array<{ index: number; embedding: number[] }>;
+      };
+
+      return json.data
+        .sort((a, b) => a.index - b.index)
+        .map((d) => d.embedding);
+    },
+  };
+}
+
+// ============================================================================
+// PROVIDER SELECTION + BATCHING
+// ============================================================================
+
+/**
+ * Get the configured embedder (see module docs for selection rules)
+ */
+export function getEmbedder(): Embedder {
+  const apiKey = process.env.OPENAI_API_KEY;
+  const provider = process.env.EMBEDDING_PROVIDER || (apiKey ? "openai" : "hash");
+
+  if (provider === "openai") {
+    if (!apiKey) {
+      throw new Error("EMBEDDING_PROVIDER=openai requires OPENAI_API_KEY");
+    }
+    return createOpenAIEmbedder(apiKey, process.env.EMBEDDING_MODEL || undefined);
+  }
+
+  return createHashEmbedder();
+}
+
+/**
+ * Embed texts in provider-sized batches, preserving input order
+ */
+export async function embedInBatches(
+  embedder: Embedder,
+  texts: string[],
+  batchSize = EMBEDDING_BATCH_SIZE
+): Promise<number[][]> {
+  const vectors: number[][] = [];
+  for (let i = 0; i < texts.length; i += batchSize) {
+    const chunk = texts.slice(i, i + batchSize);
+    const batch = await embedder.embed(chunk);
+    if (batch.length !== chunk.length) {
+      throw new Error(`Embedder returned ${batch.length} vectors for ${chunk.length} texts`);
+    }
+    for (const vector of batch) {
+      if (vector.length !== embedder.dimensions) {
+        throw new Error(
+          `Embedding has ${vector.length} dimensions, expected ${embedder.dimensions}`
+        );
+      }
+    }
+    vectors.push(...batch);
+  }
+  return vectors;
+}
+
+// ============================================================================
+// VECTOR MATH
+// ============================================================================
+
+export function normalize(vector: number[]): number[] {
+  let norm = 0;
+  for (const x of vector) {
+    norm += x * x;
+  }
+  norm = Math.sqrt(norm);
+  return norm === 0 ? vector : vector.map((x) => x / norm);
+}
+
+export function dot(a: ArrayLike<number>, b: ArrayLike<number>): number {
+  let sum = 0;
+  for (let i = 0; i < a.length; i++) {
+    sum += a[i] * b[i];
+  }
+  return sum;
+}
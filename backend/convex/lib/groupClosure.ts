@@ -0,0 +1,316 @@
+/**
+ * Group closure table helpers
+ *
+ * groupClosure stores one row per (ancestor, descendant) pair in the group
+ * tree, including a depth-0 row for every group itself:
+ *
+ *   Enterprise ─┬─ Sales ── EMEA
+ *               └─ Engineering
+ *
+ *   (Enterprise, Enterprise, 0) (Enterprise, Sales, 1) (Enterprise, EMEA, 2)
+ *   (Sales, Sales, 0) (Sales, EMEA, 1) (EMEA, EMEA, 0) ...
+ *
+ * So every hierarchy question is ONE indexed range read:
+ * - descendants of G:        ancestor_depth   where ancestorId = G
+ * - ancestors of G (path):   descendant_depth where descendantId = G
+ * - is A an ancestor of D:   descendant_ancestor (D, A) unique lookup
+ *
+ * Writes go through insertGroup / moveGroup / setGroupStatus so the table
+ * changes in the SAME transaction as the group. Groups created before the
+ * closure table existed are backfilled by mutations/groupClosure.ts.
+ */
+
+import type { WithoutSystemFields } from "convex/server";
+import type { MutationCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+
+// ============================================================================
+// LIMITS
+// ============================================================================
+
+/** Deepest tree walked when rebuilding rows from parentGroupId */
+export const MAX_GROUP_DEPTH = 64;
+
+/** Largest subtree that can be re-parented in one transaction */
+export const MAX_MOVE_SUBTREE = 1000;
+
+type GroupStatus = Doc<"groups">["status"];
+
+// ============================================================================
+// READS
+// ============================================================================
+
+/**
+ * Descendant group ids of groupId, shallowest first
+ *
+ * includeSelf adds groupId itself (depth 0) at the front. Throws if more
+ * than limit (default MAX_MOVE_SUBTREE) groups match, rather than
+ * returning part of the tree
+ */
+export async function getDescendantIds(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  options: {
+    includeSelf?: boolean;
+    maxDepth?: number;
+    status?: GroupStatus;
+    limit?: number;
+  } = {}
+): Promise<Id<"groups">[]> {
+  const rows = await readDescendants(ctx, groupId, {
+    ...options,
+    minDepth: options.includeSelf ? 0 : 1,
+  });
+  return rows.map((row) => row.descendantId);
+}
+
+/**
+ * Closure rows below groupId (depth >= 1), shallowest first
+ *
+ * Throws if more than limit (default MAX_MOVE_SUBTREE) rows match
+ */
+export async function getDescendantRows(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  options: { maxDepth?: number; status?: GroupStatus; limit?: number } = {}
+): Promise<Doc<"groupClosure">[]> {
+  return await readDescendants(ctx, groupId, { ...options, minDepth: 1 });
+}
+
+async function readDescendants(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  options: { minDepth: number; maxDepth?: number; status?: GroupStatus; limit?: number }
+): Promise<Doc<"groupClosure">[]> {
+  const limit = options.limit ?? MAX_MOVE_SUBTREE;
+  const rows = await ctx.db
+    .query("groupClosure")
+    .withIndex("ancestor_depth", (q) =>
+      q
+        .eq("ancestorId", groupId)
+        .gte("depth", options.minDepth)
+        .lte("depth", options.maxDepth ?? MAX_GROUP_DEPTH)
+    )
+    .filter((q) =>
+      options.status ? q.eq(q.field("descendantStatus"), options.status) : true
+    )
+    .take(limit + 1);
+
+  if (rows.length > limit) {
+    throw new Error(`Group hierarchy has more than ${limit} subgroups`);
+  }
+  return rows;
+}
+
+/**
+ * Ancestor ids of groupId ordered root first, ending with groupId itself
+ */
+export async function getAncestorIds(
+  ctx: QueryCtx,
+  groupId: Id<"groups">
+): Promise<Id<"groups">[]> {
+  const rows = await ctx.db
+    .query("groupClosure")
+    .withIndex("descendant_depth", (q) => q.eq("descendantId", groupId))
+    .order("desc")
+    .take(MAX_GROUP_DEPTH + 1);
+
+  return rows.map((row) => row.ancestorId);
+}
+
+/**
+ * True if ancestorId is groupId or one of its ancestors
+ */
+export async function isAncestorOrSelf(
+  ctx: QueryCtx,
+  ancestorId: Id<"groups">,
+  groupId: Id<"groups">
+): Promise<boolean> {
+  if (ancestorId === groupId) {
+    return true;
+  }
+
+  const row = await ctx.db
+    .query("groupClosure")
+    .withIndex("descendant_ancestor", (q) =>
+      q.eq("descendantId", groupId).eq("ancestorId", ancestorId)
+    )
+    .unique();
+
+  return row !== null;
+}
+
+// ============================================================================
+// WRITES
+// ============================================================================
+
+/**
+ * Insert a group and its closure rows
+ */
+export async function insertGroup(
+  ctx: MutationCtx,
+  doc: WithoutSystemFields<Doc<"groups">>
+): Promise<Id<"groups">> {
+  const groupId = await ctx.db.insert("groups", doc);
+  await linkToAncestors(ctx, groupId, doc.parentGroupId, doc.status);
+  return groupId;
+}
+
+/**
+ * Patch a group's status and mirror it onto its closure rows
+ */
+export async function setGroupStatus(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  status: GroupStatus
+): Promise<void> {
+  await ctx.db.patch(groupId, { status, updatedAt: Date.now() });
+
+  const rows = await ctx.db
+    .query("groupClosure")
+    .withIndex("descendant_depth", (q) => q.eq("descendantId", groupId))
+    .collect(); // One row per ancestor: bounded by tree depth
+
+  for (const row of rows) {
+    await ctx.db.patch(row._id, { descendantStatus: status });
+  }
+}
+
+/**
+ * Re-parent a group (and its whole subtree) under newParentId
+ *
+ * Pass undefined to make the group a root. Throws on cycles.
+ */
+export async function moveGroup(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  newParentId: Id<"groups"> | undefined
+): Promise<void> {
+  // 1. REJECT CYCLES (new parent inside the subtree being moved)
+  if (newParentId && (await isAncestorOrSelf(ctx, groupId, newParentId))) {
+    throw new Error("Cannot move a group under itself or one of its subgroups");
+  }
+
+  // 2. LOAD SUBTREE (self included, with depth below groupId)
+  const subtree = await ctx.db
+    .query("groupClosure")
+    .withIndex("ancestor_depth", (q) => q.eq("ancestorId", groupId))
+    .take(MAX_MOVE_SUBTREE + 1);
+  if (subtree.length > MAX_MOVE_SUBTREE) {
+    throw new Error(`Cannot move a subtree of more than ${MAX_MOVE_SUBTREE} groups`);
+  }
+
+  // 3. UNLINK SUBTREE FROM OLD ANCESTORS
+  // In a tree, a member's ancestors deeper than its distance to groupId are
+  // exactly groupId's old ancestors
+  for (const member of subtree) {
+    const stale = await ctx.db
+      .query("groupClosure")
+      .withIndex("descendant_depth", (q) =>
+        q.eq("descendantId", member.descendantId).gt("depth", member.depth)
+      )
+      .collect();
+    for (const row of stale) {
+      await ctx.db.delete(row._id);
+    }
+  }
+
+  // 4. LINK SUBTREE UNDER NEW ANCESTORS
+  if (newParentId) {
+    const newAncestors = await ctx.db
+      .query("groupClosure")
+      .withIndex("descendant_depth", (q) => q.eq("descendantId", newParentId))
+      .collect();
+
+    for (const ancestor of newAncestors) {
+      for (const member of subtree) {
+        await ctx.db.insert("groupClosure", {
+          ancestorId: ancestor.ancestorId,
+          descendantId: member.descendantId,
+          depth: ancestor.depth + 1 + member.depth,
+          descendantStatus: member.descendantStatus,
+        });
+      }
+    }
+  }
+
+  await ctx.db.patch(groupId, { parentGroupId: newParentId, updatedAt: Date.now() });
+}
+
+/**
+ * Recreate one group's ancestor rows from parentGroupId pointers
+ *
+ * Used by the backfill job; safe to run repeatedly
+ */
+export async function rebuildGroupClosure(
+  ctx: MutationCtx,
+  group: Doc<"groups">
+): Promise<void> {
+  const existing = await ctx.db
+    .query("groupClosure")
+    .withIndex("descendant_depth", (q) => q.eq("descendantId", group._id))
+    .collect();
+  for (const row of existing) {
+    await ctx.db.delete(row._id);
+  }
+
+  await ctx.db.insert("groupClosure", {
+    ancestorId: group._id,
+    descendantId: group._id,
+    depth: 0,
+    descendantStatus: group.status,
+  });
+
+  const visited = new Set<string>([group._id]);
+  let parentId = group.parentGroupId;
+  let depth = 1;
+  while (parentId && depth <= MAX_GROUP_DEPTH && !visited.has(parentId)) {
+    const parent: Doc<"groups"> | null = await ctx.db.get(parentId);
+    if (!parent) break;
+
+    visited.add(parentId);
+    await ctx.db.insert("groupClosure", {
+      ancestorId: parentId,
+      descendantId: group._id,
+      depth,
+      descendantStatus: group.status,
+    });
+    parentId = parent.parentGroupId;
+    depth++;
+  }
+}
+
+/**
+ * Self row plus one row per ancestor of parentGroupId
+ */
+async function linkToAncestors(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  parentGroupId: Id<"groups"> | undefined,
+  status: GroupStatus
+): Promise<void> {
+  await ctx.db.insert("groupClosure", {
+    ancestorId: groupId,
+    descendantId: groupId,
+    depth: 0,
+    descendantStatus: status,
+  });
+
+  if (!parentGroupId) {
+    return;
+  }
+
+  const parentAncestors = await ctx.db
+    .query("groupClosure")
+    .withIndex("descendant_depth", (q) => q.eq("descendantId", parentGroupId))
+    .collect();
+
+  for (const ancestor of parentAncestors) {
+    await ctx.db.insert("groupClosure", {
+      ancestorId: ancestor.ancestorId,
+      descendantId: groupId,
+      depth: ancestor.depth + 1,
+      descendantStatus: status,
+    });
+  }
+}
@@ -0,0 +1,403 @@
+/**
+ * Function instrumentation
+ *
+ * instrumentedQuery / instrumentedMutation / instrumentedAction take the
+ * same definition as query / mutation / action plus a function name, and
+ * measure each call:
+ *
+ * - docsRead: documents returned to the function by ctx.db (get, collect,
+ *   take, first, unique, paginate, async iteration). Rows discarded by
+ *   .filter() are scanned but not counted, so a filtered scan reads MORE
+ *   than this number.
+ * - docsWritten: ctx.db insert / patch / replace / delete calls
+ * - resultBytes: JSON size of the return value
+ * - durationMs: wall time, actions only. Convex freezes Date.now() for the
+ *   whole of a query or mutation, so their latency is measured by the
+ *   caller instead (see internalActions/bench.ts)
+ *
+ * A fraction of calls (PERF_SAMPLE_RATE, default 1%) is recorded:
+ * - query: "[PERF]" log line (queries cannot write)
+ * - mutation: functionMetrics row, inserted in the same transaction
+ * - action: functionMetrics row via mutations/metrics:record
+ *
+ * Reports: queries/metrics:report (p50/p95 per function)
+ */
+
+import {
+  action,
+  mutation,
+  query,
+  type ActionCtx,
+  type MutationCtx,
+  type QueryCtx,
+} from "../_generated/server";
+import type {
+  RegisteredAction,
+  RegisteredMutation,
+  RegisteredQuery,
+} from "convex/server";
+import type { ObjectType, PropertyValidators } from "convex/values";
+import { internal } from "../_generated/api";
+
+// ============================================================================
+// TYPES
+// ============================================================================
+
+export type FunctionKind = "query" | "mutation" | "action";
+
+export type FunctionMetric = {
+  functionName: string;
+  kind: FunctionKind;
+  durationMs?: number;
+  docsRead?: number;
+  docsWritten?: number;
+  resultBytes: number;
+  ok: boolean;
+  error?: string;
+  label?: string; // e.g. "bench:10000"
+  timestamp: number;
+};
+
+export type InstrumentOptions = {
+  sampleRate?: number; // Overrides PERF_SAMPLE_RATE for this function
+};
+
+type Counters = { docsRead: number; docsWritten: number };
+
+export const DEFAULT_SAMPLE_RATE = 0.01;
+
+/** functionMetrics rows older than this are pruned daily (crons.ts) */
+export const METRICS_RETENTION_MS = 7 * 24 * 60 * 60 * 1000;
+
+/** Upper bound on rows a report reads */
+export const MAX_REPORT_SAMPLES = 10000;
+
+// ============================================================================
+// COUNTING DATABASE
+// ============================================================================
+
+const WRITE_METHODS = new Set(["insert", "patch", "replace", "delete"]);
+
+/**
+ * Wrap a query builder so its results are counted as reads
+ * Chained builders (withIndex, filter, order, ...) are wrapped too
+ */
+function countingQuery<Q extends object>(builder: Q, counters: Counters): Q {
+  return new Proxy(builder, {
+    get(target, prop) {
+      const value = Reflect.get(target, prop, target);
+      if (typeof value !== "function") {
+        return value;
+      }
+
+      switch (prop) {
+        case "collect":
+        case "take":
+          return async (...args: unknown[]) => {
+            const docs = await value.apply(target, args);
+            counters.docsRead += docs.length;
+            return docs;
+          };
+        case "first":
+        case "unique":
+          return async () => {
+            const doc = await value.apply(target);
+            if (doc) counters.docsRead++;
+            return doc;
+          };
+        case "paginate":
+          return async (...args: unknown[]) => {
+            const result = await value.apply(target, args);
+            counters.docsRead += result.page.length;
+            return result;
+          };
+        case Symbol.asyncIterator:
+          return () => {
+            const iterator = value.apply(target);
+            return {
+              next: async () => {
+                const step = await iterator.next();
+                if (!step.done) counters.docsRead++;
+                return step;
+              },
+              [Symbol.asyncIterator]() {
+                return this;
+              },
+            };
+          };
+        default:
+          return (...args: unknown[]) => {
+            const next = value.apply(target, args);
+            return next && typeof next === "object" && "collect" in next
+              ? countingQuery(next, counters)
+              : next;
+          };
+      }
+    },
+  });
+}
+
+/**
+ * Copy of ctx whose db counts documents read and written
+ */
+export function withCountingDb<Ctx extends QueryCtx | MutationCtx>(
+  ctx: Ctx
+): { ctx: Ctx; counters: Counters } {
+  const counters: Counters = { docsRead: 0, docsWritten: 0 };
+
+  const db = new Proxy(ctx.db, {
+    get(target, prop) {
+      const value = Reflect.get(target, prop, target);
+      if (typeof value !== "function") {
+        return value;
+      }
+
+      if (prop === "get") {
+        return async (...args: unknown[]) => {
+          const doc = await value.apply(target, args);
+          if (doc) counters.docsRead++;
+          return doc;
+        };
+      }
+      if (prop === "query") {
+        return (...args: unknown[]) =>
+          countingQuery(value.apply(target, args), counters);
+      }
+      if (typeof prop === "string" && WRITE_METHODS.has(prop)) {
+        return async (...args: unknown[]) => {
+          const result = await value.apply(target, args);
+          counters.docsWritten++;
+          return result;
+        };
+      }
+      return value.bind(target);
+    },
+  });
+
+  return { ctx: { ...ctx, db } as Ctx, counters };
+}
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+/**
+ * JSON size of a function result (0 for undefined / unserializable)
+ */
+export function resultBytes(value: unknown): number {
+  if (value === undefined) {
+    return 0;
+  }
+  try {
+    return JSON.stringify(value, (_key, v) =>
+      typeof v === "bigint" ? v.toString() : v
+    ).length;
+  } catch {
+    return 0;
+  }
+}
+
+/**
+ * Nearest-rank percentile of an ascending array (p in 0..1)
+ */
+export function percentile(sorted: number[], p: number): number | null {
+  if (sorted.length === 0) {
+    return null;
+  }
+  const rank = Math.ceil(p * sorted.length) - 1;
+  return sorted[Math.min(sorted.length - 1, Math.max(0, rank))];
+}
+
+function shouldSample(options: InstrumentOptions): boolean {
+  const configured = parseFloat(process.env.PERF_SAMPLE_RATE ?? "");
+  const rate =
+    options.sampleRate ??
+    (Number.isFinite(configured) ? configured : DEFAULT_SAMPLE_RATE);
+  return rate > 0 && Math.random() < rate;
+}
+
+function errorMessage(error: unknown): string {
+  return (error instanceof Error ? error.message : String(error)).slice(0, 500);
+}
+
+// ============================================================================
+// REGISTRY
+// ============================================================================
+
+type QueryHandler = (ctx: QueryCtx, args: any) => Promise<unknown>;
+
+/**
+ * Instrumented query handlers by function name, for measuring reads
+ * outside the normal call path (queries/metrics:countReads)
+ */
+export const instrumentedQueryHandlers = new Map<string, QueryHandler>();
+
+/**
+ * Run a registered query handler with counting and return its costs
+ */
+export async function measureQuery(
+  ctx: QueryCtx,
+  functionName: string,
+  args: Record<string, unknown>
+): Promise<{ docsRead: number; resultBytes: number }> {
+  const handler = instrumentedQueryHandlers.get(functionName);
+  if (!handler) {
+    throw new Error(`No instrumented query named ${functionName}`);
+  }
+
+  const counting = withCountingDb(ctx);
+  const result = await handler(counting.ctx, args);
+  return {
+    docsRead: counting.counters.docsRead,
+    resultBytes: resultBytes(result),
+  };
+}
+
+// ============================================================================
+// WRAPPERS
+// ============================================================================
+
+/**
+ * query() with read counting and sampled "[PERF]" log lines
+ *
+ * @param name - Function path as Convex reports it ("queries/events:stats")
+ */
+export function instrumentedQuery<Args extends PropertyValidators, Output>(
+  name: string,
+  definition: {
+    args: Args;
+    handler: (ctx: QueryCtx, args: ObjectType<Args>) => Promise<Output>;
+  },
+  options: InstrumentOptions = {}
+): RegisteredQuery<"public", ObjectType<Args>, Promise<Output>> {
+  instrumentedQueryHandlers.set(name, definition.handler);
+
+  return query({
+    args: definition.args,
+    handler: async (ctx: QueryCtx, args: ObjectType<Args>) => {
+      if (!shouldSample(options)) {
+        return await definition.handler(ctx, args);
+      }
+
+      const counting = withCountingDb(ctx);
+      const sample: Omit<FunctionMetric, "resultBytes" | "ok"> = {
+        functionName: name,
+        kind: "query",
+        timestamp: Date.now(),
+      };
+      try {
+        const result = await definition.handler(counting.ctx, args);
+        console.log("[PERF]", JSON.stringify({
+          ...sample,
+          ...counting.counters,
+          resultBytes: resultBytes(result),
+          ok: true,
+        }));
+        return result;
+      } catch (error) {
+        console.log("[PERF]", JSON.stringify({
+          ...sample,
+          ...counting.counters,
+          resultBytes: 0,
+          ok: false,
+          error: errorMessage(error),
+        }));
+        throw error;
+      }
+    },
+  } as any) as RegisteredQuery<"public", ObjectType<Args>, Promise<Output>>;
+}
+
+/**
+ * mutation() with read/write counting; samples are inserted into
+ * functionMetrics in the same transaction (failed calls roll back, so
+ * they are logged instead)
+ */
+export function instrumentedMutation<Args extends PropertyValidators, Output>(
+  name: string,
+  definition: {
+    args: Args;
+    handler: (ctx: MutationCtx, args: ObjectType<Args>) => Promise<Output>;
+  },
+  options: InstrumentOptions = {}
+): RegisteredMutation<"public", ObjectType<Args>, Promise<Output>> {
+  return mutation({
+    args: definition.args,
+    handler: async (ctx: MutationCtx, args: ObjectType<Args>) => {
+      if (!shouldSample(options)) {
+        return await definition.handler(ctx, args);
+      }
+
+      const counting = withCountingDb(ctx);
+      try {
+        const result = await definition.handler(counting.ctx, args);
+        await ctx.db.insert("functionMetrics", {
+          functionName: name,
+          kind: "mutation",
+          ...counting.counters,
+          resultBytes: resultBytes(result),
+          ok: true,
+          timestamp: Date.now(),
+        });
+        return result;
+      } catch (error) {
+        console.log("[PERF]", JSON.stringify({
+          functionName: name,
+          kind: "mutation",
+          ...counting.counters,
+          ok: false,
+          error: errorMessage(error),
+        }));
+        throw error;
+      }
+    },
+  } as any) as RegisteredMutation<"public", ObjectType<Args>, Promise<Output>>;
+}
+
+/**
+ * action() with wall-time measurement; samples are recorded through
+ * mutations/metrics:record (including failures)
+ */
+export function instrumentedAction<Args extends PropertyValidators, Output>(
+  name: string,
+  definition: {
+    args: Args;
+    handler: (ctx: ActionCtx, args: ObjectType<Args>) => Promise<Output>;
+  },
+  options: InstrumentOptions = {}
+): RegisteredAction<"public", ObjectType<Args>, Promise<Output>> {
+  return action({
+    args: definition.args,
+    handler: async (ctx: ActionCtx, args: ObjectType<Args>) => {
+      if (!shouldSample(options)) {
+        return await definition.handler(ctx, args);
+      }
+
+      const startedAt = Date.now();
+      const record = (metric: Omit<FunctionMetric, "functionName" | "kind">) =>
+        ctx.runMutation(internal.mutations.metrics.record, {
+          samples: [{ functionName: name, kind: "action", ...metric }],
+        });
+
+      try {
+        const result = await definition.handler(ctx, args);
+        await record({
+          durationMs: Date.now() - startedAt,
+          resultBytes: resultBytes(result),
+          ok: true,
+          timestamp: startedAt,
+        });
+        return result;
+      } catch (error) {
+        await record({
+          durationMs: Date.now() - startedAt,
+          resultBytes: 0,
+          ok: false,
+          error: errorMessage(error),
+          timestamp: startedAt,
+        });
+        throw error;
+      }
+    },
+  } as any) as RegisteredAction<"public", ObjectType<Args>, Promise<Output>>;
+}
@@ -0,0 +1,567 @@
+/**
+ * Chunked job engine
+ *
+ * Bulk imports and cascades run as a chain of scheduled transactions, each
+ * touching at most job.chunkSize items, instead of one mutation that loops
+ * over everything and blows past transaction limits:
+ *
+ *   create ─▶ appendItems* ─▶ start ─▶ runChunk ─▶ runChunk ─▶ ... ─▶ completed
+ *   (staging)                (queued│running)   (throttleMs between chunks)
+ *
+ * RESUMABLE: progress (nextIndex for imports, phase + cursor for cascades)
+ * is patched in the SAME transaction as the chunk's writes, so a chunk is
+ * applied exactly once; a failed chunk rolls back and leaves the job at its
+ * last committed position.
+ *
+ * RETRIES: a chunk that throws (e.g. transaction limits) stops the chain.
+ * The job shows up as stalled (its scheduled function failed) and
+ * retryJob resumes it from the persisted position with half the chunk size.
+ * Every (re)start bumps job.generation; chunks scheduled for an older
+ * generation no-op, so there is never more than one live chain per job.
+ *
+ * THROTTLING: chunkSize and throttleMs bound each job's write rate, and at
+ * most MAX_RUNNING_JOBS_PER_GROUP jobs run per group; the rest queue and
+ * start as running jobs finish.
+ */
+
+import type { MutationCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+import { internal } from "../_generated/api";
+import { importThing, importConnection, applyThingUpdate } from "./batch";
+import {
+  CASCADE_PHASES,
+  EMPTY_CASCADE_COUNTS,
+  addCascadeCounts,
+  logCascadeCompletion,
+  runCascadeStep,
+  type CascadePhase,
+} from "./cascade";
+import { insertEvent } from "./rollups";
+
+// ============================================================================
+// LIMITS
+// ============================================================================
+
+/** Largest batch the synchronous batch mutations accept */
+export const MAX_SYNC_BATCH = 1000;
+
+/** Largest appendItems call (keeps arguments well under the size limit) */
+export const MAX_APPEND_ITEMS = 1000;
+
+export const DEFAULT_CHUNK_SIZE = 200;
+export const MAX_CHUNK_SIZE = 1000;
+
+export const DEFAULT_THROTTLE_MS = 100;
+export const MAX_THROTTLE_MS = 60_000;
+
+/** Concurrent running jobs per group; later jobs wait as "queued" */
+export const MAX_RUNNING_JOBS_PER_GROUP = 2;
+
+/** Per-item errors kept on the job row */
+export const MAX_JOB_ERRORS = 100;
+
+/** Retries before a stalled job is marked failed */
+export const MAX_JOB_ATTEMPTS = 5;
+
+export type Job = Doc<"jobs">;
+export type JobKind = Job["kind"];
+export type JobStatus = Job["status"];
+
+export type JobProgress = Job & {
+  percent: number;
+  itemsPerSecond: number;
+  stalled: boolean;
+  scheduledError?: string;
+};
+
+const FINISHED: JobStatus[] = ["completed", "failed", "cancelled"];
+
+export function clampChunkSize(chunkSize?: number): number {
+  return Math.max(1, Math.min(Math.floor(chunkSize ?? DEFAULT_CHUNK_SIZE), MAX_CHUNK_SIZE));
+}
+
+export function clampThrottleMs(throttleMs?: number): number {
+  return Math.max(0, Math.min(Math.floor(throttleMs ?? DEFAULT_THROTTLE_MS), MAX_THROTTLE_MS));
+}
+
+// ============================================================================
+// LIFECYCLE
+// ============================================================================
+
+/**
+ * Insert a job in "staging"
+ */
+export async function createJob(
+  ctx: MutationCtx,
+  input: {
+    groupId: Id<"groups">;
+    kind: JobKind;
+    options?: any;
+    targetId?: Id<"entities">;
+    chunkSize?: number;
+    throttleMs?: number;
+    createdBy?: Id<"entities">;
+  }
+): Promise<Id<"jobs">> {
+  const now = Date.now();
+  const isCascade = input.kind === "cascade_delete";
+
+  return await ctx.db.insert("jobs", {
+    groupId: input.groupId,
+    kind: input.kind,
+    status: "staging",
+    options: input.options,
+    targetId: input.targetId,
+    phase: isCascade ? CASCADE_PHASES[0] : undefined,
+    cursor: null,
+    nextIndex: 0,
+    total: 0,
+    processed: 0,
+    succeeded: 0,
+    failed: 0,
+    errors: [],
+    cascadeCounts: isCascade ? EMPTY_CASCADE_COUNTS : undefined,
+    chunkSize: clampChunkSize(input.chunkSize),
+    throttleMs: clampThrottleMs(input.throttleMs),
+    generation: 0,
+    attempts: 0,
+    chunks: 0,
+    createdBy: input.createdBy,
+    createdAt: now,
+    updatedAt: now,
+  });
+}
+
+/**
+ * Stage import items (validated by the caller against job.kind)
+ *
+ * Returns the new staged total
+ */
+export async function stageItems(
+  ctx: MutationCtx,
+  job: Job,
+  items: unknown[]
+): Promise<number> {
+  if (job.status !== "staging") {
+    throw new Error(`Job is ${job.status}; items can only be added while staging`);
+  }
+  if (items.length > MAX_APPEND_ITEMS) {
+    throw new Error(`Cannot append more than ${MAX_APPEND_ITEMS} items per call`);
+  }
+
+  for (let i = 0; i < items.length; i++) {
+    await ctx.db.insert("jobItems", {
+      jobId: job._id,
+      index: job.total + i,
+      data: items[i],
+    });
+  }
+
+  const total = job.total + items.length;
+  await ctx.db.patch(job._id, { total, updatedAt: Date.now() });
+  return total;
+}
+
+/**
+ * Start a staged job, or queue it if its group is at the running limit
+ */
+export async function startJob(ctx: MutationCtx, job: Job): Promise<JobStatus> {
+  if (job.status !== "staging") {
+    throw new Error(`Job is already ${job.status}`);
+  }
+
+  const running = await ctx.db
+    .query("jobs")
+    .withIndex("group_status", (q) =>
+      q.eq("groupId", job.groupId).eq("status", "running")
+    )
+    .take(MAX_RUNNING_JOBS_PER_GROUP);
+
+  if (running.length >= MAX_RUNNING_JOBS_PER_GROUP) {
+    await ctx.db.patch(job._id, { status: "queued", updatedAt: Date.now() });
+    return "queued";
+  }
+
+  await launchJob(ctx, job, job.generation);
+  return "running";
+}
+
+/**
+ * Cancel a job; staged items left behind are purged in chunks
+ */
+export async function cancelJob(ctx: MutationCtx, job: Job): Promise<void> {
+  if (FINISHED.includes(job.status)) {
+    throw new Error(`Job is already ${job.status}`);
+  }
+
+  if (job.scheduledId) {
+    await cancelScheduled(ctx, job.scheduledId);
+  }
+
+  const now = Date.now();
+  const generation = job.generation + 1;
+  const hasItems = job.kind !== "cascade_delete" && job.nextIndex < job.total;
+  const scheduledId = hasItems
+    ? await scheduleChunk(ctx, job._id, generation, 0)
+    : undefined;
+
+  await ctx.db.patch(job._id, {
+    status: "cancelled",
+    generation,
+    scheduledId,
+    completedAt: now,
+    updatedAt: now,
+  });
+
+  if (job.status === "running") {
+    await promoteQueuedJob(ctx, job.groupId);
+  }
+}
+
+/**
+ * Resume a stalled job from its last committed position
+ *
+ * Halves the chunk size: chunks usually fail on transaction limits. After
+ * MAX_JOB_ATTEMPTS the job is marked failed instead.
+ */
+export async function retryJob(ctx: MutationCtx, job: Job): Promise<JobStatus> {
+  const progress = await getJobProgress(ctx, job);
+  if (!progress.stalled) {
+    throw new Error(`Job is ${job.status} and not stalled; nothing to retry`);
+  }
+
+  const now = Date.now();
+  const attempts = job.attempts + 1;
+  const lastError = progress.scheduledError ?? job.lastError;
+
+  if (attempts > MAX_JOB_ATTEMPTS) {
+    await ctx.db.patch(job._id, {
+      status: "failed",
+      lastError,
+      scheduledId: undefined,
+      completedAt: now,
+      updatedAt: now,
+    });
+    await promoteQueuedJob(ctx, job.groupId);
+    return "failed";
+  }
+
+  await ctx.db.patch(job._id, {
+    attempts,
+    lastError,
+    chunkSize: Math.max(1, Math.floor(job.chunkSize / 2)),
+    completedAt: undefined,
+  });
+  await launchJob(ctx, job, job.generation + 1);
+  return "running";
+}
+
+// ============================================================================
+// CHUNK EXECUTION
+// ============================================================================
+
+type ChunkOutcome = {
+  patch: Partial<Job>;
+  done: boolean;
+};
+
+/**
+ * Run one chunk and schedule the next (called by mutations/jobs.runChunk)
+ */
+export async function runJobChunk(
+  ctx: MutationCtx,
+  jobId: Id<"jobs">,
+  generation: number
+): Promise<{ done: boolean }> {
+  const job = await ctx.db.get(jobId);
+
+  // 1. DROP STALE CHAINS (cancelled, retried, or already finished)
+  if (!job || job.generation !== generation) {
+    return { done: true };
+  }
+  if (job.status === "cancelled") {
+    return await purgeItemsChunk(ctx, job);
+  }
+  if (job.status !== "running") {
+    return { done: true };
+  }
+
+  // 2. DO ONE CHUNK OF WORK
+  const outcome =
+    job.kind === "cascade_delete"
+      ? await cascadeChunk(ctx, job)
+      : await importChunk(ctx, job);
+
+  // 3. COMMIT PROGRESS WITH THE WORK, THEN CONTINUE OR FINISH
+  const now = Date.now();
+  const patch: Partial<Job> = {
+    ...outcome.patch,
+    chunks: job.chunks + 1,
+    updatedAt: now,
+  };
+
+  if (!outcome.done) {
+    patch.scheduledId = await scheduleChunk(ctx, job._id, generation, job.throttleMs);
+    await ctx.db.patch(job._id, patch);
+    return { done: false };
+  }
+
+  await ctx.db.patch(job._id, {
+    ...patch,
+    status: "completed",
+    scheduledId: undefined,
+    completedAt: now,
+  });
+  await logJobCompletion(ctx, { ...job, ...patch });
+  await promoteQueuedJob(ctx, job.groupId);
+  return { done: true };
+}
+
+/**
+ * Apply the next chunkSize staged items, deleting them as they are consumed
+ */
+async function importChunk(ctx: MutationCtx, job: Job): Promise<ChunkOutcome> {
+  const items = await ctx.db
+    .query("jobItems")
+    .withIndex("job_index", (q) => q.eq("jobId", job._id).gte("index", job.nextIndex))
+    .take(job.chunkSize);
+
+  const now = Date.now();
+  const errors = [...job.errors];
+  let succeeded = 0;
+  let failed = 0;
+
+  for (const item of items) {
+    try {
+      await applyItem(ctx, job, item.data, now);
+      succeeded++;
+    } catch (err) {
+      failed++;
+      if (errors.length < MAX_JOB_ERRORS) {
+        errors.push({
+          index: item.index,
+          error: err instanceof Error ? err.message : String(err),
+        });
+      }
+    }
+    await ctx.db.delete(item._id);
+  }
+
+  const nextIndex = items.length > 0 ? items[items.length - 1].index + 1 : job.total;
+
+  return {
+    patch: {
+      nextIndex,
+      processed: job.processed + items.length,
+      succeeded: job.succeeded + succeeded,
+      failed: job.failed + failed,
+      errors,
+    },
+    done: nextIndex >= job.total,
+  };
+}
+
+async function applyItem(ctx: MutationCtx, job: Job, data: any, now: number): Promise<void> {
+  switch (job.kind) {
+    case "import_things":
+      await importThing(ctx, job.groupId, data, { ...job.options, now });
+      return;
+    case "import_connections":
+      await importConnection(ctx, job.groupId, data, { now });
+      return;
+    case "update_things":
+      await applyThingUpdate(ctx, job.groupId, data, { actorId: job.createdBy, now });
+      return;
+    default:
+      throw new Error(`Job kind ${job.kind} has no items`);
+  }
+}
+
+/**
+ * Run one step of the current cascade phase, advancing phase when it ends
+ *
+ * One step per chunk: event phases paginate, and a function may only
+ * paginate once.
+ */
+async function cascadeChunk(ctx: MutationCtx, job: Job): Promise<ChunkOutcome> {
+  if (!job.targetId) {
+    throw new Error("Cascade job has no target");
+  }
+
+  const phase = job.phase as CascadePhase;
+  const step = await runCascadeStep(ctx, phase, {
+    thingId: job.targetId,
+    groupId: job.groupId,
+    cursor: job.cursor,
+    numItems: job.chunkSize,
+  });
+
+  const counts = addCascadeCounts(job.cascadeCounts ?? EMPTY_CASCADE_COUNTS, phase, step.touched);
+  const nextPhase = step.done ? CASCADE_PHASES[CASCADE_PHASES.indexOf(phase) + 1] : phase;
+
+  return {
+    patch: {
+      phase: nextPhase,
+      cursor: step.done ? null : step.cursor,
+      processed: job.processed + step.touched,
+      succeeded: job.succeeded + step.touched,
+      cascadeCounts: counts,
+    },
+    done: step.done && nextPhase === undefined,
+  };
+}
+
+/**
+ * Delete leftover staged items of a cancelled job
+ */
+async function purgeItemsChunk(ctx: MutationCtx, job: Job): Promise<{ done: boolean }> {
+  const items = await ctx.db
+    .query("jobItems")
+    .withIndex("job_index", (q) => q.eq("jobId", job._id))
+    .take(job.chunkSize);
+
+  for (const item of items) {
+    await ctx.db.delete(item._id);
+  }
+
+  const done = items.length < job.chunkSize;
+  const scheduledId = done
+    ? undefined
+    : await scheduleChunk(ctx, job._id, job.generation, job.throttleMs);
+  await ctx.db.patch(job._id, { scheduledId, updatedAt: Date.now() });
+
+  return { done };
+}
+
+// ============================================================================
+// SCHEDULING
+// ============================================================================
+
+async function scheduleChunk(
+  ctx: MutationCtx,
+  jobId: Id<"jobs">,
+  generation: number,
+  delayMs: number
+): Promise<Id<"_scheduled_functions">> {
+  return await ctx.scheduler.runAfter(delayMs, internal.mutations.jobs.runChunk, {
+    jobId,
+    generation,
+  });
+}
+
+async function launchJob(ctx: MutationCtx, job: Job, generation: number): Promise<void> {
+  const now = Date.now();
+  const scheduledId = await scheduleChunk(ctx, job._id, generation, 0);
+
+  await ctx.db.patch(job._id, {
+    status: "running",
+    generation,
+    scheduledId,
+    startedAt: job.startedAt ?? now,
+    updatedAt: now,
+  });
+}
+
+async function cancelScheduled(
+  ctx: MutationCtx,
+  scheduledId: Id<"_scheduled_functions">
+): Promise<void> {
+  const scheduled = await ctx.db.system.get(scheduledId);
+  if (scheduled?.state.kind === "pending") {
+    await ctx.scheduler.cancel(scheduledId);
+  }
+}
+
+/**
+ * Start the oldest queued job in a group (a running slot just freed up)
+ */
+async function promoteQueuedJob(ctx: MutationCtx, groupId: Id<"groups">): Promise<void> {
+  const next = await ctx.db
+    .query("jobs")
+    .withIndex("group_status", (q) => q.eq("groupId", groupId).eq("status", "queued"))
+    .first();
+
+  if (next) {
+    await launchJob(ctx, next, next.generation);
+  }
+}
+
+// ============================================================================
+// PROGRESS
+// ============================================================================
+
+/**
+ * Job row plus derived progress
+ *
+ * stalled: the job should be moving but its next chunk failed or was
+ * canceled outside the engine; retryJob resumes it.
+ */
+export async function getJobProgress(ctx: QueryCtx, job: Job): Promise<JobProgress> {
+  const scheduled = job.scheduledId ? await ctx.db.system.get(job.scheduledId) : null;
+  const state = scheduled?.state;
+  const stalled =
+    job.status === "running" &&
+    (!state || state.kind === "failed" || state.kind === "canceled");
+
+  const elapsedMs = job.startedAt ? (job.completedAt ?? Date.now()) - job.startedAt : 0;
+
+  return {
+    ...job,
+    percent:
+      job.kind === "cascade_delete"
+        ? cascadePercent(job)
+        : job.total > 0
+          ? Math.round((job.processed / job.total) * 100)
+          : 0,
+    itemsPerSecond: elapsedMs > 0 ? Math.round((job.processed / elapsedMs) * 1000) : 0,
+    stalled,
+    scheduledError: state?.kind === "failed" ? state.error : undefined,
+  };
+}
+
+function cascadePercent(job: Job): number {
+  if (job.status === "completed") {
+    return 100;
+  }
+  const index = CASCADE_PHASES.indexOf(job.phase as CascadePhase);
+  return Math.round((Math.max(0, index) / CASCADE_PHASES.length) * 100);
+}
+
+// ============================================================================
+// AUDIT
+// ============================================================================
+
+/**
+ * One summary event per finished job (never one per item)
+ */
+async function logJobCompletion(ctx: MutationCtx, job: Job): Promise<void> {
+  if (job.kind === "cascade_delete") {
+    await logCascadeCompletion(ctx, {
+      thingId: job.targetId!,
+      groupId: job.groupId,
+      counts: job.cascadeCounts ?? EMPTY_CASCADE_COUNTS,
+      actorId: job.createdBy,
+    });
+    return;
+  }
+
+  const summary = {
+    jobId: job._id,
+    count: job.total,
+    failed: job.failed,
+    errors: job.errors.length > 0 ? job.errors : undefined,
+  };
+
+  await insertEvent(ctx, {
+    groupId: job.groupId,
+    type: job.kind === "update_things" ? "thing_updated" : "thing_created",
+    actorId: job.createdBy,
+    timestamp: Date.now(),
+    metadata:
+      job.kind === "import_things"
+        ? { entityType: "batch_import", created: job.succeeded, ...summary }
+        : job.kind === "import_connections"
+          ? { entityType: "batch_connection_created", created: job.succeeded, ...summary }
+          : { entityType: "batch_update", updated: job.succeeded, ...summary },
+  });
+}
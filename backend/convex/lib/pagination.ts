@@ -0,0 +1,177 @@
+/**
+ * Pagination helpers for list and hierarchy queries
+ *
+ * Every list query either returns a bounded array (limit capped at
+ * MAX_LIST_LIMIT) or a Convex PaginationResult driven by
+ * paginationOptsValidator args, so big tenants never hit document-read
+ * limits and clients fetch one page at a time (usePaginatedQuery /
+ * DataProvider listPage).
+ *
+ * Hierarchy queries page across the subgroup tree (listed from the
+ * groupClosure table in one read): the opaque cursor
+ * records which group we are in plus the Convex cursor inside that group.
+ * Each call reads from ONE group (a query may only call .paginate once), so
+ * a page can come back short at a group boundary; isDone is only true after
+ * the last group in the tree is exhausted.
+ *
+ * A page that finishes a group ends on that group's final cursor (marked
+ * exhausted) rather than on the start of the next group, so when
+ * usePaginatedQuery re-runs it with that endCursor the whole group is read
+ * again, not just numItems of it.
+ */
+
+import type { PaginationOptions, PaginationResult } from "convex/server";
+import type { QueryCtx } from "../_generated/server";
+import type { Id } from "../_generated/dataModel";
+import { getDescendantIds } from "./groupClosure";
+
+// ============================================================================
+// LIMITS
+// ============================================================================
+
+/** Hard cap for array-returning list queries */
+export const MAX_LIST_LIMIT = 1000;
+
+/** Hard cap for a single page of a paginated query */
+export const MAX_PAGE_SIZE = 500;
+
+/** Subgroups visited by hierarchy queries (root included) */
+export const MAX_HIERARCHY_GROUPS = 500;
+
+/**
+ * Resolve an optional caller limit against a default and the hard cap
+ */
+export function boundedLimit(limit: number | undefined, fallback = 100): number {
+  return Math.max(1, Math.min(limit ?? fallback, MAX_LIST_LIMIT));
+}
+
+/**
+ * Clamp client-supplied pagination options to MAX_PAGE_SIZE
+ */
+export function clampPaginationOpts(opts: PaginationOptions): PaginationOptions {
+  return { ...opts, numItems: Math.max(1, Math.min(opts.numItems, MAX_PAGE_SIZE)) };
+}
+
+// ============================================================================
+// GROUP TREE
+// ============================================================================
+
+/**
+ * Root group plus all descendants, shallowest first (root first)
+ * One range read on groupClosure; throws for trees of more than maxGroups
+ * groups instead of silently dropping the deepest ones
+ */
+export async function getHierarchyGroupIds(
+  ctx: QueryCtx,
+  rootGroupId: Id<"groups">,
+  maxGroups = MAX_HIERARCHY_GROUPS
+): Promise<Id<"groups">[]> {
+  const descendants = await getDescendantIds(ctx, rootGroupId, { limit: maxGroups - 1 });
+  return [rootGroupId, ...descendants];
+}
+
+// ============================================================================
+// HIERARCHY CURSORS
+// ============================================================================
+
+type HierarchyPosition = {
+  groupId: Id<"groups">;
+  cursor: string | null;
+  exhausted?: boolean; // cursor is the end of groupId: continue with the next group
+};
+
+export function encodeHierarchyCursor(position: HierarchyPosition): string {
+  return JSON.stringify(
+    position.exhausted
+      ? [position.groupId, position.cursor, true]
+      : [position.groupId, position.cursor]
+  );
+}
+
+export function decodeHierarchyCursor(cursor: string): HierarchyPosition {
+  try {
+    const [groupId, inner, exhausted] = JSON.parse(cursor);
+    if (
+      typeof groupId !== "string" ||
+      (inner !== null && typeof inner !== "string") ||
+      (exhausted !== undefined && exhausted !== true)
+    ) {
+      throw new Error();
+    }
+    return exhausted
+      ? { groupId: groupId as Id<"groups">, cursor: inner, exhausted: true }
+      : { groupId: groupId as Id<"groups">, cursor: inner };
+  } catch {
+    throw new Error("Invalid hierarchy cursor");
+  }
+}
+
+/**
+ * Paginate a per-group query across a group hierarchy
+ *
+ * pageForGroup runs the indexed, group-scoped query for one group and calls
+ * .paginate with the options it is given.
+ */
+export async function paginateHierarchy<T>(
+  ctx: QueryCtx,
+  rootGroupId: Id<"groups">,
+  paginationOpts: PaginationOptions,
+  pageForGroup: (groupId: Id<"groups">, opts: PaginationOptions) => Promise<PaginationResult<T>>
+): Promise<PaginationResult<T>> {
+  const opts = clampPaginationOpts(paginationOpts);
+  const groupIds = await getHierarchyGroupIds(ctx, rootGroupId);
+
+  // 1. RESOLVE POSITION (first page starts at the root group)
+  const start: HierarchyPosition = opts.cursor
+    ? decodeHierarchyCursor(opts.cursor)
+    : { groupId: rootGroupId, cursor: null };
+  let index = groupIds.indexOf(start.groupId);
+  if (index === -1) {
+    // Group left the hierarchy between pages: nothing more to read
+    return { page: [], isDone: true, continueCursor: opts.cursor ?? "" };
+  }
+
+  let position = start;
+  if (start.exhausted) {
+    index++;
+    if (index === groupIds.length) {
+      return { page: [], isDone: true, continueCursor: opts.cursor ?? "" };
+    }
+    position = { groupId: groupIds[index], cursor: null };
+  }
+
+  // 2. READ ONE PAGE FROM THE CURRENT GROUP
+  // endCursor (sent by usePaginatedQuery to pin page boundaries) always
+  // points into the group the page was read from; a page that ended on a
+  // group boundary carries that group's final cursor, so the re-run reads
+  // the group to its end instead of stopping after numItems
+  const end = opts.endCursor ? decodeHierarchyCursor(opts.endCursor) : null;
+  const endsHere = end !== null && end.groupId === position.groupId;
+  const result = await pageForGroup(position.groupId, {
+    numItems: opts.numItems,
+    cursor: position.cursor,
+    endCursor: endsHere ? end.cursor : undefined,
+  });
+
+  // 3. ADVANCE: same group, or past it (done after the last group)
+  if (!result.isDone) {
+    return {
+      page: result.page,
+      isDone: false,
+      continueCursor: encodeHierarchyCursor({
+        groupId: position.groupId,
+        cursor: result.continueCursor,
+      }),
+    };
+  }
+
+  return {
+    page: result.page,
+    isDone: index === groupIds.length - 1,
+    continueCursor: encodeHierarchyCursor({
+      groupId: position.groupId,
+      cursor: result.continueCursor,
+      exhausted: true,
+    }),
+  };
+}
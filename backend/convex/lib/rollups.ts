@@ -0,0 +1,780 @@
+/**
+ * Rollup maintenance helpers
+ *
+ * Keeps the groupRollups, groupDailyRollups and entityRollups tables in sync
+ * with the source tables. Every mutation that inserts, patches or deletes
+ * entities, connections, knowledge or events goes through these helpers so
+ * the counters are updated in the SAME transaction as the row itself.
+ *
+ * Readers (queries/computed.ts, queries/quotas.ts) then read a handful of
+ * rollup documents instead of collecting the whole group.
+ *
+ * Group and daily counters are sharded (ROLLUP_SHARDS rows, one picked at
+ * random per write, summed on read): every write in a tenant touches them,
+ * and a single row per group would serialize those writes under OCC.
+ *
+ * Drift (rows written before rollups existed, or by code that bypasses these
+ * helpers) is repaired by the reconcile job in mutations/rollups.ts, which
+ * writes its corrections as deltas through the same shards.
+ */
+
+import type { PaginationOptions, PaginationResult, WithoutSystemFields } from "convex/server";
+import type { MutationCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+
+// ============================================================================
+// SIZE ESTIMATES
+// ============================================================================
+
+export const ENTITY_BASE_BYTES = 1024;
+export const EMBEDDING_VALUE_BYTES = 8;
+export const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Estimated storage for one entity: 1KB base + JSON size of properties
+ * Computed once per write instead of once per read
+ */
+export function estimateEntityBytes(properties: unknown): number {
+  return ENTITY_BASE_BYTES + JSON.stringify(properties ?? {}).length;
+}
+
+/**
+ * Estimated storage for an embedding: 8 bytes per dimension
+ */
+export function estimateEmbeddingBytes(embedding?: number[]): number {
+  return embedding ? embedding.length * EMBEDDING_VALUE_BYTES : 0;
+}
+
+/**
+ * UTC midnight of the day containing timestamp
+ */
+export function dayBucket(timestamp: number): number {
+  return Math.floor(timestamp / DAY_MS) * DAY_MS;
+}
+
+// ============================================================================
+// SHARDS
+// ============================================================================
+
+/**
+ * Rows per group counter (and per group/day counter). Each write updates
+ * one shard picked at random, so concurrent writers in a group rarely
+ * touch the same document; reads sum all shards (as lib/usage.ts does for
+ * metered usage)
+ */
+export const ROLLUP_SHARDS = 8;
+
+/**
+ * Shard for one write
+ */
+export function pickRollupShard(shards = ROLLUP_SHARDS): number {
+  return Math.floor(Math.random() * shards);
+}
+
+// ============================================================================
+// GROUP COUNTERS
+// ============================================================================
+
+export type GroupCounters = {
+  entityCount: number;
+  userCount: number;
+  connectionCount: number;
+  knowledgeCount: number;
+  entityBytes: number;
+  embeddingBytes: number;
+  eventCount: number; // All time (daily buckets only cover recent days)
+};
+
+export const EMPTY_GROUP_COUNTERS: GroupCounters = {
+  entityCount: 0,
+  userCount: 0,
+  connectionCount: 0,
+  knowledgeCount: 0,
+  entityBytes: 0,
+  embeddingBytes: 0,
+  eventCount: 0,
+};
+
+const GROUP_COUNTER_KEYS = Object.keys(EMPTY_GROUP_COUNTERS) as Array<keyof GroupCounters>;
+
+/**
+ * Read the counters for a group (zeros if the group has no rollup yet)
+ * Sums up to ROLLUP_SHARDS rows
+ */
+export async function getGroupCounters(
+  ctx: QueryCtx,
+  groupId: Id<"groups">
+): Promise<GroupCounters> {
+  const shards = await ctx.db
+    .query("groupRollups")
+    .withIndex("group_shard", (q) => q.eq("groupId", groupId))
+    .collect();
+
+  const totals = { ...EMPTY_GROUP_COUNTERS };
+  for (const shard of shards) {
+    for (const key of GROUP_COUNTER_KEYS) {
+      totals[key] += shard[key];
+    }
+  }
+  return totals;
+}
+
+/**
+ * Add a delta to one random shard of the group counters
+ * (creates the shard on first write)
+ */
+export async function applyGroupDelta(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  delta: Partial<GroupCounters>,
+  options: { shards?: number; reconciledAt?: number } = {}
+): Promise<void> {
+  const shard = pickRollupShard(options.shards);
+  const existing = await ctx.db
+    .query("groupRollups")
+    .withIndex("group_shard", (q) => q.eq("groupId", groupId).eq("shard", shard))
+    .unique();
+
+  const next = {} as GroupCounters;
+  for (const key of GROUP_COUNTER_KEYS) {
+    next[key] = (existing?.[key] ?? 0) + (delta[key] ?? 0);
+  }
+
+  const stamps = options.reconciledAt
+    ? { updatedAt: Date.now(), reconciledAt: options.reconciledAt }
+    : { updatedAt: Date.now() };
+  if (existing) {
+    await ctx.db.patch(existing._id, { ...next, ...stamps });
+  } else {
+    await ctx.db.insert("groupRollups", { groupId, shard, ...next, ...stamps });
+  }
+}
+
+/**
+ * Correct drift found by the reconcile job
+ *
+ * `stored` is what the counters read when the recount started and
+ * `recounted` what the source rows added up to at that cutoff; the
+ * difference goes to one shard as a delta, so writes made while the
+ * recount ran are kept
+ */
+export async function correctGroupCounters(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  recounted: GroupCounters,
+  stored: GroupCounters
+): Promise<void> {
+  const delta = {} as GroupCounters;
+  for (const key of GROUP_COUNTER_KEYS) {
+    delta[key] = recounted[key] - stored[key];
+  }
+  await applyGroupDelta(ctx, groupId, delta, { reconciledAt: Date.now() });
+}
+
+// ============================================================================
+// DAILY EVENT COUNTERS
+// ============================================================================
+
+export type DailyCounters = {
+  eventCount: number;
+  paymentCount: number;
+  revenue: number;
+};
+
+/**
+ * Sum the daily counters for all buckets with day >= since
+ * Reads up to ROLLUP_SHARDS rows per day
+ */
+export async function sumDailyCounters(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  since: number
+): Promise<DailyCounters> {
+  const days = await ctx.db
+    .query("groupDailyRollups")
+    .withIndex("group_day", (q) =>
+      q.eq("groupId", groupId).gte("day", dayBucket(since))
+    )
+    .collect();
+
+  return days.reduce(
+    (acc, d) => ({
+      eventCount: acc.eventCount + d.eventCount,
+      paymentCount: acc.paymentCount + d.paymentCount,
+      revenue: acc.revenue + d.revenue,
+    }),
+    { eventCount: 0, paymentCount: 0, revenue: 0 }
+  );
+}
+
+/**
+ * Read one daily bucket (zeros if nothing was counted that day)
+ * Sums up to ROLLUP_SHARDS rows
+ */
+export async function getDailyCounters(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  day: number
+): Promise<DailyCounters> {
+  const shards = await ctx.db
+    .query("groupDailyRollups")
+    .withIndex("group_day", (q) => q.eq("groupId", groupId).eq("day", day))
+    .collect();
+
+  return shards.reduce(
+    (acc, d) => ({
+      eventCount: acc.eventCount + d.eventCount,
+      paymentCount: acc.paymentCount + d.paymentCount,
+      revenue: acc.revenue + d.revenue,
+    }),
+    { eventCount: 0, paymentCount: 0, revenue: 0 }
+  );
+}
+
+/**
+ * Add a delta to one random shard of a daily bucket
+ */
+export async function applyDailyDelta(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  day: number,
+  delta: DailyCounters,
+  options: { shards?: number } = {}
+): Promise<void> {
+  const shard = pickRollupShard(options.shards);
+  const existing = await ctx.db
+    .query("groupDailyRollups")
+    .withIndex("group_day", (q) =>
+      q.eq("groupId", groupId).eq("day", day).eq("shard", shard)
+    )
+    .unique();
+
+  if (existing) {
+    await ctx.db.patch(existing._id, {
+      eventCount: existing.eventCount + delta.eventCount,
+      paymentCount: existing.paymentCount + delta.paymentCount,
+      revenue: existing.revenue + delta.revenue,
+      updatedAt: Date.now(),
+    });
+  } else {
+    await ctx.db.insert("groupDailyRollups", {
+      groupId,
+      day,
+      shard,
+      ...delta,
+      updatedAt: Date.now(),
+    });
+  }
+}
+
+/**
+ * Correct drift in one daily bucket (see correctGroupCounters)
+ * Nothing is written when the bucket is already right
+ */
+export async function correctDailyCounters(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  day: number,
+  recounted: DailyCounters,
+  stored: DailyCounters
+): Promise<void> {
+  const delta = {
+    eventCount: recounted.eventCount - stored.eventCount,
+    paymentCount: recounted.paymentCount - stored.paymentCount,
+    revenue: recounted.revenue - stored.revenue,
+  };
+  if (delta.eventCount || delta.paymentCount || delta.revenue) {
+    await applyDailyDelta(ctx, groupId, day, delta);
+  }
+}
+
+// ============================================================================
+// ENTITY (ACTOR) COUNTERS
+// ============================================================================
+
+type EntityCounters = {
+  inboundCount: number;
+  outboundCount: number;
+  followerCount: number;
+  authoredCount: number;
+  eventCount: number;
+  totalRevenue: number;
+};
+
+const EMPTY_ENTITY_COUNTERS: EntityCounters = {
+  inboundCount: 0,
+  outboundCount: 0,
+  followerCount: 0,
+  authoredCount: 0,
+  eventCount: 0,
+  totalRevenue: 0,
+};
+
+/**
+ * Read the rollup for one entity (null if none has been written yet)
+ */
+export async function getEntityRollup(
+  ctx: QueryCtx,
+  entityId: Id<"entities">
+): Promise<Doc<"entityRollups"> | null> {
+  return await ctx.db
+    .query("entityRollups")
+    .withIndex("by_entity", (q) => q.eq("entityId", entityId))
+    .unique();
+}
+
+async function applyEntityDelta(
+  ctx: MutationCtx,
+  entityId: Id<"entities">,
+  delta: Partial<EntityCounters>,
+  activity?: { eventType: string; timestamp: number }
+): Promise<void> {
+  const existing = await getEntityRollup(ctx, entityId);
+
+  let base: Omit<Doc<"entityRollups">, "_id" | "_creationTime">;
+  if (existing) {
+    base = existing;
+  } else {
+    // Actor ids on events are not always entities (e.g. knowledge links)
+    const normalizedId = ctx.db.normalizeId("entities", entityId);
+    const entity = normalizedId ? await ctx.db.get(normalizedId) : null;
+    if (!entity) {
+      return;
+    }
+    base = {
+      entityId,
+      groupId: entity.groupId,
+      entityType: entity.type,
+      ...EMPTY_ENTITY_COUNTERS,
+      eventsByType: {},
+      updatedAt: Date.now(),
+    };
+  }
+
+  const next: Partial<Doc<"entityRollups">> = { updatedAt: Date.now() };
+  for (const key of Object.keys(EMPTY_ENTITY_COUNTERS) as Array<keyof EntityCounters>) {
+    next[key] = base[key] + (delta[key] ?? 0);
+  }
+  if (activity) {
+    const eventsByType = { ...(base.eventsByType || {}) };
+    eventsByType[activity.eventType] = (eventsByType[activity.eventType] || 0) + 1;
+    next.eventsByType = eventsByType;
+    next.lastActive = Math.max(base.lastActive ?? 0, activity.timestamp);
+  }
+
+  if (existing) {
+    await ctx.db.patch(existing._id, next);
+  } else {
+    await ctx.db.insert("entityRollups", { ...base, ...next });
+  }
+}
+
+// ============================================================================
+// ENTITY RECOUNT (reconcile job)
+// ============================================================================
+
+/** Source rows an entity rollup is counted from */
+export type EntityRowSource = "inbound" | "outbound" | "events";
+
+export const ENTITY_ROW_SOURCES: EntityRowSource[] = ["inbound", "outbound", "events"];
+
+/** Entity counters being recounted (carried in job args between steps) */
+export type EntityRecount = EntityCounters & {
+  eventsByType: Record<string, number>;
+  lastActive?: number;
+};
+
+export const EMPTY_ENTITY_RECOUNT: EntityRecount = {
+  ...EMPTY_ENTITY_COUNTERS,
+  eventsByType: {},
+};
+
+/**
+ * Counters currently stored for an entity (zeros if it has no rollup)
+ */
+export function entityRecountOf(rollup: Doc<"entityRollups"> | null): EntityRecount {
+  if (!rollup) {
+    return { ...EMPTY_ENTITY_RECOUNT, eventsByType: {} };
+  }
+  return {
+    inboundCount: rollup.inboundCount,
+    outboundCount: rollup.outboundCount,
+    followerCount: rollup.followerCount,
+    authoredCount: rollup.authoredCount,
+    eventCount: rollup.eventCount,
+    totalRevenue: rollup.totalRevenue,
+    eventsByType: { ...(rollup.eventsByType || {}) },
+    lastActive: rollup.lastActive,
+  };
+}
+
+/**
+ * First n rows of one source for an entity
+ */
+export async function takeEntityRows(
+  ctx: QueryCtx,
+  entityId: Id<"entities">,
+  source: EntityRowSource,
+  n: number
+): Promise<Array<Doc<"connections"> | Doc<"events">>> {
+  switch (source) {
+    case "inbound":
+      return await ctx.db
+        .query("connections")
+        .withIndex("to_entity", (q) => q.eq("toEntityId", entityId))
+        .take(n);
+    case "outbound":
+      return await ctx.db
+        .query("connections")
+        .withIndex("from_entity", (q) => q.eq("fromEntityId", entityId))
+        .take(n);
+    case "events":
+      return await ctx.db
+        .query("events")
+        .withIndex("by_actor", (q) => q.eq("actorId", entityId))
+        .take(n);
+  }
+}
+
+/**
+ * One page of one source for an entity
+ */
+export async function pageEntityRows(
+  ctx: QueryCtx,
+  entityId: Id<"entities">,
+  source: EntityRowSource,
+  opts: PaginationOptions
+): Promise<PaginationResult<Doc<"connections"> | Doc<"events">>> {
+  switch (source) {
+    case "inbound":
+      return await ctx.db
+        .query("connections")
+        .withIndex("to_entity", (q) => q.eq("toEntityId", entityId))
+        .paginate(opts);
+    case "outbound":
+      return await ctx.db
+        .query("connections")
+        .withIndex("from_entity", (q) => q.eq("fromEntityId", entityId))
+        .paginate(opts);
+    case "events":
+      return await ctx.db
+        .query("events")
+        .withIndex("by_actor", (q) => q.eq("actorId", entityId))
+        .paginate(opts);
+  }
+}
+
+/**
+ * Add rows of one source to a recount (rows created after cutoff are skipped)
+ */
+export function tallyEntityRows(
+  counts: EntityRecount,
+  source: EntityRowSource,
+  rows: Array<Doc<"connections"> | Doc<"events">>,
+  cutoff = Infinity
+): EntityRecount {
+  const next = { ...counts, eventsByType: { ...counts.eventsByType } };
+  for (const row of rows) {
+    if (row._creationTime > cutoff) continue;
+
+    if (source === "events") {
+      const e = row as Doc<"events">;
+      next.eventCount += 1;
+      next.eventsByType[e.type] = (next.eventsByType[e.type] || 0) + 1;
+      if (e.type === "payment_processed") {
+        next.totalRevenue += e.metadata?.amount || 0;
+      }
+      next.lastActive = Math.max(next.lastActive ?? 0, e.timestamp);
+    } else {
+      const authored = (row as Doc<"connections">).relationshipType === "created_by" ? 1 : 0;
+      if (source === "inbound") {
+        next.inboundCount += 1;
+        next.followerCount += authored;
+      } else {
+        next.outboundCount += 1;
+        next.authoredCount += authored;
+      }
+    }
+  }
+  return next;
+}
+
+/**
+ * Recount the rollup for one entity in this transaction
+ *
+ * Reads at most cap + 1 rows per source. Returns false without writing when
+ * a source has more than cap rows; the caller then rebuilds the entity in
+ * scheduled steps (pageEntityRows + correctEntityRollup)
+ */
+export async function rebuildEntityRollup(
+  ctx: MutationCtx,
+  entity: Doc<"entities">,
+  cap: number
+): Promise<boolean> {
+  let counts = EMPTY_ENTITY_RECOUNT;
+  for (const source of ENTITY_ROW_SOURCES) {
+    const rows = await takeEntityRows(ctx, entity._id, source, cap + 1);
+    if (rows.length > cap) {
+      return false;
+    }
+    counts = tallyEntityRows(counts, source, rows);
+  }
+
+  const rollup = {
+    entityId: entity._id,
+    groupId: entity.groupId,
+    entityType: entity.type,
+    ...counts,
+    updatedAt: Date.now(),
+  };
+
+  const existing = await getEntityRollup(ctx, entity._id);
+  if (existing) {
+    await ctx.db.replace(existing._id, rollup);
+  } else {
+    await ctx.db.insert("entityRollups", rollup);
+  }
+  return true;
+}
+
+/**
+ * Correct an entity rollup recounted over several transactions
+ *
+ * Same contract as correctGroupCounters: `stored` is what the rollup held
+ * at the cutoff and (recounted - stored) is added to what it holds now.
+ * lastActive only moves forward
+ */
+export async function correctEntityRollup(
+  ctx: MutationCtx,
+  entity: Doc<"entities">,
+  recounted: EntityRecount,
+  stored: EntityRecount
+): Promise<void> {
+  const existing = await getEntityRollup(ctx, entity._id);
+  const current = entityRecountOf(existing);
+
+  const next = { ...current, eventsByType: { ...current.eventsByType } };
+  for (const key of Object.keys(EMPTY_ENTITY_COUNTERS) as Array<keyof EntityCounters>) {
+    next[key] = current[key] + recounted[key] - stored[key];
+  }
+  const types = new Set([
+    ...Object.keys(recounted.eventsByType),
+    ...Object.keys(stored.eventsByType),
+  ]);
+  for (const type of types) {
+    const count =
+      (current.eventsByType[type] || 0) +
+      (recounted.eventsByType[type] || 0) -
+      (stored.eventsByType[type] || 0);
+    if (count > 0) {
+      next.eventsByType[type] = count;
+    } else {
+      delete next.eventsByType[type];
+    }
+  }
+  if (recounted.lastActive !== undefined) {
+    next.lastActive = Math.max(current.lastActive ?? 0, recounted.lastActive);
+  }
+
+  if (existing) {
+    await ctx.db.patch(existing._id, { ...next, updatedAt: Date.now() });
+  } else {
+    await ctx.db.insert("entityRollups", {
+      entityId: entity._id,
+      groupId: entity.groupId,
+      entityType: entity.type,
+      ...next,
+      updatedAt: Date.now(),
+    });
+  }
+}
+
+// ============================================================================
+// WRITE HELPERS (insert/patch/delete + rollup in one call)
+// ============================================================================
+
+/**
+ * Insert an entity and count it in its group
+ */
+export async function insertEntity(
+  ctx: MutationCtx,
+  entity: WithoutSystemFields<Doc<"entities">>
+): Promise<Id<"entities">> {
+  const entityId = await ctx.db.insert("entities", entity);
+
+  await applyGroupDelta(ctx, entity.groupId, {
+    entityCount: 1,
+    userCount: entity.type === "user" ? 1 : 0,
+    entityBytes: estimateEntityBytes(entity.properties),
+  });
+  await ctx.db.insert("entityRollups", {
+    entityId,
+    groupId: entity.groupId,
+    entityType: entity.type,
+    ...EMPTY_ENTITY_COUNTERS,
+    eventsByType: {},
+    updatedAt: entity.createdAt,
+  });
+
+  return entityId;
+}
+
+/**
+ * Patch an entity, adjusting storage if its properties changed
+ */
+export async function patchEntity(
+  ctx: MutationCtx,
+  entity: Doc<"entities">,
+  patch: Partial<WithoutSystemFields<Doc<"entities">>>
+): Promise<void> {
+  await ctx.db.patch(entity._id, patch);
+
+  if (patch.properties !== undefined) {
+    const delta =
+      estimateEntityBytes(patch.properties) - estimateEntityBytes(entity.properties);
+    if (delta !== 0) {
+      await applyGroupDelta(ctx, entity.groupId, { entityBytes: delta });
+    }
+  }
+}
+
+/**
+ * Insert a connection and count it on the group and both endpoints
+ */
+export async function insertConnection(
+  ctx: MutationCtx,
+  connection: WithoutSystemFields<Doc<"connections">>
+): Promise<Id<"connections">> {
+  const connectionId = await ctx.db.insert("connections", connection);
+  await countConnection(ctx, connection, 1);
+  return connectionId;
+}
+
+/**
+ * Delete a connection and remove it from the group and endpoint counters
+ */
+export async function deleteConnection(
+  ctx: MutationCtx,
+  connection: Doc<"connections">
+): Promise<void> {
+  await ctx.db.delete(connection._id);
+  await countConnection(ctx, connection, -1);
+}
+
+async function countConnection(
+  ctx: MutationCtx,
+  connection: WithoutSystemFields<Doc<"connections">>,
+  sign: 1 | -1
+): Promise<void> {
+  const createdBy = connection.relationshipType === "created_by" ? sign : 0;
+
+  await applyGroupDelta(ctx, connection.groupId, { connectionCount: sign });
+  await applyEntityDelta(ctx, connection.fromEntityId, {
+    outboundCount: sign,
+    authoredCount: createdBy,
+  });
+  await applyEntityDelta(ctx, connection.toEntityId, {
+    inboundCount: sign,
+    followerCount: createdBy,
+  });
+}
+
+/**
+ * Field indexed by knowledge.search_text: text followed by labels, so
+ * full-text search also matches items by label
+ */
+export function knowledgeSearchText(
+  knowledge: Pick<Doc<"knowledge">, "text" | "labels">
+): string | undefined {
+  const parts = [knowledge.text, ...(knowledge.labels ?? [])].filter(Boolean);
+  return parts.length > 0 ? parts.join(" ") : undefined;
+}
+
+/**
+ * Insert a knowledge item and count it (plus embedding storage) in its group
+ */
+export async function insertKnowledge(
+  ctx: MutationCtx,
+  knowledge: WithoutSystemFields<Doc<"knowledge">>
+): Promise<Id<"knowledge">> {
+  const knowledgeId = await ctx.db.insert("knowledge", {
+    ...knowledge,
+    searchText: knowledgeSearchText(knowledge),
+  });
+
+  await applyGroupDelta(ctx, knowledge.groupId, {
+    knowledgeCount: 1,
+    embeddingBytes: estimateEmbeddingBytes(knowledge.embedding),
+  });
+
+  return knowledgeId;
+}
+
+/**
+ * Patch a knowledge item, adjusting storage if its embedding changed
+ */
+export async function patchKnowledge(
+  ctx: MutationCtx,
+  knowledge: Doc<"knowledge">,
+  patch: Partial<WithoutSystemFields<Doc<"knowledge">>>
+): Promise<void> {
+  if (patch.text !== undefined || patch.labels !== undefined) {
+    patch = { ...patch, searchText: knowledgeSearchText({ ...knowledge, ...patch }) };
+  }
+  await ctx.db.patch(knowledge._id, patch);
+
+  if (patch.embedding !== undefined) {
+    const delta =
+      estimateEmbeddingBytes(patch.embedding) - estimateEmbeddingBytes(knowledge.embedding);
+    if (delta !== 0) {
+      await applyGroupDelta(ctx, knowledge.groupId, { embeddingBytes: delta });
+    }
+  }
+}
+
+/**
+ * Hard-delete a knowledge item and remove it from its group counters
+ */
+export async function deleteKnowledge(
+  ctx: MutationCtx,
+  knowledge: Doc<"knowledge">
+): Promise<void> {
+  await ctx.db.delete(knowledge._id);
+
+  await applyGroupDelta(ctx, knowledge.groupId, {
+    knowledgeCount: -1,
+    embeddingBytes: -estimateEmbeddingBytes(knowledge.embedding),
+  });
+}
+
+/**
+ * Insert an event and count it in the group total, the daily bucket and
+ * on its actor
+ */
+export async function insertEvent(
+  ctx: MutationCtx,
+  event: WithoutSystemFields<Doc<"events">>
+): Promise<Id<"events">> {
+  const eventId = await ctx.db.insert("events", event);
+
+  const isPayment = event.type === "payment_processed";
+  const amount = isPayment ? event.metadata?.amount || 0 : 0;
+
+  await applyGroupDelta(ctx, event.groupId, { eventCount: 1 });
+  await applyDailyDelta(ctx, event.groupId, dayBucket(event.timestamp), {
+    eventCount: 1,
+    paymentCount: isPayment ? 1 : 0,
+    revenue: amount,
+  });
+
+  if (event.actorId) {
+    await applyEntityDelta(
+      ctx,
+      event.actorId,
+      { eventCount: 1, totalRevenue: amount },
+      { eventType: event.type, timestamp: event.timestamp }
+    );
+  }
+
+  return eventId;
+}
@@ -0,0 +1,200 @@
+/**
+ * Hybrid knowledge retrieval (vector + full-text)
+ *
+ * Runs inside actions (vector search is only available to actions):
+ * 1. Embed the query with the configured embedder (lib/embeddings.ts)
+ * 2. Vector search knowledge.by_embedding, filtered by groupId
+ * 3. Full-text search knowledge.search_text (text + labels), filtered by groupId
+ * 4. Fuse both ranked lists with weighted reciprocal rank fusion (RRF)
+ * 5. Load the top-k documents, dropping soft-deleted items
+ *
+ * RRF only looks at ranks, so vector similarities and BM25-style text scores
+ * never have to be put on the same scale.
+ */
+
+import type { ActionCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+import { internal } from "../_generated/api";
+import { getEmbedder } from "./embeddings";
+
+// ============================================================================
+// FULL-TEXT SEARCH
+// ============================================================================
+
+/**
+ * Top `limit` live (not soft-deleted) text matches, relevance ordered
+ *
+ * Matches text and labels (both indexed through knowledge.searchText).
+ * Streams the search results and skips deleted items instead of
+ * take(limit) + filter, so deleted items that rank highly do not shorten
+ * the result (the search index cannot filter on deletedAt)
+ */
+export async function searchKnowledgeText(
+  ctx: QueryCtx,
+  args: { groupId: Id<"groups">; query: string; knowledgeType?: Doc<"knowledge">["knowledgeType"] },
+  limit: number
+): Promise<Doc<"knowledge">[]> {
+  if (args.query.trim().length === 0) {
+    return [];
+  }
+
+  const results: Doc<"knowledge">[] = [];
+  const matches = ctx.db
+    .query("knowledge")
+    .withSearchIndex("search_text", (q) => {
+      const scoped = q.search("searchText", args.query).eq("groupId", args.groupId);
+      return args.knowledgeType ? scoped.eq("knowledgeType", args.knowledgeType) : scoped;
+    });
+
+  for await (const knowledge of matches) {
+    if (knowledge.deletedAt !== undefined) continue;
+    results.push(knowledge);
+    if (results.length === limit) break;
+  }
+  return results;
+}
+
+// ============================================================================
+// RANK FUSION
+// ============================================================================
+
+/** Standard RRF damping constant (Cormack et al.) */
+export const RRF_K = 60;
+
+/** Convex vector search returns at most 256 results */
+export const MAX_CANDIDATES = 256;
+
+export type RankedHit<T extends string = string> = {
+  id: T;
+  score: number;
+};
+
+export type FusedHit<T extends string = string> = {
+  id: T;
+  score: number;
+  vectorRank?: number;
+  textRank?: number;
+  similarity?: number;
+};
+
+/**
+ * Weighted reciprocal rank fusion of a vector list and a text list
+ *
+ * alpha = 1 → vector only, alpha = 0 → text only
+ */
+export function fuseRankings<T extends string>(
+  vectorHits: RankedHit<T>[],
+  textHits: RankedHit<T>[],
+  options: { limit: number; alpha?: number; k?: number }
+): FusedHit<T>[] {
+  const alpha = options.alpha ?? 0.7;
+  const k = options.k ?? RRF_K;
+  const fused = new Map<T, FusedHit<T>>();
+
+  vectorHits.forEach((hit, rank) => {
+    fused.set(hit.id, {
+      id: hit.id,
+      score: alpha / (k + rank + 1),
+      vectorRank: rank + 1,
+      similarity: hit.score,
+    });
+  });
+
+  textHits.forEach((hit, rank) => {
+    const existing = fused.get(hit.id);
+    const score = (1 - alpha) / (k + rank + 1);
+    if (existing) {
+      existing.score += score;
+      existing.textRank = rank + 1;
+    } else {
+      fused.set(hit.id, { id: hit.id, score, textRank: rank + 1 });
+    }
+  });
+
+  return [...fused.values()]
+    .sort((a, b) => b.score - a.score)
+    .slice(0, options.limit);
+}
+
+// ============================================================================
+// HYBRID KNOWLEDGE SEARCH
+// ============================================================================
+
+export type KnowledgeSearchArgs = {
+  groupId: Id<"groups">;
+  query: string;
+  limit?: number;
+  alpha?: number;
+  threshold?: number; // Minimum vector similarity for vector-only hits
+  knowledgeType?: Doc<"knowledge">["knowledgeType"];
+  labels?: string[];
+};
+
+export type KnowledgeSearchHit = FusedHit<Id<"knowledge">> & {
+  knowledge: Doc<"knowledge">;
+};
+
+/**
+ * Hybrid top-k search over a group's knowledge
+ */
+export async function hybridKnowledgeSearch(
+  ctx: ActionCtx,
+  args: KnowledgeSearchArgs
+): Promise<{ model: string; hits: KnowledgeSearchHit[] }> {
+  const limit = Math.min(args.limit ?? 10, MAX_CANDIDATES);
+  // Over-fetch so post-filters (type, labels, deleted) still leave k results
+  const candidates = Math.min(limit * 4, MAX_CANDIDATES);
+  const alpha = args.alpha ?? 0.7;
+
+  const embedder = getEmbedder();
+
+  const [vectorHits, textHits]: [
+    Array<{ _id: Id<"knowledge">; _score: number }>,
+    Id<"knowledge">[],
+  ] = await Promise.all([
+    alpha > 0
+      ? embedder.embed([args.query]).then(([vector]) =>
+          ctx.vectorSearch("knowledge", "by_embedding", {
+            vector,
+            limit: candidates,
+            filter: (q) => q.eq("groupId", args.groupId),
+          })
+        )
+      : Promise.resolve([]),
+    alpha < 1
+      ? ctx.runQuery(internal.queries.knowledge.searchTextIds, {
+          groupId: args.groupId,
+          query: args.query,
+          knowledgeType: args.knowledgeType,
+          limit: candidates,
+        })
+      : Promise.resolve([]),
+  ]);
+
+  const threshold = args.threshold ?? 0;
+  const fused = fuseRankings(
+    vectorHits
+      .filter((h) => h._score >= threshold)
+      .map((h) => ({ id: h._id, score: h._score })),
+    textHits.map((id, rank) => ({ id, score: textHits.length - rank })),
+    { limit: candidates, alpha }
+  );
+
+  const docs: Doc<"knowledge">[] = await ctx.runQuery(internal.queries.knowledge.getManyForSearch, {
+    groupId: args.groupId,
+    ids: fused.map((h) => h.id),
+  });
+  const byId = new Map(docs.map((d) => [d._id, d]));
+
+  const hits: KnowledgeSearchHit[] = [];
+  for (const hit of fused) {
+    const knowledge = byId.get(hit.id);
+    if (!knowledge) continue;
+    if (args.knowledgeType && knowledge.knowledgeType !== args.knowledgeType) continue;
+    if (args.labels?.length && !args.labels.some((l) => knowledge.labels?.includes(l))) continue;
+    hits.push({ ...hit, knowledge });
+    if (hits.length === limit) break;
+  }
+
+  return { model: embedder.model, hits };
+}
@@ -0,0 +1,334 @@
+/**
+ * Sharded usage metering
+ *
+ * Every API call records usage, so a single counter row per group/metric
+ * turns into a write hot spot: concurrent requests from one tenant all
+ * read-modify-write the same document and conflict under OCC. Instead,
+ * each write lands on one of USAGE_SHARDS rows for the current hour,
+ * picked at random, so concurrent writers rarely touch the same row:
+ *
+ *   recordUsage ─▶ usageShards (groupId, metric, hour, shard)   live, small
+ *                      │  compactUsage (cron, hourly)
+ *                      ▼
+ *                  usage rows: hourly / daily / monthly buckets
+ *
+ * Compaction deletes closed-hour shard rows and adds them to the bucket
+ * rows in ONE transaction, so a read of "bucket row + uncompacted shards"
+ * is exact at any moment. Bucket rows have a single writer (compaction)
+ * and never contend with request traffic.
+ *
+ * All buckets are UTC.
+ */
+
+import type { MutationCtx, QueryCtx } from "../_generated/server";
+import type { Doc, Id } from "../_generated/dataModel";
+import { DAY_MS, dayBucket } from "./rollups";
+
+// ============================================================================
+// LIMITS
+// ============================================================================
+
+/** Shards per group/metric/hour; concurrent writers spread across them */
+export const USAGE_SHARDS = 16;
+
+/** Largest shard count a caller may request (load tests) */
+export const MAX_USAGE_SHARDS = 256;
+
+export const HOUR_MS = 60 * 60 * 1000;
+
+/**
+ * Live shard rows read per total: current hour plus up to two days of
+ * compaction lag
+ */
+export const MAX_LIVE_SHARD_ROWS = USAGE_SHARDS * 48;
+
+/** Shard rows folded into buckets per compaction transaction */
+export const COMPACTION_BATCH = 500;
+
+export type UsagePeriod = "hourly" | "daily" | "monthly" | "annual";
+
+/** Periods materialized as bucket rows ("annual" sums monthly rows) */
+const BUCKET_PERIODS = ["hourly", "daily", "monthly"] as const;
+
+// ============================================================================
+// BUCKETS
+// ============================================================================
+
+export function hourBucket(timestamp: number): number {
+  return Math.floor(timestamp / HOUR_MS) * HOUR_MS;
+}
+
+export function monthBucket(timestamp: number): number {
+  const date = new Date(timestamp);
+  return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), 1);
+}
+
+/**
+ * UTC start/end of the period containing timestamp
+ */
+export function getUsagePeriodBounds(
+  period: UsagePeriod,
+  timestamp: number
+): { start: number; end: number } {
+  const date = new Date(timestamp);
+  const year = date.getUTCFullYear();
+  const month = date.getUTCMonth();
+
+  switch (period) {
+    case "hourly": {
+      const start = hourBucket(timestamp);
+      return { start, end: start + HOUR_MS };
+    }
+    case "daily": {
+      const start = dayBucket(timestamp);
+      return { start, end: start + DAY_MS };
+    }
+    case "monthly":
+      return { start: Date.UTC(year, month, 1), end: Date.UTC(year, month + 1, 1) };
+    case "annual":
+      return { start: Date.UTC(year, 0, 1), end: Date.UTC(year + 1, 0, 1) };
+  }
+}
+
+/**
+ * Period a metric's quota is measured over
+ */
+export function getPeriodForMetric(metric: string): UsagePeriod {
+  if (metric === "api_calls_per_month" || metric === "revenue_per_month") {
+    return "monthly";
+  }
+  if (metric === "entities_total" || metric === "connections_total" || metric === "users") {
+    return "annual"; // These are cumulative
+  }
+  return "daily"; // Default to daily for most metrics
+}
+
+/**
+ * Get quota limit for a metric
+ * In production, this would fetch from group's plan settings
+ */
+export function getQuotaLimitForMetric(metric: string): number {
+  const limits: Record<string, number> = {
+    users: 50,
+    storage_gb: 100,
+    api_calls_per_month: 100000,
+    entities_total: 10000,
+    connections_total: 50000,
+  };
+
+  return limits[metric] || 1000;
+}
+
+// ============================================================================
+// WRITES
+// ============================================================================
+
+/**
+ * Add amount to a random shard of the current hour
+ *
+ * Reads and writes ONE shard row, so writers on other shards never conflict
+ */
+export async function incrementUsage(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  metric: string,
+  amount: number,
+  options: { shards?: number; now?: number } = {}
+): Promise<{ hour: number; shard: number }> {
+  const now = options.now ?? Date.now();
+  const shards = Math.max(1, Math.min(options.shards ?? USAGE_SHARDS, MAX_USAGE_SHARDS));
+  const hour = hourBucket(now);
+  const shard = Math.floor(Math.random() * shards);
+
+  const existing = await ctx.db
+    .query("usageShards")
+    .withIndex("group_metric_hour", (q) =>
+      q.eq("groupId", groupId).eq("metric", metric).eq("hour", hour).eq("shard", shard)
+    )
+    .unique();
+
+  if (existing) {
+    await ctx.db.patch(existing._id, { value: existing.value + amount, updatedAt: now });
+  } else {
+    await ctx.db.insert("usageShards", {
+      groupId,
+      metric,
+      hour,
+      shard,
+      value: amount,
+      updatedAt: now,
+    });
+  }
+
+  return { hour, shard };
+}
+
+/**
+ * Fold closed-hour shard rows into hourly/daily/monthly buckets
+ *
+ * Only shards with hour < before are touched; live writers only write the
+ * current hour, so compaction does not contend with request traffic.
+ */
+export async function compactUsageShards(
+  ctx: MutationCtx,
+  before: number,
+  limit = COMPACTION_BATCH
+): Promise<{ compacted: number; done: boolean }> {
+  const rows = await ctx.db
+    .query("usageShards")
+    .withIndex("by_hour", (q) => q.lt("hour", before))
+    .take(limit);
+
+  // 1. SUM SHARDS PER (group, metric, hour)
+  const sums = new Map<string, { groupId: Id<"groups">; metric: string; hour: number; value: number }>();
+  for (const row of rows) {
+    const key = `${row.groupId}|${row.metric}|${row.hour}`;
+    const sum = sums.get(key);
+    if (sum) {
+      sum.value += row.value;
+    } else {
+      sums.set(key, { groupId: row.groupId, metric: row.metric, hour: row.hour, value: row.value });
+    }
+  }
+
+  // 2. ADD TO EVERY BUCKET THE HOUR FALLS IN
+  for (const sum of sums.values()) {
+    for (const period of BUCKET_PERIODS) {
+      await addToBucket(ctx, sum.groupId, sum.metric, period, sum.hour, sum.value);
+    }
+  }
+
+  // 3. DELETE COMPACTED SHARDS (same transaction: totals stay exact)
+  for (const row of rows) {
+    await ctx.db.delete(row._id);
+  }
+
+  return { compacted: rows.length, done: rows.length < limit };
+}
+
+async function addToBucket(
+  ctx: MutationCtx,
+  groupId: Id<"groups">,
+  metric: string,
+  period: (typeof BUCKET_PERIODS)[number],
+  hour: number,
+  amount: number
+): Promise<void> {
+  const bounds = getUsagePeriodBounds(period, hour);
+  const now = Date.now();
+
+  const bucket = await ctx.db
+    .query("usage")
+    .withIndex("group_metric_period", (q) =>
+      q
+        .eq("groupId", groupId)
+        .eq("metric", metric)
+        .eq("period", period)
+        .eq("periodStart", bounds.start)
+    )
+    .unique();
+
+  if (bucket) {
+    await ctx.db.patch(bucket._id, { value: bucket.value + amount, timestamp: now });
+  } else {
+    await ctx.db.insert("usage", {
+      groupId,
+      metric,
+      period,
+      value: amount,
+      limit: getQuotaLimitForMetric(metric),
+      timestamp: now,
+      periodStart: bounds.start,
+      periodEnd: bounds.end,
+    });
+  }
+}
+
+// ============================================================================
+// READS
+// ============================================================================
+
+/**
+ * Usage of a metric over the period containing `at` (default: now)
+ *
+ * Compacted bucket row(s) plus live shard rows in the same window:
+ * 1 bucket row (12 for "annual") + about USAGE_SHARDS shard rows.
+ */
+export async function getUsageForPeriod(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  metric: string,
+  period: UsagePeriod,
+  at = Date.now()
+): Promise<{ value: number; periodStart: number; periodEnd: number }> {
+  const bounds = getUsagePeriodBounds(period, at);
+
+  // 1. COMPACTED BUCKETS
+  let value = 0;
+  if (period === "annual") {
+    const months = await ctx.db
+      .query("usage")
+      .withIndex("group_metric_period", (q) =>
+        q
+          .eq("groupId", groupId)
+          .eq("metric", metric)
+          .eq("period", "monthly")
+          .gte("periodStart", bounds.start)
+          .lt("periodStart", bounds.end)
+      )
+      .take(12);
+    value = months.reduce((sum, row) => sum + row.value, 0);
+  } else {
+    const bucket = await ctx.db
+      .query("usage")
+      .withIndex("group_metric_period", (q) =>
+        q
+          .eq("groupId", groupId)
+          .eq("metric", metric)
+          .eq("period", period)
+          .eq("periodStart", bounds.start)
+      )
+      .unique();
+    value = bucket?.value ?? 0;
+  }
+
+  // 2. LIVE SHARDS NOT YET COMPACTED
+  const shards = await ctx.db
+    .query("usageShards")
+    .withIndex("group_metric_hour", (q) =>
+      q
+        .eq("groupId", groupId)
+        .eq("metric", metric)
+        .gte("hour", bounds.start)
+        .lt("hour", bounds.end)
+    )
+    .take(MAX_LIVE_SHARD_ROWS);
+  value += shards.reduce((sum, row) => sum + row.value, 0);
+
+  return { value, periodStart: bounds.start, periodEnd: bounds.end };
+}
+
+/**
+ * Compacted bucket rows for a metric, oldest first (charts, billing exports)
+ */
+export async function getUsageBuckets(
+  ctx: QueryCtx,
+  groupId: Id<"groups">,
+  metric: string,
+  period: Exclude<UsagePeriod, "annual">,
+  from: number,
+  to: number,
+  limit: number
+): Promise<Doc<"usage">[]> {
+  return await ctx.db
+    .query("usage")
+    .withIndex("group_metric_period", (q) =>
+      q
+        .eq("groupId", groupId)
+        .eq("metric", metric)
+        .eq("period", period)
+        .gte("periodStart", from)
+        .lt("periodStart", to)
+    )
+    .take(limit);
+}
@@ -17,6 +17,10 @@
  */
 
 import { QueryCtx, MutationCtx } from "../_generated/server";
+import { Doc, Id } from "../_generated/dataModel";
+import type { PaginationOptions } from "convex/server";
+import { isAncestorOrSelf } from "../lib/groupClosure";
+import { clampPaginationOpts } from "../lib/pagination";
 
 export interface GroupIsolationMiddleware {
   validateThing: (ctx: QueryCtx | MutationCtx, thingId: string) => Promise<void>;
@@ -180,18 +184,13 @@ export async function validateGroupAccess(
     return true;
   }
 
-  // Check if user's group is parent of data's group
-  let currentGroup = await ctx.db.get(dataGroupId as any);
-
-  while (currentGroup && (currentGroup as any).parentGroupId) {
-    if ((currentGroup as any).parentGroupId === userGroupId) {
-      return true; // User's group is ancestor
-    }
-    currentGroup = await ctx.db.get((currentGroup as any).parentGroupId);
-  }
-
-  // User's group is not ancestor - deny access
-  return false;
+  // Check if user's group is an ancestor of data's group
+  // (one groupClosure lookup instead of walking parentGroupId)
+  return await isAncestorOrSelf(
+    ctx,
+    userGroupId as Id<"groups">,
+    dataGroupId as Id<"groups">
+  );
 }
 
 /**
@@ -243,74 +242,117 @@ export function createGroupSafeQuery<T, U>(
  * GROUP ISOLATION TESTING UTILITIES
  *
  * For testing and debugging group isolation violations
+ *
+ * Each check scans ONE group's rows through its by_group index, one page
+ * per call (pass continueCursor back until isDone), so it stays within
+ * transaction read limits on any tenant size. Referenced entities are
+ * fetched once per page.
+ */
+
+type IsolationScan = {
+  violations: any[];
+  continueCursor: string;
+  isDone: boolean;
+};
+
+/**
+ * Memoized ctx.db.get for the entities referenced on one page
  */
+function entityLoader(ctx: QueryCtx | MutationCtx) {
+  const cache = new Map<string, Promise<Doc<"entities"> | null>>();
+  return (id: Id<"entities">) => {
+    let entity = cache.get(id);
+    if (!entity) {
+      entity = ctx.db.get(id);
+      cache.set(id, entity);
+    }
+    return entity;
+  };
+}
+
 export const GroupIsolationTests = {
   /**
-   * Find all cross-group references in connections
-   * Returns connections that violate isolation
+   * Find cross-group references in a group's connections
+   * Returns connections on this page that violate isolation
    */
-  findCrossGroupConnections: async (ctx: QueryCtx | MutationCtx) => {
+  findCrossGroupConnections: async (
+    ctx: QueryCtx | MutationCtx,
+    groupId: Id<"groups">,
+    paginationOpts: PaginationOptions
+  ): Promise<IsolationScan> => {
     const violations: any[] = [];
+    const getEntity = entityLoader(ctx);
 
-    const connections = await ctx.db.query("connections").collect();
+    const page = await ctx.db
+      .query("connections")
+      .withIndex("by_group", (q) => q.eq("groupId", groupId))
+      .paginate(clampPaginationOpts(paginationOpts));
 
-    for (const conn of connections) {
-      const fromThing = await ctx.db.get((conn as any).fromEntityId);
-      const toThing = await ctx.db.get((conn as any).toEntityId);
+    for (const conn of page.page) {
+      const [fromThing, toThing] = await Promise.all([
+        getEntity(conn.fromEntityId),
+        getEntity(conn.toEntityId),
+      ]);
 
-      if (
-        fromThing &&
-        toThing &&
-        (fromThing as any).groupId !== (toThing as any).groupId
-      ) {
+      if (fromThing && toThing && fromThing.groupId !== toThing.groupId) {
         violations.push({
           connectionId: conn._id,
-          fromGroupId: (fromThing as any).groupId,
-          toGroupId: (toThing as any).groupId,
-          relationshipType: (conn as any).relationshipType,
+          fromGroupId: fromThing.groupId,
+          toGroupId: toThing.groupId,
+          relationshipType: conn.relationshipType,
         });
       }
 
-      if (
-        fromThing &&
-        (fromThing as any).groupId !== (conn as any).groupId
-      ) {
+      if (fromThing && fromThing.groupId !== conn.groupId) {
         violations.push({
           connectionId: conn._id,
           issue: "From entity in different group",
-          fromThingGroupId: (fromThing as any).groupId,
-          connectionGroupId: (conn as any).groupId,
+          fromThingGroupId: fromThing.groupId,
+          connectionGroupId: conn.groupId,
         });
       }
 
-      if (toThing && (toThing as any).groupId !== (conn as any).groupId) {
+      if (toThing && toThing.groupId !== conn.groupId) {
         violations.push({
           connectionId: conn._id,
           issue: "To entity in different group",
-          toThingGroupId: (toThing as any).groupId,
-          connectionGroupId: (conn as any).groupId,
+          toThingGroupId: toThing.groupId,
+          connectionGroupId: conn.groupId,
         });
       }
     }
 
-    return violations;
+    return {
+      violations,
+      continueCursor: page.continueCursor,
+      isDone: page.isDone,
+    };
   },
 
   /**
-   * Find all events with orphaned actors/targets
+   * Find a group's events with orphaned actors/targets
    */
-  findOrphanedEventReferences: async (ctx: QueryCtx | MutationCtx) => {
+  findOrphanedEventReferences: async (
+    ctx: QueryCtx | MutationCtx,
+    groupId: Id<"groups">,
+    paginationOpts: PaginationOptions
+  ): Promise<IsolationScan> => {
     const violations: any[] = [];
+    const getEntity = entityLoader(ctx);
 
-    const events = await ctx.db.query("events").collect();
+    const page = await ctx.db
+      .query("events")
+      .withIndex("by_group", (q) => q.eq("groupId", groupId))
+      .paginate(clampPaginationOpts(paginationOpts));
 
-    for (const event of events) {
-      const groupId = (event as any).groupId;
-      const actorId = (event as any).actorId;
-      const targetId = (event as any).targetId;
+    for (const event of page.page) {
+      const { actorId, targetId } = event;
+      const [actor, target] = await Promise.all([
+        actorId ? getEntity(actorId) : null,
+        targetId ? getEntity(targetId) : null,
+      ]);
 
       if (actorId) {
-        const actor = await ctx.db.get(actorId);
         if (!actor) {
           violations.push({
             eventId: event._id,
@@ -318,18 +360,17 @@ export const GroupIsolationTests = {
             actorId,
             groupId,
           });
-        } else if ((actor as any).groupId !== groupId) {
+        } else if (actor.groupId !== groupId) {
           violations.push({
             eventId: event._id,
             issue: "Actor in different group",
-            actorGroupId: (actor as any).groupId,
+            actorGroupId: actor.groupId,
             eventGroupId: groupId,
           });
         }
       }
 
       if (targetId) {
-        const target = await ctx.db.get(targetId);
         if (!target) {
           violations.push({
             eventId: event._id,
@@ -337,17 +378,21 @@ export const GroupIsolationTests = {
             targetId,
             groupId,
           });
-        } else if ((target as any).groupId !== groupId) {
+        } else if (target.groupId !== groupId) {
           violations.push({
             eventId: event._id,
             issue: "Target in different group",
-            targetGroupId: (target as any).groupId,
+            targetGroupId: target.groupId,
             eventGroupId: groupId,
           });
         }
       }
     }
 
-    return violations;
+    return {
+      violations,
+      continueCursor: page.continueCursor,
+      isDone: page.isDone,
+    };
   },
 };
@@ -16,6 +16,8 @@ import {
   validateDisplayName,
   onboardingService,
 } from "../services/onboardingService";
+import { insertEntity, insertKnowledge, insertEvent, patchEntity } from "../lib/rollups";
+import { insertGroup } from "../lib/groupClosure";
 
 // ============================================================================
 // Infer 18: Signup Mutation
@@ -61,7 +63,7 @@ export const signup = mutation({
     }
 
     // 3. CREATE TEMPORARY GROUP FOR USER (will be replaced when they create workspace)
-    const tempGroupId = await ctx.db.insert("groups", {
+    const tempGroupId = await insertGroup(ctx, {
       slug: `user-${args.email.split("@")[0]}-${Date.now()}`,
       name: `${args.displayName}'s Workspace`,
       type: "organization",
@@ -86,7 +88,7 @@ export const signup = mutation({
     });
 
     // 4. CREATE USER ENTITY
-    const creatorId = await ctx.db.insert("entities", {
+    const creatorId = await insertEntity(ctx, {
       groupId: tempGroupId,
       type: "user",
       name: args.displayName,
@@ -121,7 +123,7 @@ export const signup = mutation({
     });
 
     // 6. LOG SIGNUP EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: tempGroupId,
       type: "thing_created",
       actorId: creatorId,
@@ -229,7 +231,7 @@ export const verifyEmail = mutation({
     }
 
     const userSchemaVersion = user.schemaVersion || 1;
-    await ctx.db.patch(user._id, {
+    await patchEntity(ctx, user, {
       properties: {
         ...user.properties,
         emailVerified: true,
@@ -241,7 +243,7 @@ export const verifyEmail = mutation({
     });
 
     // 6. LOG EMAIL VERIFICATION EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: user.groupId,
       type: "thing_updated",
       actorId: user._id,
@@ -337,7 +339,7 @@ export const updateProfile = mutation({
     updates.onboardingStep = "workspace";
 
     const userSchemaVersion = user.schemaVersion || 1;
-    await ctx.db.patch(args.userId, {
+    await patchEntity(ctx, user, {
       properties: {
         ...user.properties,
         ...updates,
@@ -350,7 +352,7 @@ export const updateProfile = mutation({
     if (args.niche && args.niche.length > 0) {
       for (const nicheItem of args.niche) {
         // Create knowledge label
-        const knowledgeId = await ctx.db.insert("knowledge", {
+        const knowledgeId = await insertKnowledge(ctx, {
           groupId: user.groupId,
           knowledgeType: "label",
           text: nicheItem,
@@ -372,7 +374,7 @@ export const updateProfile = mutation({
     }
 
     // 5. LOG UPDATE EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: user.groupId,
       type: "thing_updated",
       actorId: args.userId,
@@ -1,14 +1,28 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
-import { THING_TYPES, isThingType } from "../types/ontology";
+import { insertEvent } from "../lib/rollups";
+import {
+  importThing,
+  importConnection,
+  applyThingUpdate,
+  importThingValidator,
+  importConnectionValidator,
+  thingUpdateValidator,
+  thingStatusValidator,
+  type BatchItemError
+} from "../lib/batch";
+import { MAX_SYNC_BATCH } from "../lib/jobs";
 
 /**
  * PHASE 3: BATCH OPERATIONS
  *
- * High-volume operations for scale (100-10,000 items per call)
+ * Synchronous batches: every item is written in ONE transaction
  * Validate each item, create atomically, log single batch event
  *
- * Performance Target: < 5s for 10K items
+ * Capped at MAX_SYNC_BATCH items per call so a batch stays well inside
+ * Convex transaction limits. Larger imports go through the chunked job
+ * engine (mutations/jobs.ts), which shares the same per-item validation
+ * (lib/batch.ts) but spreads the work over scheduled transactions.
  *
  * Pattern:
  * 1. Validate group exists and is active
@@ -19,6 +33,14 @@ import { THING_TYPES, isThingType } from "../types/ontology";
  * 6. Return array of created IDs
  */
 
+function assertSyncBatchSize(count: number): void {
+  if (count > MAX_SYNC_BATCH) {
+    throw new Error(
+      `Batch of ${count} items exceeds ${MAX_SYNC_BATCH}. Use the jobs API (mutations/jobs) for large imports.`
+    );
+  }
+}
+
 /**
  * Batch insert things (entities) with validation
  *
@@ -27,36 +49,20 @@ import { THING_TYPES, isThingType } from "../types/ontology";
  * - Properties structure is valid
  * - Group is active and not over limits
  *
- * Performance: 1000 items ~500ms, 10K items ~3s
+ * Performance: 1000 items ~500ms (MAX_SYNC_BATCH)
  */
 export const batchInsertThings = mutation({
   args: {
     groupId: v.id("groups"),
-    things: v.array(v.object({
-      type: v.string(),
-      name: v.string(),
-      properties: v.optional(v.any()),
-      status: v.optional(v.union(
-        v.literal("draft"),
-        v.literal("active"),
-        v.literal("published"),
-        v.literal("archived"),
-        v.literal("inactive")
-      ))
-    })),
+    things: v.array(importThingValidator),
     options: v.optional(v.object({
       skipValidation: v.optional(v.boolean()),
-      defaultStatus: v.optional(v.union(
-        v.literal("draft"),
-        v.literal("active"),
-        v.literal("published"),
-        v.literal("archived"),
-        v.literal("inactive")
-      ))
+      defaultStatus: v.optional(thingStatusValidator)
     }))
   },
   handler: async (ctx, args) => {
     // 1. VALIDATE GROUP
+    assertSyncBatchSize(args.things.length);
     const group = await ctx.db.get(args.groupId);
     if (!group) {
       throw new Error("Group not found");
@@ -83,40 +89,16 @@ export const batchInsertThings = mutation({
     // 2. VALIDATE AND CREATE THINGS
     const now = Date.now();
     const createdIds: string[] = [];
-    const errors: Array<{ index: number; error: string }> = [];
+    const errors: BatchItemError[] = [];
 
     for (let i = 0; i < args.things.length; i++) {
       const thing = args.things[i];
 
       try {
-        // Validate type
-        if (!args.options?.skipValidation && !isThingType(thing.type)) {
-          errors.push({
-            index: i,
-            error: `Invalid type "${thing.type}". Must be one of: ${THING_TYPES.join(", ")}`
-          });
-          continue;
-        }
-
-        // Validate name not empty
-        if (!thing.name || thing.name.trim().length === 0) {
-          errors.push({
-            index: i,
-            error: "Name cannot be empty"
-          });
-          continue;
-        }
-
-        // Create entity
-        const entityId = await ctx.db.insert("entities", {
-          groupId: args.groupId,
-          type: thing.type as any,
-          name: thing.name.trim(),
-          properties: thing.properties || {},
-          status: (thing.status || args.options?.defaultStatus || "draft") as "draft" | "active" | "published" | "archived" | "inactive",
-          schemaVersion: 1,
-          createdAt: now,
-          updatedAt: now
+        const entityId = await importThing(ctx, args.groupId, thing, {
+          skipValidation: args.options?.skipValidation,
+          defaultStatus: args.options?.defaultStatus,
+          now
         });
 
         createdIds.push(entityId);
@@ -129,7 +111,7 @@ export const batchInsertThings = mutation({
     }
 
     // 3. LOG SINGLE BATCH EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: actor?._id,
@@ -173,20 +155,14 @@ export const batchInsertThings = mutation({
 export const batchCreateConnections = mutation({
   args: {
     groupId: v.id("groups"),
-    connections: v.array(v.object({
-      fromEntityId: v.id("entities"),
-      toEntityId: v.id("entities"),
-      relationshipType: v.string(),
-      metadata: v.optional(v.any()),
-      validFrom: v.optional(v.number()),
-      validTo: v.optional(v.number())
-    })),
+    connections: v.array(importConnectionValidator),
     options: v.optional(v.object({
       skipValidation: v.optional(v.boolean())
     }))
   },
   handler: async (ctx, args) => {
     // 1. VALIDATE GROUP
+    assertSyncBatchSize(args.connections.length);
     const group = await ctx.db.get(args.groupId);
     if (!group) {
       throw new Error("Group not found");
@@ -210,71 +186,13 @@ export const batchCreateConnections = mutation({
     // 2. VALIDATE AND CREATE CONNECTIONS
     const now = Date.now();
     const createdIds: string[] = [];
-    const errors: Array<{ index: number; error: string }> = [];
+    const errors: BatchItemError[] = [];
 
     for (let i = 0; i < args.connections.length; i++) {
       const conn = args.connections[i];
 
       try {
-        // Validate both entities exist and belong to group
-        const fromEntity = await ctx.db.get(conn.fromEntityId);
-        const toEntity = await ctx.db.get(conn.toEntityId);
-
-        if (!fromEntity) {
-          errors.push({
-            index: i,
-            error: `From entity not found: ${conn.fromEntityId}`
-          });
-          continue;
-        }
-
-        if (!toEntity) {
-          errors.push({
-            index: i,
-            error: `To entity not found: ${conn.toEntityId}`
-          });
-          continue;
-        }
-
-        // Validate both entities belong to same group
-        if (fromEntity.groupId !== args.groupId || toEntity.groupId !== args.groupId) {
-          errors.push({
-            index: i,
-            error: "Both entities must belong to specified group"
-          });
-          continue;
-        }
-
-        // Check for duplicate connection (optional optimization)
-        const existing = await ctx.db
-          .query("connections")
-          .withIndex("from_type", (q) =>
-            q.eq("fromEntityId", conn.fromEntityId)
-              .eq("relationshipType", conn.relationshipType)
-          )
-          .filter((q) => q.eq(q.field("toEntityId"), conn.toEntityId))
-          .first();
-
-        if (existing) {
-          errors.push({
-            index: i,
-            error: "Connection already exists"
-          });
-          continue;
-        }
-
-        // Create connection
-        const connId = await ctx.db.insert("connections", {
-          groupId: args.groupId,
-          fromEntityId: conn.fromEntityId,
-          toEntityId: conn.toEntityId,
-          relationshipType: conn.relationshipType as any,
-          metadata: conn.metadata,
-          validFrom: conn.validFrom || now,
-          validTo: conn.validTo,
-          createdAt: now,
-          updatedAt: now
-        });
+        const connId = await importConnection(ctx, args.groupId, conn, { now });
 
         createdIds.push(connId);
       } catch (err) {
@@ -286,7 +204,7 @@ export const batchCreateConnections = mutation({
     }
 
     // 3. LOG SINGLE BATCH EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: actor?._id,
@@ -326,21 +244,11 @@ export const batchCreateConnections = mutation({
 export const batchUpdateThings = mutation({
   args: {
     groupId: v.id("groups"),
-    updates: v.array(v.object({
-      entityId: v.id("entities"),
-      name: v.optional(v.string()),
-      properties: v.optional(v.any()),
-      status: v.optional(v.union(
-        v.literal("draft"),
-        v.literal("active"),
-        v.literal("published"),
-        v.literal("archived"),
-        v.literal("inactive")
-      ))
-    }))
+    updates: v.array(thingUpdateValidator)
   },
   handler: async (ctx, args) => {
     // 1. VALIDATE GROUP
+    assertSyncBatchSize(args.updates.length);
     const group = await ctx.db.get(args.groupId);
     if (!group) {
       throw new Error("Group not found");
@@ -365,71 +273,24 @@ export const batchUpdateThings = mutation({
     const now = Date.now();
     const updatedIds: string[] = [];
     const changes: Array<{ entityId: string; changes: string[] }> = [];
-    const errors: Array<{ index: number; error: string }> = [];
+    const errors: BatchItemError[] = [];
 
     for (let i = 0; i < args.updates.length; i++) {
       const update = args.updates[i];
 
       try {
-        // Validate entity exists and belongs to group
-        const entity = await ctx.db.get(update.entityId);
-
-        if (!entity) {
-          errors.push({
-            index: i,
-            error: `Entity not found: ${update.entityId}`
-          });
-          continue;
-        }
-
-        if (entity.groupId !== args.groupId) {
-          errors.push({
-            index: i,
-            error: "Entity does not belong to specified group"
-          });
-          continue;
-        }
-
-        // Build patch object
-        const patch: any = { updatedAt: now };
-        const trackChanges: string[] = [];
-
-        if (update.name !== undefined && update.name !== entity.name) {
-          patch.name = update.name;
-          trackChanges.push("name");
-        }
-
-        if (update.properties !== undefined) {
-          patch.properties = update.properties;
-          trackChanges.push("properties");
-        }
-
-        if (update.status !== undefined && update.status !== entity.status) {
-          patch.status = update.status;
-          trackChanges.push("status");
-        }
+        const trackChanges = await applyThingUpdate(ctx, args.groupId, update, {
+          actorId: actor?._id,
+          now
+        });
 
-        // Only update if there are changes
+        // Only counted if there were changes (each logs its own event)
         if (trackChanges.length > 0) {
-          await ctx.db.patch(update.entityId, patch);
           updatedIds.push(update.entityId);
           changes.push({
             entityId: update.entityId,
             changes: trackChanges
           });
-
-          // Log individual change event
-          await ctx.db.insert("events", {
-            groupId: args.groupId,
-            type: "thing_updated",
-            actorId: actor?._id,
-            targetId: update.entityId,
-            timestamp: now,
-            metadata: {
-              changes: trackChanges,
-              values: patch
-            }
-          });
         }
       } catch (err) {
         errors.push({
@@ -440,7 +301,7 @@ export const batchUpdateThings = mutation({
     }
 
     // 3. LOG BATCH UPDATE EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_updated",
       actorId: actor?._id,
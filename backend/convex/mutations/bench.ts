@@ -0,0 +1,139 @@
+import { internalMutation } from "../_generated/server";
+import { v } from "convex/values";
+import type { Id } from "../_generated/dataModel";
+import { insertGroup } from "../lib/groupClosure";
+import { DAY_MS, insertEntity, insertEvent } from "../lib/rollups";
+
+/**
+ * PHASE 3: BENCHMARK TENANTS
+ *
+ * Seed data for internalActions/bench.ts: one group per tenant size
+ * (slug "bench-<size>") with <size> entities and <size> events, written
+ * through the rollup helpers like real traffic.
+ *
+ * Progress lives on the group (metadata.benchSeeded), so an interrupted
+ * seed resumes where it stopped and a finished tenant is reused.
+ *
+ * Dev deployments only: never run against production.
+ */
+
+export const SEED_CHUNK_SIZE = 500;
+
+/** Events are spread over this window, ending now */
+const EVENT_WINDOW_DAYS = 60;
+
+/** Events pick their actor/target from the first entities seeded */
+const EVENT_ACTORS = 100;
+
+const ENTITY_TYPES = ["product", "blog_post", "page", "note", "user"] as const;
+const EVENT_TYPES = [
+  "thing_viewed",
+  "product_viewed",
+  "thing_updated",
+  "order_placed",
+  "payment_processed",
+] as const;
+
+type SeedProgress = { entities: number; events: number };
+
+/**
+ * Get or create the tenant for a size
+ */
+export const ensureTenant = internalMutation({
+  args: {
+    size: v.number(),
+  },
+  handler: async (ctx, args): Promise<{ groupId: Id<"groups"> } & SeedProgress> => {
+    const slug = `bench-${args.size}`;
+    const existing = await ctx.db
+      .query("groups")
+      .withIndex("by_slug", (q) => q.eq("slug", slug))
+      .first();
+
+    if (existing) {
+      const progress: SeedProgress = existing.metadata?.benchSeeded ?? { entities: 0, events: 0 };
+      return { groupId: existing._id, ...progress };
+    }
+
+    const now = Date.now();
+    const groupId = await insertGroup(ctx, {
+      slug,
+      name: `Benchmark ${args.size}`,
+      type: "organization",
+      metadata: { benchSeeded: { entities: 0, events: 0 } },
+      settings: { visibility: "private", joinPolicy: "invite_only", plan: "enterprise" },
+      status: "active",
+      createdAt: now,
+      updatedAt: now,
+    });
+
+    return { groupId, entities: 0, events: 0 };
+  },
+});
+
+/**
+ * Seed the next chunk of entities (until size), then of events
+ */
+export const seedChunk = internalMutation({
+  args: {
+    groupId: v.id("groups"),
+    size: v.number(),
+  },
+  handler: async (ctx, args): Promise<SeedProgress & { done: boolean }> => {
+    // 1. LOAD PROGRESS
+    const group = await ctx.db.get(args.groupId);
+    if (!group) {
+      throw new Error("Benchmark group not found");
+    }
+    const progress: SeedProgress = group.metadata?.benchSeeded ?? { entities: 0, events: 0 };
+    const now = Date.now();
+
+    // 2. ENTITIES FIRST (events need actors)
+    if (progress.entities < args.size) {
+      const count = Math.min(SEED_CHUNK_SIZE, args.size - progress.entities);
+      for (let i = progress.entities; i < progress.entities + count; i++) {
+        await insertEntity(ctx, {
+          groupId: args.groupId,
+          type: ENTITY_TYPES[i % ENTITY_TYPES.length],
+          name: `Bench entity ${i}`,
+          properties: { index: i, price: (i % 97) + 1, tags: [`tag-${i % 13}`] },
+          status: i % 10 === 0 ? "draft" : "active",
+          createdAt: now - (i % EVENT_WINDOW_DAYS) * DAY_MS,
+          updatedAt: now,
+        });
+      }
+      progress.entities += count;
+    } else if (progress.events < args.size) {
+      // 3. THEN EVENTS, SPREAD OVER EVENT_WINDOW_DAYS
+      const actors = await ctx.db
+        .query("entities")
+        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+        .take(EVENT_ACTORS);
+
+      const count = Math.min(SEED_CHUNK_SIZE, args.size - progress.events);
+      for (let i = progress.events; i < progress.events + count; i++) {
+        const type = EVENT_TYPES[i % EVENT_TYPES.length];
+        await insertEvent(ctx, {
+          groupId: args.groupId,
+          type,
+          actorId: actors[i % actors.length]._id,
+          targetId: actors[(i * 7) % actors.length]._id,
+          timestamp: now - ((i * 7919) % (EVENT_WINDOW_DAYS * DAY_MS)),
+          metadata: type === "payment_processed" ? { amount: (i % 50) + 1 } : { index: i },
+        });
+      }
+      progress.events += count;
+    }
+
+    // 4. SAVE PROGRESS
+    await ctx.db.patch(args.groupId, {
+      metadata: { ...group.metadata, benchSeeded: progress },
+      updatedAt: now,
+    });
+
+    return {
+      ...progress,
+      done: progress.entities >= args.size && progress.events >= args.size,
+    };
+  },
+});
@@ -8,8 +8,13 @@
  * 4. Remove knowledge associations (clean up RAG linkages)
  * 5. Log cleanup completion event
  *
- * Pattern: All operations are internal (not exposed to frontend)
- * Frontend calls deleteThing() which triggers cascade internally
+ * Pattern: deleteThing() soft-deletes the thing and starts a "cascade_delete"
+ * job (lib/jobs.ts). The job runs steps 2-5 as scheduled chunks of bounded
+ * size (lib/cascade.ts), so deleting a popular thing never collects every
+ * related row in one transaction. Progress: queries/jobs:get.
+ *
+ * The internal mutations below run ONE bounded step each, for manual
+ * repair or scripts; they report `done` so callers can loop.
  *
  * CRITICAL: Cascade operations MUST preserve group isolation
  * All queries filter by groupId to prevent cross-tenant contamination
@@ -17,152 +22,90 @@
 
 import { mutation, internalMutation } from "../_generated/server";
 import { v } from "convex/values";
+import type { Id } from "../_generated/dataModel";
+import { insertEvent } from "../lib/rollups";
+import {
+  runCascadeStep,
+  logCascadeCompletion,
+  type CascadeStepResult
+} from "../lib/cascade";
+import { createJob, startJob } from "../lib/jobs";
+
+const cascadeStepArgs = {
+  thingId: v.id("entities"),
+  groupId: v.id("groups"),
+  cursor: v.optional(v.union(v.string(), v.null())),
+  limit: v.optional(v.number()),
+};
+
+const DEFAULT_STEP_SIZE = 200;
 
 /**
- * INTERNAL MUTATION 1: Delete all connections
+ * INTERNAL MUTATION 1: Delete connections (one bounded step)
  *
- * Removes connections where this thing is source or target.
- * GROUP ISOLATION: Filters by groupId to ensure we only delete from same tenant
+ * Removes up to `limit` connections where this thing is source, then target.
+ * GROUP ISOLATION: group_from / group_to indexes are prefixed by groupId
  */
 export const deleteConnections = internalMutation({
-  args: {
-    thingId: v.id("entities"),
-    groupId: v.id("groups"),
-  },
-  handler: async (ctx, args) => {
-    // Find all connections where this thing is FROM
-    const fromConnections = await ctx.db
-      .query("connections")
-      .withIndex("group_from", (q: any) =>
-        q.eq("groupId", args.groupId).eq("fromEntityId", args.thingId)
-      )
-      .collect();
-
-    // Find all connections where this thing is TO
-    const toConnections = await ctx.db
-      .query("connections")
-      .withIndex("group_to", (q: any) =>
-        q.eq("groupId", args.groupId).eq("toEntityId", args.thingId)
-      )
-      .collect();
-
-    const allConnections = [...fromConnections, ...toConnections];
-    const deletedIds = [];
+  args: cascadeStepArgs,
+  handler: async (ctx, args): Promise<CascadeStepResult> => {
+    const input = {
+      thingId: args.thingId,
+      groupId: args.groupId,
+      cursor: null,
+      numItems: args.limit ?? DEFAULT_STEP_SIZE,
+    };
 
-    // Delete all connections
-    for (const conn of allConnections) {
-      await ctx.db.delete(conn._id);
-      deletedIds.push(conn._id);
+    const from = await runCascadeStep(ctx, "connections_from", input);
+    if (!from.done) {
+      return from;
     }
 
-    return {
-      connectionCount: allConnections.length,
-      deletedIds,
-    };
+    const to = await runCascadeStep(ctx, "connections_to", {
+      ...input,
+      numItems: Math.max(1, input.numItems - from.touched),
+    });
+    return { ...to, touched: from.touched + to.touched };
   },
 });
 
 /**
- * INTERNAL MUTATION 2: Archive all events
+ * INTERNAL MUTATION 2: Archive this thing's thing_deleted events as actor (one step)
  *
  * Events (audit trail) should never be deleted. Instead, mark them as archived
  * so they can be exported to cold storage but remain queryable if needed.
- * GROUP ISOLATION: Filters by groupId
+ * Pass the returned cursor back in until done; target events are archived
+ * by the cascade job's events_target phase.
+ * GROUP ISOLATION: events from other groups are skipped
  */
 export const archiveEvents = internalMutation({
-  args: {
-    thingId: v.id("entities"),
-    groupId: v.id("groups"),
-  },
-  handler: async (ctx, args) => {
-    // Find all events where this thing is actor
-    const asActorEvents = await ctx.db
-      .query("events")
-      .withIndex("group_type", (q: any) =>
-        q.eq("groupId", args.groupId).eq("type", "thing_deleted")
-      )
-      .filter((q: any) => q.eq(q.field("actorId"), args.thingId))
-      .collect();
-
-    // Find all events where this thing is target
-    const asTargetEvents = await ctx.db
-      .query("events")
-      .filter((q: any) =>
-        q.and(
-          q.eq(q.field("groupId"), args.groupId),
-          q.eq(q.field("targetId"), args.thingId)
-        )
-      )
-      .collect();
-
-    const allEvents = [...asActorEvents, ...asTargetEvents];
-    const archivedIds = [];
-
-    // Mark events as archived (don't delete - preserve audit trail)
-    for (const event of allEvents) {
-      // Only archive if not already archived
-      if (!event.archived) {
-        await ctx.db.patch(event._id, {
-          archived: true,
-        });
-        archivedIds.push(event._id);
-      }
-    }
-
-    return {
-      eventCount: allEvents.length,
-      archivedIds,
-    };
+  args: cascadeStepArgs,
+  handler: async (ctx, args): Promise<CascadeStepResult> => {
+    return await runCascadeStep(ctx, "events_actor", {
+      thingId: args.thingId,
+      groupId: args.groupId,
+      cursor: args.cursor ?? null,
+      numItems: args.limit ?? DEFAULT_STEP_SIZE,
+    });
   },
 });
 
 /**
- * INTERNAL MUTATION 3: Remove knowledge associations
+ * INTERNAL MUTATION 3: Remove knowledge associations (one bounded step)
  *
- * Removes all thingKnowledge associations for this thing.
+ * Removes thingKnowledge associations for this thing.
  * Also soft-deletes any orphaned knowledge items (never referenced).
- * GROUP ISOLATION: Filters by groupId for safety
+ * GROUP ISOLATION: Only knowledge in the same group is soft-deleted
  */
 export const removeKnowledge = internalMutation({
-  args: {
-    thingId: v.id("entities"),
-    groupId: v.id("groups"),
-  },
-  handler: async (ctx, args) => {
-    // Find all knowledge associations for this thing
-    const associations = await ctx.db
-      .query("thingKnowledge")
-      .withIndex("by_thing", (q) => q.eq("thingId", args.thingId))
-      .collect();
-
-    const removedAssociations = [];
-
-    // Remove associations
-    for (const assoc of associations) {
-      await ctx.db.delete(assoc._id);
-      removedAssociations.push(assoc._id);
-
-      // Check if this knowledge item has other associations
-      const otherAssocs = await ctx.db
-        .query("thingKnowledge")
-        .withIndex("by_knowledge", (q) => q.eq("knowledgeId", assoc.knowledgeId))
-        .collect();
-
-      // If this was the last association, soft-delete the knowledge item
-      if (otherAssocs.length === 0) {
-        const knowledge = await ctx.db.get(assoc.knowledgeId);
-        if (knowledge && knowledge.groupId === args.groupId) {
-          await ctx.db.patch(assoc.knowledgeId, {
-            deletedAt: Date.now(),
-          });
-        }
-      }
-    }
-
-    return {
-      associationCount: associations.length,
-      removedAssociations,
-    };
+  args: cascadeStepArgs,
+  handler: async (ctx, args): Promise<CascadeStepResult> => {
+    return await runCascadeStep(ctx, "knowledge", {
+      thingId: args.thingId,
+      groupId: args.groupId,
+      cursor: null,
+      numItems: args.limit ?? DEFAULT_STEP_SIZE,
+    });
   },
 });
 
@@ -171,6 +114,7 @@ export const removeKnowledge = internalMutation({
  *
  * After all cascade operations complete, log a cleanup completion event.
  * This helps track cleanup operations in audit trail.
+ * (Cascade jobs log this themselves when their last phase finishes.)
  */
 export const logCleanupCompletion = internalMutation({
   args: {
@@ -182,32 +126,11 @@ export const logCleanupCompletion = internalMutation({
       associationCount: v.number(),
     }),
   },
-  handler: async (ctx, args) => {
-    // Get system actor (entity representing the system itself)
-    const system = await ctx.db
-      .query("entities")
-      .withIndex("by_type", (q: any) => q.eq("type", "creator"))
-      .filter((q: any) =>
-        q.and(
-          q.eq(q.field("groupId"), args.groupId),
-          q.eq(q.field("properties.isSystem"), true)
-        )
-      )
-      .first();
-
-    const now = Date.now();
-
-    // Log cleanup event
-    await ctx.db.insert("events", {
+  handler: async (ctx, args): Promise<{ logged: boolean }> => {
+    await logCascadeCompletion(ctx, {
+      thingId: args.thingId,
       groupId: args.groupId,
-      type: "thing_deleted", // Reuse thing_deleted but mark as cleanup
-      actorId: system?._id,
-      targetId: args.thingId,
-      timestamp: now,
-      metadata: {
-        action: "cascade_cleanup_completed",
-        ...args.cascadeResults,
-      },
+      counts: args.cascadeResults,
     });
 
     return { logged: true };
@@ -251,15 +174,17 @@ export const getCascadeStats = async (ctx: any, groupId: string) => {
 /**
  * PUBLIC MUTATION: Delete a thing (soft delete)
  *
- * Marks the thing as deleted and optionally cascades cleanup.
- * For production, cascade operations should be handled via separate internal mutations
- * scheduled through Convex actions or a separate cleanup service.
+ * Marks the thing as deleted and starts a cascade_delete job that cleans up
+ * connections, events and knowledge links in bounded chunks.
  */
 export const deleteThing = mutation({
   args: {
     thingId: v.id("entities"),
   },
-  handler: async (ctx, args) => {
+  handler: async (
+    ctx,
+    args
+  ): Promise<{ success: boolean; thingDeleted: Id<"entities">; cascadeJobId: Id<"jobs"> }> => {
     // Get the thing to check group and status
     const thing = await ctx.db.get(args.thingId);
     if (!thing) {
@@ -291,7 +216,7 @@ export const deleteThing = mutation({
 
     // Log deletion event
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: thing.groupId,
         type: "thing_deleted",
         actorId: actor._id,
@@ -304,8 +229,17 @@ export const deleteThing = mutation({
       });
     }
 
-    // Return success (cascade cleanup handled separately via internal mutations or actions)
-    return { success: true, thingDeleted: args.thingId };
+    // Start chunked cascade cleanup (connections, events, knowledge)
+    const cascadeJobId = await createJob(ctx, {
+      groupId: thing.groupId,
+      kind: "cascade_delete",
+      targetId: args.thingId,
+      createdBy: actor?._id,
+    });
+    const job = await ctx.db.get(cascadeJobId);
+    await startJob(ctx, job!);
+
+    return { success: true, thingDeleted: args.thingId, cascadeJobId };
   },
 });
 
@@ -320,6 +254,8 @@ export const deleteThing = mutation({
  * │       └─ Soft-delete orphaned knowledge items (never referenced)
  * └─ [5] Log cleanup_completed event for monitoring
  *
+ * [2]-[5] run as a cascade_delete job: one bounded step per scheduled chunk
+ *
  * All operations preserve group isolation by filtering on groupId
  * All timestamps use Date.now() for consistency
  * No hard deletes except connections (which are replaceable)
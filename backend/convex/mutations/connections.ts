@@ -1,6 +1,7 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 import { CONNECTION_TYPES } from "../types/ontology";
+import { insertConnection, insertEvent, deleteConnection } from "../lib/rollups";
 
 /**
  * DIMENSION 4: CONNECTIONS
@@ -71,7 +72,7 @@ export const create = mutation({
       .first() : undefined;
 
     const now = Date.now();
-    const id = await ctx.db.insert("connections", {
+    const id = await insertConnection(ctx, {
       groupId: args.groupId, // CRITICAL: Include groupId
       fromEntityId: args.fromEntityId,
       toEntityId: args.toEntityId,
@@ -86,7 +87,7 @@ export const create = mutation({
 
     // LOG EVENT
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: args.groupId,
         type: "thing_created",
         actorId: actor._id,
@@ -163,7 +164,7 @@ export const upsert = mutation({
 
       // LOG UPDATE EVENT
       if (actor) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId: args.groupId,
           type: "thing_updated",
           actorId: actor._id,
@@ -180,7 +181,7 @@ export const upsert = mutation({
       return existing._id;
     }
 
-    const id = await ctx.db.insert("connections", {
+    const id = await insertConnection(ctx, {
       groupId: args.groupId, // CRITICAL: Include groupId
       fromEntityId: args.fromEntityId,
       toEntityId: args.toEntityId,
@@ -195,7 +196,7 @@ export const upsert = mutation({
 
     // LOG CREATE EVENT
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: args.groupId,
         type: "thing_created",
         actorId: actor._id,
@@ -257,7 +258,7 @@ export const bulkCreate = mutation({
     for (const c of connections) {
       if (c.fromEntityId === c.toEntityId) continue;
 
-      const id = await ctx.db.insert("connections", {
+      const id = await insertConnection(ctx, {
         groupId, // CRITICAL: Include groupId
         fromEntityId: c.fromEntityId,
         toEntityId: c.toEntityId,
@@ -271,7 +272,7 @@ export const bulkCreate = mutation({
 
       // LOG EVENT for each connection
       if (actor) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId,
           type: "thing_created",
           actorId: actor._id,
@@ -318,11 +319,11 @@ export const remove = mutation({
       .first() : undefined;
 
     // Delete the connection
-    await ctx.db.delete(args.connectionId);
+    await deleteConnection(ctx, connection);
 
     // LOG EVENT
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: connection.groupId,
         type: "thing_deleted",
         actorId: actor._id,
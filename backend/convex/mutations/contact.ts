@@ -1,6 +1,7 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 import { THING_TYPES, isThingType, EVENT_TYPES, isEventType } from "../types/ontology";
+import { insertEntity, insertEvent } from "../lib/rollups";
 
 /**
  * Contact form submissions - Ontology-aligned
@@ -31,7 +32,7 @@ export const submit = mutation({
 
     // 2. CREATE CONTACT SUBMISSION ENTITY
     const now = Date.now();
-    const contactId = await ctx.db.insert("entities", {
+    const contactId = await insertEntity(ctx, {
       groupId: args.groupId,
       type: "contact_submission",
       name: args.name,
@@ -49,7 +50,7 @@ export const submit = mutation({
 
     // 3. LOG EVENT (audit trail)
     // Anonymous submission (no actor) - valid for public contact forms
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "contact_submitted", // Valid event type from ontology
       targetId: contactId,
@@ -111,7 +112,7 @@ export const updateStatus = mutation({
 
     // Log event
     // Anonymous update (no actor) - for background/system operations
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: contact.groupId,
       type: "thing_updated", // Valid event type from ontology
       targetId: args.contactId,
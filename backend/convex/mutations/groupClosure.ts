@@ -0,0 +1,42 @@
+import { internalMutation } from "../_generated/server";
+import { internal } from "../_generated/api";
+import { v } from "convex/values";
+import { rebuildGroupClosure } from "../lib/groupClosure";
+
+/**
+ * DIMENSION 1: GROUP CLOSURE BACKFILL
+ *
+ * groupClosure is maintained by lib/groupClosure.ts on every group write.
+ * This job rebuilds it from parentGroupId pointers:
+ * - after first deploy (groups that existed before the closure table)
+ * - after manual repairs that patched parentGroupId directly
+ *
+ * Each call rebuilds one page of groups and reschedules itself with the
+ * cursor. Rebuilding a group only reads its own ancestor chain, so pages
+ * are independent and the job is safe to re-run.
+ */
+
+const GROUP_PAGE_SIZE = 100;
+
+export const rebuildAll = internalMutation({
+  args: {
+    cursor: v.optional(v.union(v.string(), v.null())),
+  },
+  handler: async (ctx, args): Promise<{ rebuilt: number; done: boolean }> => {
+    const page = await ctx.db
+      .query("groups")
+      .paginate({ cursor: args.cursor ?? null, numItems: GROUP_PAGE_SIZE });
+
+    for (const group of page.page) {
+      await rebuildGroupClosure(ctx, group);
+    }
+
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.mutations.groupClosure.rebuildAll, {
+        cursor: page.continueCursor,
+      });
+    }
+
+    return { rebuilt: page.page.length, done: page.isDone };
+  },
+});
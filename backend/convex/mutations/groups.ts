@@ -1,5 +1,8 @@
-import { mutation } from "../_generated/server";
+import { mutation, type MutationCtx } from "../_generated/server";
 import { v } from "convex/values";
+import type { Doc, Id } from "../_generated/dataModel";
+import { insertEvent } from "../lib/rollups";
+import { getAncestorIds, insertGroup, moveGroup, setGroupStatus } from "../lib/groupClosure";
 
 /**
  * DIMENSION 1: GROUPS
@@ -18,6 +21,8 @@ import { v } from "convex/values";
  * Hierarchical Nesting:
  * Groups can contain subgroups via parentGroupId (infinite depth)
  * Example: Government > Department > Team > Squad
+ * create / move / archive / restore keep the groupClosure table in sync
+ * (lib/groupClosure.ts) so hierarchy queries are single index reads
  *
  * Mutation Pattern: authenticate → validate → create/update → log event
  */
@@ -66,12 +71,17 @@ export const create = mutation({
       throw new Error(`Group with slug "${args.slug}" already exists`);
     }
 
+    // Parent must exist (closure rows are copied from it)
+    if (args.parentGroupId && !(await ctx.db.get(args.parentGroupId))) {
+      throw new Error("Parent group not found");
+    }
+
     // Default settings based on group type
     const defaultSettings = getDefaultSettings(args.type);
     const settings = args.settings || defaultSettings;
 
     // Create the group
-    const groupId = await ctx.db.insert("groups", {
+    const groupId = await insertGroup(ctx, {
       slug: args.slug,
       name: args.name,
       type: args.type,
@@ -99,7 +109,7 @@ export const create = mutation({
         .first();
 
       if (user) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId,
           type: "thing_created",
           actorId: user._id,
@@ -181,7 +191,7 @@ export const update = mutation({
         .first();
 
       if (actor) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId: args.groupId,
           type: "thing_updated",
           actorId: actor._id,
@@ -201,6 +211,73 @@ export const update = mutation({
   }
 });
 
+/**
+ * Move a group (with all its subgroups) under a new parent
+ * Omit parentGroupId to make the group a top-level group
+ *
+ * Requires admin rights on the moved group and on the group it moves
+ * under (its current parent when made top-level)
+ */
+export const move = mutation({
+  args: {
+    groupId: v.id("groups"),
+    parentGroupId: v.optional(v.id("groups"))
+  },
+  handler: async (ctx, args) => {
+    // 1. AUTHENTICATE
+    const identity = await ctx.auth.getUserIdentity();
+    if (!identity) {
+      throw new Error("Unauthenticated: Must be logged in to move groups");
+    }
+
+    // 2. VALIDATE GROUPS
+    const group = await ctx.db.get(args.groupId);
+    if (!group) {
+      throw new Error("Group not found");
+    }
+
+    if (args.parentGroupId && !(await ctx.db.get(args.parentGroupId))) {
+      throw new Error("Parent group not found");
+    }
+
+    // 3. AUTHORIZE: admin of the moved group and of its destination
+    const actor = await getGroupAdmin(ctx, identity.tokenIdentifier, args.groupId);
+    const destinationId = args.parentGroupId ?? group.parentGroupId;
+    const destinationAdmin = destinationId
+      ? await getGroupAdmin(ctx, identity.tokenIdentifier, destinationId)
+      : actor;
+    if (!actor || !destinationAdmin) {
+      throw new Error("Permission denied: Moving a group requires admin rights on both groups");
+    }
+
+    if (group.parentGroupId === args.parentGroupId) {
+      return args.groupId;
+    }
+
+    // 4. MOVE (closure rows follow in the same transaction)
+    const previousParentId = group.parentGroupId;
+    await moveGroup(ctx, args.groupId, args.parentGroupId);
+
+    // 5. LOG MOVE EVENT
+    await insertEvent(ctx, {
+      groupId: args.groupId,
+      type: "thing_updated",
+      actorId: actor._id,
+      targetId: undefined,
+      timestamp: Date.now(),
+      metadata: {
+        thingType: "group",
+        action: "moved",
+        previousParentId,
+        parentGroupId: args.parentGroupId,
+        source: "api"
+      }
+    });
+
+    return args.groupId;
+  }
+});
+
 /**
  * Archive a group (soft delete)
  * Does NOT delete data - maintains audit trail
@@ -215,10 +292,7 @@ export const archive = mutation({
       throw new Error("Group not found");
     }
 
-    await ctx.db.patch(args.groupId, {
-      status: "archived",
-      updatedAt: Date.now()
-    });
+    await setGroupStatus(ctx, args.groupId, "archived");
 
     // Log archive event
     const identity = await ctx.auth.getUserIdentity();
@@ -234,7 +308,7 @@ export const archive = mutation({
         .first();
 
       if (actor) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId: args.groupId,
           type: "thing_deleted",
           actorId: actor._id,
@@ -271,10 +345,7 @@ export const restore = mutation({
       throw new Error("Group is not archived");
     }
 
-    await ctx.db.patch(args.groupId, {
-      status: "active",
-      updatedAt: Date.now()
-    });
+    await setGroupStatus(ctx, args.groupId, "active");
 
     // Log restore event
     const identity = await ctx.auth.getUserIdentity();
@@ -290,7 +361,7 @@ export const restore = mutation({
         .first();
 
       if (actor) {
-        await ctx.db.insert("events", {
+        await insertEvent(ctx, {
           groupId: args.groupId,
           type: "thing_updated",
           actorId: actor._id,
@@ -359,3 +430,32 @@ function getDefaultSettings(type: string) {
       };
   }
 }
+
+/**
+ * The caller's admin user entity for groupId, or null
+ *
+ * Admins of a group also administer its subgroups (the same rule as
+ * validateGroupAccess), so the caller's user entity is looked up in
+ * groupId and each of its ancestors: one indexed read per level
+ */
+async function getGroupAdmin(
+  ctx: MutationCtx,
+  tokenIdentifier: string,
+  groupId: Id<"groups">
+): Promise<Doc<"entities"> | null> {
+  // Self first; groups not yet backfilled into groupClosure have no rows
+  const ancestorIds = (await getAncestorIds(ctx, groupId)).reverse();
+  for (const ancestorId of ancestorIds.length > 0 ? ancestorIds : [groupId]) {
+    const user = await ctx.db
+      .query("entities")
+      .withIndex("group_type", (q) => q.eq("groupId", ancestorId).eq("type", "user"))
+      .filter((q) => q.eq(q.field("properties.userId"), tokenIdentifier))
+      .first();
+
+    const role = user?.properties?.role;
+    if (user && (role === "platform_owner" || role === "org_owner")) {
+      return user;
+    }
+  }
+  return null;
+}
@@ -1,4 +1,5 @@
 import { mutation } from "../_generated/server";
+import { insertGroup } from "../lib/groupClosure";
 
 /**
  * Initialize the default platform group
@@ -18,7 +19,7 @@ export const initializeDefaultGroup = mutation({
     }
 
     // Create the default platform group
-    const groupId = await ctx.db.insert("groups", {
+    const groupId = await insertGroup(ctx, {
       slug: "platform",
       name: "ONE Platform",
       type: "organization",
@@ -0,0 +1,182 @@
+import { mutation, internalMutation } from "../_generated/server";
+import { v } from "convex/values";
+import type { Id } from "../_generated/dataModel";
+import {
+  importThingValidator,
+  importConnectionValidator,
+  thingUpdateValidator,
+  thingStatusValidator
+} from "../lib/batch";
+import {
+  createJob,
+  stageItems,
+  startJob,
+  cancelJob,
+  retryJob,
+  runJobChunk,
+  type JobStatus
+} from "../lib/jobs";
+
+/**
+ * PHASE 3: BULK JOBS
+ *
+ * Chunked, resumable imports for batches too large for one transaction
+ * (see lib/jobs.ts for the engine, queries/jobs.ts for progress)
+ *
+ * Flow:
+ * 1. create({ groupId, kind })              → jobId (status "staging")
+ * 2. appendItems({ jobId, things })         → repeat, ≤ MAX_APPEND_ITEMS per call
+ * 3. start({ jobId })                       → "running" (or "queued")
+ * 4. poll queries/jobs:get({ jobId })       → processed / total, errors
+ * 5. retry({ jobId }) if the job is stalled; cancel({ jobId }) to stop
+ *
+ * Cascade deletes use the same engine: mutations/cascade.deleteThing
+ * starts a "cascade_delete" job.
+ */
+
+export const create = mutation({
+  args: {
+    groupId: v.id("groups"),
+    kind: v.union(
+      v.literal("import_things"),
+      v.literal("import_connections"),
+      v.literal("update_things")
+    ),
+    options: v.optional(v.object({
+      skipValidation: v.optional(v.boolean()),
+      defaultStatus: v.optional(thingStatusValidator)
+    })),
+    chunkSize: v.optional(v.number()),
+    throttleMs: v.optional(v.number())
+  },
+  handler: async (ctx, args): Promise<Id<"jobs">> => {
+    // 1. VALIDATE GROUP
+    const group = await ctx.db.get(args.groupId);
+    if (!group) {
+      throw new Error("Group not found");
+    }
+    if (group.status !== "active") {
+      throw new Error("Group is not active");
+    }
+
+    // Get actor for event logging
+    const identity = await ctx.auth.getUserIdentity();
+    const actor = identity
+      ? await ctx.db
+          .query("entities")
+          .withIndex("group_type", (q) =>
+            q.eq("groupId", args.groupId).eq("type", "user")
+          )
+          .filter((q) =>
+            q.eq(q.field("properties.userId"), identity.tokenIdentifier)
+          )
+          .first()
+      : null;
+
+    // 2. CREATE JOB (staging)
+    return await createJob(ctx, {
+      groupId: args.groupId,
+      kind: args.kind,
+      options: args.options,
+      chunkSize: args.chunkSize,
+      throttleMs: args.throttleMs,
+      createdBy: actor?._id
+    });
+  }
+});
+
+/**
+ * Stage items for an import job
+ *
+ * Pass the array matching the job kind: things (import_things),
+ * connections (import_connections) or updates (update_things).
+ * Items are validated here by shape and again per item when applied.
+ */
+export const appendItems = mutation({
+  args: {
+    jobId: v.id("jobs"),
+    things: v.optional(v.array(importThingValidator)),
+    connections: v.optional(v.array(importConnectionValidator)),
+    updates: v.optional(v.array(thingUpdateValidator))
+  },
+  handler: async (ctx, args): Promise<{ total: number }> => {
+    const job = await ctx.db.get(args.jobId);
+    if (!job) {
+      throw new Error("Job not found");
+    }
+
+    const items =
+      job.kind === "import_things"
+        ? args.things
+        : job.kind === "import_connections"
+          ? args.connections
+          : job.kind === "update_things"
+            ? args.updates
+            : undefined;
+    if (!items) {
+      throw new Error(`Items for a ${job.kind} job are missing`);
+    }
+
+    const total = await stageItems(ctx, job, items);
+    return { total };
+  }
+});
+
+export const start = mutation({
+  args: {
+    jobId: v.id("jobs")
+  },
+  handler: async (ctx, args): Promise<{ status: JobStatus }> => {
+    const job = await ctx.db.get(args.jobId);
+    if (!job) {
+      throw new Error("Job not found");
+    }
+
+    return { status: await startJob(ctx, job) };
+  }
+});
+
+export const cancel = mutation({
+  args: {
+    jobId: v.id("jobs")
+  },
+  handler: async (ctx, args): Promise<{ success: boolean }> => {
+    const job = await ctx.db.get(args.jobId);
+    if (!job) {
+      throw new Error("Job not found");
+    }
+
+    await cancelJob(ctx, job);
+    return { success: true };
+  }
+});
+
+/**
+ * Resume a stalled job from its last committed chunk
+ */
+export const retry = mutation({
+  args: {
+    jobId: v.id("jobs")
+  },
+  handler: async (ctx, args): Promise<{ status: JobStatus }> => {
+    const job = await ctx.db.get(args.jobId);
+    if (!job) {
+      throw new Error("Job not found");
+    }
+
+    return { status: await retryJob(ctx, job) };
+  }
+});
+
+/**
+ * INTERNAL: one chunk of a job (scheduled by lib/jobs.ts only)
+ */
+export const runChunk = internalMutation({
+  args: {
+    jobId: v.id("jobs"),
+    generation: v.number()
+  },
+  handler: async (ctx, args): Promise<{ done: boolean }> => {
+    return await runJobChunk(ctx, args.jobId, args.generation);
+  }
+});
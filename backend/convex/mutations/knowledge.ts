@@ -1,5 +1,15 @@
-import { mutation } from "../_generated/server";
+import { mutation, internalMutation } from "../_generated/server";
+import { internal } from "../_generated/api";
 import { v } from "convex/values";
+import type { Id } from "../_generated/dataModel";
+import { EMBEDDING_BATCH_SIZE, embeddingTextHash } from "../lib/embeddings";
+import {
+  insertKnowledge,
+  insertEvent,
+  knowledgeSearchText,
+  patchKnowledge,
+  deleteKnowledge as deleteKnowledgeItem,
+} from "../lib/rollups";
 
 /**
  * DIMENSION 6: KNOWLEDGE + JUNCTION
@@ -43,7 +53,7 @@ export const create = mutation({
     }
 
     // Create knowledge item
-    const knowledgeId = await ctx.db.insert("knowledge", {
+    const knowledgeId = await insertKnowledge(ctx, {
       groupId: args.groupId,
       knowledgeType: args.type,
       text: args.text,
@@ -55,7 +65,7 @@ export const create = mutation({
     });
 
     // Log event
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: undefined, // System-created
@@ -69,6 +79,13 @@ export const create = mutation({
       },
     });
 
+    // Embed in the background when the caller did not supply a vector
+    if (!args.embedding && args.type !== "label") {
+      await ctx.scheduler.runAfter(0, internal.actions.knowledge.embedKnowledge, {
+        knowledgeIds: [knowledgeId],
+      });
+    }
+
     return knowledgeId;
   },
 });
@@ -91,7 +108,7 @@ export const update = mutation({
     }
 
     // Update knowledge item
-    await ctx.db.patch(args.id, {
+    await patchKnowledge(ctx, existing, {
       ...(args.text && { text: args.text }),
       ...(args.labels && { labels: args.labels }),
       ...(args.embedding && { embedding: args.embedding }),
@@ -100,7 +117,7 @@ export const update = mutation({
     });
 
     // Log event
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: existing.groupId,
       type: "thing_updated",
       actorId: undefined,
@@ -112,6 +129,13 @@ export const update = mutation({
       },
     });
 
+    // Text changed without a new vector: the stored embedding is stale
+    if (args.text && !args.embedding && existing.knowledgeType !== "label") {
+      await ctx.scheduler.runAfter(0, internal.actions.knowledge.embedKnowledge, {
+        knowledgeIds: [args.id],
+      });
+    }
+
     return args.id;
   },
 });
@@ -130,7 +154,7 @@ export const deleteKnowledge = mutation({
     }
 
     // Log event before deletion
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: existing.groupId,
       type: "thing_deleted",
       actorId: undefined,
@@ -144,7 +168,7 @@ export const deleteKnowledge = mutation({
     });
 
     // Delete knowledge item
-    await ctx.db.delete(args.id);
+    await deleteKnowledgeItem(ctx, existing);
 
     return { success: true };
   },
@@ -174,10 +198,11 @@ export const bulkCreate = mutation({
     }
 
     const ids = [];
+    const needsEmbedding: Id<"knowledge">[] = [];
 
     // Insert all items
     for (const item of args.items) {
-      const id = await ctx.db.insert("knowledge", {
+      const id = await insertKnowledge(ctx, {
         groupId: args.groupId,
         knowledgeType: item.type,
         text: item.text,
@@ -188,10 +213,20 @@ export const bulkCreate = mutation({
         updatedAt: Date.now(),
       });
       ids.push(id);
+      if (!item.embedding && item.type !== "label") {
+        needsEmbedding.push(id);
+      }
+    }
+
+    // Embed missing vectors in background batches
+    for (let i = 0; i < needsEmbedding.length; i += EMBEDDING_BATCH_SIZE) {
+      await ctx.scheduler.runAfter(0, internal.actions.knowledge.embedKnowledge, {
+        knowledgeIds: needsEmbedding.slice(i, i + EMBEDDING_BATCH_SIZE),
+      });
     }
 
     // Log bulk creation event
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: undefined,
@@ -209,6 +244,76 @@ export const bulkCreate = mutation({
   },
 });
 
+/**
+ * INTERNAL: Store embeddings produced by actions/knowledge.embedKnowledge
+ * Skips items deleted while the embedding was in flight, and items whose
+ * text no longer matches textHash (edited since; the edit scheduled a new
+ * embedding)
+ */
+export const setEmbeddings = internalMutation({
+  args: {
+    items: v.array(
+      v.object({
+        id: v.id("knowledge"),
+        embedding: v.array(v.float64()),
+        textHash: v.string(), // embeddingTextHash of the text that was embedded
+      })
+    ),
+    embeddingModel: v.string(),
+  },
+  handler: async (ctx, args) => {
+    let updated = 0;
+    for (const item of args.items) {
+      const existing = await ctx.db.get(item.id);
+      if (!existing || existing.deletedAt !== undefined) continue;
+      if (!existing.text || embeddingTextHash(existing.text) !== item.textHash) continue;
+
+      await patchKnowledge(ctx, existing, {
+        embedding: item.embedding,
+        embeddingModel: args.embeddingModel,
+        embeddingDim: item.embedding.length,
+        updatedAt: Date.now(),
+      });
+      updated++;
+    }
+    return { updated };
+  },
+});
+
+/**
+ * INTERNAL: Fill searchText on items written before it existed, one page
+ * at a time (reschedules itself with the cursor)
+ *
+ * Run once after deploying the search_text index on searchText
+ */
+export const backfillSearchText = internalMutation({
+  args: {
+    cursor: v.optional(v.union(v.string(), v.null())),
+  },
+  handler: async (ctx, args): Promise<{ updated: number; done: boolean }> => {
+    const page = await ctx.db
+      .query("knowledge")
+      .paginate({ cursor: args.cursor ?? null, numItems: 500 });
+
+    let updated = 0;
+    for (const knowledge of page.page) {
+      const searchText = knowledgeSearchText(knowledge);
+      if (knowledge.searchText !== searchText) {
+        await ctx.db.patch(knowledge._id, { searchText });
+        updated++;
+      }
+    }
+
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.mutations.knowledge.backfillSearchText, {
+        cursor: page.continueCursor,
+      });
+    }
+
+    return { updated, done: page.isDone };
+  },
+});
+
 /**
  * Link knowledge to a thing (junction table pattern)
  */
@@ -249,7 +354,7 @@ export const linkToThing = mutation({
     });
 
     // Log event
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: args.thingId as any,
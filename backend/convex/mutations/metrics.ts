@@ -0,0 +1,76 @@
+import { internalMutation } from "../_generated/server";
+import { internal } from "../_generated/api";
+import { v } from "convex/values";
+import { METRICS_RETENTION_MS } from "../lib/instrumentation";
+
+/**
+ * PHASE 3: FUNCTION METRICS
+ *
+ * record: write samples from actions (instrumentedAction) and benchmark
+ * runs (internalActions/bench.ts). Instrumented mutations insert their own
+ * samples in their transaction; instrumented queries only log.
+ *
+ * prune: daily cron (crons.ts). Deletes samples older than
+ * METRICS_RETENTION_MS, one page at a time.
+ */
+
+const MAX_SAMPLES_PER_CALL = 500;
+const PRUNE_PAGE_SIZE = 500;
+
+const sampleValidator = v.object({
+  functionName: v.string(),
+  kind: v.union(v.literal("query"), v.literal("mutation"), v.literal("action")),
+  durationMs: v.optional(v.number()),
+  docsRead: v.optional(v.number()),
+  docsWritten: v.optional(v.number()),
+  resultBytes: v.number(),
+  ok: v.boolean(),
+  error: v.optional(v.string()),
+  label: v.optional(v.string()),
+  timestamp: v.number(),
+});
+
+/**
+ * Insert a batch of samples
+ */
+export const record = internalMutation({
+  args: {
+    samples: v.array(sampleValidator),
+  },
+  handler: async (ctx, args): Promise<{ recorded: number }> => {
+    if (args.samples.length > MAX_SAMPLES_PER_CALL) {
+      throw new Error(`At most ${MAX_SAMPLES_PER_CALL} samples per call`);
+    }
+
+    for (const sample of args.samples) {
+      await ctx.db.insert("functionMetrics", sample);
+    }
+
+    return { recorded: args.samples.length };
+  },
+});
+
+/**
+ * Delete expired samples; reschedules itself while a full page was deleted
+ */
+export const prune = internalMutation({
+  args: {},
+  handler: async (ctx): Promise<{ deleted: number; done: boolean }> => {
+    const cutoff = Date.now() - METRICS_RETENTION_MS;
+    const expired = await ctx.db
+      .query("functionMetrics")
+      .withIndex("by_timestamp", (q) => q.lt("timestamp", cutoff))
+      .take(PRUNE_PAGE_SIZE);
+
+    for (const sample of expired) {
+      await ctx.db.delete(sample._id);
+    }
+
+    const done = expired.length < PRUNE_PAGE_SIZE;
+    if (!done) {
+      await ctx.scheduler.runAfter(0, internal.mutations.metrics.prune, {});
+    }
+
+    return { deleted: expired.length, done };
+  },
+});
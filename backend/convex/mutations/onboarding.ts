@@ -6,6 +6,8 @@
 
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
+import { insertEvent } from "../lib/rollups";
+import { insertGroup } from "../lib/groupClosure";
 
 /**
  * Analyze website and map to universal ontology
@@ -118,7 +120,7 @@ export const createOnboardingGroup = mutation({
     }
 
     // Create group
-    const groupId = await ctx.db.insert("groups", {
+    const groupId = await insertGroup(ctx, {
       slug: args.slug,
       name: args.name,
       type: "organization",
@@ -158,7 +160,7 @@ export const logOnboardingEvent = mutation({
     metadata: v.optional(v.any()),
   },
   handler: async (ctx, args) => {
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: args.eventType,
       actorId: args.actorId,
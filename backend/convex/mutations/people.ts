@@ -1,6 +1,7 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 import { EVENT_TYPES } from "../types/ontology";
+import { insertEntity, insertConnection, insertEvent, patchEntity, deleteConnection } from "../lib/rollups";
 
 /**
  * DIMENSION 2: PEOPLE
@@ -63,7 +64,7 @@ export const create = mutation({
     }
 
     // Create person entity
-    const personId = await ctx.db.insert("entities", {
+    const personId = await insertEntity(ctx, {
       groupId: args.groupId,
       type: "user",
       name: args.name,
@@ -94,7 +95,7 @@ export const create = mutation({
     // });
 
     // Log event (using valid event type from ontology)
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "thing_created",
       actorId: personId,
@@ -135,7 +136,7 @@ export const updateRole = mutation({
     const personSchemaVersion = person.schemaVersion || 1;
 
     // Update person properties
-    await ctx.db.patch(args.personId, {
+    await patchEntity(ctx, person, {
       properties: {
         ...person.properties,
         role: args.newRole,
@@ -162,7 +163,7 @@ export const updateRole = mutation({
     }
 
     // Log event (using valid event type from ontology)
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: person.groupId,
       type: "thing_updated",
       actorId: args.actorId || args.personId,
@@ -197,7 +198,7 @@ export const updateProfile = mutation({
 
     // Update person
     const personSchemaVersion = person.schemaVersion || 1;
-    await ctx.db.patch(args.personId, {
+    await patchEntity(ctx, person, {
       ...(args.name && { name: args.name }),
       ...(args.properties && {
         properties: {
@@ -210,7 +211,7 @@ export const updateProfile = mutation({
     });
 
     // Log event (using valid event type from ontology)
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: person.groupId,
       type: "thing_updated",
       actorId: args.personId,
@@ -255,11 +256,11 @@ export const removeFromGroup = mutation({
       .first();
 
     if (memberConnection) {
-      await ctx.db.delete(memberConnection._id);
+      await deleteConnection(ctx, memberConnection);
     }
 
     // Log event (using valid event type from ontology)
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: person.groupId,
       type: "thing_deleted",
       actorId: args.actorId || args.personId,
@@ -322,7 +323,7 @@ export const addToGroups = mutation({
       }
 
       // Create member_of connection
-      const connectionId = await ctx.db.insert("connections", {
+      const connectionId = await insertConnection(ctx, {
         groupId,
         fromEntityId: args.personId,
         toEntityId: groupId as any, // Cast group ID as entity for now
@@ -338,7 +339,7 @@ export const addToGroups = mutation({
       connectionIds.push(connectionId);
 
       // Log event (using valid event type from ontology)
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId,
         type: "thing_created",
         actorId: args.personId,
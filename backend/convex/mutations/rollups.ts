@@ -0,0 +1,317 @@
+import { internalMutation } from "../_generated/server";
+import { internal } from "../_generated/api";
+import { v } from "convex/values";
+import type { Id } from "../_generated/dataModel";
+import {
+  DAY_MS,
+  EMPTY_GROUP_COUNTERS,
+  ENTITY_ROW_SOURCES,
+  EMPTY_ENTITY_RECOUNT,
+  correctDailyCounters,
+  correctEntityRollup,
+  correctGroupCounters,
+  dayBucket,
+  estimateEmbeddingBytes,
+  estimateEntityBytes,
+  entityRecountOf,
+  getDailyCounters,
+  getEntityRollup,
+  getGroupCounters,
+  pageEntityRows,
+  rebuildEntityRollup,
+  tallyEntityRows,
+} from "../lib/rollups";
+
+/**
+ * PHASE 3: ROLLUP BACKFILL / RECONCILE
+ *
+ * Rollups are maintained incrementally by lib/rollups.ts. These internal
+ * mutations recount them from the source tables:
+ * - after first deploy (groups that existed before rollups)
+ * - after bulk repairs that bypass the write helpers
+ * - periodically, to correct any drift
+ *
+ * Each call processes one bounded page and reschedules itself with the
+ * cursor, so a 100K-entity group never exceeds transaction limits.
+ *
+ * The first call records a _creationTime cutoff together with the stored
+ * counters at that moment; only rows created at or before the cutoff are
+ * recounted, and the final call adds (recount - stored) as a correction
+ * delta. Writes made while the job runs keep their own increments.
+ *
+ * Phases (per group):
+ * entities → connections → knowledge → events → write corrections
+ */
+
+const ENTITY_PAGE_SIZE = 50; // Each entity also rebuilds its own rollup
+const ENTITY_ROW_CAP = 50; // Rows per source read inline; bigger entities rebuild in steps
+const ROW_PAGE_SIZE = 1000;
+const EVENT_BACKFILL_DAYS = 31; // Daily buckets older than this are not rebuilt
+
+const countersValidator = v.object({
+  entityCount: v.number(),
+  userCount: v.number(),
+  connectionCount: v.number(),
+  knowledgeCount: v.number(),
+  entityBytes: v.number(),
+  embeddingBytes: v.number(),
+  eventCount: v.number(),
+});
+
+const phaseValidator = v.union(
+  v.literal("entities"),
+  v.literal("connections"),
+  v.literal("knowledge"),
+  v.literal("events")
+);
+
+/**
+ * Recount one page of a group and reschedule for the next page
+ *
+ * Start with: { groupId } (all other args default to the first page)
+ */
+export const reconcileGroup = internalMutation({
+  args: {
+    groupId: v.id("groups"),
+    phase: v.optional(phaseValidator),
+    cursor: v.optional(v.union(v.string(), v.null())),
+    counters: v.optional(countersValidator),
+    days: v.optional(v.any()), // Record<day, { eventCount, paymentCount, revenue }>
+    cutoff: v.optional(v.number()), // Last _creationTime counted (set by the first call)
+    stored: v.optional(
+      v.object({
+        counters: countersValidator,
+        days: v.any(), // Record<day, { eventCount, paymentCount, revenue }>
+      })
+    ), // Counters as stored at the cutoff
+  },
+  handler: async (ctx, args): Promise<{ groupId: Id<"groups">; phase: string; done: boolean }> => {
+    const group = await ctx.db.get(args.groupId);
+    if (!group) {
+      throw new Error("Group not found");
+    }
+
+    const phase = args.phase ?? "entities";
+    const cursor = args.cursor ?? null;
+    const counters = { ...EMPTY_GROUP_COUNTERS, ...args.counters };
+    const days: Record<string, { eventCount: number; paymentCount: number; revenue: number }> =
+      { ...(args.days ?? {}) };
+
+    // 0. FIRST CALL: RECORD THE CUTOFF AND THE COUNTERS STORED AT IT
+    const cutoff = args.cutoff ?? Date.now();
+    const firstDay = dayBucket(cutoff) - (EVENT_BACKFILL_DAYS - 1) * DAY_MS;
+    let stored = args.stored;
+    if (!stored) {
+      const storedDays: typeof days = {};
+      for (let day = firstDay; day <= cutoff; day += DAY_MS) {
+        storedDays[String(day)] = await getDailyCounters(ctx, args.groupId, day);
+      }
+      stored = { counters: await getGroupCounters(ctx, args.groupId), days: storedDays };
+    }
+
+    let isDone = false;
+    let continueCursor = cursor;
+
+    // 1. COUNT ONE PAGE OF THE CURRENT PHASE
+    if (phase === "entities") {
+      const page = await ctx.db
+        .query("entities")
+        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+        .paginate({ cursor, numItems: ENTITY_PAGE_SIZE });
+
+      for (const entity of page.page) {
+        if (entity._creationTime > cutoff) continue;
+        counters.entityCount += 1;
+        counters.userCount += entity.type === "user" ? 1 : 0;
+        counters.entityBytes += estimateEntityBytes(entity.properties);
+        const rebuilt = await rebuildEntityRollup(ctx, entity, ENTITY_ROW_CAP);
+        if (!rebuilt) {
+          await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileEntity, {
+            entityId: entity._id,
+          });
+        }
+      }
+      isDone = page.isDone;
+      continueCursor = page.continueCursor;
+    } else if (phase === "connections") {
+      const page = await ctx.db
+        .query("connections")
+        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+        .paginate({ cursor, numItems: ROW_PAGE_SIZE });
+
+      counters.connectionCount += page.page.filter((c) => c._creationTime <= cutoff).length;
+      isDone = page.isDone;
+      continueCursor = page.continueCursor;
+    } else if (phase === "knowledge") {
+      const page = await ctx.db
+        .query("knowledge")
+        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+        .paginate({ cursor, numItems: ROW_PAGE_SIZE });
+
+      for (const k of page.page) {
+        if (k._creationTime > cutoff) continue;
+        counters.knowledgeCount += 1;
+        counters.embeddingBytes += estimateEmbeddingBytes(k.embedding);
+      }
+      isDone = page.isDone;
+      continueCursor = page.continueCursor;
+    } else {
+      // All events count toward the group total; only recent ones rebuild
+      // daily buckets
+      const page = await ctx.db
+        .query("events")
+        .withIndex("group_timestamp", (q) => q.eq("groupId", args.groupId))
+        .paginate({ cursor, numItems: ROW_PAGE_SIZE });
+
+      for (const e of page.page) {
+        if (e._creationTime > cutoff) continue;
+        counters.eventCount += 1;
+        if (e.timestamp < firstDay) continue;
+
+        const key = String(dayBucket(e.timestamp));
+        const day = days[key] ?? { eventCount: 0, paymentCount: 0, revenue: 0 };
+        day.eventCount += 1;
+        if (e.type === "payment_processed") {
+          day.paymentCount += 1;
+          day.revenue += e.metadata?.amount || 0;
+        }
+        days[key] = day;
+      }
+      isDone = page.isDone;
+      continueCursor = page.continueCursor;
+    }
+
+    // 2. MORE PAGES IN THIS PHASE: RESCHEDULE WITH CURSOR
+    const phases = ["entities", "connections", "knowledge", "events"] as const;
+    if (!isDone) {
+      await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileGroup, {
+        groupId: args.groupId,
+        phase,
+        cursor: continueCursor,
+        counters,
+        days,
+        cutoff,
+        stored,
+      });
+      return { groupId: args.groupId, phase, done: false };
+    }
+
+    // 3. PHASE COMPLETE: MOVE TO NEXT PHASE
+    const nextPhase = phases[phases.indexOf(phase) + 1];
+    if (nextPhase) {
+      await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileGroup, {
+        groupId: args.groupId,
+        phase: nextPhase,
+        cursor: null,
+        counters,
+        days,
+        cutoff,
+        stored,
+      });
+      return { groupId: args.groupId, phase, done: false };
+    }
+
+    // 4. ALL PHASES COMPLETE: WRITE CORRECTIONS (recount - stored at cutoff)
+    await correctGroupCounters(ctx, args.groupId, counters, stored.counters);
+
+    const empty = { eventCount: 0, paymentCount: 0, revenue: 0 };
+    for (let day = firstDay; day <= cutoff; day += DAY_MS) {
+      await correctDailyCounters(
+        ctx,
+        args.groupId,
+        day,
+        days[String(day)] ?? empty,
+        stored.days[String(day)] ?? empty
+      );
+    }
+
+    return { groupId: args.groupId, phase, done: true };
+  },
+});
+
+/**
+ * Recount one entity's rollup a page at a time and reschedule
+ *
+ * Used by reconcileGroup for entities with too many connections or events
+ * to recount in one transaction. Like reconcileGroup, the first call
+ * records a _creationTime cutoff and the stored rollup, and the last call
+ * writes the difference as a correction.
+ *
+ * Start with: { entityId }
+ */
+export const reconcileEntity = internalMutation({
+  args: {
+    entityId: v.id("entities"),
+    source: v.optional(v.union(v.literal("inbound"), v.literal("outbound"), v.literal("events"))),
+    cursor: v.optional(v.union(v.string(), v.null())),
+    cutoff: v.optional(v.number()),
+    counts: v.optional(v.any()), // EntityRecount so far
+    stored: v.optional(v.any()), // EntityRecount as stored at the cutoff
+  },
+  handler: async (ctx, args): Promise<{ entityId: Id<"entities">; done: boolean }> => {
+    const entity = await ctx.db.get(args.entityId);
+    if (!entity) {
+      // Deleted while the job ran: nothing left to reconcile
+      return { entityId: args.entityId, done: true };
+    }
+
+    const source = args.source ?? "inbound";
+    const cutoff = args.cutoff ?? Date.now();
+    const stored = args.stored ?? entityRecountOf(await getEntityRollup(ctx, args.entityId));
+
+    // 1. COUNT ONE PAGE OF THE CURRENT SOURCE
+    const page = await pageEntityRows(ctx, args.entityId, source, {
+      cursor: args.cursor ?? null,
+      numItems: ROW_PAGE_SIZE,
+    });
+    const counts = tallyEntityRows(args.counts ?? EMPTY_ENTITY_RECOUNT, source, page.page, cutoff);
+
+    // 2. MORE ROWS: RESCHEDULE WITH CURSOR (or move to the next source)
+    const nextSource = ENTITY_ROW_SOURCES[ENTITY_ROW_SOURCES.indexOf(source) + 1];
+    if (!page.isDone || nextSource) {
+      await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileEntity, {
+        entityId: args.entityId,
+        source: page.isDone ? nextSource : source,
+        cursor: page.isDone ? null : page.continueCursor,
+        cutoff,
+        counts,
+        stored,
+      });
+      return { entityId: args.entityId, done: false };
+    }
+
+    // 3. ALL SOURCES COUNTED: WRITE THE CORRECTION
+    await correctEntityRollup(ctx, entity, counts, stored);
+    return { entityId: args.entityId, done: true };
+  },
+});
+
+/**
+ * Schedule reconcileGroup for every group, one page of groups at a time
+ *
+ * Run once after deploying rollups, then periodically to correct drift
+ */
+export const reconcileAllGroups = internalMutation({
+  args: {
+    cursor: v.optional(v.union(v.string(), v.null())),
+  },
+  handler: async (ctx, args): Promise<{ scheduled: number; done: boolean }> => {
+    const page = await ctx.db
+      .query("groups")
+      .paginate({ cursor: args.cursor ?? null, numItems: 100 });
+
+    for (const group of page.page) {
+      await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileGroup, {
+        groupId: group._id,
+      });
+    }
+
+    if (!page.isDone) {
+      await ctx.scheduler.runAfter(0, internal.mutations.rollups.reconcileAllGroups, {
+        cursor: page.continueCursor,
+      });
+    }
+
+    return { scheduled: page.page.length, done: page.isDone };
+  },
+});
@@ -1,6 +1,8 @@
 import { mutation } from "../_generated/server";
 import { v } from "convex/values";
 import { THING_TYPES, isThingType, EVENT_TYPES, isEventType } from "../types/ontology";
+import { insertEntity, insertEvent, patchEntity } from "../lib/rollups";
+import { instrumentedMutation } from "../lib/instrumentation";
 
 /**
  * DIMENSION 3: THINGS
@@ -18,7 +20,7 @@ import { THING_TYPES, isThingType, EVENT_TYPES, isEventType } from "../types/ont
  * 5. CREATE thing in database
  * 6. LOG EVENT (audit trail)
  */
-export const create = mutation({
+export const create = instrumentedMutation("mutations/things:create", {
   args: {
     groupId: v.id("groups"),
     type: v.string(), // Validated against THING_TYPES at runtime
@@ -68,7 +70,7 @@ export const create = mutation({
 
     // 5. CREATE ENTITY
     const now = Date.now();
-    const entityId = await ctx.db.insert("entities", {
+    const entityId = await insertEntity(ctx, {
       groupId: args.groupId,
       type: args.type as any, // Type validated above
       name: args.name,
@@ -81,7 +83,7 @@ export const create = mutation({
 
     // 6. LOG EVENT (CRITICAL - audit trail)
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: args.groupId,
         type: "thing_created",
         actorId: actor._id,
@@ -171,12 +173,12 @@ export const update = mutation({
     }
 
     // 6. UPDATE ENTITY
-    await ctx.db.patch(args.entityId, updates);
+    await patchEntity(ctx, entity, updates);
 
     // 7. LOG EVENT
     const now = Date.now();
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: entity.groupId,
         type: "thing_updated",
         actorId: actor._id,
@@ -244,7 +246,7 @@ export const archive = mutation({
 
     // 6. LOG EVENT
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: entity.groupId,
         type: "thing_deleted",
         actorId: actor._id,
@@ -315,7 +317,7 @@ export const restore = mutation({
 
     // 6. LOG EVENT
     if (actor) {
-      await ctx.db.insert("events", {
+      await insertEvent(ctx, {
         groupId: entity.groupId,
         type: "thing_updated", // Restoration is an update, not a new creation
         actorId: actor._id,
@@ -357,7 +359,7 @@ export const submitContact = mutation({
 
     // 2. CREATE CONTACT SUBMISSION THING
     const now = Date.now();
-    const contactEntityId = await ctx.db.insert("entities", {
+    const contactEntityId = await insertEntity(ctx, {
       groupId: args.groupId,
       type: "contact_submission",
       name: `Contact from ${args.name}`,
@@ -375,7 +377,7 @@ export const submitContact = mutation({
     });
 
     // 3. LOG EVENT (Contact form submission is anonymous, so no actorId)
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.groupId,
       type: "contact_submitted",
       actorId: undefined, // Anonymous submission
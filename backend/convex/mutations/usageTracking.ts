@@ -1,13 +1,35 @@
 import { mutation, internalMutation } from "../_generated/server";
 import { v } from "convex/values";
+import {
+  compactUsageShards,
+  getPeriodForMetric,
+  getQuotaLimitForMetric,
+  getUsageForPeriod,
+  hourBucket,
+  incrementUsage,
+  type UsagePeriod
+} from "../lib/usage";
 
 /**
  * PHASE 3: USAGE TRACKING HELPERS
  *
  * Internal mutations to record usage for quota tracking
  * Called after operations that consume resources
+ *
+ * Writes are sharded (lib/usage.ts): each call touches one of
+ * USAGE_SHARDS rows for the current hour, so concurrent requests from one
+ * group do not conflict. compactShards (hourly cron via
+ * internalActions/usage.compactUsage) folds closed hours into
+ * hourly/daily/monthly usage buckets.
  */
 
+const periodValidator = v.union(
+  v.literal("hourly"),
+  v.literal("daily"),
+  v.literal("monthly"),
+  v.literal("annual")
+);
+
 /**
  * Record a usage metric for quota tracking
  *
@@ -22,55 +44,22 @@ export const recordUsage = internalMutation({
     groupId: v.id("groups"),
     metric: v.string(), // "users", "storage_gb", "api_calls_per_month", "entities_total", "connections_total"
     amount: v.number(), // Amount to add (usually 1 for counts, bytes for storage)
-    period: v.optional(v.string()), // "daily", "monthly", "annual" - defaults to metric type
+    period: v.optional(v.string()), // Deprecated: every write feeds hourly/daily/monthly buckets
+    shards: v.optional(v.number()), // Override USAGE_SHARDS (load tests compare 1 vs N)
   },
   handler: async (ctx, args) => {
-    // 1. FIND OR CREATE USAGE RECORD FOR THIS PERIOD
-    const periodType = args.period || getPeriodForMetric(args.metric);
-    const periodBounds = getPeriodBounds(periodType);
-
-    const existing = await ctx.db
-      .query("usage")
-      .withIndex("by_group_metric_time", (q) =>
-        q
-          .eq("groupId", args.groupId)
-          .eq("metric", args.metric)
-          .eq("timestamp", Math.floor(Date.now() / 1000) * 1000) // Today's bucket
-      )
-      .first();
-
-    if (existing) {
-      // 2. INCREMENT EXISTING RECORD
-      await ctx.db.patch(existing._id, {
-        value: existing.value + args.amount,
-        timestamp: Date.now()
-      });
-
-      return {
-        action: "updated",
-        metric: args.metric,
-        newValue: existing.value + args.amount
-      };
-    } else {
-      // 3. CREATE NEW RECORD
-      const usageId = await ctx.db.insert("usage", {
-        groupId: args.groupId,
-        metric: args.metric,
-        period: periodType,
-        value: args.amount,
-        limit: getQuotaLimitForMetric(args.metric), // Would fetch from group plan
-        timestamp: Date.now(),
-        periodStart: periodBounds.start,
-        periodEnd: periodBounds.end
-      });
+    // One shard row read + written: no group-wide hot document
+    const { hour, shard } = await incrementUsage(ctx, args.groupId, args.metric, args.amount, {
+      shards: args.shards
+    });
 
-      return {
-        action: "created",
-        metric: args.metric,
-        value: args.amount,
-        usageId
-      };
-    }
+    return {
+      action: "recorded",
+      metric: args.metric,
+      amount: args.amount,
+      hour,
+      shard
+    };
   }
 });
 
@@ -84,19 +73,16 @@ export const enforceQuota = mutation({
   args: {
     groupId: v.id("groups"),
     metric: v.string(),
-    requestedAmount: v.number()
+    requestedAmount: v.number(),
+    period: v.optional(periodValidator)
   },
   handler: async (ctx, args) => {
-    // Get current usage
-    const usage = await ctx.db
-      .query("usage")
-      .withIndex("by_group_metric", (q) =>
-        q.eq("groupId", args.groupId).eq("metric", args.metric)
-      )
-      .first();
+    // Get current usage for the metric's quota period
+    const period: UsagePeriod = args.period || getPeriodForMetric(args.metric);
+    const usage = await getUsageForPeriod(ctx, args.groupId, args.metric, period);
 
-    const currentValue = usage?.value || 0;
-    const limit = usage?.limit || getQuotaLimitForMetric(args.metric);
+    const currentValue = usage.value;
+    const limit = getQuotaLimitForMetric(args.metric);
 
     // Check if would exceed
     if (currentValue + args.requestedAmount > limit) {
@@ -117,125 +103,17 @@ export const enforceQuota = mutation({
 });
 
 /**
- * Reset monthly/daily counters
+ * Fold closed-hour shards into usage buckets (one bounded batch)
  *
- * Called daily for daily metrics, monthly for monthly metrics
+ * Buckets are keyed by period start, so periods never need resetting:
+ * a new hour/day/month simply starts a new bucket row.
  */
-export const resetPeriodCounter = internalMutation({
+export const compactShards = internalMutation({
   args: {
-    groupId: v.id("groups"),
-    metric: v.string(),
-    period: v.string()
+    before: v.optional(v.number()), // Compact hours strictly before this (default: current hour)
   },
-  handler: async (ctx, args) => {
-    // Find all records for this metric/period that are expired
-    const periodBounds = getPeriodBounds(args.period);
-
-    // Fetch all records for this metric and filter in JavaScript
-    const allRecords = await ctx.db
-      .query("usage")
-      .withIndex("by_group_metric", (q) =>
-        q.eq("groupId", args.groupId).eq("metric", args.metric)
-      )
-      .collect();
-
-    // Filter for expired records (where periodEnd < now)
-    const expired = allRecords.filter(u =>
-      u.periodEnd !== undefined && u.periodEnd < Date.now()
-    );
-
-    // Delete expired records and create new one for new period
-    let resetCount = 0;
-    for (const record of expired) {
-      // Archive old record (optional)
-      await ctx.db.delete(record._id);
-      resetCount++;
-    }
-
-    // Create new record for this period
-    if (resetCount > 0) {
-      await ctx.db.insert("usage", {
-        groupId: args.groupId,
-        metric: args.metric,
-        period: args.period,
-        value: 0,
-        limit: getQuotaLimitForMetric(args.metric),
-        timestamp: Date.now(),
-        periodStart: periodBounds.start,
-        periodEnd: periodBounds.end
-      });
-    }
-
-    return {
-      metric: args.metric,
-      period: args.period,
-      recordsReset: resetCount
-    };
+  handler: async (ctx, args): Promise<{ compacted: number; done: boolean }> => {
+    const before = Math.min(args.before ?? Date.now(), hourBucket(Date.now()));
+    return await compactUsageShards(ctx, before);
   }
 });
-
-// ============================================================================
-// HELPER FUNCTIONS
-// ============================================================================
-
-/**
- * Determine period type for a metric
- */
-function getPeriodForMetric(metric: string): string {
-  if (metric === "api_calls_per_month" || metric === "revenue_per_month") {
-    return "monthly";
-  }
-  if (metric === "entities_total" || metric === "connections_total" || metric === "users") {
-    return "annual"; // These are cumulative
-  }
-  return "daily"; // Default to daily for most metrics
-}
-
-/**
- * Get period start/end timestamps
- */
-function getPeriodBounds(period: string): { start: number; end: number } {
-  const now = new Date();
-
-  if (period === "daily") {
-    const start = new Date(now);
-    start.setHours(0, 0, 0, 0);
-    const end = new Date(start);
-    end.setDate(end.getDate() + 1);
-    return { start: start.getTime(), end: end.getTime() };
-  }
-
-  if (period === "monthly") {
-    const start = new Date(now);
-    start.setDate(1);
-    start.setHours(0, 0, 0, 0);
-    const end = new Date(start);
-    end.setMonth(end.getMonth() + 1);
-    return { start: start.getTime(), end: end.getTime() };
-  }
-
-  // annual or other
-  const start = new Date(now);
-  start.setMonth(0);
-  start.setDate(1);
-  start.setHours(0, 0, 0, 0);
-  const end = new Date(start);
-  end.setFullYear(end.getFullYear() + 1);
-  return { start: start.getTime(), end: end.getTime() };
-}
-
-/**
- * Get quota limit for a metric
- * In production, this would fetch from group's plan settings
- */
-function getQuotaLimitForMetric(metric: string): number {
-  const limits: Record<string, number> = {
-    users: 50,
-    storage_gb: 100,
-    api_calls_per_month: 100000,
-    entities_total: 10000,
-    connections_total: 50000,
-  };
-
-  return limits[metric] || 1000;
-}
@@ -15,6 +15,8 @@ import {
   generateInvitationToken,
   onboardingService,
 } from "../services/onboardingService";
+import { insertEntity, insertConnection, insertKnowledge, insertEvent, patchEntity } from "../lib/rollups";
+import { insertGroup } from "../lib/groupClosure";
 
 // ============================================================================
 // Infer 21: Create Workspace Mutation
@@ -73,7 +75,7 @@ export const createWorkspace = mutation({
     }
 
     // 5. CREATE NEW WORKSPACE GROUP
-    const workspaceId = await ctx.db.insert("groups", {
+    const workspaceId = await insertGroup(ctx, {
       slug,
       name: args.name,
       type: "organization",
@@ -98,7 +100,7 @@ export const createWorkspace = mutation({
     });
 
     // 6. CREATE WORKSPACE ENTITY (thing type: organization)
-    const workspaceEntityId = await ctx.db.insert("entities", {
+    const workspaceEntityId = await insertEntity(ctx, {
       groupId: workspaceId,
       type: "organization",
       name: args.name,
@@ -116,7 +118,7 @@ export const createWorkspace = mutation({
     });
 
     // 7. CREATE "OWNS" CONNECTION (creator owns workspace)
-    await ctx.db.insert("connections", {
+    await insertConnection(ctx, {
       groupId: workspaceId,
       fromEntityId: args.userId,
       toEntityId: workspaceEntityId,
@@ -132,7 +134,7 @@ export const createWorkspace = mutation({
     // 8. CREATE "MEMBER_OF" CONNECTION (creator is member of workspace)
     // This would be a new connection type we need in the ontology
     // For now, use a generic connection
-    await ctx.db.insert("connections", {
+    await insertConnection(ctx, {
       groupId: workspaceId,
       fromEntityId: args.userId,
       toEntityId: workspaceEntityId,
@@ -147,7 +149,7 @@ export const createWorkspace = mutation({
     });
 
     // 9. UPDATE USER WITH WORKSPACE INFO
-    await ctx.db.patch(args.userId, {
+    await patchEntity(ctx, user, {
       properties: {
         ...user.properties,
         workspaceId,
@@ -158,7 +160,7 @@ export const createWorkspace = mutation({
     });
 
     // 10. LOG WORKSPACE CREATION EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: workspaceId,
       type: "thing_created",
       actorId: args.userId,
@@ -281,7 +283,7 @@ export const inviteTeamMember = mutation({
     });
 
     // 8. LOG INVITATION EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: args.workspaceId,
       type: "thing_updated",
       actorId: args.userId,
@@ -374,7 +376,7 @@ export const acceptInvitation = mutation({
     let userId: any;
     if (!user) {
       // Create new user for this workspace
-      userId = await ctx.db.insert("entities", {
+      userId = await insertEntity(ctx, {
         groupId: workspaceId,
         type: "user",
         name: args.acceptingUserEmail.split("@")[0],
@@ -402,7 +404,7 @@ export const acceptInvitation = mutation({
       currentRoles[workspaceId] = invitation.role;
       const userSchemaVersion = user.schemaVersion || 1;
 
-      await ctx.db.patch(user._id, {
+      await patchEntity(ctx, user, {
         properties: {
           ...user.properties,
           roles: currentRoles,
@@ -437,7 +439,7 @@ export const acceptInvitation = mutation({
       .first();
 
     if (workspaceEntity) {
-      await ctx.db.insert("connections", {
+      await insertConnection(ctx, {
         groupId: workspaceId,
         fromEntityId: user._id,
         toEntityId: workspaceEntity._id,
@@ -453,7 +455,7 @@ export const acceptInvitation = mutation({
     }
 
     // 7. LOG ACCEPTANCE EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: workspaceId,
       type: "thing_updated",
       actorId: user._id,
@@ -550,7 +552,7 @@ export const connectWallet = mutation({
 
     // 6. UPDATE USER WITH WALLET ADDRESS
     const userSchemaVersion = user.schemaVersion || 1;
-    await ctx.db.patch(args.userId, {
+    await patchEntity(ctx, user, {
       properties: {
         ...user.properties,
         walletAddress: normalizedAddress,
@@ -561,7 +563,7 @@ export const connectWallet = mutation({
     });
 
     // 7. LOG WALLET CONNECTION EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: user.groupId,
       type: "thing_updated",
       actorId: args.userId,
@@ -633,7 +635,7 @@ export const addSkills = mutation({
       if (!skill.trim()) continue;
 
       // Create knowledge label for skill
-      const knowledgeId = await ctx.db.insert("knowledge", {
+      const knowledgeId = await insertKnowledge(ctx, {
         groupId: user.groupId,
         knowledgeType: "label",
         text: skill.trim(),
@@ -668,7 +670,7 @@ export const addSkills = mutation({
     );
     const userSchemaVersion = user.schemaVersion || 1;
 
-    await ctx.db.patch(args.userId, {
+    await patchEntity(ctx, user, {
       properties: {
         ...user.properties,
         expertise: newExpertise,
@@ -681,7 +683,7 @@ export const addSkills = mutation({
     });
 
     // 5. LOG SKILLS UPDATE EVENT
-    await ctx.db.insert("events", {
+    await insertEvent(ctx, {
       groupId: user.groupId,
       type: "thing_updated",
       actorId: args.userId,
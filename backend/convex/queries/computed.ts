@@ -1,24 +1,42 @@
 import { query } from "../_generated/server";
 import { v } from "convex/values";
 import { THING_TYPES, CONNECTION_TYPES, EVENT_TYPES, isThingType, isEventType } from "../types/ontology";
+import { getEntityRollup, getGroupCounters, sumDailyCounters } from "../lib/rollups";
+import { instrumentedQuery } from "../lib/instrumentation";
 
 /**
  * PHASE 3: COMPUTED FIELDS PATTERN
  *
- * Queries that compute derived fields on-the-fly from events and connections
- * Always reflect true state (never get out of sync with source data)
+ * Queries that compute derived fields from events and connections
+ *
+ * Creator stats and group metrics read rollups (lib/rollups.ts) that are
+ * updated in the same transaction as the source rows, so they stay in sync
+ * without scanning. Drift is repaired by mutations/rollups.ts.
  *
  * Benefits:
- * - No denormalization (single source of truth)
- * - Always accurate (computed from events)
- * - Scalable (events are archived, computation runs on subset)
+ * - O(1) documents per stats read (independent of group size)
+ * - Transactionally consistent with the writes that produce them
+ * - Relationship queries still read source tables directly
  *
  * Performance:
- * - Creator stats: ~50-100ms (1000 events scanned)
- * - Group metrics: ~200-500ms (10K+ events scanned)
+ * - Creator stats: 2 document reads
+ * - Group metrics: up to ~1300 document reads (counter shards + 31 days of
+ *   daily shards + top 10 + ACTIVE_ACTORS_LIMIT active actors), independent
+ *   of group size
  * - Thing relationships: ~10-50ms (simple connection scan)
  */
 
+/**
+ * Entity types ranked in topContentByEngagement
+ */
+const CONTENT_TYPES = ["blog_post", "project", "case_study", "product"];
+
+/**
+ * Most active actors counted per group metrics read; past this activeUsers
+ * is reported as a lower bound (activeUsersCapped)
+ */
+const ACTIVE_ACTORS_LIMIT = 1000;
+
 /**
  * Compute statistics for a creator (user)
  *
@@ -30,7 +48,7 @@ import { THING_TYPES, CONNECTION_TYPES, EVENT_TYPES, isThingType, isEventType }
  * - averageEngagement: (followers / content) or 0
  * - activeStreaks: Days with at least one event (optional)
  *
- * Performance: ~50-100ms for active creator with 1000+ events
+ * Performance: 2 document reads (entity + rollup)
  */
 export const getCreatorStats = query({
   args: {
@@ -47,56 +65,24 @@ export const getCreatorStats = query({
       throw new Error("Creator does not belong to a group");
     }
 
-    // 2. COMPUTE FIELDS FROM EVENTS
-    // Get all events where this creator is the actor
-    const creatorEvents = await ctx.db
-      .query("events")
-      .withIndex("by_actor", (q) => q.eq("actorId", args.creatorId))
-      .collect();
+    // 2. READ ROLLUP (maintained by lib/rollups.ts on every write)
+    // One document instead of every event and connection for the creator
+    const rollup = await getEntityRollup(ctx, args.creatorId);
 
-    // Total revenue: sum all payment_processed events
-    const totalRevenue = creatorEvents
-      .filter(e => e.type === "payment_processed")
-      .reduce((sum, e) => sum + (e.metadata?.amount || 0), 0);
-
-    // Last active: max timestamp
-    const lastActive = creatorEvents.length > 0
-      ? Math.max(...creatorEvents.map(e => e.timestamp))
-      : null;
-
-    // Events by type for activity metrics
-    const eventCounts = creatorEvents.reduce((acc, e) => {
-      acc[e.type] = (acc[e.type] || 0) + 1;
-      return acc;
-    }, {} as Record<string, number>);
-
-    // 3. COMPUTE FIELDS FROM CONNECTIONS
-    // Total followers: count connections where others follow this creator
-    const followers = await ctx.db
-      .query("connections")
-      .withIndex("to_type", (q) =>
-        q.eq("toEntityId", args.creatorId)
-          .eq("relationshipType", "created_by")
-      )
-      .collect();
+    const totalRevenue = rollup?.totalRevenue ?? 0;
+    const lastActive = rollup?.lastActive ?? null;
+    const eventCounts: Record<string, number> = rollup?.eventsByType ?? {};
+    const totalEvents = rollup?.eventCount ?? 0;
 
-    // Authored content: count things created by this creator
-    const authored = await ctx.db
-      .query("connections")
-      .withIndex("from_type", (q) =>
-        q.eq("fromEntityId", args.creatorId)
-          .eq("relationshipType", "created_by")
-      )
-      .collect();
-
-    // 4. COMPUTE DERIVED METRICS
-    const contentCount = authored.length;
-    const followerCount = followers.length;
+    // 3. COMPUTE DERIVED METRICS
+    // Followers: inbound "created_by" connections; authored: outbound
+    const contentCount = rollup?.authoredCount ?? 0;
+    const followerCount = rollup?.followerCount ?? 0;
     const averageEngagement = contentCount > 0
       ? Math.round((followerCount / contentCount) * 100) / 100
       : 0;
 
-    // 5. RETURN WITH COMPUTED FIELDS
+    // 4. RETURN WITH COMPUTED FIELDS
     return {
       ...creator,
       _computed: {
@@ -108,7 +94,7 @@ export const getCreatorStats = query({
         averageEngagement,
 
         // Activity breakdown
-        totalEvents: creatorEvents.length,
+        totalEvents,
         eventsByType: eventCounts,
 
         // Derived metrics
@@ -132,13 +118,16 @@ export const getCreatorStats = query({
  * - storageUsed: SUM of storage bytes used by things
  * - apiCallsThisMonth: COUNT of api_call events this month
  * - revenueThisMonth: SUM of revenue_generated events this month
- * - activeUsers: COUNT of unique actors with events in last 7 days
+ * - activeUsers: COUNT of actors whose last event is in the last 7 days
+ *   (at most ACTIVE_ACTORS_LIMIT; activeUsersCapped marks a lower bound)
  * - totalEntities: COUNT of things in group
  * - topContentByEngagement: Things with most connections (ordered)
  *
- * Performance: ~200-500ms for large group (10K+ events)
+ * Monthly/weekly windows are summed from daily buckets (day granularity)
+ *
+ * Performance: independent of group size (reads rollups only)
  */
-export const getGroupMetrics = query({
+export const getGroupMetrics = instrumentedQuery("queries/computed:getGroupMetrics", {
   args: {
     groupId: v.id("groups")
   },
@@ -149,93 +138,79 @@ export const getGroupMetrics = query({
       throw new Error("Group not found");
     }
 
-    // 2. COUNT ENTITIES AND CALCULATE STORAGE
-    const entities = await ctx.db
-      .query("entities")
-      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-      .collect();
-
-    // Count members (users in this group)
-    const memberCount = entities.filter(e => e.type === "user").length;
+    // 2. READ GROUP COUNTERS (entities, members, storage)
+    const counters = await getGroupCounters(ctx, args.groupId);
+    const memberCount = counters.userCount;
+    const storageUsed = counters.entityBytes;
 
-    const storageUsed = entities.reduce((sum, e) => {
-      // Estimate: 1KB base + JSON size
-      const json = JSON.stringify(e.properties);
-      return sum + (1024 + json.length);
-    }, 0);
-
-    // 4. ANALYZE EVENTS THIS MONTH
+    // 3. SUM DAILY EVENT BUCKETS (day granularity, <= 31 documents)
     const now = Date.now();
     const monthAgo = now - 30 * 24 * 60 * 60 * 1000;
     const weekAgo = now - 7 * 24 * 60 * 60 * 1000;
 
-    const monthlyEvents = await ctx.db
-      .query("events")
-      .withIndex("group_timestamp", (q) =>
-        q.eq("groupId", args.groupId).gt("timestamp", monthAgo)
-      )
-      .collect();
-
-    const weeklyEvents = monthlyEvents.filter(e => e.timestamp > weekAgo);
+    const monthly = await sumDailyCounters(ctx, args.groupId, monthAgo);
+    const weekly = await sumDailyCounters(ctx, args.groupId, weekAgo);
 
     // API calls this month
-    const apiCalls = monthlyEvents.filter(e => e.type === "payment_processed").length;
+    const apiCalls = monthly.paymentCount;
 
     // Revenue this month
-    const monthlyRevenue = monthlyEvents
-      .filter(e => e.type === "payment_processed")
-      .reduce((sum, e) => sum + (e.metadata?.amount || 0), 0);
-
-    // Active users (unique actors in last 7 days)
-    const activeUserIds = new Set(
-      weeklyEvents
-        .filter(e => e.actorId)
-        .map(e => e.actorId)
-    );
+    const monthlyRevenue = monthly.revenue;
 
-    // 5. ANALYZE CONTENT ENGAGEMENT
-    const contentEngagement = await Promise.all(
-      entities
-        .filter(e => ["blog_post", "project", "case_study", "product"].includes(e.type))
-        .map(async (entity) => {
-          // Count connections to this content
-          const connections = await ctx.db
-            .query("connections")
-            .withIndex("to_type", (q) =>
-              q.eq("toEntityId", entity._id)
-            )
-            .collect();
+    // Active users (actors whose last event is in the last 7 days), bounded
+    const activeRollups = await ctx.db
+      .query("entityRollups")
+      .withIndex("group_last_active", (q) =>
+        q.eq("groupId", args.groupId).gt("lastActive", weekAgo)
+      )
+      .take(ACTIVE_ACTORS_LIMIT + 1);
+    const activeUsersCapped = activeRollups.length > ACTIVE_ACTORS_LIMIT;
+    const activeUsers = Math.min(activeRollups.length, ACTIVE_ACTORS_LIMIT);
+
+    // 4. TOP CONTENT BY ENGAGEMENT (index ordered by inbound connections)
+    const topRollups = await ctx.db
+      .query("entityRollups")
+      .withIndex("group_inbound", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .filter((q) =>
+        q.or(
+          ...CONTENT_TYPES.map((t) => q.eq(q.field("entityType"), t))
+        )
+      )
+      .take(10);
 
-          return {
+    const topContent = (
+      await Promise.all(
+        topRollups.map(async (r) => {
+          const entity = await ctx.db.get(r.entityId);
+          return entity && {
             entityId: entity._id,
             name: entity.name,
             type: entity.type,
-            connectionCount: connections.length,
+            connectionCount: r.inboundCount,
             createdAt: entity.createdAt
           };
         })
-    );
-
-    const topContent = contentEngagement
-      .sort((a, b) => b.connectionCount - a.connectionCount)
-      .slice(0, 10);
+      )
+    ).filter((c) => c !== null);
 
-    // 6. RETURN METRICS
+    // 5. RETURN METRICS
     return {
       ...group,
       _computed: {
         // Core metrics
         userCount: memberCount,
-        activeUsers: activeUserIds.size,
-        totalEntities: entities.length,
+        activeUsers,
+        activeUsersCapped, // true: activeUsers is a lower bound
+        totalEntities: counters.entityCount,
         storageUsed,
         storageUsedMB: Math.round(storageUsed / (1024 * 1024) * 100) / 100,
 
         // Activity metrics
         apiCallsThisMonth: apiCalls,
         revenueThisMonth: Math.round(monthlyRevenue * 100) / 100,
-        eventsThisMonth: monthlyEvents.length,
-        eventsThisWeek: weeklyEvents.length,
+        eventsThisMonth: monthly.eventCount,
+        eventsThisWeek: weekly.eventCount,
 
         // Engagement metrics
         topContentByEngagement: topContent,
@@ -244,16 +219,16 @@ export const getGroupMetrics = query({
           : 0,
 
         // Growth metrics
-        avgEventsPerUser: activeUserIds.size > 0
-          ? Math.round((monthlyEvents.length / activeUserIds.size) * 100) / 100
+        avgEventsPerUser: activeUsers > 0
+          ? Math.round((monthly.eventCount / activeUsers) * 100) / 100
           : 0,
         avgRevenuePerUser: memberCount > 0
           ? Math.round((monthlyRevenue / memberCount) * 100) / 100
           : 0,
 
         // Status indicators
-        isActive: monthlyEvents.length > 0, // Had events this month
-        trendingUp: weeklyEvents.length > 0, // Activity in last week
+        isActive: monthly.eventCount > 0, // Had events this month
+        trendingUp: weekly.eventCount > 0, // Activity in last week
 
         // Metadata
         lastComputed: Date.now()
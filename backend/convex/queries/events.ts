@@ -1,5 +1,8 @@
 import { query } from "../_generated/server";
+import { paginationOptsValidator } from "convex/server";
 import { v } from "convex/values";
+import { MAX_LIST_LIMIT, boundedLimit, clampPaginationOpts } from "../lib/pagination";
+import { instrumentedQuery } from "../lib/instrumentation";
 
 /**
  * DIMENSION 5: EVENTS - Query Layer
@@ -36,6 +39,9 @@ import { v } from "convex/values";
  * - Use by_type for event analytics
  *
  * Query Pattern: Start with group ID, optionally filter by actor/target/type, order by timestamp
+ *
+ * Bounds: array results are capped at MAX_LIST_LIMIT; use listPaginated
+ * (paginationOpts) for infinite-scroll timelines
  */
 
 /**
@@ -52,24 +58,93 @@ export const list = query({
     offset: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    let query = ctx.db
-      .query("events")
-      .withIndex("group_timestamp", (q) => q.eq("groupId", args.groupId))
-      .order("desc"); // Most recent first
+    const offset = args.offset || 0;
+    const limit = boundedLimit(args.limit);
 
-    const events = await query.collect();
+    // Offset pages still read offset + limit rows; prefer listPaginated
+    const take = Math.min(offset + limit, MAX_LIST_LIMIT);
 
-    // Filter by event type if provided
-    let filtered = events;
-    if (args.eventType) {
-      filtered = events.filter(e => e.type === args.eventType);
+    const events = args.eventType
+      ? await ctx.db
+          .query("events")
+          .withIndex("group_type_time", (q) =>
+            q.eq("groupId", args.groupId).eq("type", args.eventType as any)
+          )
+          .order("desc") // Most recent first
+          .take(take)
+      : await ctx.db
+          .query("events")
+          .withIndex("group_timestamp", (q) => q.eq("groupId", args.groupId))
+          .order("desc") // Most recent first
+          .take(take);
+
+    return events.slice(offset, offset + limit);
+  }
+});
+
+/**
+ * List events in a group one page at a time (timeline view)
+ *
+ * Most recent first. Optional actor/target narrow the timeline to an
+ * activity feed or audit trail; returns { page, isDone, continueCursor }
+ */
+export const listPaginated = query({
+  args: {
+    groupId: v.id("groups"),
+    eventType: v.optional(v.string()),
+    actorId: v.optional(v.id("entities")),
+    targetId: v.optional(v.id("entities")),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    const opts = clampPaginationOpts(args.paginationOpts);
+
+    if (args.actorId) {
+      const actorId = args.actorId;
+      return await ctx.db
+        .query("events")
+        .withIndex("actor_time", (q) => q.eq("actorId", actorId))
+        .order("desc")
+        .filter((q) =>
+          q.and(
+            q.eq(q.field("groupId"), args.groupId),
+            args.eventType ? q.eq(q.field("type"), args.eventType) : true,
+            args.targetId ? q.eq(q.field("targetId"), args.targetId) : true
+          )
+        )
+        .paginate(opts);
     }
 
-    // Apply pagination
-    const offset = args.offset || 0;
-    const limit = args.limit || 100;
+    if (args.targetId) {
+      const targetId = args.targetId;
+      return await ctx.db
+        .query("events")
+        .withIndex("by_target", (q) => q.eq("targetId", targetId))
+        .order("desc")
+        .filter((q) =>
+          q.and(
+            q.eq(q.field("groupId"), args.groupId),
+            args.eventType ? q.eq(q.field("type"), args.eventType) : true
+          )
+        )
+        .paginate(opts);
+    }
 
-    return filtered.slice(offset, offset + limit);
+    if (args.eventType) {
+      return await ctx.db
+        .query("events")
+        .withIndex("group_type_time", (q) =>
+          q.eq("groupId", args.groupId).eq("type", args.eventType as any)
+        )
+        .order("desc")
+        .paginate(opts);
+    }
+
+    return await ctx.db
+      .query("events")
+      .withIndex("group_timestamp", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .paginate(opts);
   }
 });
 
@@ -87,22 +162,17 @@ export const byActor = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    const events = await ctx.db
+    return await ctx.db
       .query("events")
-      .withIndex("by_actor", (q) => q.eq("actorId", args.actorId))
-      .filter((q) => q.eq(q.field("groupId"), args.groupId))
+      .withIndex("actor_time", (q) => q.eq("actorId", args.actorId))
       .order("desc")
-      .collect();
-
-    // Filter by event type if provided
-    let filtered = events;
-    if (args.eventType) {
-      filtered = events.filter(e => e.type === args.eventType);
-    }
-
-    // Apply limit
-    const limit = args.limit || 100;
-    return filtered.slice(0, limit);
+      .filter((q) =>
+        q.and(
+          q.eq(q.field("groupId"), args.groupId),
+          args.eventType ? q.eq(q.field("type"), args.eventType) : true
+        )
+      )
+      .take(boundedLimit(args.limit));
   }
 });
 
@@ -120,22 +190,17 @@ export const byTarget = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    const events = await ctx.db
+    return await ctx.db
       .query("events")
       .withIndex("by_target", (q) => q.eq("targetId", args.targetId))
-      .filter((q) => q.eq(q.field("groupId"), args.groupId))
       .order("desc")
-      .collect();
-
-    // Filter by event type if provided
-    let filtered = events;
-    if (args.eventType) {
-      filtered = events.filter(e => e.type === args.eventType);
-    }
-
-    // Apply limit
-    const limit = args.limit || 100;
-    return filtered.slice(0, limit);
+      .filter((q) =>
+        q.and(
+          q.eq(q.field("groupId"), args.groupId),
+          args.eventType ? q.eq(q.field("type"), args.eventType) : true
+        )
+      )
+      .take(boundedLimit(args.limit));
   }
 });
 
@@ -154,24 +219,32 @@ export const byTimeRange = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    const events = await ctx.db
-      .query("events")
-      .withIndex("by_timestamp", (q) =>
-        q.gte("timestamp", args.startTime).lte("timestamp", args.endTime)
-      )
-      .filter((q) => q.eq(q.field("groupId"), args.groupId))
-      .order("desc")
-      .collect();
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
 
-    // Filter by event type if provided
-    let filtered = events;
     if (args.eventType) {
-      filtered = events.filter(e => e.type === args.eventType);
+      return await ctx.db
+        .query("events")
+        .withIndex("group_type_time", (q) =>
+          q
+            .eq("groupId", args.groupId)
+            .eq("type", args.eventType as any)
+            .gte("timestamp", args.startTime)
+            .lte("timestamp", args.endTime)
+        )
+        .order("desc")
+        .take(limit);
     }
 
-    // Apply limit
-    const limit = args.limit || 1000;
-    return filtered.slice(0, limit);
+    return await ctx.db
+      .query("events")
+      .withIndex("group_timestamp", (q) =>
+        q
+          .eq("groupId", args.groupId)
+          .gte("timestamp", args.startTime)
+          .lte("timestamp", args.endTime)
+      )
+      .order("desc")
+      .take(limit);
   }
 });
 
@@ -181,7 +254,7 @@ export const byTimeRange = query({
  * Returns counts by event type for the specified time range
  * Useful for analytics dashboards
  */
-export const stats = query({
+export const stats = instrumentedQuery("queries/events:stats", {
   args: {
     groupId: v.id("groups"),
     startTime: v.optional(v.number()),
@@ -1,5 +1,21 @@
 import { query } from "../_generated/server";
+import { paginationOptsValidator } from "convex/server";
 import { v } from "convex/values";
+import type { Doc } from "../_generated/dataModel";
+import {
+  MAX_LIST_LIMIT,
+  boundedLimit,
+  clampPaginationOpts,
+  getHierarchyGroupIds,
+  paginateHierarchy,
+} from "../lib/pagination";
+import {
+  getAncestorIds,
+  getDescendantRows,
+  isAncestorOrSelf,
+} from "../lib/groupClosure";
+import { instrumentedQuery } from "../lib/instrumentation";
+import { getGroupCounters } from "../lib/rollups";
 
 /**
  * DIMENSION 1: GROUPS - Query Layer
@@ -7,12 +23,19 @@ import { v } from "convex/values";
  * All read operations for groups (multi-tenant isolation boundary)
  * Supports:
  * - Direct lookup by ID or slug
- * - Hierarchical queries (ancestors, descendants, breadcrumbs)
- * - Aggregated statistics (entities, connections, events, knowledge)
- * - Full-text search with type/visibility filters
+ * - Hierarchical queries (ancestors, descendants, breadcrumbs) via the
+ *   groupClosure table (lib/groupClosure.ts): single indexed reads, no
+ *   parentGroupId walks
+ * - Aggregated statistics (entities, connections, events, knowledge) from
+ *   rollups (lib/rollups.ts)
+ * - Full-text search with type/visibility filters (search_name index)
  *
  * Query Pattern: All queries filter by user permissions (future enhancement)
  * Performance: Use indexes for efficient filtering on type, status, created time
+ *
+ * Bounds: array-returning lists are capped at MAX_LIST_LIMIT; *Paginated
+ * variants take paginationOpts and stream hierarchies group by group
+ * (see lib/pagination.ts)
  */
 
 /**
@@ -63,28 +86,70 @@ export const list = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    let groups;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
 
-    // Filter by type if provided
+    // Filter by type if provided (status checked in the same index scan)
     if (args.type) {
       const type = args.type;
-      groups = await ctx.db
+      return await ctx.db
         .query("groups")
         .withIndex("by_type", (q) => q.eq("type", type))
-        .collect();
-    } else {
-      groups = await ctx.db
+        .filter((q) => (args.status ? q.eq(q.field("status"), args.status) : true))
+        .take(limit);
+    }
+
+    if (args.status) {
+      const status = args.status;
+      return await ctx.db
         .query("groups")
-        .collect();
+        .withIndex("by_status", (q) => q.eq("status", status))
+        .take(limit);
+    }
+
+    return await ctx.db.query("groups").take(limit);
+  }
+});
+
+/**
+ * List groups one page at a time (cursor-paginated variant of list)
+ */
+export const listPaginated = query({
+  args: {
+    type: v.optional(v.union(
+      v.literal("friend_circle"),
+      v.literal("business"),
+      v.literal("community"),
+      v.literal("dao"),
+      v.literal("government"),
+      v.literal("organization")
+    )),
+    status: v.optional(v.union(
+      v.literal("active"),
+      v.literal("archived")
+    )),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    const opts = clampPaginationOpts(args.paginationOpts);
+
+    if (args.type) {
+      const type = args.type;
+      return await ctx.db
+        .query("groups")
+        .withIndex("by_type", (q) => q.eq("type", type))
+        .filter((q) => (args.status ? q.eq(q.field("status"), args.status) : true))
+        .paginate(opts);
     }
 
-    // Filter by status if provided
     if (args.status) {
-      groups = groups.filter((g) => g.status === args.status);
+      const status = args.status;
+      return await ctx.db
+        .query("groups")
+        .withIndex("by_status", (q) => q.eq("status", status))
+        .paginate(opts);
     }
 
-    // Apply limit if provided
-    return args.limit ? groups.slice(0, args.limit) : groups;
+    return await ctx.db.query("groups").paginate(opts);
   }
 });
 
@@ -100,83 +165,65 @@ export const getSubgroups = query({
     return await ctx.db
       .query("groups")
       .withIndex("by_parent", (q) => q.eq("parentGroupId", args.parentGroupId))
-      .collect();
+      .take(MAX_LIST_LIMIT);
   }
 });
 
 /**
  * Get entire group hierarchy recursively
- * Returns all descendants (children, grandchildren, etc.)
+ * Returns all descendants (children, grandchildren, etc.), shallowest first
+ *
+ * One range read on groupClosure (ancestor_depth) plus one get per group;
+ * throws for subtrees larger than MAX_MOVE_SUBTREE instead of truncating
  */
 export const getHierarchy = query({
   args: {
     rootGroupId: v.id("groups"),
-    maxDepth: v.optional(v.number()) // Prevent infinite recursion
+    maxDepth: v.optional(v.number()),
+    status: v.optional(v.union(
+      v.literal("active"),
+      v.literal("archived")
+    ))
   },
   handler: async (ctx, args) => {
-    const maxDepth = args.maxDepth || 10;
-    const allSubgroups: any[] = [];
-    const queue: Array<{ id: string; depth: number }> = [
-      { id: args.rootGroupId, depth: 0 }
-    ];
-    const visited = new Set<string>();
-
-    while (queue.length > 0) {
-      const current = queue.shift();
-      if (!current || current.depth >= maxDepth) continue;
-      if (visited.has(current.id)) continue; // Prevent cycles
-      visited.add(current.id);
-
-      // Get direct children
-      const subgroups = await ctx.db
-        .query("groups")
-        .withIndex("by_parent", (q) => q.eq("parentGroupId", current.id as any))
-        .collect();
-
-      for (const subgroup of subgroups) {
-        allSubgroups.push({
-          ...subgroup,
-          depth: current.depth + 1,
-          parentId: current.id
-        });
-        queue.push({ id: subgroup._id, depth: current.depth + 1 });
-      }
-    }
-
-    return allSubgroups;
+    const rows = await getDescendantRows(ctx, args.rootGroupId, {
+      maxDepth: args.maxDepth || 10,
+      status: args.status
+    });
+
+    const groups = await Promise.all(rows.map((row) => ctx.db.get(row.descendantId)));
+
+    return rows.flatMap((row, i) => {
+      const subgroup = groups[i];
+      return subgroup
+        ? [{ ...subgroup, depth: row.depth, parentId: subgroup.parentGroupId }]
+        : [];
+    });
   }
 });
 
 /**
  * Get path from root to a specific group (breadcrumb trail)
  * Returns: [root, parent, grandparent, ..., targetGroup]
+ *
+ * One range read on groupClosure (descendant_depth)
  */
 export const getGroupPath = query({
   args: {
     groupId: v.id("groups")
   },
   handler: async (ctx, args) => {
-    const path: any[] = [];
-    let currentId: string | undefined = args.groupId;
-    const maxIterations = 10; // Prevent infinite loops
-    let iterations = 0;
-
-    while (currentId && iterations < maxIterations) {
-      const group = await ctx.db.get(currentId as any) as any;
-      if (!group) break;
-
-      path.unshift(group); // Add to beginning of array
-      currentId = group.parentGroupId;
-      iterations++;
-    }
-
-    return path;
+    const ancestorIds = await getAncestorIds(ctx, args.groupId);
+    const path = await Promise.all(ancestorIds.map((id) => ctx.db.get(id)));
+    return path.filter((group): group is Doc<"groups"> => group !== null);
   }
 });
 
 /**
  * Check if a group is a descendant of another group
  * Useful for permission checks: "Is user in parent group or any subgroup?"
+ *
+ * One unique lookup on groupClosure (descendant_ancestor)
  */
 export const isDescendantOf = query({
   args: {
@@ -184,33 +231,17 @@ export const isDescendantOf = query({
     ancestorGroupId: v.id("groups")
   },
   handler: async (ctx, args) => {
-    if (args.groupId === args.ancestorGroupId) {
-      return true; // A group is considered its own descendant
-    }
-
-    let currentId: string | undefined = args.groupId;
-    const maxIterations = 10;
-    let iterations = 0;
-
-    while (currentId && iterations < maxIterations) {
-      const group = await ctx.db.get(currentId as any) as any;
-      if (!group) return false;
-
-      if (group.parentGroupId === args.ancestorGroupId) {
-        return true;
-      }
-
-      currentId = group.parentGroupId;
-      iterations++;
-    }
-
-    return false;
+    // A group is considered its own descendant
+    return await isAncestorOrSelf(ctx, args.ancestorGroupId, args.groupId);
   }
 });
 
 /**
  * Get all entities in a group hierarchy (recursive)
  * Returns entities from the root group and all subgroups
+ *
+ * Bounded: reads group by group (by_group / group_type index) and stops at
+ * limit. Use getEntitiesInHierarchyPaginated to stream the whole tree.
  */
 export const getEntitiesInHierarchy = query({
   args: {
@@ -219,57 +250,64 @@ export const getEntitiesInHierarchy = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // Get all subgroups
-    const hierarchy = await ctx.db
-      .query("groups")
-      .withIndex("by_parent", (q) => q.eq("parentGroupId", args.rootGroupId))
-      .collect();
-
-    // Build list of all group IDs (root + subgroups)
-    const allGroupIds = [args.rootGroupId];
-    const queue = [...hierarchy];
-    const maxIterations = 100;
-    let iterations = 0;
-
-    while (queue.length > 0 && iterations < maxIterations) {
-      const current = queue.shift();
-      if (!current) continue;
-
-      allGroupIds.push(current._id);
-
-      // Get children of current group
-      const children = await ctx.db
-        .query("groups")
-        .withIndex("by_parent", (q) => q.eq("parentGroupId", current._id))
-        .collect();
-
-      queue.push(...children);
-      iterations++;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
+    const groupIds = await getHierarchyGroupIds(ctx, args.rootGroupId);
+    const entities: Doc<"entities">[] = [];
+
+    for (const groupId of groupIds) {
+      if (entities.length >= limit) break;
+      const remaining = limit - entities.length;
+
+      const page = args.entityType
+        ? await ctx.db
+            .query("entities")
+            .withIndex("group_type", (q) =>
+              q.eq("groupId", groupId).eq("type", args.entityType as any)
+            )
+            .take(remaining)
+        : await ctx.db
+            .query("entities")
+            .withIndex("by_group", (q) => q.eq("groupId", groupId))
+            .take(remaining);
+
+      entities.push(...page);
     }
 
-    // Get all entities from all groups
-    const entities = await ctx.db
-      .query("entities")
-      .filter((q) =>
-        q.or(
-          ...allGroupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Filter by entity type if provided
-    let filteredEntities = entities;
-    if (args.entityType) {
-      filteredEntities = entities.filter(e => e.type === args.entityType);
-    }
+    return entities;
+  }
+});
 
-    // Apply limit if provided
-    return args.limit ? filteredEntities.slice(0, args.limit) : filteredEntities;
+/**
+ * Stream entities across a group hierarchy, one page at a time
+ * Pages are ordered group by group (root first, then breadth first)
+ */
+export const getEntitiesInHierarchyPaginated = query({
+  args: {
+    rootGroupId: v.id("groups"),
+    entityType: v.optional(v.string()),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    return await paginateHierarchy(ctx, args.rootGroupId, args.paginationOpts, (groupId, opts) =>
+      args.entityType
+        ? ctx.db
+            .query("entities")
+            .withIndex("group_type", (q) =>
+              q.eq("groupId", groupId).eq("type", args.entityType as any)
+            )
+            .paginate(opts)
+        : ctx.db
+            .query("entities")
+            .withIndex("by_group", (q) => q.eq("groupId", groupId))
+            .paginate(opts)
+    );
   }
 });
 
 /**
  * Get all connections in a group hierarchy (recursive)
+ *
+ * Bounded: reads group by group and stops at limit
  */
 export const getConnectionsInHierarchy = query({
   args: {
@@ -278,55 +316,64 @@ export const getConnectionsInHierarchy = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // Get all subgroups (same logic as getEntitiesInHierarchy)
-    const hierarchy = await ctx.db
-      .query("groups")
-      .withIndex("by_parent", (q) => q.eq("parentGroupId", args.rootGroupId))
-      .collect();
-
-    const allGroupIds = [args.rootGroupId];
-    const queue = [...hierarchy];
-    const maxIterations = 100;
-    let iterations = 0;
-
-    while (queue.length > 0 && iterations < maxIterations) {
-      const current = queue.shift();
-      if (!current) continue;
-
-      allGroupIds.push(current._id);
-
-      const children = await ctx.db
-        .query("groups")
-        .withIndex("by_parent", (q) => q.eq("parentGroupId", current._id))
-        .collect();
-
-      queue.push(...children);
-      iterations++;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
+    const groupIds = await getHierarchyGroupIds(ctx, args.rootGroupId);
+    const connections: Doc<"connections">[] = [];
+
+    for (const groupId of groupIds) {
+      if (connections.length >= limit) break;
+      const remaining = limit - connections.length;
+
+      const page = args.relationshipType
+        ? await ctx.db
+            .query("connections")
+            .withIndex("group_type", (q) =>
+              q.eq("groupId", groupId).eq("relationshipType", args.relationshipType as any)
+            )
+            .take(remaining)
+        : await ctx.db
+            .query("connections")
+            .withIndex("by_group", (q) => q.eq("groupId", groupId))
+            .take(remaining);
+
+      connections.push(...page);
     }
 
-    // Get all connections from all groups
-    const connections = await ctx.db
-      .query("connections")
-      .filter((q) =>
-        q.or(
-          ...allGroupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Filter by relationship type if provided
-    let filteredConnections = connections;
-    if (args.relationshipType) {
-      filteredConnections = connections.filter(c => c.relationshipType === args.relationshipType);
-    }
+    return connections;
+  }
+});
 
-    // Apply limit if provided
-    return args.limit ? filteredConnections.slice(0, args.limit) : filteredConnections;
+/**
+ * Stream connections across a group hierarchy, one page at a time
+ */
+export const getConnectionsInHierarchyPaginated = query({
+  args: {
+    rootGroupId: v.id("groups"),
+    relationshipType: v.optional(v.string()),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    return await paginateHierarchy(ctx, args.rootGroupId, args.paginationOpts, (groupId, opts) =>
+      args.relationshipType
+        ? ctx.db
+            .query("connections")
+            .withIndex("group_type", (q) =>
+              q.eq("groupId", groupId).eq("relationshipType", args.relationshipType as any)
+            )
+            .paginate(opts)
+        : ctx.db
+            .query("connections")
+            .withIndex("by_group", (q) => q.eq("groupId", groupId))
+            .paginate(opts)
+    );
   }
 });
 
 /**
  * Get all events in a group hierarchy (recursive)
+ *
+ * Bounded: takes the most recent events of each group until limit is
+ * reached, then returns them merged most recent first
  */
 export const getEventsInHierarchy = query({
   args: {
@@ -335,58 +382,72 @@ export const getEventsInHierarchy = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // Get all subgroups (same logic)
-    const hierarchy = await ctx.db
-      .query("groups")
-      .withIndex("by_parent", (q) => q.eq("parentGroupId", args.rootGroupId))
-      .collect();
-
-    const allGroupIds = [args.rootGroupId];
-    const queue = [...hierarchy];
-    const maxIterations = 100;
-    let iterations = 0;
-
-    while (queue.length > 0 && iterations < maxIterations) {
-      const current = queue.shift();
-      if (!current) continue;
-
-      allGroupIds.push(current._id);
-
-      const children = await ctx.db
-        .query("groups")
-        .withIndex("by_parent", (q) => q.eq("parentGroupId", current._id))
-        .collect();
-
-      queue.push(...children);
-      iterations++;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
+    const groupIds = await getHierarchyGroupIds(ctx, args.rootGroupId);
+    const events: Doc<"events">[] = [];
+
+    for (const groupId of groupIds) {
+      if (events.length >= limit) break;
+      const remaining = limit - events.length;
+
+      const page = args.eventType
+        ? await ctx.db
+            .query("events")
+            .withIndex("group_type_time", (q) =>
+              q.eq("groupId", groupId).eq("type", args.eventType as any)
+            )
+            .order("desc")
+            .take(remaining)
+        : await ctx.db
+            .query("events")
+            .withIndex("group_timestamp", (q) => q.eq("groupId", groupId))
+            .order("desc")
+            .take(remaining);
+
+      events.push(...page);
     }
 
-    // Get all events from all groups
-    const events = await ctx.db
-      .query("events")
-      .filter((q) =>
-        q.or(
-          ...allGroupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .order("desc") // Most recent first
-      .collect();
-
-    // Filter by event type if provided
-    let filteredEvents = events;
-    if (args.eventType) {
-      filteredEvents = events.filter(e => e.type === args.eventType);
-    }
+    // Most recent first
+    return events.sort((a, b) => b.timestamp - a.timestamp);
+  }
+});
 
-    // Apply limit if provided
-    return args.limit ? filteredEvents.slice(0, args.limit) : filteredEvents;
+/**
+ * Stream events across a group hierarchy, one page at a time
+ * Most recent first within each group
+ */
+export const getEventsInHierarchyPaginated = query({
+  args: {
+    rootGroupId: v.id("groups"),
+    eventType: v.optional(v.string()),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    return await paginateHierarchy(ctx, args.rootGroupId, args.paginationOpts, (groupId, opts) =>
+      args.eventType
+        ? ctx.db
+            .query("events")
+            .withIndex("group_type_time", (q) =>
+              q.eq("groupId", groupId).eq("type", args.eventType as any)
+            )
+            .order("desc")
+            .paginate(opts)
+        : ctx.db
+            .query("events")
+            .withIndex("group_timestamp", (q) => q.eq("groupId", groupId))
+            .order("desc")
+            .paginate(opts)
+    );
   }
 });
 
 /**
  * Get group statistics
+ *
+ * Performance: reads rollups, not the entity/connection/event/knowledge
+ * tables (see internalActions/bench.ts for numbers by tenant size)
  */
-export const getStats = query({
+export const getStats = instrumentedQuery("queries/groups:getStats", {
   args: {
     groupId: v.id("groups"),
     includeSubgroups: v.optional(v.boolean())
@@ -397,86 +458,40 @@ export const getStats = query({
       throw new Error("Group not found");
     }
 
-    let groupIds = [args.groupId];
-
-    // Include subgroups if requested
-    if (args.includeSubgroups) {
-      const hierarchy = await ctx.db
-        .query("groups")
-        .withIndex("by_parent", (q) => q.eq("parentGroupId", args.groupId))
-        .collect();
-
-      const queue = [...hierarchy];
-      const maxIterations = 100;
-      let iterations = 0;
-
-      while (queue.length > 0 && iterations < maxIterations) {
-        const current = queue.shift();
-        if (!current) continue;
-
-        groupIds.push(current._id);
-
-        const children = await ctx.db
-          .query("groups")
-          .withIndex("by_parent", (q) => q.eq("parentGroupId", current._id))
-          .collect();
-
-        queue.push(...children);
-        iterations++;
-      }
-    }
+    // Include subgroups if requested (one groupClosure range read)
+    const groupIds = args.includeSubgroups
+      ? await getHierarchyGroupIds(ctx, args.groupId)
+      : [args.groupId];
+
+    // Counters from rollups (lib/rollups.ts, events all time) and members
+    // from the group_type index: reads per group are O(members), not
+    // O(group size)
+    const perGroup = await Promise.all(
+      groupIds.map(async (groupId) => {
+        const [counters, creators] = await Promise.all([
+          getGroupCounters(ctx, groupId),
+          ctx.db
+            .query("entities")
+            .withIndex("group_type", (q) =>
+              q.eq("groupId", groupId).eq("type", "creator" as any)
+            )
+            .collect(),
+        ]);
+        return { counters, members: creators.length };
+      })
+    );
 
-    // Count entities
-    const entities = await ctx.db
-      .query("entities")
-      .filter((q) =>
-        q.or(
-          ...groupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Count connections
-    const connections = await ctx.db
-      .query("connections")
-      .filter((q) =>
-        q.or(
-          ...groupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Count events
-    const events = await ctx.db
-      .query("events")
-      .filter((q) =>
-        q.or(
-          ...groupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Count knowledge entries
-    const knowledge = await ctx.db
-      .query("knowledge")
-      .filter((q) =>
-        q.or(
-          ...groupIds.map(id => q.eq(q.field("groupId"), id))
-        )
-      )
-      .collect();
-
-    // Count members (entities with type "creator")
-    const members = entities.filter(e => e.type === "creator");
+    const total = (pick: (g: (typeof perGroup)[number]) => number) =>
+      perGroup.reduce((sum, g) => sum + pick(g), 0);
 
     return {
       group,
       stats: {
-        members: members.length,
-        entities: entities.length,
-        connections: connections.length,
-        events: events.length,
-        knowledge: knowledge.length,
+        members: total((g) => g.members),
+        entities: total((g) => g.counters.entityCount),
+        connections: total((g) => g.counters.connectionCount),
+        events: total((g) => g.counters.eventCount),
+        knowledge: total((g) => g.counters.knowledgeCount),
         subgroups: args.includeSubgroups ? groupIds.length - 1 : 0
       }
     };
@@ -485,6 +500,9 @@ export const getStats = query({
 
 /**
  * Search groups by name or slug
+ *
+ * Full-text search on name (search_name index, relevance ordered) plus an
+ * exact slug match via by_slug, so the groups table is never scanned
  */
 export const search = query({
   args: {
@@ -504,29 +522,41 @@ export const search = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    const searchTerm = args.query.toLowerCase();
-    let groups = await ctx.db.query("groups").collect();
+    const term = args.query.trim();
+    if (term.length === 0) {
+      return [];
+    }
+    const limit = boundedLimit(args.limit, 20);
 
-    // Filter by search term (name or slug)
-    groups = groups.filter(g =>
-      g.name.toLowerCase().includes(searchTerm) ||
-      g.slug.toLowerCase().includes(searchTerm)
-    );
+    const matches = (g: Doc<"groups">) =>
+      g.status === "active" &&
+      (!args.type || g.type === args.type) &&
+      (!args.visibility || g.settings.visibility === args.visibility);
 
-    // Filter by type if provided
-    if (args.type) {
-      groups = groups.filter(g => g.type === args.type);
-    }
+    // Exact slug match first
+    const bySlug = await ctx.db
+      .query("groups")
+      .withIndex("by_slug", (q) => q.eq("slug", term.toLowerCase()))
+      .first();
 
-    // Filter by visibility if provided
-    if (args.visibility) {
-      groups = groups.filter(g => g.settings.visibility === args.visibility);
+    // Then name matches (visibility is post-filtered, so over-fetch)
+    const byName = await ctx.db
+      .query("groups")
+      .withSearchIndex("search_name", (q) => {
+        const scoped = q.search("name", term).eq("status", "active");
+        return args.type ? scoped.eq("type", args.type) : scoped;
+      })
+      .take(args.visibility ? Math.min(limit * 4, MAX_LIST_LIMIT) : limit);
+
+    const results: Doc<"groups">[] = [];
+    const seen = new Set<string>();
+    for (const group of bySlug ? [bySlug, ...byName] : byName) {
+      if (seen.has(group._id) || !matches(group)) continue;
+      seen.add(group._id);
+      results.push(group);
+      if (results.length === limit) break;
     }
 
-    // Filter to only active groups
-    groups = groups.filter(g => g.status === "active");
-
-    // Apply limit if provided
-    return args.limit ? groups.slice(0, args.limit) : groups;
+    return results;
   }
 });
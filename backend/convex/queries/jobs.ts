@@ -0,0 +1,64 @@
+import { query } from "../_generated/server";
+import { v } from "convex/values";
+import { getJobProgress, type JobProgress } from "../lib/jobs";
+import { boundedLimit } from "../lib/pagination";
+
+/**
+ * PHASE 3: BULK JOBS - Query Layer
+ *
+ * Progress for chunked imports and cascades (see lib/jobs.ts)
+ * Reactive: subscribe with useQuery and the UI updates after every chunk.
+ */
+
+/**
+ * Get one job with progress (percent, items/sec, stalled)
+ */
+export const get = query({
+  args: {
+    jobId: v.id("jobs")
+  },
+  handler: async (ctx, args): Promise<JobProgress | null> => {
+    const job = await ctx.db.get(args.jobId);
+    if (!job) {
+      return null;
+    }
+    return await getJobProgress(ctx, job);
+  }
+});
+
+/**
+ * List a group's jobs, newest first
+ */
+export const listByGroup = query({
+  args: {
+    groupId: v.id("groups"),
+    status: v.optional(v.union(
+      v.literal("staging"),
+      v.literal("queued"),
+      v.literal("running"),
+      v.literal("completed"),
+      v.literal("failed"),
+      v.literal("cancelled")
+    )),
+    limit: v.optional(v.number())
+  },
+  handler: async (ctx, args): Promise<JobProgress[]> => {
+    const limit = boundedLimit(args.limit, 20);
+
+    const jobs = args.status
+      ? await ctx.db
+          .query("jobs")
+          .withIndex("group_status", (q) =>
+            q.eq("groupId", args.groupId).eq("status", args.status!)
+          )
+          .order("desc")
+          .take(limit)
+      : await ctx.db
+          .query("jobs")
+          .withIndex("group_created", (q) => q.eq("groupId", args.groupId))
+          .order("desc")
+          .take(limit);
+
+    return await Promise.all(jobs.map((job) => getJobProgress(ctx, job)));
+  }
+});
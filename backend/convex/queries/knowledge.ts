@@ -1,5 +1,10 @@
-import { query } from "../_generated/server";
+import { query, internalQuery } from "../_generated/server";
+import type { Doc } from "../_generated/dataModel";
+import { paginationOptsValidator } from "convex/server";
 import { v } from "convex/values";
+import { MAX_LIST_LIMIT, boundedLimit, clampPaginationOpts } from "../lib/pagination";
+import { embeddingTextHash } from "../lib/embeddings";
+import { searchKnowledgeText } from "../lib/search";
 
 /**
  * DIMENSION 6: KNOWLEDGE - Query Layer
@@ -9,7 +14,8 @@ import { v } from "convex/values";
  *
  * Supports:
  * - List by type (labels, documents, chunks, vector_only)
- * - Semantic text search (ready for vector similarity in future)
+ * - Full-text search (search_text index); vector + hybrid search lives in
+ *   actions/knowledge.ts because vector search is action-only
  * - Find knowledge linked to specific entity (via junction table)
  * - Filter by label/category (taxonomy)
  * - Aggregate statistics (unique labels, with embeddings, etc.)
@@ -19,22 +25,32 @@ import { v } from "convex/values";
  * - Content tagging: Find all items with specific label
  * - Knowledge base search: Find documents matching text query
  * - Taxonomy exploration: Browse all labels and categories
- * - Semantic matching: Find similar content (vector similarity - future)
+ * - Semantic matching: Find similar content (by_embedding vector index)
  * - Bulk knowledge operations: Import/export labels and documents
  *
  * Performance:
  * - CRITICAL: Use group_type index for filtering by knowledge type
  * - Use by_source to find knowledge for specific entity
- * - Text search uses substring matching (ready for full-text index)
- * - Embeddings ready for vector similarity search
+ * - Text search uses the search_text full-text index (filtered by groupId)
+ * - Embeddings use the by_embedding vector index (filtered by groupId)
  *
  * Junction Table (thingKnowledge):
  * - Links knowledge items to entities with semantic roles
  * - Roles: label (categorical), summary (synthesis), chunk_of (part), caption (description), keyword (search)
  *
  * Query Pattern: Filter by group, optionally filter by type/label, order by relevance
+ *
+ * Bounds: array results are capped at MAX_LIST_LIMIT; use listPaginated
+ * (paginationOpts) to page through large knowledge bases
  */
 
+const knowledgeTypeValidator = v.optional(v.union(
+  v.literal("label"),
+  v.literal("document"),
+  v.literal("chunk"),
+  v.literal("vector_only")
+));
+
 /**
  * List knowledge items in a group
  *
@@ -52,86 +68,141 @@ export const list = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    let results;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
 
     if (args.knowledgeType) {
       const type = args.knowledgeType;
-      results = await ctx.db
+      return await ctx.db
         .query("knowledge")
         .withIndex("group_type", (q) =>
           q.eq("groupId", args.groupId).eq("knowledgeType", type)
         )
-        .collect();
-    } else {
-      results = await ctx.db
+        .take(limit);
+    }
+
+    return await ctx.db
+      .query("knowledge")
+      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+      .take(limit);
+  }
+});
+
+/**
+ * List knowledge items in a group one page at a time (most recent first)
+ */
+export const listPaginated = query({
+  args: {
+    groupId: v.id("groups"),
+    knowledgeType: knowledgeTypeValidator,
+    sourceThingId: v.optional(v.id("entities")),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    const opts = clampPaginationOpts(args.paginationOpts);
+
+    if (args.sourceThingId) {
+      const sourceThingId = args.sourceThingId;
+      return await ctx.db
         .query("knowledge")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
+        .withIndex("group_source", (q) =>
+          q.eq("groupId", args.groupId).eq("sourceThingId", sourceThingId)
+        )
+        .order("desc")
+        .filter((q) =>
+          args.knowledgeType ? q.eq(q.field("knowledgeType"), args.knowledgeType) : true
+        )
+        .paginate(opts);
     }
 
-    // Apply limit if provided
-    if (args.limit) {
-      results = results.slice(0, args.limit);
+    if (args.knowledgeType) {
+      const type = args.knowledgeType;
+      return await ctx.db
+        .query("knowledge")
+        .withIndex("group_type", (q) =>
+          q.eq("groupId", args.groupId).eq("knowledgeType", type)
+        )
+        .order("desc")
+        .paginate(opts);
     }
 
-    return results;
+    return await ctx.db
+      .query("knowledge")
+      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .paginate(opts);
   }
 });
 
-/**
- * Search knowledge by text (basic text search)
+ * Search knowledge by text or label (full-text search index)
+ * Search knowledge by text (full-text search index)
  *
- * For now: case-insensitive substring search
- * TODO: Replace with vector search when ready
+ * Uses the search_text index (relevance ordered, prefix match on last term)
+ * For semantic / hybrid ranking use actions/knowledge.semanticSearch
  */
 export const search = query({
   args: {
     groupId: v.id("groups"),
     query: v.string(),
-    knowledgeType: v.optional(v.union(
-      v.literal("label"),
-      v.literal("document"),
-      v.literal("chunk"),
-      v.literal("vector_only")
-    )),
+    knowledgeType: knowledgeTypeValidator,
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // Get all knowledge items for group
-    let knowledge;
+    const limit = boundedLimit(args.limit, 10);
+    return await searchKnowledgeText(ctx, args, limit);
+  }
+});
 
-    if (args.knowledgeType) {
-      const knowledgeType = args.knowledgeType;
-      knowledge = await ctx.db
-        .query("knowledge")
-        .withIndex("group_type", (q) =>
-          q.eq("groupId", args.groupId).eq("knowledgeType", knowledgeType)
-        )
-        .collect();
-    } else {
-      knowledge = await ctx.db
-        .query("knowledge")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
-    }
+/**
+ * INTERNAL: Full-text candidate ids for hybrid search (lib/search.ts)
+ */
+export const searchTextIds = internalQuery({
+  args: {
+    groupId: v.id("groups"),
+    query: v.string(),
+    knowledgeType: knowledgeTypeValidator,
+    limit: v.number()
+  },
+  handler: async (ctx, args) => {
+    const results = await searchKnowledgeText(ctx, args, args.limit);
+    return results.map((k) => k._id);
+  }
+});
 
-    // Basic text search (case-insensitive)
-    const searchLower = args.query.toLowerCase();
-    const filtered = knowledge.filter(k => {
-      // Search in text field
-      if (k.text && k.text.toLowerCase().includes(searchLower)) {
-        return true;
-      }
-      // Search in labels
-      if (k.labels && k.labels.some(label => label.toLowerCase().includes(searchLower))) {
-        return true;
-      }
-      return false;
-    });
+/**
+ * INTERNAL: Load search hits by id, scoped to group, skipping deleted items
+ */
+export const getManyForSearch = internalQuery({
+  args: {
+    groupId: v.id("groups"),
+    ids: v.array(v.id("knowledge"))
+  },
+  handler: async (ctx, args) => {
+    const docs = await Promise.all(args.ids.map((id) => ctx.db.get(id)));
+    return docs.filter(
+      (k): k is Doc<"knowledge"> =>
+        k !== null && k.groupId === args.groupId && k.deletedAt === undefined
+    );
+  }
+});
 
-    // Apply limit
-    const limit = args.limit || 10;
-    return filtered.slice(0, limit);
+/**
+ * INTERNAL: Text of knowledge items waiting for embeddings
+ * textHash goes back to setEmbeddings with the vector
+ */
+export const getForEmbedding = internalQuery({
+  args: {
+    ids: v.array(v.id("knowledge"))
+  },
+  handler: async (ctx, args) => {
+    const docs = await Promise.all(args.ids.map((id) => ctx.db.get(id)));
+    return docs
+      .filter((k): k is Doc<"knowledge"> => k !== null && !!k.text)
+      .map((k) => ({
+        id: k._id,
+        groupId: k.groupId,
+        text: k.text as string,
+        textHash: embeddingTextHash(k.text as string),
+      }));
   }
 });
 
@@ -152,18 +223,15 @@ export const bySourceThing = query({
     ))
   },
   handler: async (ctx, args) => {
-    const knowledge = await ctx.db
+    return await ctx.db
       .query("knowledge")
-      .withIndex("by_source", (q) => q.eq("sourceThingId", args.sourceThingId))
-      .filter((q) => q.eq(q.field("groupId"), args.groupId))
-      .collect();
-
-    // Filter by knowledge type if provided
-    if (args.knowledgeType) {
-      return knowledge.filter(k => k.knowledgeType === args.knowledgeType);
-    }
-
-    return knowledge;
+      .withIndex("group_source", (q) =>
+        q.eq("groupId", args.groupId).eq("sourceThingId", args.sourceThingId)
+      )
+      .filter((q) =>
+        args.knowledgeType ? q.eq(q.field("knowledgeType"), args.knowledgeType) : true
+      )
+      .take(MAX_LIST_LIMIT);
   }
 });
 
@@ -188,7 +256,7 @@ export const byThing = query({
     let associations = await ctx.db
       .query("thingKnowledge")
       .withIndex("by_thing", (q) => q.eq("thingId", args.thingId))
-      .collect();
+      .take(MAX_LIST_LIMIT);
 
     // Filter by role if provided
     if (args.role) {
@@ -223,19 +291,23 @@ export const byLabel = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    const knowledge = await ctx.db
+    const limit = boundedLimit(args.limit);
+
+    // Labels are an array (not indexable): stream the group and stop as
+    // soon as limit matches are found instead of collecting everything
+    const matches: Doc<"knowledge">[] = [];
+    const items = ctx.db
       .query("knowledge")
-      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-      .collect();
+      .withIndex("by_group", (q) => q.eq("groupId", args.groupId));
 
-    // Filter by label
-    const filtered = knowledge.filter(k =>
-      k.labels && k.labels.includes(args.label)
-    );
+    for await (const item of items) {
+      if (item.labels?.includes(args.label)) {
+        matches.push(item);
+        if (matches.length >= limit) break;
+      }
+    }
 
-    // Apply limit
-    const limit = args.limit || 100;
-    return filtered.slice(0, limit);
+    return matches;
   }
 });
 
@@ -0,0 +1,142 @@
+import { internalQuery } from "../_generated/server";
+import { v } from "convex/values";
+import type { Doc } from "../_generated/dataModel";
+import {
+  MAX_REPORT_SAMPLES,
+  measureQuery,
+  percentile,
+} from "../lib/instrumentation";
+
+// Register the instrumented query handlers measured by countReads
+import "./things";
+import "./events";
+import "./quotas";
+import "./groups";
+import "./computed";
+
+/**
+ * PHASE 3: FUNCTION METRICS - Query Layer
+ *
+ * report: p50/p95 per function over the sampled functionMetrics rows
+ * (lib/instrumentation.ts). Filter by label to read one benchmark run:
+ *
+ *   npx convex run queries/metrics:report '{"label": "bench:10000"}'
+ *
+ * countReads: documents an instrumented query reads for given args (the
+ * benchmark records it next to the caller-measured latency)
+ *
+ * Internal only: metrics span every tenant.
+ */
+
+type FunctionReport = {
+  functionName: string;
+  kind: Doc<"functionMetrics">["kind"];
+  count: number;
+  errors: number;
+  p50Ms: number | null; // null: no timed samples (live query/mutation samples)
+  p95Ms: number | null;
+  maxMs: number | null;
+  p50DocsRead: number | null;
+  p95DocsRead: number | null;
+  p95ResultBytes: number | null;
+};
+
+/**
+ * Percentiles per function, slowest p95 first
+ *
+ * Reads at most MAX_REPORT_SAMPLES rows (newest first)
+ */
+export const report = internalQuery({
+  args: {
+    since: v.optional(v.number()), // Default: last 24 hours
+    label: v.optional(v.string()),
+    functionName: v.optional(v.string()),
+  },
+  handler: async (ctx, args): Promise<{ samples: number; truncated: boolean; functions: FunctionReport[] }> => {
+    const since = args.since ?? Date.now() - 24 * 60 * 60 * 1000;
+
+    // 1. READ SAMPLES THROUGH THE NARROWEST INDEX
+    let samples: Doc<"functionMetrics">[];
+    if (args.functionName) {
+      samples = await ctx.db
+        .query("functionMetrics")
+        .withIndex("function_time", (q) =>
+          q.eq("functionName", args.functionName!).gte("timestamp", since)
+        )
+        .order("desc")
+        .take(MAX_REPORT_SAMPLES);
+      if (args.label) {
+        samples = samples.filter((s) => s.label === args.label);
+      }
+    } else if (args.label) {
+      samples = await ctx.db
+        .query("functionMetrics")
+        .withIndex("label_time", (q) =>
+          q.eq("label", args.label).gte("timestamp", since)
+        )
+        .order("desc")
+        .take(MAX_REPORT_SAMPLES);
+    } else {
+      samples = await ctx.db
+        .query("functionMetrics")
+        .withIndex("by_timestamp", (q) => q.gte("timestamp", since))
+        .order("desc")
+        .take(MAX_REPORT_SAMPLES);
+    }
+
+    // 2. GROUP BY FUNCTION
+    const byFunction = new Map<string, Doc<"functionMetrics">[]>();
+    for (const sample of samples) {
+      const rows = byFunction.get(sample.functionName) ?? [];
+      rows.push(sample);
+      byFunction.set(sample.functionName, rows);
+    }
+
+    // 3. PERCENTILES
+    const sorted = (values: (number | undefined)[]) =>
+      values.filter((n): n is number => n !== undefined).sort((a, b) => a - b);
+
+    const functions: FunctionReport[] = [...byFunction.entries()].map(
+      ([functionName, rows]) => {
+        const durations = sorted(rows.filter((r) => r.ok).map((r) => r.durationMs));
+        const docsRead = sorted(rows.map((r) => r.docsRead));
+        const bytes = sorted(rows.map((r) => r.resultBytes));
+        return {
+          functionName,
+          kind: rows[0].kind,
+          count: rows.length,
+          errors: rows.filter((r) => !r.ok).length,
+          p50Ms: percentile(durations, 0.5),
+          p95Ms: percentile(durations, 0.95),
+          maxMs: durations.length > 0 ? durations[durations.length - 1] : null,
+          p50DocsRead: percentile(docsRead, 0.5),
+          p95DocsRead: percentile(docsRead, 0.95),
+          p95ResultBytes: percentile(bytes, 0.95),
+        };
+      }
+    );
+
+    functions.sort((a, b) => (b.p95Ms ?? -1) - (a.p95Ms ?? -1));
+
+    return {
+      samples: samples.length,
+      truncated: samples.length === MAX_REPORT_SAMPLES,
+      functions,
+    };
+  },
+});
+
+/**
+ * Run an instrumented query's handler with read counting
+ *
+ * Throws if the query fails (e.g. exceeds read limits)
+ */
+export const countReads = internalQuery({
+  args: {
+    functionName: v.string(), // "queries/events:stats"
+    args: v.any(),
+  },
+  handler: async (ctx, args): Promise<{ docsRead: number; resultBytes: number }> => {
+    return await measureQuery(ctx, args.functionName, args.args);
+  },
+});
@@ -2,7 +2,15 @@ import { query } from "../_generated/server";
 import { v } from "convex/values";
 import type { QueryCtx } from "../_generated/server";
 import type { Id } from "../_generated/dataModel";
-import type { Doc } from "../_generated/dataModel";
+import { getGroupCounters, sumDailyCounters } from "../lib/rollups";
+import {
+  getPeriodForMetric,
+  getUsageBuckets,
+  getUsageForPeriod,
+  type UsagePeriod
+} from "../lib/usage";
+import { boundedLimit } from "../lib/pagination";
+import { instrumentedQuery } from "../lib/instrumentation";
 
 /**
  * PHASE 3: QUOTA ENFORCEMENT QUERIES
@@ -18,13 +26,14 @@ import type { Doc } from "../_generated/dataModel";
  *
  * Convex 1.5+ Patterns:
  * - Use .withIndex() for efficient lookups
- * - Filter in code after .collect() (NOT chained to index)
+ * - Read counters from rollups (lib/rollups.ts) instead of scanning the group
+ * - Read metered usage (getMeteredUsage) from sharded counters (lib/usage.ts)
  * - No ctx.runQuery() - call helper functions directly
  * - All price calculations use number types
  *
  * Performance:
- * - < 50ms for quota lookups (cached index)
- * - < 100ms for full quota check with calculations
+ * - Quota checks read up to ROLLUP_SHARDS counter rows plus the daily
+ *   rollups of the last 30 days, regardless of group size
  */
 
 /**
@@ -74,61 +83,25 @@ async function getGroupQuotasHandler(ctx: QueryCtx, args: { groupId: Id<"groups"
   const plan = (group.settings?.plan || "starter") as keyof typeof QUOTA_LIMITS;
   const limits = QUOTA_LIMITS[plan];
 
-  // 2. COUNT USERS (members - count user entities in group)
-  // Correct Convex 1.5+ pattern: collect first, then filter in code
-  const allEntities = await ctx.db
-    .query("entities")
-    .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-    .collect();
-  const userEntities = allEntities.filter((e) => e.type === "user");
-  const userCount = userEntities.length;
-
-  // 3. CALCULATE STORAGE (reuse allEntities from step 2)
-  const storageBytes = allEntities.reduce((sum: number, e: Doc<"entities">) => {
-    const json = JSON.stringify(e.properties);
-    return sum + (1024 + json.length); // 1KB base + properties size
-  }, 0);
-  const storageGB = storageBytes / (1024 * 1024 * 1024);
-
-  // Add knowledge embeddings storage
-  const knowledge = await ctx.db
-    .query("knowledge")
-    .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-    .collect();
-
-  const embeddingStorageBytes = knowledge.reduce((sum: number, k: Doc<"knowledge">) => {
-    if (k.embedding) {
-      // Each embedding is array of numbers (typically 1536 or 3072 dimensions)
-      // Rough: 8 bytes per number
-      return sum + (k.embedding.length * 8);
-    }
-    return sum;
-  }, 0);
+  // 2. READ GROUP COUNTERS (maintained by lib/rollups.ts on every write)
+  const counters = await getGroupCounters(ctx, args.groupId);
+  const userCount = counters.userCount;
 
-  const totalStorageGB = (storageBytes + embeddingStorageBytes) / (1024 * 1024 * 1024);
+  // 3. CALCULATE STORAGE (entity properties + knowledge embeddings)
+  const totalStorageGB = (counters.entityBytes + counters.embeddingBytes) / (1024 * 1024 * 1024);
 
-  // 4. COUNT API CALLS THIS MONTH
+  // 4. COUNT API CALLS THIS MONTH (daily buckets, day granularity)
+  // Payment events stand in for API calls: nothing records
+  // api_calls_per_month through recordUsage on the request path yet, so the
+  // metered counter (getMeteredUsage) would always read ~0
   const now = Date.now();
   const monthAgo = now - 30 * 24 * 60 * 60 * 1000;
-
-  const monthlyEvents = await ctx.db
-    .query("events")
-    .withIndex("group_timestamp", (q) =>
-      q.eq("groupId", args.groupId).gt("timestamp", monthAgo)
-    )
-    .collect();
-
-  // Count payment events as API calls
-  const apiCallCount = monthlyEvents.filter((e) => e.type === "payment_processed").length;
+  const monthly = await sumDailyCounters(ctx, args.groupId, monthAgo);
+  const apiCallCount = monthly.paymentCount;
 
   // 5. COUNT ENTITIES AND CONNECTIONS
-  const entityCount = allEntities.length;
-
-  const connections = await ctx.db
-    .query("connections")
-    .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-    .collect();
-  const connectionCount = connections.length;
+  const entityCount = counters.entityCount;
+  const connectionCount = counters.connectionCount;
 
   // 6. BUILD QUOTA STATUS
   const quotas = {
@@ -225,7 +198,7 @@ async function getGroupQuotasHandler(ctx: QueryCtx, args: { groupId: Id<"groups"
  * - entities_total: COUNT of entities in group
  * - connections_total: COUNT of connections in group
  */
-export const getGroupQuotas = query({
+export const getGroupQuotas = instrumentedQuery("queries/quotas:getGroupQuotas", {
   args: {
     groupId: v.id("groups")
   },
@@ -261,13 +234,9 @@ export const checkCanCreateEntities = query({
     const plan = (group.settings?.plan || "starter") as keyof typeof QUOTA_LIMITS;
     const limits = QUOTA_LIMITS[plan];
 
-    // Count current entities
-    const entities = await ctx.db
-      .query("entities")
-      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-      .collect();
-
-    const currentCount = entities.length;
+    // Count current entities (rollup, not a scan)
+    const counters = await getGroupCounters(ctx, args.groupId);
+    const currentCount = counters.entityCount;
     const limit = limits.entities_total;
 
     // Check if we can create
@@ -314,31 +283,9 @@ export const checkCanStore = query({
     const plan = (group.settings?.plan || "starter") as keyof typeof QUOTA_LIMITS;
     const limits = QUOTA_LIMITS[plan];
 
-    // Calculate current storage
-    const entities = await ctx.db
-      .query("entities")
-      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-      .collect();
-
-    const storageBytes = entities.reduce((sum, e) => {
-      const json = JSON.stringify(e.properties);
-      return sum + (1024 + json.length);
-    }, 0);
-
-    // Add knowledge embeddings
-    const knowledge = await ctx.db
-      .query("knowledge")
-      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-      .collect();
-
-    const embeddingBytes = knowledge.reduce((sum, k) => {
-      if (k.embedding) {
-        return sum + (k.embedding.length * 8);
-      }
-      return sum;
-    }, 0);
-
-    const currentBytes = storageBytes + embeddingBytes;
+    // Current storage: entity properties + knowledge embeddings (rollup)
+    const counters = await getGroupCounters(ctx, args.groupId);
+    const currentBytes = counters.entityBytes + counters.embeddingBytes;
     const limitBytes = limits.storage_gb * (1024 * 1024 * 1024);
 
     // Check if we can store
@@ -399,6 +346,57 @@ export const getQuotaStatus = query({
   }
 });
 
+/**
+ * Get metered usage for one metric
+ *
+ * Current period total (compacted bucket + live shards), plus compacted
+ * history when `from` is given (oldest first).
+ */
+export const getMeteredUsage = query({
+  args: {
+    groupId: v.id("groups"),
+    metric: v.string(),
+    period: v.optional(v.union(
+      v.literal("hourly"),
+      v.literal("daily"),
+      v.literal("monthly"),
+      v.literal("annual")
+    )),
+    from: v.optional(v.number()), // History start (bucket periodStart >= from)
+    limit: v.optional(v.number())
+  },
+  handler: async (ctx, args) => {
+    const period: UsagePeriod = args.period || getPeriodForMetric(args.metric);
+    const current = await getUsageForPeriod(ctx, args.groupId, args.metric, period);
+
+    const history =
+      args.from !== undefined && period !== "annual"
+        ? await getUsageBuckets(
+            ctx,
+            args.groupId,
+            args.metric,
+            period,
+            args.from,
+            current.periodStart,
+            boundedLimit(args.limit, 100)
+          )
+        : [];
+
+    return {
+      metric: args.metric,
+      period,
+      current: current.value,
+      periodStart: current.periodStart,
+      periodEnd: current.periodEnd,
+      history: history.map((bucket) => ({
+        periodStart: bucket.periodStart,
+        periodEnd: bucket.periodEnd,
+        value: bucket.value
+      }))
+    };
+  }
+});
+
 /**
  * Get quota upgrade pricing info
  *
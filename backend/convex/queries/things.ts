@@ -1,5 +1,8 @@
 import { query } from "../_generated/server";
+import { paginationOptsValidator } from "convex/server";
 import { v } from "convex/values";
+import { MAX_LIST_LIMIT, boundedLimit, clampPaginationOpts } from "../lib/pagination";
+import { instrumentedQuery } from "../lib/instrumentation";
 
 /**
  * DIMENSION 3: THINGS - Query Layer
@@ -11,7 +14,7 @@ import { v } from "convex/values";
  * Supports:
  * - List by type with optional filtering (users, products, articles, etc.)
  * - Dashboard metrics (count by type, status, creation time)
- * - Full-text search on thing names
+ * - Full-text search on thing names (search_name index)
  * - Activity timeline (recent things, recently updated)
  * - Relationships (thing with all connections from/to)
  *
@@ -21,6 +24,9 @@ import { v } from "convex/values";
  * - Use by_created/by_updated for timeline queries
  *
  * Query Pattern: Always filter by groupId first, then type/status
+ *
+ * Bounds: array results are capped at MAX_LIST_LIMIT; use listPaginated
+ * (paginationOpts) to page through large groups
  */
 
 /**
@@ -29,7 +35,7 @@ import { v } from "convex/values";
  * CRITICAL: Uses group_type index for efficient filtering
  * Always scoped by groupId for multi-tenant isolation
  */
-export const list = query({
+export const list = instrumentedQuery("queries/things:list", {
   args: {
     groupId: v.id("groups"),
     type: v.optional(v.string()),
@@ -37,34 +43,77 @@ export const list = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // CRITICAL: Use group_type index for efficiency
-    let results;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
 
+    // CRITICAL: Use group_type index for efficiency
     if (args.type) {
-      results = await ctx.db
+      return await ctx.db
         .query("entities")
         .withIndex("group_type", (q) =>
           q.eq("groupId", args.groupId).eq("type", args.type as any)
         )
-        .collect();
-    } else {
-      results = await ctx.db
-        .query("entities")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
+        .filter((q) => (args.status ? q.eq(q.field("status"), args.status) : true))
+        .take(limit);
     }
 
-    // Filter by status if provided
     if (args.status) {
-      results = results.filter(e => e.status === args.status);
+      return await ctx.db
+        .query("entities")
+        .withIndex("group_status", (q) =>
+          q.eq("groupId", args.groupId).eq("status", args.status as any)
+        )
+        .take(limit);
+    }
+
+    return await ctx.db
+      .query("entities")
+      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+      .take(limit);
+  }
+});
+
+/**
+ * List things in a group one page at a time (most recent first)
+ *
+ * Same filters as list; returns { page, isDone, continueCursor } for
+ * usePaginatedQuery / infinite scroll
+ */
+export const listPaginated = query({
+  args: {
+    groupId: v.id("groups"),
+    type: v.optional(v.string()),
+    status: v.optional(v.string()),
+    paginationOpts: paginationOptsValidator
+  },
+  handler: async (ctx, args) => {
+    const opts = clampPaginationOpts(args.paginationOpts);
+
+    if (args.type) {
+      return await ctx.db
+        .query("entities")
+        .withIndex("group_type", (q) =>
+          q.eq("groupId", args.groupId).eq("type", args.type as any)
+        )
+        .order("desc")
+        .filter((q) => (args.status ? q.eq(q.field("status"), args.status) : true))
+        .paginate(opts);
     }
 
-    // Apply limit if provided
-    if (args.limit) {
-      results = results.slice(0, args.limit);
+    if (args.status) {
+      return await ctx.db
+        .query("entities")
+        .withIndex("group_status", (q) =>
+          q.eq("groupId", args.groupId).eq("status", args.status as any)
+        )
+        .order("desc")
+        .paginate(opts);
     }
 
-    return results;
+    return await ctx.db
+      .query("entities")
+      .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .paginate(opts);
   }
 });
 
@@ -93,7 +142,7 @@ export const getById = query({
 /**
  * Search entities by name
  *
- * Case-insensitive search scoped to group
+ * Full-text search (search_name index) scoped to group, relevance ordered
  */
 export const search = query({
   args: {
@@ -103,35 +152,17 @@ export const search = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    // Get entities for group
-    let results;
-
-    if (args.type) {
-      results = await ctx.db
-        .query("entities")
-        .withIndex("group_type", (q) =>
-          q.eq("groupId", args.groupId).eq("type", args.type as any)
-        )
-        .collect();
-    } else {
-      results = await ctx.db
-        .query("entities")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
-    }
-
-    // Search by name (case-insensitive)
-    const searchLower = args.query.toLowerCase();
-    results = results.filter(e =>
-      e.name.toLowerCase().includes(searchLower)
-    );
-
-    // Apply limit
-    if (args.limit) {
-      results = results.slice(0, args.limit);
+    if (args.query.trim().length === 0) {
+      return [];
     }
 
-    return results;
+    return await ctx.db
+      .query("entities")
+      .withSearchIndex("search_name", (q) => {
+        const scoped = q.search("name", args.query).eq("groupId", args.groupId);
+        return args.type ? scoped.eq("type", args.type as any) : scoped;
+      })
+      .take(args.limit || 50);
   }
 });
 
@@ -161,14 +192,14 @@ export const getWithConnections = query({
       .query("connections")
       .withIndex("from_entity", (q) => q.eq("fromEntityId", args.entityId))
       .filter((q) => q.eq(q.field("groupId"), entity.groupId))
-      .collect();
+      .take(MAX_LIST_LIMIT);
 
     // Get connections TO this entity
     const connectionsTo = await ctx.db
       .query("connections")
       .withIndex("to_entity", (q) => q.eq("toEntityId", args.entityId))
       .filter((q) => q.eq(q.field("groupId"), entity.groupId))
-      .collect();
+      .take(MAX_LIST_LIMIT);
 
     return {
       entity,
@@ -193,17 +224,14 @@ export const getActivity = query({
     const entity = await ctx.db.get(args.entityId);
     if (!entity) return null;
 
-    let q = ctx.db
+    // Most recent first (events are inserted in timestamp order)
+    const events = await ctx.db
       .query("events")
-      .withIndex("by_target", (q) => q.eq("targetId", args.entityId));
-
-    const events = await q.collect();
+      .withIndex("by_target", (q) => q.eq("targetId", args.entityId))
+      .order("desc")
+      .take(boundedLimit(args.limit, MAX_LIST_LIMIT));
 
-    // Sort by timestamp descending (most recent first)
-    const sorted = events.sort((a, b) => b.timestamp - a.timestamp);
-
-    // Apply limit if provided
-    return args.limit ? sorted.slice(0, args.limit) : sorted;
+    return events.sort((a, b) => b.timestamp - a.timestamp);
   }
 });
 
@@ -212,7 +240,7 @@ export const getActivity = query({
  *
  * Useful for dashboard statistics
  */
-export const countByType = query({
+export const countByType = instrumentedQuery("queries/things:countByType", {
   args: {
     groupId: v.id("groups")
   },
@@ -282,27 +310,25 @@ export const getRecent = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    let entities;
+    const limit = boundedLimit(args.limit, MAX_LIST_LIMIT);
 
+    // group_type orders by insertion time, which tracks createdAt
     if (args.type) {
-      entities = await ctx.db
+      return await ctx.db
         .query("entities")
         .withIndex("group_type", (q) =>
           q.eq("groupId", args.groupId).eq("type", args.type as any)
         )
-        .collect();
-    } else {
-      entities = await ctx.db
-        .query("entities")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
+        .order("desc")
+        .take(limit);
     }
 
-    // Sort by createdAt descending (most recent first)
-    const sorted = entities.sort((a, b) => b.createdAt - a.createdAt);
-
-    // Apply limit if provided
-    return args.limit ? sorted.slice(0, args.limit) : sorted;
+    // group_created index is already ordered by createdAt
+    return await ctx.db
+      .query("entities")
+      .withIndex("group_created", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .take(limit);
   }
 });
 
@@ -318,27 +344,13 @@ export const getRecentlyUpdated = query({
     limit: v.optional(v.number())
   },
   handler: async (ctx, args) => {
-    let entities;
-
-    if (args.type) {
-      entities = await ctx.db
-        .query("entities")
-        .withIndex("group_type", (q) =>
-          q.eq("groupId", args.groupId).eq("type", args.type as any)
-        )
-        .collect();
-    } else {
-      entities = await ctx.db
-        .query("entities")
-        .withIndex("by_group", (q) => q.eq("groupId", args.groupId))
-        .collect();
-    }
-
-    // Sort by updatedAt descending (most recent first)
-    const sorted = entities.sort((a, b) => b.updatedAt - a.updatedAt);
-
-    // Apply limit if provided
-    return args.limit ? sorted.slice(0, args.limit) : sorted;
+    // group_updated index is already ordered by updatedAt
+    return await ctx.db
+      .query("entities")
+      .withIndex("group_updated", (q) => q.eq("groupId", args.groupId))
+      .order("desc")
+      .filter((q) => (args.type ? q.eq(q.field("type"), args.type) : true))
+      .take(boundedLimit(args.limit, MAX_LIST_LIMIT));
   }
 });
 
@@ -350,23 +362,20 @@ export const listContacts = query({
   args: {
     groupId: v.id("groups"),
     status: v.optional(v.string()),
+    limit: v.optional(v.number()),
   },
   handler: async (ctx, args) => {
-    let q = ctx.db
+    // Most recent first
+    return await ctx.db
       .query("entities")
       .withIndex("group_type", (q) =>
         q.eq("groupId", args.groupId).eq("type", "contact_submission")
-      );
-
-    const contacts = await q.collect();
-
-    if (args.status) {
-      return contacts.filter(
-        (c) => c.properties?.status === args.status
-      );
-    }
-
-    return contacts.sort((a, b) => b.createdAt - a.createdAt);
+      )
+      .order("desc")
+      .filter((q) =>
+        args.status ? q.eq(q.field("properties.status"), args.status) : true
+      )
+      .take(boundedLimit(args.limit, MAX_LIST_LIMIT));
   },
 });
 
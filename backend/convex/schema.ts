@@ -9,6 +9,7 @@ import {
   type ConnectionType,
   type EventType,
 } from "./types/ontology";
+import { EMBEDDING_DIMENSIONS } from "./lib/embeddings";
 
 // ============================================================================
 // Ontology Composition System
@@ -78,7 +79,24 @@ export default defineSchema({
     .index("by_type", ["type"])
     .index("by_parent", ["parentGroupId"])
     .index("by_status", ["status"])
-    .index("by_created", ["createdAt"]),
+    .index("by_created", ["createdAt"])
+    .searchIndex("search_name", {
+      searchField: "name",
+      filterFields: ["type", "status"],
+    }),
+
+  // Ancestor/descendant pairs of the group tree (see lib/groupClosure.ts)
+  // One row per pair plus a depth-0 self row, so hierarchy reads are a
+  // single index range instead of a parentGroupId walk
+  groupClosure: defineTable({
+    ancestorId: v.id("groups"),
+    descendantId: v.id("groups"),
+    depth: v.number(), // 0 = self, 1 = child, 2 = grandchild, ...
+    descendantStatus: v.union(v.literal("active"), v.literal("archived")),
+  })
+    .index("ancestor_depth", ["ancestorId", "depth"])
+    .index("descendant_depth", ["descendantId", "depth"])
+    .index("descendant_ancestor", ["descendantId", "ancestorId"]),
 
   // ========================
   // Dimension 3: Things (Entities)
@@ -110,7 +128,11 @@ export default defineSchema({
     .index("group_type", ["groupId", "type"])
     .index("group_status", ["groupId", "status"])
     .index("group_created", ["groupId", "createdAt"])
-    .index("group_updated", ["groupId", "updatedAt"]),
+    .index("group_updated", ["groupId", "updatedAt"])
+    .searchIndex("search_name", {
+      searchField: "name",
+      filterFields: ["groupId", "type", "status"],
+    }),
 
   // ========================
   // Dimension 4: Connections
@@ -188,6 +210,7 @@ export default defineSchema({
     sourceField: v.optional(v.string()),
     chunk: v.optional(v.any()),
     labels: v.optional(v.array(v.string())),
+    searchText: v.optional(v.string()), // text + labels, kept in sync by lib/rollups write helpers
     metadata: v.optional(v.any()),
     createdAt: v.number(),
     updatedAt: v.number(),
@@ -199,7 +222,16 @@ export default defineSchema({
     .index("by_created", ["createdAt"])
     .index("by_updated", ["updatedAt"])
     .index("group_type", ["groupId", "knowledgeType"])
-    .index("group_source", ["groupId", "sourceThingId"]),
+    .index("group_source", ["groupId", "sourceThingId"])
+    .vectorIndex("by_embedding", {
+      vectorField: "embedding",
+      dimensions: EMBEDDING_DIMENSIONS, // See lib/embeddings.ts
+      filterFields: ["groupId", "knowledgeType"],
+    })
+    .searchIndex("search_text", {
+      searchField: "searchText",
+      filterFields: ["groupId", "knowledgeType"],
+    }),
 
   thingKnowledge: defineTable({
     thingId: v.id("entities"),
@@ -519,11 +551,12 @@ export default defineSchema({
   // ========================
   // PHASE 3: USAGE QUOTA TRACKING
   // Track resource usage per metric per group per period
+  // Compacted buckets (see lib/usage.ts); live writes go to usageShards
   // ========================
   usage: defineTable({
     groupId: v.id("groups"), // REQUIRED: which group this usage belongs to
     metric: v.string(), // "users", "storage_gb", "api_calls", "entities_total", "connections_total"
-    period: v.string(), // "daily", "monthly", "annual" - for resetting counters
+    period: v.string(), // "hourly", "daily", "monthly" bucket (UTC)
     value: v.number(), // Current usage value
     limit: v.number(), // Quota limit for this metric/period
     timestamp: v.number(), // When this usage snapshot was recorded
@@ -534,5 +567,154 @@ export default defineSchema({
     .index("by_group_period", ["groupId", "period"])
     .index("by_group_metric", ["groupId", "metric"])
     .index("by_group_metric_time", ["groupId", "metric", "timestamp"])
+    .index("group_metric_period", ["groupId", "metric", "period", "periodStart"])
+    .index("by_timestamp", ["timestamp"]),
+
+  // Live usage counters: USAGE_SHARDS rows per group/metric/hour so
+  // concurrent writers for one tenant do not conflict. Folded into usage
+  // buckets and deleted by the hourly compaction (crons.ts)
+  usageShards: defineTable({
+    groupId: v.id("groups"),
+    metric: v.string(),
+    hour: v.number(), // UTC start of the hour
+    shard: v.number(), // 0..USAGE_SHARDS-1, picked at random per write
+    value: v.number(),
+    updatedAt: v.number(),
+  })
+    .index("group_metric_hour", ["groupId", "metric", "hour", "shard"])
+    .index("by_hour", ["hour"]),
+
+  // ========================
+  // PHASE 3: ROLLUPS
+  // Incrementally maintained aggregates (see lib/rollups.ts)
+  // Written in the same transaction as the source rows, so computed stats
+  // and quota checks read O(1) documents instead of scanning the group.
+  // Group and daily counters are split over ROLLUP_SHARDS rows (one picked
+  // at random per write) and summed on read, so concurrent writers in one
+  // group do not conflict on a single document
+  // ========================
+  groupRollups: defineTable({
+    groupId: v.id("groups"),
+    shard: v.number(), // 0..ROLLUP_SHARDS-1
+    entityCount: v.number(), // All entities in group (including archived)
+    userCount: v.number(), // Entities with type "user"
+    connectionCount: v.number(),
+    knowledgeCount: v.number(),
+    entityBytes: v.number(), // SUM of 1KB base + JSON size of properties
+    embeddingBytes: v.number(), // SUM of embedding length * 8 bytes
+    eventCount: v.number(), // All-time events
+    updatedAt: v.number(),
+    reconciledAt: v.optional(v.number()), // Last full recount (backfill job)
+  })
+    .index("group_shard", ["groupId", "shard"]),
+
+  groupDailyRollups: defineTable({
+    groupId: v.id("groups"),
+    day: v.number(), // UTC midnight of the bucket
+    shard: v.number(), // 0..ROLLUP_SHARDS-1
+    eventCount: v.number(),
+    paymentCount: v.number(), // payment_processed events
+    revenue: v.number(), // SUM of payment_processed metadata.amount
+    updatedAt: v.number(),
+  })
+    .index("group_day", ["groupId", "day", "shard"]),
+
+  entityRollups: defineTable({
+    entityId: v.id("entities"),
+    groupId: v.id("groups"),
+    entityType: v.string(),
+    inboundCount: v.number(), // Connections where entity is target
+    outboundCount: v.number(), // Connections where entity is source
+    followerCount: v.number(), // Inbound "created_by" connections
+    authoredCount: v.number(), // Outbound "created_by" connections
+    eventCount: v.number(), // Events where entity is actor
+    eventsByType: v.any(), // Record<eventType, count>
+    totalRevenue: v.number(), // SUM of payment_processed amounts as actor
+    lastActive: v.optional(v.number()), // MAX timestamp of events as actor
+    updatedAt: v.number(),
+  })
+    .index("by_entity", ["entityId"])
+    .index("group_inbound", ["groupId", "inboundCount"])
+    .index("group_last_active", ["groupId", "lastActive"]),
+
+  // ========================
+  // PHASE 3: JOBS
+  // Chunked, resumable bulk work (see lib/jobs.ts)
+  // Imports and cascades run as scheduled transactions of chunkSize items;
+  // progress and resume cursors live on the job row
+  // ========================
+  jobs: defineTable({
+    groupId: v.id("groups"),
+    kind: v.union(
+      v.literal("import_things"),
+      v.literal("import_connections"),
+      v.literal("update_things"),
+      v.literal("cascade_delete"),
+    ),
+    status: v.union(
+      v.literal("staging"), // Accepting appendItems
+      v.literal("queued"), // Waiting for a run slot in its group
+      v.literal("running"),
+      v.literal("completed"),
+      v.literal("failed"),
+      v.literal("cancelled"),
+    ),
+    options: v.optional(v.any()), // Import options (skipValidation, defaultStatus)
+    targetId: v.optional(v.id("entities")), // cascade_delete: the deleted thing
+    phase: v.optional(v.string()), // cascade_delete: current CascadePhase
+    cursor: v.union(v.string(), v.null()), // Resume point inside the phase
+    nextIndex: v.number(), // Imports: next jobItems index to process
+    total: v.number(), // Imports: staged items
+    processed: v.number(),
+    succeeded: v.number(),
+    failed: v.number(),
+    errors: v.array(v.object({ index: v.number(), error: v.string() })), // First MAX_JOB_ERRORS
+    cascadeCounts: v.optional(v.object({
+      connectionCount: v.number(),
+      eventCount: v.number(),
+      associationCount: v.number(),
+    })),
+    chunkSize: v.number(),
+    throttleMs: v.number(), // Delay between chunks
+    generation: v.number(), // Bumped on retry; stale scheduled chunks no-op
+    attempts: v.number(), // Retries so far
+    chunks: v.number(), // Chunks committed
+    scheduledId: v.optional(v.id("_scheduled_functions")), // Next chunk
+    lastError: v.optional(v.string()),
+    createdBy: v.optional(v.id("entities")),
+    createdAt: v.number(),
+    updatedAt: v.number(),
+    startedAt: v.optional(v.number()),
+    completedAt: v.optional(v.number()),
+  })
+    .index("group_status", ["groupId", "status"])
+    .index("group_created", ["groupId", "createdAt"]),
+
+  jobItems: defineTable({
+    jobId: v.id("jobs"),
+    index: v.number(), // Position in the import (error reports use it)
+    data: v.any(), // Validated on append against the job kind
+  })
+    .index("job_index", ["jobId", "index"]),
+
+  // ========================
+  // PHASE 3: FUNCTION METRICS
+  // Sampled costs of instrumented functions (see lib/instrumentation.ts)
+  // Pruned after METRICS_RETENTION_MS by the daily cron (crons.ts)
+  // ========================
+  functionMetrics: defineTable({
+    functionName: v.string(), // "queries/events:stats"
+    kind: v.union(v.literal("query"), v.literal("mutation"), v.literal("action")),
+    durationMs: v.optional(v.number()), // Actions and bench runs only
+    docsRead: v.optional(v.number()),
+    docsWritten: v.optional(v.number()),
+    resultBytes: v.number(),
+    ok: v.boolean(),
+    error: v.optional(v.string()),
+    label: v.optional(v.string()), // "bench:10000"; absent for live samples
+    timestamp: v.number(),
+  })
+    .index("function_time", ["functionName", "timestamp"])
+    .index("label_time", ["label", "timestamp"])
     .index("by_timestamp", ["timestamp"]),
 });
@@ -0,0 +1,211 @@
+/**
+ * Bulk job benchmark: 100K things + 100K connections, then a hub cascade
+ *
+ * Runs against a real deployment (local `convex dev` backend recommended):
+ *
+ *   CONVEX_URL=http://127.0.0.1:3210 npx tsx scripts/bench-bulk-import.ts
+ *
+ * Options (env):
+ *   BENCH_THINGS       things to import                      (default 100000)
+ *   BENCH_CONNECTIONS  connections to import                 (default 100000)
+ *   BENCH_HUB          connections attached to one hub thing (default 10000)
+ *   BENCH_CHUNK        job chunkSize                         (default 200)
+ *   BENCH_THROTTLE     job throttleMs                        (default 0)
+ *
+ * Phases (each reported with wall time and items/sec):
+ * 1. import_things job
+ * 2. import_connections job: BENCH_HUB edges from one hub thing, the rest
+ *    a chain over the remaining things
+ * 3. deleteThing(hub): cascade_delete job removing the hub's connections
+ *
+ * Staging time (appendItems) is reported separately from run time so the
+ * chunk loop itself is measured.
+ */
+
+import { ConvexHttpClient } from "convex/browser";
+import { api } from "../convex/_generated/api";
+import type { Id } from "../convex/_generated/dataModel";
+
+// ============================================================================
+// CONFIG
+// ============================================================================
+
+const CONVEX_URL = process.env.CONVEX_URL;
+const THINGS = parseInt(process.env.BENCH_THINGS || "100000", 10);
+const CONNECTIONS = parseInt(process.env.BENCH_CONNECTIONS || "100000", 10);
+const HUB = parseInt(process.env.BENCH_HUB || "10000", 10);
+const CHUNK = parseInt(process.env.BENCH_CHUNK || "200", 10);
+const THROTTLE = parseInt(process.env.BENCH_THROTTLE || "0", 10);
+
+const APPEND_BATCH = 1000; // MAX_APPEND_ITEMS
+const LIST_PAGE = 500; // MAX_PAGE_SIZE
+const POLL_MS = 1000;
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+function seconds(ms: number): string {
+  return `${(ms / 1000).toFixed(1)}s`;
+}
+
+/** Stage count items in appendItems-sized batches; returns elapsed ms */
+async function stage<T>(
+  count: number,
+  item: (i: number) => T,
+  append: (items: T[]) => Promise<unknown>
+): Promise<number> {
+  const started = Date.now();
+  for (let from = 0; from < count; from += APPEND_BATCH) {
+    const items: T[] = [];
+    for (let i = from; i < Math.min(count, from + APPEND_BATCH); i++) {
+      items.push(item(i));
+    }
+    await append(items);
+  }
+  return Date.now() - started;
+}
+
+/** Poll a job until it finishes; returns wall time from start */
+async function waitForJob(client: ConvexHttpClient, jobId: Id<"jobs">, label: string) {
+  const started = Date.now();
+  let lastPercent = -1;
+
+  for (;;) {
+    const job = await client.query(api.queries.jobs.get, { jobId });
+    if (!job) {
+      throw new Error(`Job ${jobId} disappeared`);
+    }
+
+    if (job.percent !== lastPercent) {
+      lastPercent = job.percent;
+      process.stdout.write(`\r  ${label}: ${job.percent}% (${job.processed} items, ${job.chunks} chunks)   `);
+    }
+
+    if (job.status === "completed" || job.status === "failed" || job.status === "cancelled") {
+      process.stdout.write("\n");
+      return { job, ms: Date.now() - started };
+    }
+    if (job.stalled) {
+      console.log(`\n  ${label}: stalled (${job.scheduledError}), retrying with smaller chunks`);
+      await client.mutation(api.mutations.jobs.retry, { jobId });
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, POLL_MS));
+  }
+}
+
+function report(label: string, items: number, stagingMs: number, runMs: number, failed: number) {
+  console.log(
+    `  ${label}: ${items.toLocaleString()} items  staging ${seconds(stagingMs)}  ` +
+      `run ${seconds(runMs)}  ${Math.round(items / (runMs / 1000)).toLocaleString()} items/s  ` +
+      `failed ${failed}`
+  );
+}
+
+async function listThingIds(
+  client: ConvexHttpClient,
+  groupId: Id<"groups">
+): Promise<Id<"entities">[]> {
+  const ids: Id<"entities">[] = [];
+  let cursor: string | null = null;
+  for (;;) {
+    const result: { page: Array<{ _id: Id<"entities"> }>; isDone: boolean; continueCursor: string } =
+      await client.query(api.queries.things.listPaginated, {
+        groupId,
+        type: "note",
+        paginationOpts: { cursor, numItems: LIST_PAGE },
+      });
+    ids.push(...result.page.map((thing) => thing._id));
+    if (result.isDone) return ids;
+    cursor = result.continueCursor;
+  }
+}
+
+// ============================================================================
+// MAIN
+// ============================================================================
+
+async function main() {
+  if (!CONVEX_URL) {
+    throw new Error("CONVEX_URL is required (e.g. http://127.0.0.1:3210)");
+  }
+  const client = new ConvexHttpClient(CONVEX_URL);
+
+  const slug = `bench-jobs-${Date.now()}`;
+  const groupId = await client.mutation(api.mutations.groups.create, {
+    slug,
+    name: "Bulk job benchmark",
+    type: "organization",
+  });
+  console.log(`Benchmark group ${slug} (${groupId}), chunkSize ${CHUNK}, throttle ${THROTTLE}ms`);
+
+  // 1. IMPORT THINGS
+  console.log(`\n=== import ${THINGS.toLocaleString()} things ===`);
+  const thingsJob = await client.mutation(api.mutations.jobs.create, {
+    groupId,
+    kind: "import_things",
+    options: { defaultStatus: "active" },
+    chunkSize: CHUNK,
+    throttleMs: THROTTLE,
+  });
+  const thingsStaging = await stage(
+    THINGS,
+    (i) => ({ type: "note", name: `Bench note ${i}`, properties: { benchIndex: i } }),
+    (things) => client.mutation(api.mutations.jobs.appendItems, { jobId: thingsJob, things })
+  );
+  await client.mutation(api.mutations.jobs.start, { jobId: thingsJob });
+  const things = await waitForJob(client, thingsJob, "things");
+  report("things", THINGS, thingsStaging, things.ms, things.job.failed);
+
+  // 2. IMPORT CONNECTIONS
+  console.log(`\n=== import ${CONNECTIONS.toLocaleString()} connections ===`);
+  const ids = await listThingIds(client, groupId);
+  if (ids.length < 3) {
+    throw new Error(`Need at least 3 things, found ${ids.length}`);
+  }
+  const hub = ids[0];
+  const rest = ids.length - 1;
+
+  const connectionsJob = await client.mutation(api.mutations.jobs.create, {
+    groupId,
+    kind: "import_connections",
+    chunkSize: CHUNK,
+    throttleMs: THROTTLE,
+  });
+  const connectionsStaging = await stage(
+    CONNECTIONS,
+    (i) => {
+      if (i < HUB) {
+        return { fromEntityId: hub, toEntityId: ids[1 + (i % rest)], relationshipType: "posted_in" };
+      }
+      const j = i - HUB;
+      return {
+        fromEntityId: ids[1 + (j % rest)],
+        toEntityId: ids[1 + ((j + 1) % rest)],
+        relationshipType: "posted_in",
+      };
+    },
+    (connections) =>
+      client.mutation(api.mutations.jobs.appendItems, { jobId: connectionsJob, connections })
+  );
+  await client.mutation(api.mutations.jobs.start, { jobId: connectionsJob });
+  const connections = await waitForJob(client, connectionsJob, "connections");
+  report("connections", CONNECTIONS, connectionsStaging, connections.ms, connections.job.failed);
+
+  // 3. CASCADE DELETE THE HUB
+  console.log(`\n=== cascade delete hub (${HUB.toLocaleString()} connections) ===`);
+  const deleted = await client.mutation(api.mutations.cascade.deleteThing, { thingId: hub });
+  const cascade = await waitForJob(client, deleted.cascadeJobId, "cascade");
+  const counts = cascade.job.cascadeCounts;
+  report("cascade", cascade.job.processed, 0, cascade.ms, 0);
+  console.log(
+    `  removed ${counts?.connectionCount ?? 0} connections, archived ${counts?.eventCount ?? 0} events, ` +
+      `unlinked ${counts?.associationCount ?? 0} knowledge items in ${cascade.job.chunks} chunks`
+  );
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
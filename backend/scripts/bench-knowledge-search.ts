@@ -0,0 +1,242 @@
+/**
+ * Knowledge search benchmark: recall + latency at 10K / 100K / 1M chunks
+ *
+ * Runs against a real deployment (local `convex dev` backend recommended):
+ *
+ *   EMBEDDING_PROVIDER=hash  (set on the deployment: npx convex env set ...)
+ *   CONVEX_URL=http://127.0.0.1:3210 npx tsx scripts/bench-knowledge-search.ts
+ *
+ * Options (env):
+ *   BENCH_SIZES    comma-separated corpus sizes     (default 10000,100000,1000000)
+ *   BENCH_QUERIES  queries per size                 (default 50)
+ *   BENCH_K        top-k                            (default 10)
+ *   BENCH_ALPHA    hybrid weight for latency runs   (default 0.7)
+ *
+ * Corpus is deterministic: chunk i always has the same text, so its
+ * embedding can be regenerated locally instead of read back. Sizes are
+ * seeded cumulatively into one fresh group (10K, then +90K, then +900K).
+ *
+ * Recall@k compares vector-only search (alpha = 1) against an exact
+ * brute-force top-k computed locally over the same hash embeddings.
+ * Latency is measured end to end for vector-only and hybrid search.
+ */
+
+import { ConvexHttpClient } from "convex/browser";
+import { api } from "../convex/_generated/api";
+import type { Id } from "../convex/_generated/dataModel";
+import { hashEmbed } from "../convex/lib/embeddings";
+
+// ============================================================================
+// CONFIG
+// ============================================================================
+
+const CONVEX_URL = process.env.CONVEX_URL;
+const SIZES = (process.env.BENCH_SIZES || "10000,100000,1000000")
+  .split(",")
+  .map((s) => parseInt(s, 10))
+  .sort((a, b) => a - b);
+const QUERIES = parseInt(process.env.BENCH_QUERIES || "50", 10);
+const K = parseInt(process.env.BENCH_K || "10", 10);
+const ALPHA = parseFloat(process.env.BENCH_ALPHA || "0.7");
+
+const SEED_BATCH = 100; // Keeps each bulkCreate call well under the argument size limit
+const SEED_CONCURRENCY = 8;
+
+// ============================================================================
+// DETERMINISTIC CORPUS
+// ============================================================================
+
+const VOCABULARY = (
+  "agent course lesson token payment group member creator audience video " +
+  "podcast thread comment invoice refund subscription plan quota storage " +
+  "embedding vector search index ranking recall latency schema mutation query " +
+  "action event connection knowledge label chunk document hierarchy tenant " +
+  "workspace project milestone task review release deploy monitor alert " +
+  "metric dashboard report export import sync webhook integration provider " +
+  "wallet contract governance proposal vote treasury stake reward badge " +
+  "onboarding invite profile avatar setting theme language region currency"
+).split(" ");
+
+/** mulberry32 PRNG: small, fast, seedable */
+function prng(seed: number): () => number {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6d2b79f5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function chunkText(index: number): string {
+  const rand = prng(index + 1);
+  const length = 12 + Math.floor(rand() * 20);
+  const words: string[] = [];
+  for (let i = 0; i < length; i++) {
+    words.push(VOCABULARY[Math.floor(rand() * VOCABULARY.length)]);
+  }
+  return words.join(" ");
+}
+
+/** Query = a contiguous slice of some chunk in the corpus */
+function queryText(corpusSize: number, q: number): string {
+  const rand = prng(0x51ed + q);
+  const words = chunkText(Math.floor(rand() * corpusSize)).split(" ");
+  const start = Math.floor(rand() * Math.max(1, words.length - 6));
+  return words.slice(start, start + 6).join(" ");
+}
+
+// ============================================================================
+// EXACT TOP-K (GROUND TRUTH)
+// ============================================================================
+
+/**
+ * Brute-force top-k for all queries in one pass over the corpus
+ * Hash embeddings are sparse, so only non-zero buckets are multiplied.
+ */
+function exactTopK(corpusSize: number, queries: number[][], k: number): number[][] {
+  const top = queries.map(() => [] as Array<{ index: number; score: number }>);
+
+  for (let i = 0; i < corpusSize; i++) {
+    const vector = hashEmbed(chunkText(i));
+    const nonZero: number[] = [];
+    for (let d = 0; d < vector.length; d++) {
+      if (vector[d] !== 0) nonZero.push(d);
+    }
+
+    queries.forEach((query, q) => {
+      let score = 0;
+      for (const d of nonZero) score += vector[d] * query[d];
+
+      const list = top[q];
+      if (list.length < k || score > list[list.length - 1].score) {
+        list.push({ index: i, score });
+        list.sort((a, b) => b.score - a.score);
+        if (list.length > k) list.pop();
+      }
+    });
+  }
+
+  return top.map((list) => list.map((hit) => hit.index));
+}
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+function percentile(values: number[], p: number): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+}
+
+async function seed(
+  client: ConvexHttpClient,
+  groupId: Id<"groups">,
+  from: number,
+  to: number
+): Promise<void> {
+  const started = Date.now();
+  let next = from;
+
+  const worker = async () => {
+    while (next < to) {
+      const start = next;
+      next = Math.min(to, next + SEED_BATCH);
+      const items = [];
+      for (let i = start; i < Math.min(to, start + SEED_BATCH); i++) {
+        const text = chunkText(i);
+        items.push({
+          type: "chunk" as const,
+          text,
+          embedding: hashEmbed(text),
+          metadata: { benchIndex: i },
+        });
+      }
+      await client.mutation(api.mutations.knowledge.bulkCreate, { groupId, items });
+    }
+  };
+
+  await Promise.all(Array.from({ length: SEED_CONCURRENCY }, worker));
+  console.log(`  seeded ${from}..${to} in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+}
+
+async function timedSearch(
+  client: ConvexHttpClient,
+  groupId: Id<"groups">,
+  query: string,
+  alpha: number
+) {
+  const started = performance.now();
+  const result = await client.action(api.actions.knowledge.semanticSearch, {
+    groupId,
+    query,
+    limit: K,
+    alpha,
+  });
+  return { ms: performance.now() - started, result };
+}
+
+// ============================================================================
+// MAIN
+// ============================================================================
+
+async function main() {
+  if (!CONVEX_URL) {
+    throw new Error("CONVEX_URL is required (e.g. http://127.0.0.1:3210)");
+  }
+  const client = new ConvexHttpClient(CONVEX_URL);
+
+  const slug = `bench-search-${Date.now()}`;
+  const groupId = await client.mutation(api.mutations.groups.create, {
+    slug,
+    name: "Search benchmark",
+    type: "organization",
+  });
+  console.log(`Benchmark group ${slug} (${groupId})`);
+
+  let seeded = 0;
+  for (const size of SIZES) {
+    console.log(`\n=== ${size.toLocaleString()} chunks ===`);
+    await seed(client, groupId, seeded, size);
+    seeded = size;
+
+    const queries = Array.from({ length: QUERIES }, (_, q) => queryText(size, q));
+
+    const truthStarted = Date.now();
+    const truth = exactTopK(size, queries.map((q) => hashEmbed(q)), K);
+    console.log(`  exact top-${K} computed in ${((Date.now() - truthStarted) / 1000).toFixed(1)}s`);
+
+    const vectorLatency: number[] = [];
+    const hybridLatency: number[] = [];
+    let recallSum = 0;
+
+    for (let q = 0; q < queries.length; q++) {
+      const vector = await timedSearch(client, groupId, queries[q], 1);
+      vectorLatency.push(vector.ms);
+
+      // Compare by text: chunk i's text is regenerable, ids are not
+      const found = new Set(vector.result.results.map((hit) => hit.text));
+      const expected = truth[q].map(chunkText);
+      recallSum += expected.filter((text) => found.has(text)).length / expected.length;
+
+      const hybrid = await timedSearch(client, groupId, queries[q], ALPHA);
+      hybridLatency.push(hybrid.ms);
+    }
+
+    console.log(`  recall@${K} (vector): ${(recallSum / queries.length).toFixed(3)}`);
+    console.log(
+      `  latency vector  p50 ${percentile(vectorLatency, 50).toFixed(0)}ms  ` +
+        `p95 ${percentile(vectorLatency, 95).toFixed(0)}ms`
+    );
+    console.log(
+      `  latency hybrid  p50 ${percentile(hybridLatency, 50).toFixed(0)}ms  ` +
+        `p95 ${percentile(hybridLatency, 95).toFixed(0)}ms  (alpha ${ALPHA})`
+    );
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
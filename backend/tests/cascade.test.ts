@@ -0,0 +1,81 @@
+/**
+ * Cascade Tests
+ *
+ * Event archiving (lib/cascade.ts): the actor phase archives only the
+ * deleted thing's own thing_deleted events; the target phase archives
+ * every event aimed at it. Events from other groups are left alone.
+ */
+
+import { describe, expect, it } from "vitest";
+import { runCascadeStep } from "../convex/lib/cascade";
+import { FakeDatabase } from "./helpers/fakeDb";
+
+const INDEXES = {
+  events: {
+    actor_type: ["actorId", "type"],
+    by_target: ["targetId"],
+  },
+};
+
+const GROUP = "groups:1" as any;
+const OTHER_GROUP = "groups:2" as any;
+const THING = "entities:1" as any;
+
+async function seedEvents(db: FakeDatabase) {
+  await db.runMutation(async (ctx) => {
+    const event = (groupId: string, type: string, fields: Record<string, unknown>) =>
+      ctx.db.insert("events", { groupId, type, timestamp: 0, ...fields });
+
+    await event(GROUP, "thing_deleted", { actorId: THING, name: "own-delete" });
+    await event(GROUP, "thing_created", { actorId: THING, name: "own-create" });
+    await event(GROUP, "payment_processed", { actorId: THING, name: "own-payment" });
+    await event(GROUP, "thing_viewed", { targetId: THING, name: "viewed" });
+    await event(OTHER_GROUP, "thing_deleted", { actorId: THING, name: "other-group" });
+  });
+}
+
+function archivedNames(db: FakeDatabase): string[] {
+  return db
+    .all("events")
+    .filter((event) => event.archived)
+    .map((event) => event.name)
+    .sort();
+}
+
+describe("Cascade", () => {
+  describe("archiveEventsStep", () => {
+    it("should archive only thing_deleted events as actor", async () => {
+      const db = new FakeDatabase(INDEXES);
+      await seedEvents(db);
+
+      const result = await db.runMutation((ctx) =>
+        runCascadeStep(ctx as any, "events_actor", {
+          thingId: THING,
+          groupId: GROUP,
+          cursor: null,
+          numItems: 10,
+        })
+      );
+
+      expect(result).toMatchObject({ touched: 1, done: true });
+      expect(archivedNames(db)).toEqual(["own-delete"]);
+    });
+
+    it("should archive every event targeting the thing", async () => {
+      const db = new FakeDatabase(INDEXES);
+      await seedEvents(db);
+
+      const result = await db.runMutation((ctx) =>
+        runCascadeStep(ctx as any, "events_target", {
+          thingId: THING,
+          groupId: GROUP,
+          cursor: null,
+          numItems: 10,
+        })
+      );
+
+      expect(result).toMatchObject({ touched: 1, done: true });
+      expect(archivedNames(db)).toEqual(["viewed"]);
+    });
+  });
+});
@@ -0,0 +1,415 @@
+/**
+ * In-memory stand-in for ctx.db with Convex-style optimistic concurrency
+ *
+ * Enough of the database API for lib/ helpers (get, insert, patch, replace,
+ * delete, query().withIndex().filter().order().collect/take/first/unique/
+ * paginate; filter supports q.eq on q.field and constants;
+ * query().withSearchIndex() matches whole words or prefixes, ranked by the
+ * number of query terms found, and supports collect/take/for await)
+ * plus transactions that conflict like Convex mutations do:
+ *
+ * - every document and index range a transaction reads is recorded
+ * - writes are buffered and applied on commit
+ * - commit fails if anything it read changed since it was read; the
+ *   transaction is then retried from scratch (runMutation)
+ *
+ * Each database call yields to the event loop, so transactions started
+ * together with Promise.all really interleave.
+ */
+
+type Doc = { _id: string; _creationTime: number; [field: string]: any };
+
+type Condition = {
+  field: string;
+  op: "eq" | "gt" | "gte" | "lt" | "lte";
+  value: unknown;
+};
+
+/** Compiled .filter() expression */
+type Predicate = (doc: Doc) => unknown;
+
+/** q for .filter(): field references, constants and eq */
+const filterBuilder = {
+  field: (name: string): Predicate => (doc) => doc[name],
+  eq: (a: unknown, b: unknown): Predicate => (doc) =>
+    compareValues(evaluate(a, doc), evaluate(b, doc)) === 0,
+};
+
+function evaluate(expression: unknown, doc: Doc): unknown {
+  return typeof expression === "function" ? expression(doc) : expression;
+}
+
+/** Index definitions: table -> index name -> fields */
+export type IndexFields = Record<string, Record<string, string[]>>;
+
+type RangeRead = {
+  table: string;
+  conditions: Condition[];
+  ids: string[];
+};
+
+export class ConflictError extends Error {
+  constructor() {
+    super("Transaction conflict (OCC)");
+  }
+}
+
+const tick = () => new Promise<void>((resolve) => setImmediate(resolve));
+
+function compareValues(a: any, b: any): number {
+  if (a === b) return 0;
+  if (a === undefined) return -1;
+  if (b === undefined) return 1;
+  return a < b ? -1 : 1;
+}
+
+/** Lowercased words of a search field or query */
+function searchTerms(text: unknown): string[] {
+  return String(text ?? "").toLowerCase().split(/[^a-z0-9]+/).filter(Boolean);
+}
+
+function matches(doc: Doc, conditions: Condition[]): boolean {
+  return conditions.every(({ field, op, value }) => {
+    const cmp = compareValues(doc[field], value);
+    switch (op) {
+      case "eq":
+        return cmp === 0;
+      case "gt":
+        return cmp > 0;
+      case "gte":
+        return cmp >= 0;
+      case "lt":
+        return cmp < 0;
+      case "lte":
+        return cmp <= 0;
+    }
+  });
+}
+
+export class FakeDatabase {
+  private docs = new Map<string, Doc>();
+  private versions = new Map<string, number>();
+  private nextId = 0;
+  private clock = 0;
+
+  conflicts = 0;
+  commits = 0;
+
+  constructor(private indexes: IndexFields = {}) {}
+
+  /**
+   * Run fn as a mutation: retried on conflict, like Convex does
+   */
+  async runMutation<T>(
+    fn: (ctx: { db: any }) => Promise<T>,
+    maxAttempts = 1000
+  ): Promise<T> {
+    for (let attempt = 1; ; attempt++) {
+      const tx = new Transaction(this);
+      const result = await fn({ db: tx.db });
+      try {
+        await tx.commit();
+        return result;
+      } catch (error) {
+        if (!(error instanceof ConflictError) || attempt >= maxAttempts) {
+          throw error;
+        }
+        this.conflicts++;
+      }
+    }
+  }
+
+  /** Run fn as a query (no writes, no conflicts) */
+  async runQuery<T>(fn: (ctx: { db: any }) => Promise<T>): Promise<T> {
+    return await fn({ db: new Transaction(this).db });
+  }
+
+  /** Committed documents of a table (test assertions) */
+  all(table: string): Doc[] {
+    return [...this.docs.values()].filter((doc) => doc._id.startsWith(`${table}:`));
+  }
+
+  // Internal: used by Transaction
+
+  newId(table: string): string {
+    return `${table}:${++this.nextId}`;
+  }
+
+  now(): number {
+    return ++this.clock;
+  }
+
+  committed(id: string): Doc | undefined {
+    return this.docs.get(id);
+  }
+
+  version(id: string): number {
+    return this.versions.get(id) ?? 0;
+  }
+
+  sortKey(table: string, indexName?: string): string[] {
+    return indexName ? this.indexes[table]?.[indexName] ?? [] : [];
+  }
+
+  apply(writes: Map<string, Doc | null>): void {
+    for (const [id, doc] of writes) {
+      if (doc) {
+        this.docs.set(id, doc);
+      } else {
+        this.docs.delete(id);
+      }
+      this.versions.set(id, this.version(id) + 1);
+    }
+    this.commits++;
+  }
+}
+
+class Transaction {
+  private readVersions = new Map<string, number>();
+  private rangeReads: RangeRead[] = [];
+  private writes = new Map<string, Doc | null>();
+
+  constructor(private store: FakeDatabase) {}
+
+  private current(id: string): Doc | null {
+    if (this.writes.has(id)) {
+      return this.writes.get(id) ?? null;
+    }
+    return this.store.committed(id) ?? null;
+  }
+
+  private scan(
+    table: string,
+    conditions: Condition[],
+    sortFields: string[],
+    predicate?: Predicate
+  ): Doc[] {
+    const ids = new Set<string>();
+    for (const doc of this.store.all(table)) ids.add(doc._id);
+    for (const id of this.writes.keys()) {
+      if (id.startsWith(`${table}:`)) ids.add(id);
+    }
+
+    const rows = [...ids]
+      .map((id) => this.current(id))
+      .filter((doc): doc is Doc => doc !== null && matches(doc, conditions))
+      .filter((doc) => !predicate || Boolean(predicate(doc)));
+
+    rows.sort((a, b) => {
+      for (const field of sortFields) {
+        const cmp = compareValues(a[field], b[field]);
+        if (cmp !== 0) return cmp;
+      }
+      return a._creationTime - b._creationTime;
+    });
+    return rows;
+  }
+
+  /** matched: every row in the range; returned: rows handed to the caller */
+  private recordRange(
+    table: string,
+    conditions: Condition[],
+    matched: Doc[],
+    returned: Doc[] = matched
+  ) {
+    this.rangeReads.push({ table, conditions, ids: matched.map((doc) => doc._id) });
+    for (const doc of returned) this.recordDoc(doc._id);
+  }
+
+  private recordDoc(id: string) {
+    if (!this.readVersions.has(id) && !this.writes.has(id)) {
+      this.readVersions.set(id, this.store.version(id));
+    }
+  }
+
+  async commit(): Promise<void> {
+    await tick();
+    for (const [id, version] of this.readVersions) {
+      if (this.store.version(id) !== version) {
+        throw new ConflictError();
+      }
+    }
+    // Phantoms: a range read would now return different rows
+    for (const range of this.rangeReads) {
+      const now = this.store
+        .all(range.table)
+        .filter((doc) => matches(doc, range.conditions))
+        .map((doc) => doc._id);
+      const before = new Set(range.ids);
+      if (now.some((id) => !before.has(id) && !this.writes.has(id))) {
+        throw new ConflictError();
+      }
+    }
+    this.store.apply(this.writes);
+  }
+
+  db = {
+    get: async (id: string) => {
+      await tick();
+      this.recordDoc(id);
+      return this.current(id);
+    },
+
+    normalizeId: (table: string, id: string) =>
+      typeof id === "string" && id.startsWith(`${table}:`) ? id : null,
+
+    insert: async (table: string, value: Record<string, unknown>) => {
+      await tick();
+      const id = this.store.newId(table);
+      this.writes.set(id, { ...value, _id: id, _creationTime: this.store.now() });
+      return id;
+    },
+
+    patch: async (id: string, value: Record<string, unknown>) => {
+      await tick();
+      const doc = this.current(id);
+      if (!doc) throw new Error(`Document not found: ${id}`);
+      this.recordDoc(id);
+      this.writes.set(id, { ...doc, ...value });
+    },
+
+    replace: async (id: string, value: Record<string, unknown>) => {
+      await tick();
+      const doc = this.current(id);
+      if (!doc) throw new Error(`Document not found: ${id}`);
+      this.recordDoc(id);
+      this.writes.set(id, { ...value, _id: id, _creationTime: doc._creationTime });
+    },
+
+    delete: async (id: string) => {
+      await tick();
+      this.recordDoc(id);
+      this.writes.set(id, null);
+    },
+
+    query: (table: string) => this.queryBuilder(table, [], undefined, "asc"),
+  };
+
+  private queryBuilder(
+    table: string,
+    conditions: Condition[],
+    indexName: string | undefined,
+    order: "asc" | "desc",
+    predicate?: Predicate
+  ): any {
+    const run = async () => {
+      await tick();
+      const rows = this.scan(table, conditions, this.store.sortKey(table, indexName), predicate);
+      return order === "desc" ? rows.reverse() : rows;
+    };
+
+    return {
+      withIndex: (name: string, build?: (q: any) => any) => {
+        const added: Condition[] = [];
+        const q: any = {};
+        for (const op of ["eq", "gt", "gte", "lt", "lte"] as const) {
+          q[op] = (field: string, value: unknown) => {
+            added.push({ field, op, value });
+            return q;
+          };
+        }
+        build?.(q);
+        return this.queryBuilder(table, [...conditions, ...added], name, order, predicate);
+      },
+      withSearchIndex: (_name: string, build: (q: any) => any) => {
+        let search = { field: "", terms: [] as string[] };
+        const added: Condition[] = [];
+        const q: any = {
+          search: (field: string, text: string) => {
+            search = { field, terms: searchTerms(text) };
+            return q;
+          },
+          eq: (field: string, value: unknown) => {
+            added.push({ field, op: "eq", value });
+            return q;
+          },
+        };
+        build(q);
+
+        const filters = [...conditions, ...added];
+        const ranked = async () => {
+          await tick();
+          const scored = this.scan(table, filters, [], predicate)
+            .map((doc) => {
+              const words = searchTerms(doc[search.field]);
+              const hits = search.terms.filter((term) =>
+                words.some((word) => word.startsWith(term))
+              ).length;
+              return { doc, hits };
+            })
+            .filter(({ hits }) => hits > 0);
+          scored.sort((a, b) => b.hits - a.hits);
+          const rows = scored.map(({ doc }) => doc);
+          this.recordRange(table, filters, rows);
+          return rows;
+        };
+
+        return {
+          collect: ranked,
+          take: async (n: number) => (await ranked()).slice(0, n),
+          [Symbol.asyncIterator]: async function* () {
+            yield* await ranked();
+          },
+        };
+      },
+      filter: (build: (q: typeof filterBuilder) => unknown) => {
+        const expression = build(filterBuilder);
+        return this.queryBuilder(table, conditions, indexName, order, (doc) =>
+          (!predicate || predicate(doc)) && evaluate(expression, doc)
+        );
+      },
+      order: (direction: "asc" | "desc") =>
+        this.queryBuilder(table, conditions, indexName, direction, predicate),
+      collect: async () => {
+        const rows = await run();
+        this.recordRange(table, conditions, rows);
+        return rows;
+      },
+      take: async (n: number) => {
+        const rows = await run();
+        this.recordRange(table, conditions, rows, rows.slice(0, n));
+        return rows.slice(0, n);
+      },
+      first: async () => {
+        const rows = await run();
+        this.recordRange(table, conditions, rows, rows.slice(0, 1));
+        return rows[0] ?? null;
+      },
+      unique: async () => {
+        const rows = await run();
+        if (rows.length > 1) {
+          throw new Error(`unique() matched ${rows.length} documents in ${table}`);
+        }
+        this.recordRange(table, conditions, rows);
+        return rows[0] ?? null;
+      },
+      paginate: async (opts: {
+        cursor: string | null;
+        numItems: number;
+        endCursor?: string | null;
+      }) => {
+        // Cursor: _id of the last row returned ("" = end of range)
+        const rows = await run();
+        const start = opts.cursor
+          ? rows.findIndex((doc) => doc._id === opts.cursor) + 1
+          : 0;
+        let end: number;
+        if (opts.endCursor !== undefined && opts.endCursor !== null) {
+          end = opts.endCursor === ""
+            ? rows.length
+            : rows.findIndex((doc) => doc._id === opts.endCursor) + 1;
+        } else {
+          end = Math.min(rows.length, start + opts.numItems);
+        }
+        const page = rows.slice(start, end);
+        this.recordRange(table, conditions, rows, page);
+        const isDone = end >= rows.length;
+        return {
+          page,
+          isDone,
+          continueCursor: isDone ? "" : page[page.length - 1]?._id ?? opts.cursor ?? "",
+        };
+      },
+    };
+  }
+}
@@ -0,0 +1,182 @@
+/**
+ * Pagination Tests
+ *
+ * Hierarchy reads (lib/pagination.ts): oversized trees are rejected, not
+ * truncated; cursor encoding round trips; pages walk the tree group by
+ * group; and a page that ended on a group boundary is re-read to the end
+ * of its group when pinned with its endCursor.
+ */
+
+import { describe, expect, it } from "vitest";
+import {
+  decodeHierarchyCursor,
+  encodeHierarchyCursor,
+  getHierarchyGroupIds,
+  paginateHierarchy,
+} from "../convex/lib/pagination";
+import { insertGroup } from "../convex/lib/groupClosure";
+import { FakeDatabase } from "./helpers/fakeDb";
+
+const INDEXES = {
+  groupClosure: { ancestor_depth: ["ancestorId", "depth"] },
+  entities: { by_group: ["groupId"] },
+};
+
+/** Root with two children; root has 3 entities, first child 5, second 2 */
+async function seedTree(db: FakeDatabase) {
+  return await db.runMutation(async (ctx) => {
+    const group = (name: string, parentGroupId?: string) =>
+      insertGroup(ctx as any, {
+        slug: name,
+        name,
+        type: "organization",
+        parentGroupId,
+        status: "active",
+        createdAt: 0,
+        updatedAt: 0,
+      } as any);
+
+    const root = await group("root");
+    const first = await group("first", root);
+    const second = await group("second", root);
+
+    for (const [groupId, count] of [[root, 3], [first, 5], [second, 2]] as const) {
+      for (let i = 0; i < count; i++) {
+        await ctx.db.insert("entities", { groupId, name: `${groupId}-${i}` });
+      }
+    }
+    return { root, first, second };
+  });
+}
+
+function page(
+  db: FakeDatabase,
+  root: string,
+  opts: { cursor: string | null; numItems: number; endCursor?: string | null }
+) {
+  return db.runQuery((ctx) =>
+    paginateHierarchy(ctx as any, root as any, opts, (groupId, groupOpts) =>
+      ctx.db
+        .query("entities")
+        .withIndex("by_group", (q: any) => q.eq("groupId", groupId))
+        .paginate(groupOpts)
+    )
+  );
+}
+
+describe("Pagination", () => {
+  describe("hierarchy cursors", () => {
+    it("should round trip positions", () => {
+      const mid = { groupId: "groups:1" as any, cursor: "entities:7" };
+      const boundary = { groupId: "groups:1" as any, cursor: "", exhausted: true };
+      const start = { groupId: "groups:2" as any, cursor: null };
+
+      expect(decodeHierarchyCursor(encodeHierarchyCursor(mid))).toEqual(mid);
+      expect(decodeHierarchyCursor(encodeHierarchyCursor(boundary))).toEqual(boundary);
+      expect(decodeHierarchyCursor(encodeHierarchyCursor(start))).toEqual(start);
+    });
+
+    it("should reject malformed cursors", () => {
+      expect(() => decodeHierarchyCursor("not json")).toThrow("Invalid hierarchy cursor");
+      expect(() => decodeHierarchyCursor("[1, null]")).toThrow("Invalid hierarchy cursor");
+      expect(() => decodeHierarchyCursor('["groups:1", null, "yes"]')).toThrow(
+        "Invalid hierarchy cursor"
+      );
+    });
+  });
+
+  describe("getHierarchyGroupIds", () => {
+    it("should list the root first, then its subgroups", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root, first, second } = await seedTree(db);
+
+      const ids = await db.runQuery((ctx) => getHierarchyGroupIds(ctx as any, root as any));
+      expect(ids).toEqual([root, first, second]);
+    });
+
+    it("should reject trees larger than the cap instead of truncating", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root } = await seedTree(db);
+
+      await expect(
+        db.runQuery((ctx) => getHierarchyGroupIds(ctx as any, root as any, 2))
+      ).rejects.toThrow("more than 1 subgroups");
+    });
+  });
+
+  describe("paginateHierarchy", () => {
+    it("should return every entity once, group by group", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root } = await seedTree(db);
+
+      const seen: string[] = [];
+      const sizes: number[] = [];
+      let cursor: string | null = null;
+      for (let calls = 0; calls < 20; calls++) {
+        const result = await page(db, root, { cursor, numItems: 4 });
+        seen.push(...result.page.map((doc: any) => doc.name));
+        sizes.push(result.page.length);
+        cursor = result.continueCursor;
+        if (result.isDone) break;
+      }
+
+      expect(seen).toHaveLength(10);
+      expect(new Set(seen).size).toBe(10);
+      // Short pages at group boundaries: root 3, first 4 + 1, second 2
+      expect(sizes).toEqual([3, 4, 1, 2]);
+    });
+
+    it("should end a boundary page on its own group", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root, first } = await seedTree(db);
+
+      const result = await page(db, root, { cursor: null, numItems: 10 });
+      expect(result.page).toHaveLength(3);
+      expect(result.isDone).toBe(false);
+      expect(decodeHierarchyCursor(result.continueCursor)).toEqual({
+        groupId: root,
+        cursor: "",
+        exhausted: true,
+      });
+
+      const next = await page(db, root, { cursor: result.continueCursor, numItems: 10 });
+      expect(next.page.every((doc: any) => doc.groupId === first)).toBe(true);
+      expect(next.page).toHaveLength(5);
+    });
+
+    it("should re-read a pinned boundary page to the end of its group", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root } = await seedTree(db);
+
+      const first = await page(db, root, { cursor: null, numItems: 3 });
+      expect(first.page).toHaveLength(3);
+
+      // The group grows; the client re-runs the page pinned to its endCursor
+      await db.runMutation((ctx) => ctx.db.insert("entities", { groupId: root, name: "late" }));
+      const rerun = await page(db, root, {
+        cursor: null,
+        numItems: 3,
+        endCursor: first.continueCursor,
+      });
+
+      expect(rerun.page).toHaveLength(4);
+      expect(rerun.continueCursor).toBe(first.continueCursor);
+    });
+
+    it("should be done after the last group", async () => {
+      const db = new FakeDatabase(INDEXES);
+      const { root, second } = await seedTree(db);
+
+      const last = await page(db, root, {
+        cursor: encodeHierarchyCursor({ groupId: second as any, cursor: null }),
+        numItems: 10,
+      });
+      expect(last.page).toHaveLength(2);
+      expect(last.isDone).toBe(true);
+
+      const after = await page(db, root, { cursor: last.continueCursor, numItems: 10 });
+      expect(after.page).toHaveLength(0);
+      expect(after.isDone).toBe(true);
+    });
+  });
+});
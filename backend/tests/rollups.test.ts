@@ -0,0 +1,274 @@
+/**
+ * Rollup Tests
+ *
+ * Sharded group and daily counters (lib/rollups.ts): totals stay exact
+ * under concurrent writers, sharding removes most OCC conflicts compared
+ * with a single counter row, events are counted all time, reconcile
+ * corrections land as deltas without losing concurrent writes, and large
+ * entity rollups are recounted in bounded steps.
+ */
+
+import { describe, expect, it } from "vitest";
+import {
+  ROLLUP_SHARDS,
+  applyDailyDelta,
+  applyGroupDelta,
+  ENTITY_ROW_SOURCES,
+  EMPTY_ENTITY_RECOUNT,
+  correctDailyCounters,
+  correctEntityRollup,
+  correctGroupCounters,
+  entityRecountOf,
+  getDailyCounters,
+  getEntityRollup,
+  getGroupCounters,
+  insertEvent,
+  pageEntityRows,
+  rebuildEntityRollup,
+  sumDailyCounters,
+  tallyEntityRows,
+} from "../convex/lib/rollups";
+import { FakeDatabase } from "./helpers/fakeDb";
+
+const GROUP = "groups:1" as any;
+const DAY = Date.UTC(2026, 0, 15);
+
+const WRITERS = 32;
+const WRITES_PER_WRITER = 5;
+
+/** WRITERS concurrent mutations, each adding 1 entity WRITES_PER_WRITER times */
+async function concurrentEntityWrites(db: FakeDatabase, shards?: number) {
+  await Promise.all(
+    Array.from({ length: WRITERS }, async () => {
+      for (let i = 0; i < WRITES_PER_WRITER; i++) {
+        await db.runMutation((ctx) =>
+          applyGroupDelta(ctx as any, GROUP, { entityCount: 1, entityBytes: 10 }, { shards })
+        );
+      }
+    })
+  );
+}
+
+describe("Rollups", () => {
+  describe("group counters", () => {
+    it("should count every concurrent write exactly once", async () => {
+      const db = new FakeDatabase();
+      await concurrentEntityWrites(db);
+
+      const counters = await db.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      expect(counters.entityCount).toBe(WRITERS * WRITES_PER_WRITER);
+      expect(counters.entityBytes).toBe(WRITERS * WRITES_PER_WRITER * 10);
+      expect(db.all("groupRollups").length).toBeLessThanOrEqual(ROLLUP_SHARDS);
+    });
+
+    it("should conflict far less than a single counter row", async () => {
+      const single = new FakeDatabase();
+      await concurrentEntityWrites(single, 1);
+
+      const sharded = new FakeDatabase();
+      await concurrentEntityWrites(sharded);
+
+      expect(single.conflicts).toBeGreaterThan(WRITERS);
+      expect(sharded.conflicts).toBeLessThan(single.conflicts / 2);
+
+      // Same totals either way
+      const a = await single.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      const b = await sharded.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      expect(a).toEqual(b);
+    });
+
+    it("should keep concurrent writes when reconcile corrects drift", async () => {
+      const db = new FakeDatabase();
+      await concurrentEntityWrites(db);
+
+      // Snapshot at the cutoff; the recount finds 10 entities fewer
+      const stored = await db.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      const recounted = { ...stored, entityCount: stored.entityCount - 10, eventCount: 12 };
+
+      // Writers keep going while the recount runs
+      await concurrentEntityWrites(db);
+      await db.runMutation((ctx) => correctGroupCounters(ctx as any, GROUP, recounted, stored));
+
+      const counters = await db.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      expect(counters.entityCount).toBe(2 * WRITERS * WRITES_PER_WRITER - 10);
+      expect(counters.eventCount).toBe(12);
+      expect(db.all("groupRollups").length).toBeLessThanOrEqual(ROLLUP_SHARDS);
+      expect(db.all("groupRollups").some((row) => row.reconciledAt)).toBe(true);
+    });
+  });
+
+  describe("event counters", () => {
+    it("should count events of every age in the group total", async () => {
+      const db = new FakeDatabase();
+      const yearAgo = DAY - 365 * 86400000;
+      for (const timestamp of [yearAgo, DAY, DAY]) {
+        await db.runMutation((ctx) =>
+          insertEvent(ctx as any, { groupId: GROUP, type: "thing_viewed", timestamp } as any)
+        );
+      }
+
+      const counters = await db.runQuery((ctx) => getGroupCounters(ctx as any, GROUP));
+      expect(counters.eventCount).toBe(3);
+      const recent = await db.runQuery((ctx) => sumDailyCounters(ctx as any, GROUP, DAY));
+      expect(recent.eventCount).toBe(2);
+    });
+  });
+
+  describe("entity rollups", () => {
+    /** One user with 3 inbound connections (1 created_by) and 2 events as actor */
+    async function seedEntity(db: FakeDatabase) {
+      return await db.runMutation(async (ctx) => {
+        const entityId = await ctx.db.insert("entities", { groupId: GROUP, type: "user" });
+        for (const relationshipType of ["created_by", "follows", "follows"]) {
+          await ctx.db.insert("connections", {
+            groupId: GROUP,
+            fromEntityId: "entities:other",
+            toEntityId: entityId,
+            relationshipType,
+          });
+        }
+        await ctx.db.insert("events", {
+          groupId: GROUP,
+          type: "thing_viewed",
+          actorId: entityId,
+          timestamp: 10,
+        });
+        await ctx.db.insert("events", {
+          groupId: GROUP,
+          type: "payment_processed",
+          actorId: entityId,
+          timestamp: 20,
+          metadata: { amount: 5 },
+        });
+        return entityId;
+      });
+    }
+
+    it("should leave entities over the row cap to the stepped rebuild", async () => {
+      const db = new FakeDatabase();
+      const entityId = await seedEntity(db);
+      const entity = db.all("entities")[0];
+
+      expect(await db.runMutation((ctx) => rebuildEntityRollup(ctx as any, entity, 2))).toBe(false);
+      expect(db.all("entityRollups")).toHaveLength(0);
+
+      expect(await db.runMutation((ctx) => rebuildEntityRollup(ctx as any, entity, 10))).toBe(true);
+      const rollup = await db.runQuery((ctx) => getEntityRollup(ctx as any, entityId));
+      expect(rollup).toMatchObject({
+        inboundCount: 3,
+        followerCount: 1,
+        eventCount: 2,
+        totalRevenue: 5,
+        lastActive: 20,
+        eventsByType: { thing_viewed: 1, payment_processed: 1 },
+      });
+    });
+
+    it("should keep events written while an entity is recounted in steps", async () => {
+      const db = new FakeDatabase();
+      const entityId = await seedEntity(db);
+      const entity = db.all("entities")[0];
+      await db.runMutation((ctx) => rebuildEntityRollup(ctx as any, entity, 10));
+
+      // Drift: the stored rollup over-counts events
+      const rollup = db.all("entityRollups")[0];
+      await db.runMutation((ctx) => ctx.db.patch(rollup._id, { eventCount: 7 }));
+
+      const stored = entityRecountOf(
+        await db.runQuery((ctx) => getEntityRollup(ctx as any, entityId))
+      );
+      const cutoff = db.now();
+      let counts = EMPTY_ENTITY_RECOUNT;
+      for (const source of ENTITY_ROW_SOURCES) {
+        let cursor: string | null = null;
+        for (let isDone = false; !isDone; ) {
+          const page = await db.runQuery((ctx) =>
+            pageEntityRows(ctx as any, entityId, source, { cursor, numItems: 2 })
+          );
+          counts = tallyEntityRows(counts, source, page.page, cutoff);
+          cursor = page.continueCursor;
+          isDone = page.isDone;
+
+          // A new event lands mid-recount
+          if (source === "inbound" && !isDone) {
+            await db.runMutation((ctx) =>
+              insertEvent(ctx as any, {
+                groupId: GROUP,
+                type: "thing_created",
+                actorId: entityId,
+                timestamp: 30,
+              } as any)
+            );
+          }
+        }
+      }
+      await db.runMutation((ctx) => correctEntityRollup(ctx as any, entity, counts, stored));
+
+      expect(await db.runQuery((ctx) => getEntityRollup(ctx as any, entityId))).toMatchObject({
+        inboundCount: 3,
+        followerCount: 1,
+        eventCount: 3,
+        totalRevenue: 5,
+        lastActive: 30,
+        eventsByType: { thing_viewed: 1, payment_processed: 1, thing_created: 1 },
+      });
+    });
+  });
+
+  describe("daily counters", () => {
+    it("should sum concurrent event writes across shards and days", async () => {
+      const db = new FakeDatabase();
+      await Promise.all(
+        Array.from({ length: WRITERS }, (_, writer) =>
+          db.runMutation((ctx) =>
+            applyDailyDelta(ctx as any, GROUP, writer % 2 ? DAY : DAY + 86400000, {
+              eventCount: 1,
+              paymentCount: writer % 4 === 0 ? 1 : 0,
+              revenue: writer % 4 === 0 ? 5 : 0,
+            })
+          )
+        )
+      );
+
+      const all = await db.runQuery((ctx) => sumDailyCounters(ctx as any, GROUP, DAY));
+      expect(all).toEqual({ eventCount: WRITERS, paymentCount: WRITERS / 4, revenue: WRITERS * 5 / 4 });
+
+      const secondDay = await db.runQuery((ctx) =>
+        sumDailyCounters(ctx as any, GROUP, DAY + 86400000)
+      );
+      expect(secondDay.eventCount).toBe(WRITERS / 2);
+    });
+
+    it("should correct a day as a delta", async () => {
+      const db = new FakeDatabase();
+      const write = () =>
+        db.runMutation((ctx) =>
+          applyDailyDelta(ctx as any, GROUP, DAY, { eventCount: 1, paymentCount: 0, revenue: 0 })
+        );
+      for (let i = 0; i < 20; i++) {
+        await write();
+      }
+
+      const stored = await db.runQuery((ctx) => getDailyCounters(ctx as any, GROUP, DAY));
+      for (let i = 0; i < 5; i++) {
+        await write();
+      }
+      await db.runMutation((ctx) =>
+        correctDailyCounters(
+          ctx as any,
+          GROUP,
+          DAY,
+          { eventCount: 4, paymentCount: 1, revenue: 9 },
+          stored
+        )
+      );
+
+      expect(db.all("groupDailyRollups").length).toBeLessThanOrEqual(ROLLUP_SHARDS);
+      expect(await db.runQuery((ctx) => sumDailyCounters(ctx as any, GROUP, DAY))).toEqual({
+        eventCount: 9,
+        paymentCount: 1,
+        revenue: 9,
+      });
+    });
+  });
+});
@@ -0,0 +1,77 @@
+/**
+ * Search Tests
+ *
+ * Full-text knowledge search (lib/search.ts): items match on text or on
+ * labels (both indexed through searchText, kept in sync by the knowledge
+ * write helpers), and soft-deleted items are skipped.
+ */
+
+import { describe, expect, it } from "vitest";
+import { insertKnowledge, patchKnowledge } from "../convex/lib/rollups";
+import { searchKnowledgeText } from "../convex/lib/search";
+import { FakeDatabase } from "./helpers/fakeDb";
+
+const GROUP = "groups:1" as any;
+
+async function seed(db: FakeDatabase, items: Array<{ text?: string; labels?: string[] }>) {
+  await db.runMutation(async (ctx) => {
+    for (const item of items) {
+      await insertKnowledge(ctx as any, {
+        groupId: GROUP,
+        knowledgeType: "document",
+        ...item,
+        createdAt: 0,
+        updatedAt: 0,
+      });
+    }
+  });
+}
+
+function search(db: FakeDatabase, query: string) {
+  return db.runQuery((ctx) => searchKnowledgeText(ctx as any, { groupId: GROUP, query }, 10));
+}
+
+describe("Search", () => {
+  describe("searchKnowledgeText", () => {
+    it("should find items whose only match is a label", async () => {
+      const db = new FakeDatabase();
+      await seed(db, [
+        { text: "Quarterly summary", labels: ["finance", "q3"] },
+        { text: "Team offsite notes", labels: ["events"] },
+      ]);
+
+      const results = await search(db, "finance");
+      expect(results.map((k: any) => k.text)).toEqual(["Quarterly summary"]);
+    });
+
+    it("should follow label changes", async () => {
+      const db = new FakeDatabase();
+      await seed(db, [{ text: "Pricing page copy", labels: ["draft"] }]);
+
+      const item = db.all("knowledge")[0];
+      await db.runMutation((ctx) => patchKnowledge(ctx as any, item, { labels: ["published"] }));
+
+      expect(await search(db, "draft")).toHaveLength(0);
+      expect(await search(db, "published")).toHaveLength(1);
+      expect(await search(db, "pricing")).toHaveLength(1);
+    });
+
+    it("should skip deleted items without shortening the result", async () => {
+      const db = new FakeDatabase();
+      await seed(db, [
+        { text: "launch plan", labels: ["launch"] },
+        { text: "launch checklist" },
+        { text: "launch retro" },
+      ]);
+
+      const top = db.all("knowledge")[0];
+      await db.runMutation((ctx) => ctx.db.patch(top._id, { deletedAt: 1 }));
+
+      const results = await db.runQuery((ctx) =>
+        searchKnowledgeText(ctx as any, { groupId: GROUP, query: "launch" }, 2)
+      );
+      expect(results).toHaveLength(2);
+      expect(results.every((k: any) => k.deletedAt === undefined)).toBe(true);
+    });
+  });
+});
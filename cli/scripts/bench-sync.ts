@@ -0,0 +1,187 @@
+/**
+ * Ontology sync benchmark: cold and warm installs
+ *
+ *   bun run bench:sync
+ *
+ * Syncs the package's own one/ tree (folders.yaml patterns, as
+ * syncOntologyFiles does) into temporary project directories and times:
+ *
+ * 1. legacy cold: one glob per extension, serial mkdir + copyFile per file
+ * 2. legacy warm: the same again over an installed tree (it always copies)
+ * 3. sync cold: empty project
+ * 4. sync warm: nothing changed (stat-only)
+ * 5. sync upgrade: new package version, same files (content hashes)
+ * 6. sync 1% changed: a few source files edited
+ * 7. dry run: diff only
+ *
+ * Options (env):
+ *   BENCH_SYNTHETIC  generate N files instead of using one/ (e.g. 5000)
+ *   BENCH_CONCURRENCY  copy concurrency (default 16)
+ */
+
+import fs from "fs/promises";
+import os from "os";
+import path from "path";
+import { fileURLToPath } from "url";
+import yaml from "yaml";
+import { glob } from "glob";
+import {
+  DEFAULT_SYNC_CONCURRENCY,
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+  type SyncResult,
+} from "../src/utils/file-sync.js";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const SYNTHETIC = parseInt(process.env.BENCH_SYNTHETIC || "0", 10);
+const CONCURRENCY = parseInt(
+  process.env.BENCH_CONCURRENCY || String(DEFAULT_SYNC_CONCURRENCY),
+  10
+);
+
+interface Source {
+  root: string;
+  patterns: string[];
+  ignore: string[];
+  extensions: string[];
+}
+
+async function loadSource(workDir: string): Promise<Source> {
+  const packageRoot = path.join(__dirname, "..");
+  const config = yaml.parse(
+    await fs.readFile(path.join(packageRoot, "folders.yaml"), "utf-8")
+  );
+  const extensions: string[] = config.allowed_extensions;
+  const ignore: string[] = config.exclude_patterns;
+
+  if (!SYNTHETIC) {
+    return {
+      root: packageRoot,
+      patterns: extensions.map((ext) => `one/**/*${ext}`),
+      ignore,
+      extensions,
+    };
+  }
+
+  // Synthetic tree: N files of 1-16 KB across nested folders
+  const root = path.join(workDir, "package");
+  for (let i = 0; i < SYNTHETIC; i++) {
+    const file = path.join(
+      root,
+      "one",
+      `d${i % 20}`,
+      `s${i % 7}`,
+      `file-${i}${extensions[i % 3]}`
+    );
+    await fs.mkdir(path.dirname(file), { recursive: true });
+    await fs.writeFile(file, "x".repeat(1024 + ((i * 7919) % 15360)));
+  }
+  return {
+    root,
+    patterns: extensions.map((ext) => `one/**/*${ext}`),
+    ignore,
+    extensions,
+  };
+}
+
+/** The previous syncOntologyFiles loop */
+async function legacySync(source: Source, targetDir: string) {
+  const files: string[] = [];
+  for (const pattern of source.patterns) {
+    files.push(
+      ...(await glob(pattern, { cwd: source.root, ignore: source.ignore }))
+    );
+  }
+  for (const file of files) {
+    const targetPath = path.join(targetDir, file);
+    await fs.mkdir(path.dirname(targetPath), { recursive: true });
+    await fs.copyFile(path.join(source.root, file), targetPath);
+  }
+  return files.length;
+}
+
+function newSync(
+  source: Source,
+  targetDir: string,
+  version: string,
+  dryRun = false
+): Promise<SyncResult> {
+  return syncFiles({
+    sourceDir: source.root,
+    targetDir,
+    patterns: source.patterns,
+    ignore: source.ignore,
+    manifestPath: manifestPathFor(targetDir, "ontology"),
+    version,
+    concurrency: CONCURRENCY,
+    dryRun,
+  });
+}
+
+async function time<T>(
+  label: string,
+  run: () => Promise<T>,
+  describe: (value: T) => string
+) {
+  const started = performance.now();
+  const value = await run();
+  const ms = (performance.now() - started).toFixed(0);
+  console.log(`  ${label.padEnd(22)} ${ms.padStart(6)}ms  ${describe(value)}`);
+  return value;
+}
+
+async function main() {
+  const workDir = await fs.mkdtemp(
+    path.join(os.tmpdir(), "oneie-bench-sync-")
+  );
+
+  try {
+    const source = await loadSource(workDir);
+    const legacyTarget = path.join(workDir, "legacy");
+    const syncTarget = path.join(workDir, "project");
+    await fs.mkdir(legacyTarget, { recursive: true });
+    await fs.mkdir(syncTarget, { recursive: true });
+
+    console.log(
+      `Source: ${SYNTHETIC ? `${SYNTHETIC} synthetic files` : source.root}, ` +
+        `concurrency ${CONCURRENCY}\n`
+    );
+
+    const copied = (count: number) => `${count} files copied`;
+    const summary = (result: SyncResult) => summarizeSync(result);
+
+    await time("legacy cold", () => legacySync(source, legacyTarget), copied);
+    await time("legacy warm", () => legacySync(source, legacyTarget), copied);
+
+    const sync = (version: string) => () =>
+      newSync(source, syncTarget, version);
+    const cold = await time("sync cold", sync("1"), summary);
+    await time("sync warm", sync("1"), summary);
+    await time("sync upgrade (hash)", sync("2"), summary);
+
+    // Edit 1% of the source files (synthetic trees only: never touch one/)
+    if (SYNTHETIC) {
+      const edits = cold.files.filter((_, i) => i % 100 === 0);
+      for (const file of edits) {
+        await fs.appendFile(path.join(source.root, file), "\nedited");
+      }
+      await time("sync 1% changed", sync("2"), summary);
+    }
+
+    await time(
+      "dry run",
+      () => newSync(source, syncTarget, "2", true),
+      (result) => `${summary(result)} (${result.files.length} checked)`
+    );
+  } finally {
+    await fs.rm(workDir, { recursive: true, force: true });
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
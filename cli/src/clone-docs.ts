@@ -2,6 +2,7 @@ import { exec } from "child_process";
 import { promisify } from "util";
 import fs from "fs/promises";
 import path from "path";
+import { mapWithConcurrency } from "./utils/file-sync.js";
 
 const execAsync = promisify(exec);
 
@@ -39,38 +40,64 @@ const DOC_REPOS: DocRepo[] = [
   },
 ];
 
-export async function cloneThirdPartyDocs() {
-  const docsDir = path.join(process.cwd(), "docs");
+// Clones are network-bound: a few at once, not all five
+const CLONE_CONCURRENCY = 3;
+
+export interface DocCloneResult {
+  name: string;
+  skipped?: boolean;
+  cloned?: boolean;
+  wouldClone?: boolean;
+  error?: string;
+}
+
+export async function cloneThirdPartyDocs(
+  options: { basePath?: string; dryRun?: boolean } = {}
+): Promise<DocCloneResult[]> {
+  const docsDir = path.join(options.basePath || process.cwd(), "docs");
 
   // Create docs directory
-  await fs.mkdir(docsDir, { recursive: true });
+  if (!options.dryRun) {
+    await fs.mkdir(docsDir, { recursive: true });
+  }
 
-  const results = [];
+  return mapWithConcurrency(
+    DOC_REPOS,
+    CLONE_CONCURRENCY,
+    async (doc): Promise<DocCloneResult> => {
+      const targetDir = path.join(docsDir, doc.name);
 
-  for (const doc of DOC_REPOS) {
-    const targetDir = path.join(docsDir, doc.name);
+      // Check if already exists
+      if (await fs.stat(targetDir).catch(() => null)) {
+        console.log(`⚠️  ${doc.name} docs already exist, skipping`);
+        return { name: doc.name, skipped: true };
+      }
 
-    // Check if already exists
-    if (await fs.stat(targetDir).catch(() => null)) {
-      console.log(`⚠️  ${doc.name} docs already exist, skipping`);
-      results.push({ name: doc.name, skipped: true });
-      continue;
-    }
+      if (options.dryRun) {
+        console.log(`+ ${doc.name} docs → /docs/${doc.name}`);
+        return { name: doc.name, wouldClone: true };
+      }
 
-    // Clone repository
-    const cloneCmd = doc.branch
-      ? `git clone --depth 1 --branch ${doc.branch} ${doc.repo} ${doc.name}`
-      : `git clone --depth 1 ${doc.repo} ${doc.name}`;
+      // Clone into a temporary directory and rename when complete, so an
+      // interrupted clone is retried next time instead of being skipped
+      const tempName = `.${doc.name}.cloning`;
+      const tempDir = path.join(docsDir, tempName);
+      await fs.rm(tempDir, { recursive: true, force: true });
 
-    try {
-      await execAsync(cloneCmd, { cwd: docsDir });
-      console.log(`✓ ${doc.name} docs → /docs/${doc.name}`);
-      results.push({ name: doc.name, cloned: true });
-    } catch (error: any) {
-      console.error(`✗ Failed to clone ${doc.name}: ${error.message}`);
-      results.push({ name: doc.name, error: error.message });
-    }
-  }
+      const cloneCmd = doc.branch
+        ? `git clone --depth 1 --branch ${doc.branch} ${doc.repo} ${tempName}`
+        : `git clone --depth 1 ${doc.repo} ${tempName}`;
 
-  return results;
+      try {
+        await execAsync(cloneCmd, { cwd: docsDir });
+        await fs.rename(tempDir, targetDir);
+        console.log(`✓ ${doc.name} docs → /docs/${doc.name}`);
+        return { name: doc.name, cloned: true };
+      } catch (error: any) {
+        await fs.rm(tempDir, { recursive: true, force: true });
+        console.error(`✗ Failed to clone ${doc.name}: ${error.message}`);
+        return { name: doc.name, error: error.message };
+      }
+    }
+  );
 }
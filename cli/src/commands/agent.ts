@@ -22,9 +22,26 @@ import {
   rollbackInstallation,
 } from "../utils/installation-setup.js";
 import { slugify } from "../utils/validation.js";
+import { getPackageVersion } from "../sync-ontology.js";
+import { platformSyncs } from "../sync-platform.js";
+import {
+  formatSyncDiff,
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+} from "../utils/file-sync.js";
 
 const execAsync = promisify(exec);
 
+const ROOT_FILES = [
+  "AGENTS.md",
+  "CLAUDE.md",
+  "README.md",
+  "SECURITY.md",
+  "LICENSE.md",
+  ".mcp.json",
+];
+
 export interface AgentOptions {
   quiet?: boolean;
   verbose?: boolean;
@@ -80,54 +97,44 @@ export async function runAgent(options: AgentOptions = {}): Promise<void> {
     if (!options.skipWeb) {
       console.log(`6. Clone web template (optional)`);
     }
-    console.log(chalk.green("\n✓ Dry run complete (no changes made)\n"));
-    return;
-  }
-
-  let installationPath: string | null = null;
-
-  try {
-    // Step 2: Sync platform files
-    if (!options.quiet) {
-      spinner = ora("Copying /one directory (ontology, docs, specs)...").start();
-    }
 
-    const oneSourcePath = path.join(
+    // Actual file changes for steps 1-2
+    const cliRoot = path.join(
       path.dirname(new URL(import.meta.url).pathname),
-      "../../one"
+      "../.."
     );
-    const oneTargetPath = path.join(basePath, "one");
-
-    if (await fs.pathExists(oneSourcePath)) {
-      await fs.copy(oneSourcePath, oneTargetPath, { overwrite: true });
-      if (!options.quiet && spinner) {
-        spinner.succeed("Copied /one directory");
-      }
-    } else {
-      if (!options.quiet && spinner) {
-        spinner.warn("/one directory not found in CLI package");
+    const syncs = await platformSyncs(cliRoot, basePath);
+    for (const { label, prefix, options: syncOptions } of syncs) {
+      const result = await syncFiles({ ...syncOptions, dryRun: true });
+      console.log(chalk.bold(`\n${label}: ${summarizeSync(result)}`));
+      if (options.verbose) {
+        for (const line of formatSyncDiff(result, prefix)) {
+          console.log(`  ${line}`);
+        }
       }
     }
 
-    // Sync .claude directory
-    if (!options.quiet) {
-      spinner = ora("Copying .claude directory (agents, commands, hooks)...").start();
-    }
+    console.log(chalk.green("\n✓ Dry run complete (no changes made)\n"));
+    return;
+  }
+
+  let installationPath: string | null = null;
 
-    const claudeSourcePath = path.join(
+  try {
+    // Step 2: Sync platform files (same manifests as `oneie sync`)
+    const cliRoot = path.join(
       path.dirname(new URL(import.meta.url).pathname),
-      "../../.claude"
+      "../.."
     );
-    const claudeTargetPath = path.join(basePath, ".claude");
+    const version = await getPackageVersion(cliRoot);
 
-    if (await fs.pathExists(claudeSourcePath)) {
-      await fs.copy(claudeSourcePath, claudeTargetPath, { overwrite: true });
-      if (!options.quiet && spinner) {
-        spinner.succeed("Copied .claude directory");
+    for (const { label, options: syncOptions } of await platformSyncs(cliRoot, basePath)) {
+      if (!options.quiet) {
+        spinner = ora(`Copying ${label}...`).start();
       }
-    } else {
+      const result = await syncFiles(syncOptions);
       if (!options.quiet && spinner) {
-        spinner.warn(".claude directory not found in CLI package");
+        spinner.succeed(`Synced ${label} (${summarizeSync(result)})`);
       }
     }
 
@@ -136,32 +143,17 @@ export async function runAgent(options: AgentOptions = {}): Promise<void> {
       spinner = ora("Copying documentation files...").start();
     }
 
-    const rootFiles = [
-      "AGENTS.md",
-      "CLAUDE.md",
-      "README.md",
-      "SECURITY.md",
-      "LICENSE.md",
-      ".mcp.json",
-    ];
-    const cliRoot = path.join(
-      path.dirname(new URL(import.meta.url).pathname),
-      "../.."
-    );
-
-    let copiedCount = 0;
-    for (const file of rootFiles) {
-      const sourcePath = path.join(cliRoot, file);
-      const targetPath = path.join(basePath, file);
-
-      if (await fs.pathExists(sourcePath)) {
-        await fs.copy(sourcePath, targetPath, { overwrite: true });
-        copiedCount++;
-      }
-    }
+    const docsResult = await syncFiles({
+      sourceDir: cliRoot,
+      targetDir: basePath,
+      patterns: ROOT_FILES,
+      dot: true,
+      manifestPath: manifestPathFor(basePath, "root-docs"),
+      version,
+    });
 
     if (!options.quiet && spinner) {
-      spinner.succeed(`Copied ${copiedCount} documentation files`);
+      spinner.succeed(`Synced ${docsResult.files.length} documentation files`);
     }
 
     // Step 3: Create installation folder
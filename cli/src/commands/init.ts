@@ -26,6 +26,13 @@ import {
 } from "../utils/validation.js";
 import { launchClaude } from "../utils/launch-claude.js";
 import { displayBanner } from "../banner.js";
+import { getPackageVersion } from "../sync-ontology.js";
+import { platformSyncs } from "../sync-platform.js";
+import {
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+} from "../utils/file-sync.js";
 
 const execAsync = promisify(exec);
 
@@ -212,46 +219,30 @@ CONVEX_DEPLOYMENT=dev:your-deployment
     // Step 1: Sync platform files
     console.log(chalk.bold("\n📚 Setting up ONE Platform files...\n"));
 
-    // Sync /one directory
-    let spinner = ora("Copying /one directory (ontology, docs, specs)...").start();
-    const oneSourcePath = path.join(path.dirname(new URL(import.meta.url).pathname), "../../one");
-    const oneTargetPath = path.join(basePath, "one");
-
-    if (await fs.pathExists(oneSourcePath)) {
-      await fs.copy(oneSourcePath, oneTargetPath, { overwrite: true });
-      spinner.succeed("Copied /one directory");
-    } else {
-      spinner.warn("/one directory not found in CLI package");
-    }
-
-    // Sync .claude directory
-    spinner = ora("Copying .claude directory (agents, commands, hooks)...").start();
-    const claudeSourcePath = path.join(path.dirname(new URL(import.meta.url).pathname), "../../.claude");
-    const claudeTargetPath = path.join(basePath, ".claude");
+    // Sync /one, agents and Claude config with the same manifests and
+    // patterns as `oneie sync` (only new and changed files are copied)
+    const cliRoot = path.join(path.dirname(new URL(import.meta.url).pathname), "../..");
+    const version = await getPackageVersion(cliRoot);
 
-    if (await fs.pathExists(claudeSourcePath)) {
-      await fs.copy(claudeSourcePath, claudeTargetPath, { overwrite: true });
-      spinner.succeed("Copied .claude directory");
-    } else {
-      spinner.warn(".claude directory not found in CLI package");
+    let spinner = ora();
+    for (const { label, options: syncOptions } of await platformSyncs(cliRoot, basePath)) {
+      spinner = ora(`Copying ${label}...`).start();
+      const result = await syncFiles(syncOptions);
+      spinner.succeed(`Synced ${label} (${summarizeSync(result)})`);
     }
 
     // Copy root documentation files
     spinner = ora("Copying documentation files...").start();
     const rootFiles = ["AGENTS.md", "CLAUDE.md", "README.md", "SECURITY.md", "LICENSE.md"];
-    const cliRoot = path.join(path.dirname(new URL(import.meta.url).pathname), "../..");
-
-    let copiedCount = 0;
-    for (const file of rootFiles) {
-      const sourcePath = path.join(cliRoot, file);
-      const targetPath = path.join(basePath, file);
 
-      if (await fs.pathExists(sourcePath)) {
-        await fs.copy(sourcePath, targetPath, { overwrite: true });
-        copiedCount++;
-      }
-    }
-    spinner.succeed(`Copied ${copiedCount} documentation files`);
+    const docsResult = await syncFiles({
+      sourceDir: cliRoot,
+      targetDir: basePath,
+      patterns: rootFiles,
+      manifestPath: manifestPathFor(basePath, "root-docs"),
+      version,
+    });
+    spinner.succeed(`Synced ${docsResult.files.length} documentation files`);
 
     // Step 2: Create installation folder
     spinner = ora(`Creating installation folder: /${installationName}`).start();
@@ -1,38 +1,46 @@
-import fs from "fs/promises";
 import path from "path";
 import { fileURLToPath } from "url";
+import { getPackageVersion, type SyncRunOptions } from "./sync-ontology.js";
+import {
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+  type SyncOptions,
+} from "./utils/file-sync.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-export async function copyClaudeConfig() {
+/**
+ * syncFiles options for Claude Code configuration: .claude hooks/,
+ * commands/, skills/, agents/ and settings.json (whichever exist),
+ * recorded in the "claude-config" manifest
+ */
+export async function claudeConfigSyncOptions(
+  packageRoot: string,
+  basePath: string
+): Promise<SyncOptions> {
+  return {
+    sourceDir: path.join(packageRoot, ".claude"),
+    targetDir: path.join(basePath, ".claude"),
+    patterns: ["hooks/**", "commands/**", "skills/**", "agents/**", "settings.json"],
+    dot: true,
+    manifestPath: manifestPathFor(basePath, "claude-config"),
+    version: await getPackageVersion(packageRoot),
+  };
+}
+
+export async function copyClaudeConfig(options: SyncRunOptions = {}) {
   // Package root is one level up from dist/
   const packageRoot = path.join(__dirname, "..");
-  const sourceDir = path.join(packageRoot, ".claude");
-  const targetDir = path.join(process.cwd(), ".claude");
-
-  // Create target directory
-  await fs.mkdir(targetDir, { recursive: true });
-
-  // Copy hooks/
-  const hooksSource = path.join(sourceDir, "hooks");
-  const hooksTarget = path.join(targetDir, "hooks");
-  if (await fs.stat(hooksSource).catch(() => null)) {
-    await fs.cp(hooksSource, hooksTarget, { recursive: true });
-  }
+  const basePath = options.basePath || process.cwd();
 
-  // Copy commands/
-  const commandsSource = path.join(sourceDir, "commands");
-  const commandsTarget = path.join(targetDir, "commands");
-  if (await fs.stat(commandsSource).catch(() => null)) {
-    await fs.cp(commandsSource, commandsTarget, { recursive: true });
-  }
+  const result = await syncFiles({
+    ...(await claudeConfigSyncOptions(packageRoot, basePath)),
+    dryRun: options.dryRun,
+  });
 
-  // Copy settings if exists
-  const settingsPath = path.join(sourceDir, "settings.json");
-  if (await fs.stat(settingsPath).catch(() => null)) {
-    await fs.copyFile(settingsPath, path.join(targetDir, "settings.json"));
-  }
+  console.log(`✓ Claude Code configuration: ${summarizeSync(result)}`);
 
-  console.log("✓ Copied Claude Code configuration");
+  return result;
 }
@@ -10,6 +10,7 @@ import { createOrgProfile } from "./create-org-profile.js";
 import { cloneWeb } from "./clone-web.js";
 import { cloneThirdPartyDocs } from "./clone-docs.js";
 import { displayBanner } from "./banner.js";
+import { formatSyncDiff, summarizeSync } from "./utils/file-sync.js";
 import { runInit } from "./commands/init.js";
 import { runAgent } from "./commands/agent.js";
 import {
@@ -52,6 +53,12 @@ async function main() {
     return;
   }
 
+  if (args[0] === "sync") {
+    // Incremental re-sync of ontology, agents and Claude config
+    await runSync({ dryRun: args.includes("--dry-run") });
+    return;
+  }
+
   if (args[0] === "setup") {
     // Legacy "setup" command (full ontology sync)
     await runFullSetup();
@@ -72,6 +79,39 @@ async function main() {
   await runInit();
 }
 
+async function runSync(options: { dryRun: boolean }) {
+  if (options.dryRun) {
+    console.log(chalk.yellow("🔍 Dry run mode - no changes will be made\n"));
+  }
+
+  const ontology = await syncOntologyFiles(options);
+  const agents = await syncAgentDefinitions(options);
+  const claudeConfig = await copyClaudeConfig(options);
+
+  if (options.dryRun) {
+    const diff = [
+      ...formatSyncDiff(ontology.result),
+      ...formatSyncDiff(agents.result, ".claude/agents/"),
+      ...formatSyncDiff(claudeConfig, ".claude/"),
+    ];
+    console.log("");
+    for (const line of diff) {
+      if (line.startsWith("+")) {
+        console.log(chalk.green(line));
+      } else if (line.startsWith("-")) {
+        console.log(chalk.red(line));
+      } else {
+        console.log(chalk.yellow(line));
+      }
+    }
+    console.log(
+      chalk.green(
+        `\n✓ Dry run complete: ${diff.length} changes (no changes made)\n`
+      )
+    );
+  }
+}
+
 async function runFullSetup() {
   // Display welcome banner
   displayBanner();
@@ -144,7 +184,9 @@ async function runFullSetup() {
 
   let spinner = ora("Copying ontology files from /one/*...").start();
   const ontologyResult = await syncOntologyFiles();
-  spinner.succeed(`Copied ${ontologyResult.filesCopied} ontology files`);
+  spinner.succeed(
+    `Synced ontology files (${summarizeSync(ontologyResult.result)})`
+  );
 
   spinner = ora("Syncing agent definitions...").start();
   const agentsResult = await syncAgentDefinitions();
@@ -153,8 +195,10 @@ async function runFullSetup() {
   );
 
   spinner = ora("Copying Claude Code configuration...").start();
-  await copyClaudeConfig();
-  spinner.succeed("Synced .claude/hooks/ and .claude/commands/");
+  const claudeResult = await copyClaudeConfig();
+  spinner.succeed(
+    `Synced .claude/hooks/ and .claude/commands/ (${summarizeSync(claudeResult)})`
+  );
 
   // Step 4: Create profiles
   console.log(chalk.bold("\nCreating your profile...\n"));
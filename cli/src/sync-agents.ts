@@ -1,34 +1,52 @@
-import fs from "fs/promises";
 import path from "path";
 import { fileURLToPath } from "url";
-import { glob } from "glob";
+import { getPackageVersion, type SyncRunOptions } from "./sync-ontology.js";
+import {
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+  type SyncOptions,
+} from "./utils/file-sync.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-export async function syncAgentDefinitions() {
+/**
+ * syncFiles options for agent definitions: one/things/agents/*.md into
+ * .claude/agents, recorded in the "agents" manifest
+ */
+export async function agentSyncOptions(
+  packageRoot: string,
+  basePath: string
+): Promise<SyncOptions> {
+  return {
+    sourceDir: path.join(packageRoot, "one/things/agents"),
+    targetDir: path.join(basePath, ".claude/agents"),
+    patterns: ["*.md"],
+    manifestPath: manifestPathFor(basePath, "agents"),
+    version: await getPackageVersion(packageRoot),
+  };
+}
+
+export async function syncAgentDefinitions(options: SyncRunOptions = {}) {
   // Package root is one level up from dist/
   const packageRoot = path.join(__dirname, "..");
-  const sourceDir = path.join(packageRoot, "one/things/agents");
-  const targetDir = path.join(process.cwd(), ".claude/agents");
-
-  // Create target directory
-  await fs.mkdir(targetDir, { recursive: true });
-
-  // Find all agent files
-  const agentFiles = await glob("*.md", { cwd: sourceDir });
+  const basePath = options.basePath || process.cwd();
 
-  // Copy each agent file
-  for (const file of agentFiles) {
-    const sourcePath = path.join(sourceDir, file);
-    const targetPath = path.join(targetDir, file);
-    await fs.copyFile(sourcePath, targetPath);
-  }
+  // Copy new and changed agent files (directory created on first copy)
+  const result = await syncFiles({
+    ...(await agentSyncOptions(packageRoot, basePath)),
+    dryRun: options.dryRun,
+  });
 
-  console.log(`✓ Synced ${agentFiles.length} agent definitions`);
+  console.log(
+    `✓ Synced ${result.files.length} agent definitions ` +
+      `(${summarizeSync(result)})`
+  );
 
   return {
-    agentsSynced: agentFiles.length,
-    agents: agentFiles.map((f) => path.basename(f, ".md")),
+    agentsSynced: result.files.length,
+    agents: result.files.map((f) => path.basename(f, ".md")),
+    result,
   };
 }
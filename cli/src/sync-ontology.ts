@@ -2,7 +2,13 @@ import fs from "fs/promises";
 import path from "path";
 import { fileURLToPath } from "url";
 import yaml from "yaml";
-import { glob } from "glob";
+import {
+  manifestPathFor,
+  summarizeSync,
+  syncFiles,
+  type SyncOptions,
+  type SyncResult,
+} from "./utils/file-sync.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -14,43 +20,105 @@ interface FoldersConfig {
   exclude_patterns: string[];
 }
 
-export async function syncOntologyFiles() {
-  // 1. Determine package root (one level up from dist/)
-  const packageRoot = path.join(__dirname, "..");
+export interface SyncRunOptions {
+  basePath?: string; // Project root (defaults to cwd)
+  dryRun?: boolean; // Report the diff without writing
+}
 
-  // 2. Read config
-  const configPath = path.join(packageRoot, "folders.yaml");
-  const configContent = await fs.readFile(configPath, "utf-8");
-  const config: FoldersConfig = yaml.parse(configContent);
-
-  // 3. Build glob pattern for all allowed extensions
-  const patterns = config.allowed_extensions.map((ext) => `one/**/*${ext}`);
-
-  // 4. Find all matching files
-  const oneFiles: string[] = [];
-  for (const pattern of patterns) {
-    const files = await glob(pattern, {
-      cwd: packageRoot,
-      ignore: config.exclude_patterns,
-    });
-    oneFiles.push(...files);
+/**
+ * Reads the CLI package version (manifests record it so an upgrade
+ * re-checks file contents)
+ */
+export async function getPackageVersion(
+  packageRoot: string
+): Promise<string | undefined> {
+  try {
+    const packageJson = JSON.parse(
+      await fs.readFile(path.join(packageRoot, "package.json"), "utf-8")
+    );
+    return packageJson.version;
+  } catch {
+    return undefined;
   }
+}
+
+/**
+ * syncFiles options for the ontology: one/ files (dot-directories
+ * included) with the extensions and excludes from folders.yaml, recorded
+ * in the "ontology" manifest
+ *
+ * Shared by `oneie sync`, `oneie init` and `oneie agent` so every command
+ * tracks these files in the same manifest
+ */
+export async function ontologySyncOptions(
+  packageRoot: string,
+  basePath: string
+): Promise<SyncOptions> {
+  const config = await readFoldersConfig(packageRoot);
 
-  // 5. Copy all files to user directory
-  for (const file of oneFiles) {
-    const sourcePath = path.join(packageRoot, file);
-    const targetPath = path.join(process.cwd(), file);
+  return {
+    sourceDir: packageRoot,
+    targetDir: basePath,
+    patterns: ontologyPatterns(config),
+    ignore: config.exclude_patterns,
+    dot: true,
+    manifestPath: manifestPathFor(basePath, "ontology"),
+    version: await getPackageVersion(packageRoot),
+  };
+}
 
-    // Create directory if needed
-    await fs.mkdir(path.dirname(targetPath), { recursive: true });
+/**
+ * syncFiles options for everything else under one/ (dotfiles, .txt, ...),
+ * which `oneie init` and `oneie agent` install along with the ontology.
+ * Disjoint from ontologySyncOptions and recorded in its own
+ * "ontology-extras" manifest, so `oneie sync` never removes these files
+ */
+export async function ontologyExtrasSyncOptions(
+  packageRoot: string,
+  basePath: string
+): Promise<SyncOptions> {
+  const config = await readFoldersConfig(packageRoot);
 
-    // Copy file
-    await fs.copyFile(sourcePath, targetPath);
-  }
+  return {
+    sourceDir: packageRoot,
+    targetDir: basePath,
+    patterns: ["one/**/*"],
+    ignore: [...ontologyPatterns(config), ...config.exclude_patterns],
+    dot: true,
+    manifestPath: manifestPathFor(basePath, "ontology-extras"),
+    version: await getPackageVersion(packageRoot),
+  };
+}
+
+async function readFoldersConfig(packageRoot: string): Promise<FoldersConfig> {
+  const configContent = await fs.readFile(path.join(packageRoot, "folders.yaml"), "utf-8");
+  return yaml.parse(configContent);
+}
+
+/**
+ * One pattern per allowed extension (globbed in one walk)
+ */
+function ontologyPatterns(config: FoldersConfig): string[] {
+  return config.allowed_extensions.map((ext) => `one/**/*${ext}`);
+}
+
+export async function syncOntologyFiles(options: SyncRunOptions = {}) {
+  // 1. Determine package root (one level up from dist/)
+  const packageRoot = path.join(__dirname, "..");
+  const basePath = options.basePath || process.cwd();
+
+  // 2. Copy new and changed files, remove files dropped from the package
+  const result: SyncResult = await syncFiles({
+    ...(await ontologySyncOptions(packageRoot, basePath)),
+    dryRun: options.dryRun,
+  });
 
-  console.log(`✓ Copied ${oneFiles.length} ontology files`);
+  console.log(`✓ Ontology files: ${summarizeSync(result)}`);
 
   return {
-    filesCopied: oneFiles.length,
+    filesCopied: result.added.length + result.updated.length,
+    filesUnchanged: result.unchanged,
+    filesRemoved: result.removed.length,
+    result,
   };
 }
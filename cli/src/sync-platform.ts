@@ -0,0 +1,43 @@
+import { ontologyExtrasSyncOptions, ontologySyncOptions } from "./sync-ontology.js";
+import { agentSyncOptions } from "./sync-agents.js";
+import { claudeConfigSyncOptions } from "./copy-claude-config.js";
+import type { SyncOptions } from "./utils/file-sync.js";
+
+export interface PlatformSync {
+  label: string; // Spinner / dry-run heading
+  prefix: string; // Prepended to synced paths in dry-run diffs
+  options: SyncOptions;
+}
+
+/**
+ * Platform file syncs run by `oneie init` and `oneie agent`: the same
+ * named manifests and patterns as `oneie sync` (sync-ontology,
+ * sync-agents, copy-claude-config), plus the rest of one/
+ */
+export async function platformSyncs(
+  packageRoot: string,
+  basePath: string
+): Promise<PlatformSync[]> {
+  return [
+    {
+      label: "/one",
+      prefix: "", // Paths already start with one/
+      options: await ontologySyncOptions(packageRoot, basePath),
+    },
+    {
+      label: "/one (other files)",
+      prefix: "",
+      options: await ontologyExtrasSyncOptions(packageRoot, basePath),
+    },
+    {
+      label: "/.claude/agents",
+      prefix: ".claude/agents/",
+      options: await agentSyncOptions(packageRoot, basePath),
+    },
+    {
+      label: "/.claude",
+      prefix: ".claude/",
+      options: await claudeConfigSyncOptions(packageRoot, basePath),
+    },
+  ];
+}
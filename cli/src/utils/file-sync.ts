@@ -0,0 +1,399 @@
+import fs from "fs/promises";
+import path from "path";
+import { createHash } from "crypto";
+import { glob } from "glob";
+
+/**
+ * Manifest-based incremental file sync
+ *
+ * Copies the files matched by a set of glob patterns from a source tree
+ * (the CLI package) into a target tree (the user's project), and records
+ * what it wrote in a manifest. On the next run:
+ *
+ * - Files whose target still matches the manifest (size + mtime) and whose
+ *   source is unchanged (size + mtime, same package version) are skipped
+ *   without being read
+ * - Otherwise same-size files are compared by SHA-256 before copying
+ * - Files the previous run installed that are no longer in the source are
+ *   removed, unless the user has modified them since
+ *
+ * The source is globbed once, directories are created once, and copies
+ * run with bounded concurrency.
+ */
+
+export const MANIFEST_VERSION = 1;
+export const DEFAULT_SYNC_CONCURRENCY = 16;
+
+/**
+ * Options for syncFiles
+ */
+export interface SyncOptions {
+  sourceDir: string;
+  targetDir: string;
+  patterns: string[]; // Glob patterns relative to sourceDir
+  ignore?: string[];
+  dot?: boolean; // Match dotfiles (default: false)
+  manifestPath: string; // See manifestPathFor()
+  version?: string; // Source version; a change forces content checks
+  concurrency?: number; // Default: DEFAULT_SYNC_CONCURRENCY
+  dryRun?: boolean; // Compute the diff, write nothing
+}
+
+/**
+ * What a sync did (or would do, for a dry run)
+ */
+export interface SyncResult {
+  files: string[]; // Every matched source file
+  added: string[]; // New in the target
+  updated: string[]; // Content changed
+  removed: string[]; // Stale: installed before, gone from the source
+  kept: string[]; // Stale but modified by the user, left in place
+  unchanged: number;
+  bytesCopied: number;
+  durationMs: number;
+  dryRun: boolean;
+}
+
+interface ManifestEntry {
+  size: number;
+  hash: string; // SHA-256 of the content
+  mtimeMs: number; // Target mtime after copy
+  sourceMtimeMs: number;
+}
+
+interface Manifest {
+  version: number;
+  source?: string;
+  files: Record<string, ManifestEntry>;
+}
+
+type FileStat = { size: number; mtimeMs: number };
+
+/**
+ * Standard manifest location for a named sync in a project
+ * @param basePath Project root
+ * @param name Sync name (one manifest per set of patterns)
+ * @returns Path to .oneie/manifests/<name>.json
+ */
+export function manifestPathFor(basePath: string, name: string): string {
+  return path.join(basePath, ".oneie", "manifests", `${name}.json`);
+}
+
+/**
+ * Maps items through fn with at most `limit` calls in flight
+ * @param items Items to process
+ * @param limit Maximum concurrent calls
+ * @param fn Async mapper
+ * @returns Results in input order
+ */
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  };
+
+  const workers = Math.min(Math.max(1, limit), items.length);
+  await Promise.all(Array.from({ length: workers }, worker));
+  return results;
+}
+
+/**
+ * Syncs matching files from sourceDir to targetDir
+ * @param options Sync options
+ * @returns Files added, updated, removed and kept
+ */
+export async function syncFiles(options: SyncOptions): Promise<SyncResult> {
+  const startedAt = performance.now();
+  const concurrency = options.concurrency ?? DEFAULT_SYNC_CONCURRENCY;
+  const dryRun = options.dryRun ?? false;
+  const result: SyncResult = {
+    files: [],
+    added: [],
+    updated: [],
+    removed: [],
+    kept: [],
+    unchanged: 0,
+    bytesCopied: 0,
+    durationMs: 0,
+    dryRun,
+  };
+
+  // Running from inside the package: source and target are the same files
+  if (path.resolve(options.sourceDir) === path.resolve(options.targetDir)) {
+    result.durationMs = performance.now() - startedAt;
+    return result;
+  }
+
+  // 1. Glob once for all patterns
+  const files = (
+    await glob(options.patterns, {
+      cwd: options.sourceDir,
+      ignore: options.ignore,
+      dot: options.dot ?? false,
+      nodir: true,
+      posix: true,
+    })
+  ).sort();
+  result.files = files;
+
+  // 2. Load the previous manifest (a new source version disables the
+  //    stat-only fast path: packed files can keep their mtimes)
+  const previous = await readManifest(options.manifestPath);
+  const sameSource = !options.version || previous.source === options.version;
+  const manifest: Manifest = {
+    version: MANIFEST_VERSION,
+    source: options.version,
+    files: {},
+  };
+
+  // 3. Decide what each file needs
+  type Plan = {
+    file: string;
+    action: "add" | "update" | "skip";
+    source: FileStat;
+    hash?: string;
+  };
+
+  const plans = await mapWithConcurrency(
+    files,
+    concurrency,
+    async (file): Promise<Plan> => {
+      const sourcePath = path.join(options.sourceDir, file);
+      const targetPath = path.join(options.targetDir, file);
+      const [source, target] = await Promise.all([
+        statFile(sourcePath),
+        statFile(targetPath),
+      ]);
+      if (!source) {
+        throw new Error(`Source file disappeared during sync: ${sourcePath}`);
+      }
+
+      if (!target) {
+        return { file, action: "add", source };
+      }
+
+      const entry = previous.files[file];
+      const targetUntouched =
+        entry !== undefined &&
+        target.size === entry.size &&
+        target.mtimeMs === entry.mtimeMs;
+
+      // Fast path: nothing changed on either side since the last sync
+      if (
+        entry &&
+        targetUntouched &&
+        sameSource &&
+        source.size === entry.size &&
+        source.mtimeMs === entry.sourceMtimeMs
+      ) {
+        manifest.files[file] = entry;
+        return { file, action: "skip", source };
+      }
+
+      if (source.size !== target.size) {
+        return { file, action: "update", source };
+      }
+
+      // Same size: compare content
+      const sourceHash = await hashFile(sourcePath);
+      const targetHash =
+        entry && targetUntouched ? entry.hash : await hashFile(targetPath);
+      if (sourceHash === targetHash) {
+        manifest.files[file] = {
+          size: target.size,
+          hash: sourceHash,
+          mtimeMs: target.mtimeMs,
+          sourceMtimeMs: source.mtimeMs,
+        };
+        return { file, action: "skip", source, hash: sourceHash };
+      }
+
+      return { file, action: "update", source, hash: sourceHash };
+    }
+  );
+
+  const copies = plans.filter((plan) => plan.action !== "skip");
+  result.unchanged = plans.length - copies.length;
+  for (const plan of copies) {
+    (plan.action === "add" ? result.added : result.updated).push(plan.file);
+    result.bytesCopied += plan.source.size;
+  }
+
+  // 4. Stale files: in the previous manifest, no longer in the source
+  const current = new Set(files);
+  const stale = Object.keys(previous.files).filter(
+    (file) => !current.has(file)
+  );
+  const staleTargets = await mapWithConcurrency(stale, concurrency, (file) =>
+    statFile(path.join(options.targetDir, file))
+  );
+  stale.forEach((file, index) => {
+    const target = staleTargets[index];
+    const entry = previous.files[file];
+    if (!target) return;
+    if (target.size === entry.size && target.mtimeMs === entry.mtimeMs) {
+      result.removed.push(file);
+    } else {
+      result.kept.push(file);
+    }
+  });
+
+  if (dryRun) {
+    result.durationMs = performance.now() - startedAt;
+    return result;
+  }
+
+  // 5. Create each target directory once
+  const directories = [
+    ...new Set(
+      copies.map((plan) =>
+        path.dirname(path.join(options.targetDir, plan.file))
+      )
+    ),
+  ];
+  await mapWithConcurrency(directories, concurrency, (directory) =>
+    fs.mkdir(directory, { recursive: true })
+  );
+
+  // 6. Copy with bounded concurrency, recording what was written
+  await mapWithConcurrency(copies, concurrency, async (plan) => {
+    const sourcePath = path.join(options.sourceDir, plan.file);
+    const targetPath = path.join(options.targetDir, plan.file);
+    const [hash] = await Promise.all([
+      plan.hash ?? hashFile(sourcePath),
+      fs.copyFile(sourcePath, targetPath),
+    ]);
+    const target = await fs.stat(targetPath);
+    manifest.files[plan.file] = {
+      size: target.size,
+      hash,
+      mtimeMs: target.mtimeMs,
+      sourceMtimeMs: plan.source.mtimeMs,
+    };
+  });
+
+  // 7. Remove stale files and the directories they leave empty
+  await mapWithConcurrency(result.removed, concurrency, (file) =>
+    fs.rm(path.join(options.targetDir, file), { force: true })
+  );
+  await removeEmptyDirectories(options.targetDir, result.removed);
+
+  await writeManifest(options.manifestPath, manifest);
+
+  result.durationMs = performance.now() - startedAt;
+  return result;
+}
+
+/**
+ * Counts for spinner messages ("12 copied, 850 unchanged, 1 removed")
+ * @param result Sync result
+ * @returns Human-readable summary
+ */
+export function summarizeSync(result: SyncResult): string {
+  const copied = result.added.length + result.updated.length;
+  const parts = [
+    `${copied} ${result.dryRun ? "to copy" : "copied"}`,
+    `${result.unchanged} unchanged`,
+  ];
+  if (result.removed.length > 0) {
+    parts.push(
+      `${result.removed.length} ${result.dryRun ? "to remove" : "removed"}`
+    );
+  }
+  if (result.kept.length > 0) {
+    parts.push(`${result.kept.length} modified locally (kept)`);
+  }
+  return parts.join(", ");
+}
+
+/**
+ * Diff lines for a dry run: "+ added", "~ updated", "- removed"
+ * @param result Sync result
+ * @param prefix Path prefix to show (e.g. "one/")
+ * @returns One line per changed file
+ */
+export function formatSyncDiff(result: SyncResult, prefix = ""): string[] {
+  return [
+    ...result.added.map((file) => `+ ${prefix}${file}`),
+    ...result.updated.map((file) => `~ ${prefix}${file}`),
+    ...result.removed.map((file) => `- ${prefix}${file}`),
+    ...result.kept.map((file) => `! ${prefix}${file} (modified, kept)`),
+  ];
+}
+
+async function statFile(filePath: string): Promise<FileStat | null> {
+  try {
+    const stat = await fs.stat(filePath);
+    return stat.isFile() ? { size: stat.size, mtimeMs: stat.mtimeMs } : null;
+  } catch (error: any) {
+    if (error.code === "ENOENT" || error.code === "ENOTDIR") {
+      return null;
+    }
+    throw error;
+  }
+}
+
+async function hashFile(filePath: string): Promise<string> {
+  const content = await fs.readFile(filePath);
+  return createHash("sha256").update(content).digest("hex");
+}
+
+async function readManifest(manifestPath: string): Promise<Manifest> {
+  try {
+    const manifest = JSON.parse(await fs.readFile(manifestPath, "utf-8"));
+    if (manifest.version === MANIFEST_VERSION && manifest.files) {
+      return manifest;
+    }
+  } catch (error: any) {
+    if (error.code !== "ENOENT" && !(error instanceof SyntaxError)) {
+      throw error;
+    }
+  }
+  // Missing, unreadable or old format: treat as a first sync
+  return { version: MANIFEST_VERSION, files: {} };
+}
+
+async function writeManifest(
+  manifestPath: string,
+  manifest: Manifest
+): Promise<void> {
+  // Write then rename, so an interrupted sync never leaves a torn manifest
+  await fs.mkdir(path.dirname(manifestPath), { recursive: true });
+  const tempPath = `${manifestPath}.${process.pid}.tmp`;
+  await fs.writeFile(tempPath, JSON.stringify(manifest, null, 2), "utf-8");
+  await fs.rename(tempPath, manifestPath);
+}
+
+async function removeEmptyDirectories(
+  rootDir: string,
+  removedFiles: string[]
+): Promise<void> {
+  const root = path.resolve(rootDir);
+  const directories = new Set<string>();
+  for (const file of removedFiles) {
+    let directory = path.dirname(path.resolve(root, file));
+    while (directory.startsWith(root + path.sep)) {
+      directories.add(directory);
+      directory = path.dirname(directory);
+    }
+  }
+
+  // Deepest first, so parents are empty by the time they are tried
+  const sorted = [...directories].sort((a, b) => b.length - a.length);
+  for (const directory of sorted) {
+    try {
+      await fs.rmdir(directory);
+    } catch {
+      // Not empty (or already gone): leave it
+    }
+  }
+}
@@ -11,6 +11,8 @@ import {
   updateGitignore,
   rollbackInstallation,
 } from "../../src/utils/installation-setup.js";
+import { platformSyncs } from "../../src/sync-platform.js";
+import { syncFiles } from "../../src/utils/file-sync.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -332,4 +334,79 @@ describe("Installation Setup", () => {
       }
     });
   });
+
+  describe("Platform files", () => {
+    const PACKAGE = path.join(TEST_BASE_PATH, "package");
+    const PROJECT = path.join(TEST_BASE_PATH, "project");
+
+    async function writePackageFile(file: string, content = file) {
+      const filePath = path.join(PACKAGE, file);
+      await fs.mkdir(path.dirname(filePath), { recursive: true });
+      await fs.writeFile(filePath, content);
+    }
+
+    async function exists(file: string) {
+      return fs
+        .access(path.join(PROJECT, file))
+        .then(() => true)
+        .catch(() => false);
+    }
+
+    beforeEach(async () => {
+      await writePackageFile("package.json", JSON.stringify({ version: "1.0.0" }));
+      await writePackageFile(
+        "folders.yaml",
+        "allowed_extensions:\n  - .md\nexclude_patterns:\n  - \"*/.DS_Store\"\n"
+      );
+      await writePackageFile("one/knowledge/ontology.md");
+      await writePackageFile("one/knowledge/notes.txt");
+      await writePackageFile("one/.gitignore");
+      await writePackageFile("one/.obsidian/notes.md");
+      await writePackageFile("one/things/agents/agent-backend.md");
+      await writePackageFile(".claude/skills/convex/SKILL.md");
+      await writePackageFile(".claude/agents/agent-review.md");
+      await writePackageFile(".claude/commands/one.md");
+      await writePackageFile(".claude/settings.json", "{}");
+    });
+
+    it("should install .claude skills, agents, commands and settings", async () => {
+      for (const { options } of await platformSyncs(PACKAGE, PROJECT)) {
+        await syncFiles(options);
+      }
+
+      expect(await exists(".claude/skills/convex/SKILL.md")).toBe(true);
+      expect(await exists(".claude/agents/agent-review.md")).toBe(true);
+      expect(await exists(".claude/agents/agent-backend.md")).toBe(true);
+      expect(await exists(".claude/commands/one.md")).toBe(true);
+      expect(await exists(".claude/settings.json")).toBe(true);
+    });
+
+    it("should install every file under one/, dotfiles included", async () => {
+      for (const { options } of await platformSyncs(PACKAGE, PROJECT)) {
+        await syncFiles(options);
+      }
+
+      expect(await exists("one/knowledge/ontology.md")).toBe(true);
+      expect(await exists("one/knowledge/notes.txt")).toBe(true);
+      expect(await exists("one/.gitignore")).toBe(true);
+      expect(await exists("one/.obsidian/notes.md")).toBe(true);
+    });
+
+    it("should track each file in exactly one manifest", async () => {
+      const installed: string[] = [];
+      for (const { options } of await platformSyncs(PACKAGE, PROJECT)) {
+        if (options.targetDir === PROJECT) {
+          installed.push(...(await syncFiles(options)).files);
+        }
+      }
+
+      expect(installed.filter((file) => file.startsWith("one/")).sort()).toEqual([
+        "one/.gitignore",
+        "one/.obsidian/notes.md",
+        "one/knowledge/notes.txt",
+        "one/knowledge/ontology.md",
+        "one/things/agents/agent-backend.md",
+      ]);
+    });
+  });
 });
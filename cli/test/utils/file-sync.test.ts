@@ -0,0 +1,240 @@
+import { describe, it, expect, beforeEach, afterEach } from "bun:test";
+import fs from "fs/promises";
+import path from "path";
+import { fileURLToPath } from "url";
+import {
+  syncFiles,
+  manifestPathFor,
+  mapWithConcurrency,
+  formatSyncDiff,
+  summarizeSync,
+  type SyncOptions,
+} from "../../src/utils/file-sync.js";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const TEST_BASE_PATH = path.join(__dirname, "../.test-tmp-sync");
+const SOURCE = path.join(TEST_BASE_PATH, "package");
+const TARGET = path.join(TEST_BASE_PATH, "project");
+
+function options(overrides: Partial<SyncOptions> = {}): SyncOptions {
+  return {
+    sourceDir: SOURCE,
+    targetDir: TARGET,
+    patterns: ["one/**/*.md", "one/**/*.yaml"],
+    manifestPath: manifestPathFor(TARGET, "test"),
+    version: "1.0.0",
+    ...overrides,
+  };
+}
+
+async function writeSource(file: string, content: string) {
+  const filePath = path.join(SOURCE, file);
+  await fs.mkdir(path.dirname(filePath), { recursive: true });
+  await fs.writeFile(filePath, content);
+}
+
+async function readTarget(file: string) {
+  return fs.readFile(path.join(TARGET, file), "utf-8");
+}
+
+async function targetExists(file: string) {
+  return fs
+    .access(path.join(TARGET, file))
+    .then(() => true)
+    .catch(() => false);
+}
+
+describe("File Sync", () => {
+  beforeEach(async () => {
+    await fs.mkdir(TARGET, { recursive: true });
+    await writeSource("one/knowledge/ontology.md", "# Ontology");
+    await writeSource("one/things/agents/agent-backend.md", "# Backend");
+    await writeSource("one/things/plans.yaml", "plans: []");
+    await writeSource("one/things/notes.txt", "not synced");
+  });
+
+  afterEach(async () => {
+    try {
+      await fs.rm(TEST_BASE_PATH, { recursive: true, force: true });
+    } catch (error) {
+      // Ignore cleanup errors
+    }
+  });
+
+  describe("syncFiles", () => {
+    it("should copy matching files on a cold sync", async () => {
+      const result = await syncFiles(options());
+
+      expect(result.added).toEqual([
+        "one/knowledge/ontology.md",
+        "one/things/agents/agent-backend.md",
+        "one/things/plans.yaml",
+      ]);
+      expect(result.unchanged).toBe(0);
+      expect(await readTarget("one/knowledge/ontology.md")).toBe("# Ontology");
+      expect(await targetExists("one/things/notes.txt")).toBe(false);
+    });
+
+    it("should skip everything on a warm sync", async () => {
+      await syncFiles(options());
+      const result = await syncFiles(options());
+
+      expect(result.added).toEqual([]);
+      expect(result.updated).toEqual([]);
+      expect(result.unchanged).toBe(3);
+      expect(result.bytesCopied).toBe(0);
+    });
+
+    it("should copy only changed files", async () => {
+      await syncFiles(options());
+      await writeSource("one/knowledge/ontology.md", "# Ontology v2 (longer)");
+
+      const result = await syncFiles(options());
+
+      expect(result.updated).toEqual(["one/knowledge/ontology.md"]);
+      expect(result.unchanged).toBe(2);
+      expect(await readTarget("one/knowledge/ontology.md")).toBe(
+        "# Ontology v2 (longer)"
+      );
+    });
+
+    it("should detect same-size changes by hash after an upgrade", async () => {
+      await syncFiles(options());
+
+      // Same size and mtime as before: only the content differs
+      const sourcePath = path.join(SOURCE, "one/things/plans.yaml");
+      const { mtime } = await fs.stat(sourcePath);
+      await fs.writeFile(sourcePath, "plans: {}");
+      await fs.utimes(sourcePath, mtime, mtime);
+
+      const result = await syncFiles(options({ version: "1.0.1" }));
+
+      expect(result.updated).toEqual(["one/things/plans.yaml"]);
+      expect(await readTarget("one/things/plans.yaml")).toBe("plans: {}");
+    });
+
+    it("should adopt identical files without copying", async () => {
+      // Target already has the same content (e.g. installed before manifests)
+      await fs.mkdir(path.join(TARGET, "one/knowledge"), { recursive: true });
+      await fs.writeFile(
+        path.join(TARGET, "one/knowledge/ontology.md"),
+        "# Ontology"
+      );
+
+      const result = await syncFiles(options());
+
+      expect(result.added).not.toContain("one/knowledge/ontology.md");
+      expect(result.unchanged).toBe(1);
+    });
+
+    it("should restore files edited in the target", async () => {
+      await syncFiles(options());
+      await fs.writeFile(
+        path.join(TARGET, "one/things/plans.yaml"),
+        "edited locally"
+      );
+
+      const result = await syncFiles(options());
+
+      expect(result.updated).toEqual(["one/things/plans.yaml"]);
+      expect(await readTarget("one/things/plans.yaml")).toBe("plans: []");
+    });
+
+    it("should remove stale files and empty directories", async () => {
+      await syncFiles(options());
+      await fs.rm(path.join(SOURCE, "one/things/agents"), { recursive: true });
+
+      const result = await syncFiles(options());
+
+      expect(result.removed).toEqual(["one/things/agents/agent-backend.md"]);
+      expect(await targetExists("one/things/agents")).toBe(false);
+      expect(await targetExists("one/things/plans.yaml")).toBe(true);
+    });
+
+    it("should keep stale files the user modified", async () => {
+      await syncFiles(options());
+      await fs.writeFile(
+        path.join(TARGET, "one/things/agents/agent-backend.md"),
+        "# My own backend agent"
+      );
+      await fs.rm(path.join(SOURCE, "one/things/agents"), { recursive: true });
+
+      const result = await syncFiles(options());
+
+      expect(result.removed).toEqual([]);
+      expect(result.kept).toEqual(["one/things/agents/agent-backend.md"]);
+      expect(await targetExists("one/things/agents/agent-backend.md")).toBe(
+        true
+      );
+    });
+
+    it("should not touch files it did not install", async () => {
+      await fs.mkdir(path.join(TARGET, "one/things"), { recursive: true });
+      await fs.writeFile(path.join(TARGET, "one/things/mine.md"), "# Mine");
+
+      await syncFiles(options());
+      const result = await syncFiles(options());
+
+      expect(result.removed).toEqual([]);
+      expect(await readTarget("one/things/mine.md")).toBe("# Mine");
+    });
+
+    it("should report the diff without writing on a dry run", async () => {
+      await syncFiles(options());
+      await writeSource("one/things/new.md", "# New");
+      await writeSource("one/knowledge/ontology.md", "# Ontology changed");
+      await fs.rm(path.join(SOURCE, "one/things/plans.yaml"));
+
+      const result = await syncFiles(options({ dryRun: true }));
+
+      expect(formatSyncDiff(result)).toEqual([
+        "+ one/things/new.md",
+        "~ one/knowledge/ontology.md",
+        "- one/things/plans.yaml",
+      ]);
+      expect(summarizeSync(result)).toBe(
+        "2 to copy, 1 unchanged, 1 to remove"
+      );
+      expect(await targetExists("one/things/new.md")).toBe(false);
+      expect(await targetExists("one/things/plans.yaml")).toBe(true);
+
+      // The manifest is unchanged, so the real sync sees the same diff
+      const real = await syncFiles(options());
+      expect(formatSyncDiff(real)).toEqual(formatSyncDiff(result));
+    });
+
+    it("should treat a corrupt manifest as a first sync", async () => {
+      await syncFiles(options());
+      await fs.writeFile(manifestPathFor(TARGET, "test"), "{not json");
+
+      const result = await syncFiles(options());
+
+      expect(result.unchanged).toBe(3);
+      expect(result.removed).toEqual([]);
+    });
+  });
+
+  describe("mapWithConcurrency", () => {
+    it("should bound concurrent calls and keep order", async () => {
+      let active = 0;
+      let maxActive = 0;
+
+      const results = await mapWithConcurrency(
+        [5, 1, 4, 2, 3, 0],
+        2,
+        async (value) => {
+          active++;
+          maxActive = Math.max(maxActive, active);
+          await new Promise((resolve) => setTimeout(resolve, value));
+          active--;
+          return value * 10;
+        }
+      );
+
+      expect(results).toEqual([50, 10, 40, 20, 30, 0]);
+      expect(maxActive).toBe(2);
+    });
+  });
+});
@@ -0,0 +1,279 @@
+/**
+ * Chat stream benchmark against a local fake OpenRouter upstream
+ *
+ *   bun run bench:chat
+ *
+ * Starts an HTTP server that streams OpenAI-style SSE deltas (random network
+ * chunking, optional first-token latency and per-token delay) and runs the
+ * same pipeline as /api/chat (createChatStream over the fetch body).
+ *
+ * Options (env):
+ *   BENCH_TOKENS  deltas per response          (default 20000)
+ *   BENCH_TTFT    upstream first-token latency (default 150ms)
+ *   BENCH_DELAY   per-token delay, paced run   (default 2ms)
+ *
+ * Scenarios:
+ * 1. correctness: deltas recovered by the old per-chunk line split vs the
+ *    line-buffered parser, same randomly chunked stream
+ * 2. throughput: unpaced stream, raw pipe vs createChatStream (+UI)
+ * 3. paced: TTFT and tokens/sec as reported by the stream metrics
+ * 4. backpressure: slow client; upstream chunks read ahead of the client
+ * 5. cancellation: client disconnects mid-stream; upstream sees the abort
+ */
+
+import { createServer, type Server } from "node:http";
+import type { AddressInfo } from "node:net";
+import { type ChatStreamMetrics, createChatStream } from "../src/lib/chat-stream";
+
+// ============================================================================
+// CONFIG
+// ============================================================================
+
+const TOKENS = parseInt(process.env.BENCH_TOKENS || "20000", 10);
+const TTFT_MS = parseInt(process.env.BENCH_TTFT || "150", 10);
+const DELAY_MS = parseInt(process.env.BENCH_DELAY || "2", 10);
+const PACED_TOKENS = Math.min(TOKENS, 500);
+
+// ============================================================================
+// FAKE UPSTREAM
+// ============================================================================
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+const delta = (content: string) =>
+	`data: ${JSON.stringify({ choices: [{ delta: { content } }] })}\n\n`;
+
+function makeTokens(count: number): string[] {
+	const tokens: string[] = [];
+	for (let i = 0; i < count; i++) {
+		// A chart block every 1000 tokens exercises UI extraction
+		if (i % 1000 === 250) {
+			tokens.push(
+				"\n```ui-chart\n",
+				JSON.stringify({ title: `Chart ${i}`, data: [i, i + 1, i + 2] }),
+				"\n```\n",
+			);
+		} else {
+			tokens.push(`tok${i} `);
+		}
+	}
+	return tokens;
+}
+
+interface Upstream {
+	url: string;
+	aborted: number;
+	close: () => Promise<void>;
+}
+
+/**
+ * Streams ?tokens=N deltas; ?paced=1 adds TTFT and per-token delay.
+ * Writes are cut at random byte offsets, like a real network.
+ */
+async function startUpstream(): Promise<Upstream> {
+	const upstream: Upstream = { url: "", aborted: 0, close: async () => {} };
+
+	const server: Server = createServer(async (req, res) => {
+		const url = new URL(req.url ?? "/", "http://localhost");
+		const count = parseInt(url.searchParams.get("tokens") || "100", 10);
+		const paced = url.searchParams.get("paced") === "1";
+		let closed = false;
+		res.on("close", () => {
+			if (!res.writableEnded) {
+				closed = true;
+				upstream.aborted++;
+			}
+		});
+
+		res.writeHead(200, { "Content-Type": "text/event-stream" });
+		if (paced) await sleep(TTFT_MS);
+
+		let pending = "";
+		for (const token of makeTokens(count)) {
+			if (closed) return;
+			pending += delta(token);
+			if (paced || pending.length > 512) {
+				// Random cut: events straddle writes
+				const cut = paced
+					? pending.length
+					: Math.floor(pending.length * (0.3 + Math.random() * 0.7));
+				const ok = res.write(pending.slice(0, cut));
+				pending = pending.slice(cut);
+				if (!ok) await new Promise((resolve) => res.once("drain", resolve));
+				if (paced) await sleep(DELAY_MS);
+			}
+		}
+		res.end(`${pending}data: [DONE]\n\n`);
+	});
+
+	await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+	upstream.url = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+	upstream.close = () =>
+		new Promise<void>((resolve) => server.close(() => resolve()));
+	return upstream;
+}
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+function sleep(ms: number) {
+	return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+async function drain(
+	stream: ReadableStream<Uint8Array>,
+	onText?: (text: string) => void,
+): Promise<number> {
+	let bytes = 0;
+	const reader = stream.getReader();
+	for (;;) {
+		const { done, value } = await reader.read();
+		if (done) return bytes;
+		bytes += value.byteLength;
+		onText?.(decoder.decode(value, { stream: true }));
+	}
+}
+
+/** The previous handler's parsing: split each chunk on \n, no buffering */
+function countNaiveDeltas(text: string, state: { count: number }) {
+	for (const line of text.split("\n")) {
+		if (!line.startsWith("data: ") || line === "data: [DONE]") continue;
+		try {
+			if (JSON.parse(line.slice(6)).choices?.[0]?.delta?.content) {
+				state.count++;
+			}
+		} catch {
+			// Dropped: JSON cut by a chunk boundary
+		}
+	}
+}
+
+function countDeltas(text: string): number {
+	return (text.match(/"delta":\{"content"/g) ?? []).length;
+}
+
+function mbps(bytes: number, ms: number) {
+	return ((bytes / 1024 / 1024) / (ms / 1000)).toFixed(1);
+}
+
+async function fetchBody(url: string, signal?: AbortSignal) {
+	const response = await fetch(url, { signal });
+	if (!response.body) throw new Error("Upstream returned no body");
+	return response.body;
+}
+
+// ============================================================================
+// MAIN
+// ============================================================================
+
+async function main() {
+	const upstream = await startUpstream();
+	const expected = makeTokens(TOKENS).length;
+	console.log(`Fake upstream ${upstream.url}, ${expected} deltas per response\n`);
+
+	// 1. CORRECTNESS
+	const naive = { count: 0 };
+	await drain(await fetchBody(`${upstream.url}/?tokens=${TOKENS}`), (text) =>
+		countNaiveDeltas(text, naive),
+	);
+	let forwarded = "";
+	await drain(
+		createChatStream(await fetchBody(`${upstream.url}/?tokens=${TOKENS}`)),
+		(text) => {
+			forwarded += text;
+		},
+	);
+	console.log("=== correctness (randomly chunked upstream) ===");
+	console.log(`  per-chunk split: ${naive.count}/${expected} deltas parsed`);
+	console.log(`  line-buffered:   ${countDeltas(forwarded)}/${expected} deltas forwarded\n`);
+
+	// 2. THROUGHPUT (after one warm-up run)
+	await drain(createChatStream(await fetchBody(`${upstream.url}/?tokens=${TOKENS}`)));
+	console.log("=== throughput (unpaced) ===");
+	for (const [label, run] of [
+		["raw pipe", (body: ReadableStream<Uint8Array>) => body],
+		["createChatStream", (body: ReadableStream<Uint8Array>) => createChatStream(body)],
+		[
+			"createChatStream+UI",
+			(body: ReadableStream<Uint8Array>) =>
+				createChatStream(body, { enableGenerativeUI: true }),
+		],
+	] as const) {
+		const started = performance.now();
+		const bytes = await drain(run(await fetchBody(`${upstream.url}/?tokens=${TOKENS}`)));
+		const ms = performance.now() - started;
+		console.log(
+			`  ${label.padEnd(20)} ${ms.toFixed(0)}ms  ${mbps(bytes, ms)} MB/s  ` +
+				`${Math.round(expected / (ms / 1000))} deltas/s`,
+		);
+	}
+
+	// 3. PACED: TTFT AND TOKENS/SEC
+	let metrics: ChatStreamMetrics | undefined;
+	const startedAt = performance.now();
+	await drain(
+		createChatStream(await fetchBody(`${upstream.url}/?tokens=${PACED_TOKENS}&paced=1`), {
+			enableGenerativeUI: true,
+			startedAt,
+			onMetrics: (m) => {
+				metrics = m;
+			},
+		}),
+	);
+	console.log(`\n=== paced (TTFT ${TTFT_MS}ms, ${DELAY_MS}ms/token) ===`);
+	console.log(
+		`  ttft ${metrics?.ttftMs?.toFixed(0)}ms  ${metrics?.tokensPerSecond} tokens/s  ` +
+			`${metrics?.tokens} tokens  ${metrics?.uiComponents} UI components`,
+	);
+
+	// 4. BACKPRESSURE: in-process upstream, client reads every 5ms
+	let produced = 0;
+	const source = new ReadableStream<Uint8Array>(
+		{
+			pull(controller) {
+				if (produced >= 200) {
+					controller.enqueue(encoder.encode("data: [DONE]\n\n"));
+					controller.close();
+					return;
+				}
+				produced++;
+				controller.enqueue(encoder.encode(delta(`tok${produced} `)));
+			},
+		},
+		{ highWaterMark: 0 },
+	);
+	const reader = createChatStream(source).getReader();
+	let consumed = 0;
+	let maxAhead = 0;
+	for (;;) {
+		const { done } = await reader.read();
+		if (done) break;
+		consumed++;
+		maxAhead = Math.max(maxAhead, produced - consumed);
+		await sleep(5);
+	}
+	console.log("\n=== backpressure (slow client) ===");
+	console.log(`  upstream chunks read ahead of client: max ${maxAhead}`);
+
+	// 5. CANCELLATION
+	const before = upstream.aborted;
+	const controller = new AbortController();
+	const cancelReader = createChatStream(
+		await fetchBody(`${upstream.url}/?tokens=${PACED_TOKENS}&paced=1`, controller.signal),
+	).getReader();
+	await cancelReader.read();
+	await cancelReader.cancel("client disconnected");
+	controller.abort();
+	await sleep(50);
+	console.log("\n=== cancellation ===");
+	console.log(`  upstream saw disconnect: ${upstream.aborted > before ? "yes" : "no"}`);
+
+	await upstream.close();
+}
+
+main().catch((error) => {
+	console.error(error);
+	process.exit(1);
+});
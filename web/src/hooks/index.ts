@@ -52,6 +52,7 @@ export {
 	queryClient,
 	useDataProvider,
 } from "./useDataProvider";
+export type { InfiniteListOptions } from "./useInfiniteList";
 
 // ============================================================================
 // TYPES
@@ -61,6 +62,7 @@ export type {
 	ExtractMutationArgs,
 	ExtractMutationData,
 	ExtractQueryData,
+	InfiniteQueryResult,
 	MutationOptions,
 	MutationResult,
 	QueryOptions,
@@ -79,6 +81,8 @@ export {
 	// Mutation hooks
 	useCreateThing,
 	useDeleteThing,
+	// Infinite scroll
+	useInfiniteThings,
 	useThing,
 	// Query hooks
 	useThings,
@@ -115,6 +119,7 @@ export {
 	useEvent,
 	// Query hooks
 	useEvents,
+	useInfiniteEvents,
 	// Mutation hooks
 	useLogEvent,
 	useRecentEvents,
@@ -127,6 +132,7 @@ export {
 export {
 	// Mutation hooks
 	useCreateKnowledge,
+	useInfiniteKnowledge,
 	// Query hooks
 	useKnowledge,
 	// Convenience hooks
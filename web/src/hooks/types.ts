@@ -31,6 +31,35 @@ export interface QueryResult<T> {
 	refetching: boolean;
 }
 
+/**
+ * InfiniteQueryResult - Return type for infinite-scroll hooks
+ * (similar to usePaginatedQuery in Convex)
+ *
+ * @template T - The item type of each page
+ */
+export interface InfiniteQueryResult<T> {
+	/** All items loaded so far, pages concatenated in order */
+	data: T[];
+
+	/** True while the first page is loading */
+	loading: boolean;
+
+	/** Error object if a page failed to load, null otherwise */
+	error: Error | null;
+
+	/** Load the next page (no-op when there is none or one is in flight) */
+	loadMore: () => Promise<void>;
+
+	/** True if another page is available */
+	hasMore: boolean;
+
+	/** True while a subsequent page is loading */
+	loadingMore: boolean;
+
+	/** Refetch all loaded pages */
+	refetch: () => Promise<void>;
+}
+
 /**
  * MutationResult - Return type for mutation hooks (similar to useMutation in Convex)
  *
@@ -16,12 +16,14 @@ import type {
 	ListEventsOptions,
 } from "@/providers/DataProvider";
 import type {
+	InfiniteQueryResult,
 	MutationOptions,
 	MutationResult,
 	QueryOptions,
 	QueryResult,
 } from "./types";
 import { useDataProvider } from "./useDataProvider";
+import { type InfiniteListOptions, useInfiniteList } from "./useInfiniteList";
 
 // ============================================================================
 // QUERY HOOKS
@@ -80,6 +82,28 @@ export function useEvents(
 	};
 }
 
+/**
+ * useInfiniteEvents - Page through an event timeline (infinite scroll)
+ *
+ * Most recent first. Narrow with actorId (activity feed) or targetId
+ * (audit trail).
+ *
+ * @example
+ * ```tsx
+ * const { data: events, hasMore, loadMore } = useInfiniteEvents({
+ *   groupId,
+ *   actorId: userId
+ * });
+ * ```
+ */
+export function useInfiniteEvents(
+	options?: ListEventsOptions & InfiniteListOptions,
+	queryOptions?: QueryOptions,
+): InfiniteQueryResult<Event> {
+	const provider = useDataProvider();
+	return useInfiniteList(["events"], provider.events, options, queryOptions);
+}
+
 /**
  * useEvent - Get single event by ID
  *
@@ -0,0 +1,70 @@
+/**
+ * useInfiniteList - Shared infinite-scroll hook for DataProvider lists
+ *
+ * Pages through a provider resource with opaque cursors (listPage), falling
+ * back to offset paging for providers without native cursors. Used by
+ * useInfiniteThings, useInfiniteEvents and useInfiniteKnowledge.
+ */
+
+import { useInfiniteQuery } from "@tanstack/react-query";
+import { Effect } from "effect";
+import type { Page, PageOptions, QueryError } from "@/providers/DataProvider";
+import { DEFAULT_PAGE_SIZE, listPage } from "@/providers/pagination";
+import type { InfiniteQueryResult, QueryOptions } from "./types";
+
+export interface InfiniteListOptions {
+	/** Items per page (default 50) */
+	pageSize?: number;
+}
+
+export function useInfiniteList<T, O extends { limit?: number }>(
+	queryKey: readonly unknown[],
+	resource: {
+		list: (options?: O) => Effect.Effect<T[], QueryError>;
+		listPage?: (
+			options?: O,
+			page?: PageOptions,
+		) => Effect.Effect<Page<T>, QueryError>;
+	},
+	options: (O & InfiniteListOptions) | undefined,
+	queryOptions?: QueryOptions,
+): InfiniteQueryResult<T> {
+	const {
+		realtime: _realtime,
+		enabled = true,
+		...reactQueryOptions
+	} = queryOptions ?? {};
+	const { pageSize = DEFAULT_PAGE_SIZE, ...listOptions } = options ?? {};
+
+	const query = useInfiniteQuery({
+		queryKey: [...queryKey, "infinite", listOptions, pageSize],
+		queryFn: async ({ pageParam }) =>
+			Effect.runPromise(
+				listPage(resource, listOptions as O, {
+					cursor: pageParam,
+					numItems: pageSize,
+				}),
+			),
+		initialPageParam: null as string | null,
+		getNextPageParam: (lastPage) =>
+			lastPage.isDone ? undefined : (lastPage.continueCursor ?? undefined),
+		enabled,
+		...reactQueryOptions,
+	});
+
+	return {
+		data: query.data?.pages.flatMap((page) => page.page) ?? [],
+		loading: query.isLoading,
+		error: query.error as Error | null,
+		loadMore: async () => {
+			if (query.hasNextPage && !query.isFetchingNextPage) {
+				await query.fetchNextPage();
+			}
+		},
+		hasMore: query.hasNextPage,
+		loadingMore: query.isFetchingNextPage,
+		refetch: async () => {
+			await query.refetch();
+		},
+	};
+}
@@ -18,12 +18,14 @@ import type {
 	SearchKnowledgeOptions,
 } from "@/providers/DataProvider";
 import type {
+	InfiniteQueryResult,
 	MutationOptions,
 	MutationResult,
 	QueryOptions,
 	QueryResult,
 } from "./types";
 import { useDataProvider } from "./useDataProvider";
+import { type InfiniteListOptions, useInfiniteList } from "./useInfiniteList";
 
 // ============================================================================
 // QUERY HOOKS
@@ -81,6 +83,30 @@ export function useKnowledge(
 	};
 }
 
+/**
+ * useInfiniteKnowledge - Page through knowledge items (infinite scroll)
+ *
+ * @example
+ * ```tsx
+ * const { data: chunks, hasMore, loadMore } = useInfiniteKnowledge({
+ *   groupId,
+ *   knowledgeType: 'chunk'
+ * });
+ * ```
+ */
+export function useInfiniteKnowledge(
+	options?: SearchKnowledgeOptions & InfiniteListOptions,
+	queryOptions?: QueryOptions,
+): InfiniteQueryResult<Knowledge> {
+	const provider = useDataProvider();
+	return useInfiniteList(
+		["knowledge"],
+		provider.knowledge,
+		options,
+		queryOptions,
+	);
+}
+
 /**
  * useSearch - Semantic search with query debouncing
  *
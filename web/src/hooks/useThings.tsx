@@ -19,12 +19,14 @@ import type {
 	UpdateThingInput,
 } from "@/providers/DataProvider";
 import type {
+	InfiniteQueryResult,
 	MutationOptions,
 	MutationResult,
 	QueryOptions,
 	QueryResult,
 } from "./types";
 import { queryClient, useDataProvider } from "./useDataProvider";
+import { type InfiniteListOptions, useInfiniteList } from "./useInfiniteList";
 
 // ============================================================================
 // QUERY HOOKS
@@ -108,6 +110,36 @@ export function useThings<T extends Thing = Thing>(
 	};
 }
 
+/**
+ * useInfiniteThings - Page through entities (infinite scroll)
+ *
+ * Fetches one page at a time with opaque cursors instead of loading the
+ * whole list. Shares the ["things"] cache key, so thing mutations refresh it.
+ *
+ * @example
+ * ```tsx
+ * const { data: courses, hasMore, loadMore, loadingMore } = useInfiniteThings({
+ *   groupId,
+ *   type: 'course',
+ *   pageSize: 20
+ * });
+ *
+ * <button disabled={!hasMore || loadingMore} onClick={loadMore}>Load more</button>
+ * ```
+ */
+export function useInfiniteThings<T extends Thing = Thing>(
+	options?: ListThingsOptions & InfiniteListOptions,
+	queryOptions?: QueryOptions,
+): InfiniteQueryResult<T> {
+	const provider = useDataProvider();
+	return useInfiniteList(
+		["things"],
+		provider.things,
+		options,
+		queryOptions,
+	) as InfiniteQueryResult<T>;
+}
+
 /**
  * useThing - Get single entity by ID
  *
@@ -0,0 +1,368 @@
+/**
+ * Chat Streaming Pipeline (OpenAI-compatible SSE)
+ *
+ * Turns an upstream chat-completions stream into the stream sent to the
+ * browser:
+ *
+ *   upstream bytes ─▶ SSEParser (line-buffered) ─▶ content deltas
+ *                                                    │
+ *                     GenerativeUIExtractor ◀────────┘
+ *                     (ui-* blocks sent as soon as they close)
+ *
+ * - Events split across network chunks are reassembled, never dropped
+ * - Chunks that start and end on event boundaries are forwarded as the
+ *   original bytes; only split chunks are re-encoded per event
+ * - pull-based: the upstream is read only when the client is ready for
+ *   more, so a slow client slows the upstream instead of growing a buffer
+ * - Client disconnect cancels the upstream read (and the fetch via signal)
+ * - Time-to-first-token and tokens/sec reported when the stream ends
+ */
+
+export type GenerativeUIComponent =
+	| "chart"
+	| "table"
+	| "button"
+	| "card"
+	| "form"
+	| "product";
+
+export interface GenerativeUIMessage {
+	type: "ui";
+	payload: {
+		component: GenerativeUIComponent;
+		data: unknown;
+	};
+}
+
+export interface SSEEvent {
+	data: string | null; // Joined data lines; null for comment-only blocks
+	raw: string; // Original event text including the blank line
+}
+
+export interface ChatStreamMetrics {
+	ttftMs: number | null; // Request start to first content delta
+	durationMs: number; // Request start to end of stream
+	tokens: number; // usage.completion_tokens, else content deltas
+	tokensPerSecond: number; // After the first token
+	chunks: number; // Upstream network chunks
+	bytes: number; // Upstream bytes
+	uiComponents: number;
+	cancelled: boolean;
+}
+
+const GENERATIVE_UI_COMPONENTS = new Set<string>([
+	"chart",
+	"table",
+	"button",
+	"card",
+	"form",
+	"product",
+]);
+
+// ============================================================================
+// SSE PARSER
+// ============================================================================
+
+/**
+ * Line-buffered Server-Sent Events parser
+ *
+ * push() accepts decoded text of any size and returns the events it
+ * completed; a partial line or event waits in the buffer for more text.
+ */
+export class SSEParser {
+	private buffer = "";
+
+	push(text: string): SSEEvent[] {
+		this.buffer += text;
+		const events: SSEEvent[] = [];
+
+		// Events end with a blank line (\n\n, \r\n\r\n or \r\r)
+		const boundary = /\r\n\r\n|\n\n|\r\r/g;
+		let start = 0;
+		let match: RegExpExecArray | null = boundary.exec(this.buffer);
+		while (match) {
+			const end = match.index + match[0].length;
+			const block = this.buffer.slice(start, match.index);
+			events.push({
+				data: parseData(block),
+				raw: this.buffer.slice(start, end),
+			});
+			start = end;
+			match = boundary.exec(this.buffer);
+		}
+
+		this.buffer = this.buffer.slice(start);
+		return events;
+	}
+
+	/**
+	 * Nothing buffered: the stream is between events
+	 */
+	get idle(): boolean {
+		return this.buffer.length === 0;
+	}
+
+	/**
+	 * Final event without a trailing blank line (stream ended mid-event)
+	 */
+	flush(): SSEEvent[] {
+		if (!this.buffer.trim()) {
+			this.buffer = "";
+			return [];
+		}
+		const block = this.buffer;
+		this.buffer = "";
+		return [{ data: parseData(block), raw: `${block}\n\n` }];
+	}
+}
+
+function parseData(block: string): string | null {
+	const data: string[] = [];
+	for (const line of block.split(/\r\n|\r|\n/)) {
+		if (line.startsWith("data:")) {
+			// One optional space after the colon is part of the syntax
+			data.push(line.slice(line.startsWith("data: ") ? 6 : 5));
+		}
+	}
+	return data.length > 0 ? data.join("\n") : null;
+}
+
+// ============================================================================
+// GENERATIVE UI
+// ============================================================================
+
+const UI_FENCE = "```ui-";
+const UI_BLOCK = /^```ui-([\w-]+)\s*\n([\s\S]*?)\n```/;
+
+/**
+ * Incremental ```ui-<component> block extraction
+ *
+ * push() takes content deltas and returns the blocks they closed, so UI can
+ * render while the model is still writing. Only text after the last closed
+ * block (or an open fence) is retained.
+ */
+export class GenerativeUIExtractor {
+	private pending = "";
+	extracted = 0;
+
+	push(content: string): GenerativeUIMessage[] {
+		this.pending += content;
+		const messages: GenerativeUIMessage[] = [];
+
+		for (;;) {
+			const start = this.pending.indexOf(UI_FENCE);
+			if (start === -1) {
+				// Keep a tail that could be the start of a fence
+				this.pending = this.pending.slice(-(UI_FENCE.length - 1));
+				return messages;
+			}
+
+			const match = this.pending.slice(start).match(UI_BLOCK);
+			if (!match) {
+				// Block still open: wait for more content
+				this.pending = this.pending.slice(start);
+				return messages;
+			}
+
+			this.pending = this.pending.slice(start + match[0].length);
+
+			const [, component, json] = match;
+			if (!GENERATIVE_UI_COMPONENTS.has(component)) continue;
+
+			try {
+				messages.push({
+					type: "ui",
+					payload: {
+						component: component as GenerativeUIComponent,
+						data: JSON.parse(json),
+					},
+				});
+				this.extracted++;
+			} catch (e) {
+				console.error(`[GENERATIVE UI] Failed to parse ${component} JSON:`, e);
+			}
+		}
+	}
+}
+
+/**
+ * All generative UI components in a complete response, in document order
+ */
+export function parseGenerativeUI(content: string): GenerativeUIMessage[] {
+	return new GenerativeUIExtractor().push(content);
+}
+
+// ============================================================================
+// STREAM
+// ============================================================================
+
+export interface ChatStreamOptions {
+	enableGenerativeUI?: boolean;
+	startedAt?: number; // When the upstream request was sent (TTFT origin)
+	onMetrics?: (metrics: ChatStreamMetrics) => void;
+	now?: () => number;
+}
+
+/**
+ * Pipe an upstream SSE body to the client with UI extraction and metrics
+ *
+ * UI messages go out as soon as their block closes, always on an event
+ * boundary and always before [DONE]. Metrics are appended as an SSE
+ * comment (": metrics {...}"), which EventSource and line-based clients
+ * ignore.
+ */
+export function createChatStream(
+	upstream: ReadableStream<Uint8Array>,
+	options: ChatStreamOptions = {},
+): ReadableStream<Uint8Array> {
+	const now = options.now ?? (() => performance.now());
+	const startedAt = options.startedAt ?? now();
+	const encoder = new TextEncoder();
+	const decoder = new TextDecoder();
+	const parser = new SSEParser();
+	const extractor = options.enableGenerativeUI
+		? new GenerativeUIExtractor()
+		: null;
+	const reader = upstream.getReader();
+
+	let firstTokenAt: number | null = null;
+	let deltas = 0;
+	let usageTokens: number | null = null;
+	let chunks = 0;
+	let bytes = 0;
+	let pendingUI: GenerativeUIMessage[] = [];
+	let finished = false;
+
+	const report = (cancelled: boolean): ChatStreamMetrics => {
+		const endedAt = now();
+		const tokens = usageTokens ?? deltas;
+		const generatingMs = firstTokenAt === null ? 0 : endedAt - firstTokenAt;
+		const metrics: ChatStreamMetrics = {
+			ttftMs: firstTokenAt === null ? null : firstTokenAt - startedAt,
+			durationMs: endedAt - startedAt,
+			tokens,
+			tokensPerSecond:
+				generatingMs > 0 ? Math.round((tokens / generatingMs) * 1000) : 0,
+			chunks,
+			bytes,
+			uiComponents: extractor?.extracted ?? 0,
+			cancelled,
+		};
+		options.onMetrics?.(metrics);
+		return metrics;
+	};
+
+	// Content deltas feed the metrics and the UI extractor
+	const consume = (data: string) => {
+		try {
+			const parsed = JSON.parse(data);
+			const content = parsed.choices?.[0]?.delta?.content;
+			if (content) {
+				if (firstTokenAt === null) firstTokenAt = now();
+				deltas++;
+				if (extractor) pendingUI.push(...extractor.push(content));
+			}
+			const completionTokens = parsed.usage?.completion_tokens;
+			if (typeof completionTokens === "number") {
+				usageTokens = completionTokens;
+			}
+		} catch {
+			// Not JSON (provider-specific payload): forwarded untouched
+		}
+	};
+
+	type Controller = ReadableStreamDefaultController<Uint8Array>;
+
+	const send = (controller: Controller, text: string) =>
+		controller.enqueue(encoder.encode(text));
+
+	const enqueueUI = (controller: Controller) => {
+		for (const message of pendingUI) {
+			send(controller, `data: ${JSON.stringify(message)}\n\n`);
+		}
+		pendingUI = [];
+	};
+
+	const finish = (controller: Controller, done: SSEEvent | null) => {
+		finished = true;
+		enqueueUI(controller);
+		const metrics = report(false);
+		send(controller, `: metrics ${JSON.stringify(metrics)}\n\n`);
+		send(controller, done ? done.raw : "data: [DONE]\n\n");
+		controller.close();
+		// Anything after [DONE] is not needed
+		reader.cancel().catch(() => {});
+	};
+
+	return new ReadableStream<Uint8Array>(
+		{
+			async pull(controller) {
+				// Read until something is enqueued: one client pull, one step
+				while (!finished) {
+					const { done, value } = await reader.read();
+
+					if (done) {
+						// Upstream ended without [DONE]: flush and end cleanly
+						const tail = [
+							...parser.push(decoder.decode()),
+							...parser.flush(),
+						];
+						for (const event of tail) {
+							if (event.data === "[DONE]") break;
+							if (event.data) consume(event.data);
+							send(controller, event.raw);
+						}
+						finish(controller, null);
+						return;
+					}
+
+					chunks++;
+					bytes += value.byteLength;
+					const wasIdle = parser.idle;
+					const text = decoder.decode(value, { stream: true });
+					const events = parser.push(text);
+					const doneIndex = events.findIndex((e) => e.data === "[DONE]");
+					const forward =
+						doneIndex === -1 ? events : events.slice(0, doneIndex);
+
+					for (const event of forward) {
+						if (event.data) consume(event.data);
+					}
+
+					if (doneIndex === -1 && wasIdle && parser.idle) {
+						// Common case: whole events in this chunk, pass bytes through
+						controller.enqueue(value);
+						enqueueUI(controller);
+						return;
+					}
+
+					// Split chunk: forward the events it completed
+					for (const event of forward) {
+						send(controller, event.raw);
+					}
+
+					if (doneIndex !== -1) {
+						finish(controller, events[doneIndex]);
+						return;
+					}
+
+					if (forward.length > 0) {
+						enqueueUI(controller);
+						return;
+					}
+					// Only a partial event so far: read again
+				}
+			},
+
+			async cancel(reason) {
+				// Client went away: stop reading (aborts the upstream body)
+				if (!finished) {
+					finished = true;
+					report(true);
+				}
+				await reader.cancel(reason);
+			},
+		},
+		{ highWaterMark: 1 },
+	);
+}
@@ -1,4 +1,5 @@
 import type { APIRoute } from "astro";
+import { type ChatStreamMetrics, createChatStream } from "@/lib/chat-stream";
 import { maskSensitive } from "@/lib/security";
 
 /**
@@ -11,6 +12,12 @@ import { maskSensitive } from "@/lib/security";
  * Access to all models: Gemini Flash Lite (free), GPT-4, Claude, Llama, etc.
  *
  * Generative UI is OPTIONAL and activated only when enableGenerativeUI=true
+ *
+ * Streaming (lib/chat-stream.ts): SSE is parsed line-buffered, UI components
+ * are sent as soon as their block closes, the upstream is read only as fast
+ * as the client consumes, and a client disconnect aborts the upstream.
+ * OPENROUTER_API_URL overrides the upstream (local fake upstream for
+ * benchmarks: web/scripts/bench-chat-stream.ts).
  */
 export const POST: APIRoute = async ({ request }) => {
 	try {
@@ -67,10 +74,13 @@ export const POST: APIRoute = async ({ request }) => {
 		});
 
 		// Call OpenRouter API directly
+		const startedAt = performance.now();
 		const response = await fetch(
-			"https://openrouter.ai/api/v1/chat/completions",
+			import.meta.env.OPENROUTER_API_URL ||
+				"https://openrouter.ai/api/v1/chat/completions",
 			{
 				method: "POST",
+				signal: request.signal, // Client disconnect aborts the upstream
 				headers: {
 					Authorization: `Bearer ${effectiveApiKey}`,
 					"Content-Type": "application/json",
@@ -110,94 +120,18 @@ export const POST: APIRoute = async ({ request }) => {
 			});
 		}
 
-		// Parse streaming response for UI components (only if generative UI enabled)
-		const encoder = new TextEncoder();
-		const decoder = new TextDecoder();
-
-		const stream = new ReadableStream({
-			async start(controller) {
-				const reader = response.body?.getReader();
-				if (!reader) {
-					controller.close();
-					return;
-				}
-
-				let fullContent = "";
-
-				try {
-					console.log("[CHAT API] Stream started");
-
-					while (true) {
-						const { done, value } = await reader.read();
-
-						if (done) {
-							console.log(
-								"[CHAT API] Stream done naturally (after [DONE] was sent)",
-							);
-							controller.close();
-							return;
-						}
-
-						const chunk = decoder.decode(value, { stream: true });
-
-						// Log every chunk to see what we're getting
-						if (chunk.includes("[DONE]")) {
-							console.log(
-								"[CHAT API] FOUND DONE CHUNK:",
-								JSON.stringify(chunk),
-							);
-						}
-
-						// Extract content from SSE format
-						const lines = chunk.split("\n");
-						for (const line of lines) {
-							if (line.startsWith("data: ")) {
-								const data = line.slice(6);
-								if (data === "[DONE]") {
-									console.log("[CHAT API] Found [DONE] in line processing");
-									continue; // Don't forward [DONE] yet
-								}
-
-								try {
-									const parsed = JSON.parse(data);
-									const content = parsed.choices?.[0]?.delta?.content;
-									if (content) {
-										fullContent += content;
-									}
-								} catch (e) {
-									// Ignore parse errors
-								}
-							}
-						}
-
-						// Check if this chunk contains [DONE]
-						const hasDone = chunk.includes("[DONE]");
-
-						if (hasDone && enableGenerativeUI) {
-							console.log(
-								"[CHAT API] Detected [DONE] in chunk, processing UI components now",
-							);
-
-							// Send UI messages BEFORE [DONE] (only if generative UI enabled)
-							const uiMessages = parseGenerativeUI(fullContent);
-							for (const uiMessage of uiMessages) {
-								controller.enqueue(
-									encoder.encode(`data: ${JSON.stringify(uiMessage)}\n\n`),
-								);
-							}
-
-							// Now forward the chunk with [DONE]
-							controller.enqueue(encoder.encode(chunk));
-						} else {
-							// Forward chunk as-is
-							controller.enqueue(encoder.encode(chunk));
-						}
-					}
-				} catch (error) {
-					console.error("Stream error:", error);
-					controller.close();
-				}
-			},
+		if (!response.body) {
+			return new Response(
+				JSON.stringify({ error: "OpenRouter returned an empty stream" }),
+				{ status: 502, headers: { "Content-Type": "application/json" } },
+			);
+		}
+
+		// Forward the stream, extracting UI components as blocks complete
+		const stream = createChatStream(response.body, {
+			enableGenerativeUI,
+			startedAt,
+			onMetrics: (metrics) => logStreamMetrics(model, metrics),
 		});
 
 		return new Response(stream, {
@@ -220,151 +154,18 @@ export const POST: APIRoute = async ({ request }) => {
 };
 
 /**
- * Parse generative UI components from text content
- * Activated only when enableGenerativeUI=true
+ * Time-to-first-token and throughput for one streamed response
  */
-function parseGenerativeUI(content: string): any[] {
-	const uiMessages: any[] = [];
-
-	// Check for charts
-	const chartMatches = [
-		...content.matchAll(/```ui-chart\s*\n([\s\S]*?)\n```/g),
-	];
-	console.log(
-		"[GENERATIVE UI] Found",
-		chartMatches.length,
-		"charts in content",
-	);
-
-	for (const match of chartMatches) {
-		try {
-			const chartData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "chart",
-					data: chartData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse chart JSON:", e);
-		}
-	}
-
-	// Check for tables
-	const tableMatches = [
-		...content.matchAll(/```ui-table\s*\n([\s\S]*?)\n```/g),
-	];
-	console.log(
-		"[GENERATIVE UI] Found",
-		tableMatches.length,
-		"tables in content",
-	);
-
-	for (const match of tableMatches) {
-		try {
-			const tableData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "table",
-					data: tableData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse table JSON:", e);
-		}
-	}
-
-	// Check for buttons
-	const buttonMatches = [
-		...content.matchAll(/```ui-button\s*\n([\s\S]*?)\n```/g),
-	];
-	console.log(
-		"[GENERATIVE UI] Found",
-		buttonMatches.length,
-		"buttons in content",
-	);
-
-	for (const match of buttonMatches) {
-		try {
-			const buttonData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "button",
-					data: buttonData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse button JSON:", e);
-		}
-	}
-
-	// Check for cards
-	const cardMatches = [...content.matchAll(/```ui-card\s*\n([\s\S]*?)\n```/g)];
-	console.log("[GENERATIVE UI] Found", cardMatches.length, "cards in content");
-
-	for (const match of cardMatches) {
-		try {
-			const cardData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "card",
-					data: cardData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse card JSON:", e);
-		}
-	}
-
-	// Check for forms
-	const formMatches = [...content.matchAll(/```ui-form\s*\n([\s\S]*?)\n```/g)];
-	console.log("[GENERATIVE UI] Found", formMatches.length, "forms in content");
-
-	for (const match of formMatches) {
-		try {
-			const formData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "form",
-					data: formData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse form JSON:", e);
-		}
-	}
-
-	// Check for products
-	const productMatches = [
-		...content.matchAll(/```ui-product\s*\n([\s\S]*?)\n```/g),
-	];
-	console.log(
-		"[GENERATIVE UI] Found",
-		productMatches.length,
-		"products in content",
-	);
-
-	for (const match of productMatches) {
-		try {
-			const productData = JSON.parse(match[1]);
-			uiMessages.push({
-				type: "ui",
-				payload: {
-					component: "product",
-					data: productData,
-				},
-			});
-		} catch (e) {
-			console.error("[GENERATIVE UI] Failed to parse product JSON:", e);
-		}
-	}
-
-	return uiMessages;
+function logStreamMetrics(model: string, metrics: ChatStreamMetrics) {
+	console.log("[CHAT API] Stream metrics:", {
+		model,
+		ttftMs: metrics.ttftMs === null ? null : Math.round(metrics.ttftMs),
+		tokens: metrics.tokens,
+		tokensPerSecond: metrics.tokensPerSecond,
+		durationMs: Math.round(metrics.durationMs),
+		uiComponents: metrics.uiComponents,
+		cancelled: metrics.cancelled,
+	});
 }
 
 /**
@@ -507,113 +308,105 @@ async function handleFreeTier(
 				? lastMessage.content[0].text
 				: "";
 
+	// Generate appropriate response based on message content
+	let response = "";
+	const lowerMessage = userMessage.toLowerCase();
+
+	// Get friendly model name
+	const modelNames: Record<string, string> = {
+		"google/gemini-2.5-flash-lite": "Gemini Flash Lite",
+		"openrouter/polaris-alpha": "Polaris Alpha",
+		"tngtech/deepseek-r1t2-chimera:free": "DeepSeek R1T2 Chimera",
+		"z-ai/glm-4.5-air:free": "GLM 4.5 Air",
+		"tngtech/deepseek-r1t-chimera:free": "DeepSeek R1T Chimera",
+	};
+	const modelName = modelNames[model] || "AI Assistant";
+
+	// Check for chart/visualization requests (only if generative UI enabled)
+	if (
+		enableGenerativeUI &&
+		(lowerMessage.includes("chart") ||
+			lowerMessage.includes("graph") ||
+			lowerMessage.includes("visualiz") ||
+			lowerMessage.includes("data"))
+	) {
+		response = generateDataVisualization(userMessage);
+	}
+	// Check for product requests
+	else if (
+		enableGenerativeUI &&
+		(lowerMessage.includes("product") ||
+			lowerMessage.includes("toaster") ||
+			lowerMessage.includes("e-commerce") ||
+			lowerMessage.includes("shop"))
+	) {
+		response = generateProductResponse(userMessage);
+	}
+	// Check for table requests
+	else if (
+		enableGenerativeUI &&
+		(lowerMessage.includes("table") ||
+			lowerMessage.includes("list") ||
+			lowerMessage.includes("spreadsheet"))
+	) {
+		response = generateTableResponse(userMessage);
+	}
+	// Programming/code requests
+	else if (
+		lowerMessage.includes("code") ||
+		lowerMessage.includes("function") ||
+		lowerMessage.includes("component") ||
+		lowerMessage.includes("program")
+	) {
+		response = generateCodeResponse(userMessage);
+	}
+	// General conversation
+	else {
+		response = generateConversationalResponse(userMessage, modelName);
+	}
+
+	// Simulated upstream: one word per pull, like a model emitting tokens
 	const encoder = new TextEncoder();
+	const words = response.split(" ");
+	let index = 0;
+	let typing: ReturnType<typeof setTimeout> | undefined;
 
-	// Create streaming response
-	const stream = new ReadableStream({
-		async start(controller) {
-			try {
-				// Generate appropriate response based on message content
-				let response = "";
-				const lowerMessage = userMessage.toLowerCase();
-
-				// Get friendly model name
-				const modelNames: Record<string, string> = {
-					"google/gemini-2.5-flash-lite": "Gemini Flash Lite",
-					"openrouter/polaris-alpha": "Polaris Alpha",
-					"tngtech/deepseek-r1t2-chimera:free": "DeepSeek R1T2 Chimera",
-					"z-ai/glm-4.5-air:free": "GLM 4.5 Air",
-					"tngtech/deepseek-r1t-chimera:free": "DeepSeek R1T Chimera",
-				};
-				const modelName = modelNames[model] || "AI Assistant";
-
-				// Check for chart/visualization requests (only if generative UI enabled)
-				if (
-					enableGenerativeUI &&
-					(lowerMessage.includes("chart") ||
-						lowerMessage.includes("graph") ||
-						lowerMessage.includes("visualiz") ||
-						lowerMessage.includes("data"))
-				) {
-					response = generateDataVisualization(userMessage);
-				}
-				// Check for product requests
-				else if (
-					enableGenerativeUI &&
-					(lowerMessage.includes("product") ||
-						lowerMessage.includes("toaster") ||
-						lowerMessage.includes("e-commerce") ||
-						lowerMessage.includes("shop"))
-				) {
-					response = generateProductResponse(userMessage);
-				}
-				// Check for table requests
-				else if (
-					enableGenerativeUI &&
-					(lowerMessage.includes("table") ||
-						lowerMessage.includes("list") ||
-						lowerMessage.includes("spreadsheet"))
-				) {
-					response = generateTableResponse(userMessage);
-				}
-				// Programming/code requests
-				else if (
-					lowerMessage.includes("code") ||
-					lowerMessage.includes("function") ||
-					lowerMessage.includes("component") ||
-					lowerMessage.includes("program")
-				) {
-					response = generateCodeResponse(userMessage);
-				}
-				// General conversation
-				else {
-					response = generateConversationalResponse(userMessage, modelName);
-				}
-
-				// Stream the response word by word for realistic typing effect
-				const words = response.split(" ");
-				for (let i = 0; i < words.length; i++) {
-					const word = words[i] + (i < words.length - 1 ? " " : "");
-					const data = JSON.stringify({
-						choices: [
-							{
-								delta: { content: word },
-							},
-						],
-					});
-
-					controller.enqueue(encoder.encode(`data: ${data}\n\n`));
-
-					// Simulate typing delay
-					await new Promise((resolve) =>
-						setTimeout(resolve, 30 + Math.random() * 20),
-					);
-				}
-
-				// BEFORE sending [DONE], check for and send UI components (only if generative UI enabled)
-				if (enableGenerativeUI) {
-					const uiMessages = parseGenerativeUI(response);
-					console.log("[FREE TIER] Found", uiMessages.length, "UI components");
-
-					for (const uiMessage of uiMessages) {
-						console.log(
-							"[FREE TIER] Sending UI message:",
-							uiMessage.payload.component,
-						);
-						controller.enqueue(
-							encoder.encode(`data: ${JSON.stringify(uiMessage)}\n\n`),
-						);
-					}
-				}
-
-				// Send completion signal
+	const upstream = new ReadableStream<Uint8Array>({
+		async pull(controller) {
+			if (index >= words.length) {
 				controller.enqueue(encoder.encode("data: [DONE]\n\n"));
 				controller.close();
-			} catch (error) {
-				console.error("Free tier streaming error:", error);
-				controller.close();
+				return;
 			}
+
+			// Simulate typing delay
+			if (index > 0) {
+				await new Promise((resolve) => {
+					typing = setTimeout(resolve, 30 + Math.random() * 20);
+				});
+			}
+
+			const word = words[index] + (index < words.length - 1 ? " " : "");
+			index++;
+			const data = JSON.stringify({
+				choices: [
+					{
+						delta: { content: word },
+					},
+				],
+			});
+			controller.enqueue(encoder.encode(`data: ${data}\n\n`));
 		},
+
+		cancel() {
+			clearTimeout(typing);
+		},
+	});
+
+	// Same pipeline as premium: UI components go out as their block closes
+	const stream = createChatStream(upstream, {
+		enableGenerativeUI,
+		onMetrics: (metrics) => logStreamMetrics(model, metrics),
 	});
 
 	return new Response(stream, {
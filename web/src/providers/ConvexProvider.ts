@@ -27,6 +27,7 @@ import type {
 	ListEventsOptions,
 	ListGroupsOptions,
 	ListThingsOptions,
+	PageOptions,
 	SearchKnowledgeOptions,
 	Thing,
 	ThingKnowledge,
@@ -45,6 +46,7 @@ import {
 	ThingNotFoundError,
 	ThingUpdateError,
 } from "./DataProvider";
+import { DEFAULT_PAGE_SIZE, fromConvexPage } from "./pagination";
 
 /**
  * Configuration for ConvexProvider
@@ -91,6 +93,16 @@ export function createConvexProvider(
 		});
 	}
 
+	/**
+	 * Utility: PageOptions → Convex paginationOpts
+	 */
+	function toPaginationOpts(page?: PageOptions) {
+		return {
+			cursor: page?.cursor ?? null,
+			numItems: page?.numItems ?? DEFAULT_PAGE_SIZE,
+		};
+	}
+
 	return {
 		// ===== GROUPS =====
 		groups: {
@@ -186,6 +198,20 @@ export function createConvexProvider(
 					(message, cause) => new QueryError(message, cause),
 				),
 
+			listPage: (options?: ListThingsOptions, page?: PageOptions) =>
+				toEffect(
+					() =>
+						client
+							.query("queries/things:listPaginated" as any, {
+								groupId: options?.groupId,
+								type: options?.type,
+								status: options?.status,
+								paginationOpts: toPaginationOpts(page),
+							})
+							.then((result) => fromConvexPage<Thing>(result)),
+					(message, cause) => new QueryError(message, cause),
+				),
+
 			create: (input: CreateThingInput) =>
 				toEffect(
 					() =>
@@ -281,6 +307,21 @@ export function createConvexProvider(
 					(message, cause) => new QueryError(message, cause),
 				),
 
+			listPage: (options?: ListEventsOptions, page?: PageOptions) =>
+				toEffect(
+					() =>
+						client
+							.query("queries/events:listPaginated" as any, {
+								groupId: options?.groupId,
+								eventType: options?.type,
+								actorId: options?.actorId,
+								targetId: options?.targetId,
+								paginationOpts: toPaginationOpts(page),
+							})
+							.then((result) => fromConvexPage<Event>(result)),
+					(message, cause) => new QueryError(message, cause),
+				),
+
 			create: (input: CreateEventInput) =>
 				toEffect(
 					() =>
@@ -315,6 +356,20 @@ export function createConvexProvider(
 					(message, cause) => new QueryError(message, cause),
 				),
 
+			listPage: (options?: SearchKnowledgeOptions, page?: PageOptions) =>
+				toEffect(
+					() =>
+						client
+							.query("queries/knowledge:listPaginated" as any, {
+								groupId: options?.groupId,
+								knowledgeType: options?.knowledgeType,
+								sourceThingId: options?.sourceThingId,
+								paginationOpts: toPaginationOpts(page),
+							})
+							.then((result) => fromConvexPage<Knowledge>(result)),
+					(message, cause) => new QueryError(message, cause),
+				),
+
 			create: (input: CreateKnowledgeInput) =>
 				toEffect(
 					() =>
@@ -444,6 +444,7 @@ export interface ListConnectionsOptions {
 
 export interface ListEventsOptions {
 	type?: string;
+	groupId?: string;
 	actorId?: string;
 	targetId?: string;
 	since?: number;
@@ -454,12 +455,30 @@ export interface ListEventsOptions {
 
 export interface SearchKnowledgeOptions {
 	query?: string;
+	groupId?: string;
 	embedding?: number[];
 	sourceThingId?: string;
 	knowledgeType?: KnowledgeType;
 	limit?: number;
 }
 
+/**
+ * Cursor pagination (infinite scroll)
+ *
+ * Cursors are opaque: pass back the continueCursor of the previous page.
+ * A null/undefined cursor requests the first page.
+ */
+export interface PageOptions {
+	cursor?: string | null;
+	numItems?: number;
+}
+
+export interface Page<T> {
+	page: T[];
+	continueCursor: string | null;
+	isDone: boolean;
+}
+
 // ============================================================================
 // AUTH TYPES
 // ============================================================================
@@ -548,6 +567,12 @@ export interface DataProvider {
 	things: {
 		get: (id: string) => Effect.Effect<Thing, ThingNotFoundError>;
 		list: (options?: ListThingsOptions) => Effect.Effect<Thing[], QueryError>;
+		// Optional: providers without native cursors fall back to offset paging
+		// (see providers/pagination.ts)
+		listPage?: (
+			options?: ListThingsOptions,
+			page?: PageOptions,
+		) => Effect.Effect<Page<Thing>, QueryError>;
 		create: (
 			input: CreateThingInput,
 		) => Effect.Effect<string, ThingCreateError>;
@@ -574,6 +599,10 @@ export interface DataProvider {
 	events: {
 		get: (id: string) => Effect.Effect<Event, DataProviderError>;
 		list: (options?: ListEventsOptions) => Effect.Effect<Event[], QueryError>;
+		listPage?: (
+			options?: ListEventsOptions,
+			page?: PageOptions,
+		) => Effect.Effect<Page<Event>, QueryError>;
 		create: (
 			input: CreateEventInput,
 		) => Effect.Effect<string, EventCreateError>;
@@ -585,6 +614,10 @@ export interface DataProvider {
 		list: (
 			options?: SearchKnowledgeOptions,
 		) => Effect.Effect<Knowledge[], QueryError>;
+		listPage?: (
+			options?: SearchKnowledgeOptions,
+			page?: PageOptions,
+		) => Effect.Effect<Page<Knowledge>, QueryError>;
 		create: (
 			input: CreateKnowledgeInput,
 		) => Effect.Effect<string, DataProviderError>;
@@ -0,0 +1,299 @@
+/**
+ * CachingProvider - Read-Through Cache Decorator for any DataProvider
+ *
+ * Wraps a provider so reads are served from an in-memory LRU:
+ * - get/list/listPage results cached per resource with a TTL
+ * - Bounded by entry count AND estimated bytes (least recently used evicted)
+ * - Concurrent identical reads share ONE upstream call (coalescing)
+ * - Writes invalidate the affected resources; reads that were in flight
+ *   during a write are returned but never stored
+ * - Hit/miss/coalesced/eviction counters via provider.cache.metrics()
+ *
+ * Errors are never cached. auth and knowledge.search pass straight through.
+ *
+ * @example
+ * ```typescript
+ * const provider = makeCachingProvider(makeWordPressProvider(config), {
+ *   ttlMs: 30_000,
+ *   ttl: { things: 5 * 60_000 },
+ * });
+ * await Effect.runPromise(provider.things.list({ type: "blog_post" })); // miss
+ * await Effect.runPromise(provider.things.list({ type: "blog_post" })); // hit
+ * provider.cache.metrics(); // { hits: 1, misses: 1, ... }
+ * ```
+ */
+
+import { Effect, Exit, Layer } from "effect";
+import type { DataProvider } from "../DataProvider";
+import { DataProviderService } from "../DataProvider";
+import {
+	DEFAULT_CACHE_TTL_MS,
+	LRUCache,
+	type LRUCacheMetrics,
+	type LRUCacheOptions,
+} from "./LRUCache";
+
+// ============================================================================
+// CONFIG
+// ============================================================================
+
+export type CacheResource =
+	| "groups"
+	| "things"
+	| "connections"
+	| "events"
+	| "knowledge";
+
+export interface CachingProviderOptions extends LRUCacheOptions {
+	// Per-resource TTL overrides (ms); falls back to ttlMs
+	ttl?: Partial<Record<CacheResource, number>>;
+}
+
+export interface CachingProviderMetrics extends LRUCacheMetrics {
+	coalesced: number; // Reads that joined an in-flight upstream call
+	invalidations: number;
+	hitRate: number; // hits / (hits + misses), 0 when idle
+}
+
+export interface CachingDataProvider extends DataProvider {
+	cache: {
+		metrics: () => CachingProviderMetrics;
+		invalidate: (resource?: CacheResource) => void;
+		clear: () => void;
+	};
+}
+
+const RESOURCES: CacheResource[] = [
+	"groups",
+	"things",
+	"connections",
+	"events",
+	"knowledge",
+];
+
+// ============================================================================
+// CACHING PROVIDER IMPLEMENTATION
+// ============================================================================
+
+export const makeCachingProvider = (
+	provider: DataProvider,
+	options: CachingProviderOptions = {},
+): CachingDataProvider => {
+	const lru = new LRUCache<unknown>(options);
+	const inFlight = new Map<string, Promise<Exit.Exit<unknown, unknown>>>();
+	const generations: Record<CacheResource, number> = {
+		groups: 0,
+		things: 0,
+		connections: 0,
+		events: 0,
+		knowledge: 0,
+	};
+	let coalesced = 0;
+	let invalidations = 0;
+
+	const ttlFor = (resource: CacheResource): number =>
+		options.ttl?.[resource] ?? options.ttlMs ?? DEFAULT_CACHE_TTL_MS;
+
+	// ===== READ-THROUGH =====
+
+	const cached = <A, E>(
+		resource: CacheResource,
+		key: string,
+		load: () => Effect.Effect<A, E>,
+	): Effect.Effect<A, E> =>
+		Effect.suspend(() => {
+			const cacheKey = `${resource}:${key}`;
+
+			const hit = lru.get(cacheKey);
+			if (hit !== undefined) {
+				return Effect.succeed(hit as A);
+			}
+
+			let pending = inFlight.get(cacheKey);
+			if (pending) {
+				coalesced++;
+			} else {
+				// A write bumps the generation: results loaded across it are stale
+				const generation = generations[resource];
+				const request: Promise<Exit.Exit<unknown, unknown>> =
+					Effect.runPromiseExit(Effect.suspend(load)).then((exit) => {
+						if (inFlight.get(cacheKey) === request) {
+							inFlight.delete(cacheKey);
+						}
+						if (
+							Exit.isSuccess(exit) &&
+							generations[resource] === generation
+						) {
+							lru.set(cacheKey, exit.value, ttlFor(resource));
+						}
+						return exit;
+					});
+				pending = request;
+				inFlight.set(cacheKey, pending);
+			}
+
+			const shared = pending as Promise<Exit.Exit<A, E>>;
+			return Effect.flatten(Effect.promise(() => shared));
+		});
+
+	const keyOf = (...args: unknown[]): string => JSON.stringify(args);
+
+	// ===== INVALIDATION =====
+
+	const invalidate = (...resources: CacheResource[]) => {
+		for (const resource of resources) {
+			generations[resource]++;
+			lru.deletePrefix(`${resource}:`);
+			for (const key of [...inFlight.keys()]) {
+				if (key.startsWith(`${resource}:`)) {
+					inFlight.delete(key);
+				}
+			}
+		}
+		invalidations++;
+	};
+
+	// Invalidate before (reads racing the write are not stored) and after
+	// (including on failure: a failed write may have partially applied)
+	const writes =
+		(...resources: CacheResource[]) =>
+		<A, E>(effect: Effect.Effect<A, E>): Effect.Effect<A, E> =>
+			Effect.suspend(() => {
+				invalidate(...resources);
+				return effect.pipe(
+					Effect.ensuring(Effect.sync(() => invalidate(...resources))),
+				);
+			});
+
+	// Connections live on thing properties in WordPress/Notion, and deleting
+	// a thing may cascade to its connections and knowledge links
+	const writesGroups = writes("groups");
+	const writesThings = writes("things");
+	const deletesThings = writes("things", "connections", "knowledge");
+	const writesConnections = writes("connections", "things");
+	const writesEvents = writes("events");
+	const writesKnowledge = writes("knowledge");
+
+	// ===== DECORATED PROVIDER =====
+
+	const { things, events, knowledge } = provider;
+
+	return {
+		// ===== GROUPS =====
+		groups: {
+			get: (id) =>
+				cached("groups", keyOf("get", id), () => provider.groups.get(id)),
+			getBySlug: (slug) =>
+				cached("groups", keyOf("getBySlug", slug), () =>
+					provider.groups.getBySlug(slug),
+				),
+			list: (listOptions) =>
+				cached("groups", keyOf("list", listOptions), () =>
+					provider.groups.list(listOptions),
+				),
+			create: (input) => writesGroups(provider.groups.create(input)),
+			update: (id, input) => writesGroups(provider.groups.update(id, input)),
+			delete: (id) => writesGroups(provider.groups.delete(id)),
+		},
+
+		// ===== THINGS =====
+		things: {
+			get: (id) => cached("things", keyOf("get", id), () => things.get(id)),
+			list: (listOptions) =>
+				cached("things", keyOf("list", listOptions), () =>
+					things.list(listOptions),
+				),
+			listPage: things.listPage
+				? (listOptions, page) =>
+						cached("things", keyOf("listPage", listOptions, page), () =>
+							things.listPage!(listOptions, page),
+						)
+				: undefined,
+			create: (input) => writesThings(things.create(input)),
+			update: (id, input) => writesThings(things.update(id, input)),
+			delete: (id) => deletesThings(things.delete(id)),
+		},
+
+		// ===== CONNECTIONS =====
+		connections: {
+			get: (id) =>
+				cached("connections", keyOf("get", id), () =>
+					provider.connections.get(id),
+				),
+			list: (listOptions) =>
+				cached("connections", keyOf("list", listOptions), () =>
+					provider.connections.list(listOptions),
+				),
+			create: (input) =>
+				writesConnections(provider.connections.create(input)),
+			delete: (id) => writesConnections(provider.connections.delete(id)),
+		},
+
+		// ===== EVENTS =====
+		events: {
+			get: (id) => cached("events", keyOf("get", id), () => events.get(id)),
+			list: (listOptions) =>
+				cached("events", keyOf("list", listOptions), () =>
+					events.list(listOptions),
+				),
+			listPage: events.listPage
+				? (listOptions, page) =>
+						cached("events", keyOf("listPage", listOptions, page), () =>
+							events.listPage!(listOptions, page),
+						)
+				: undefined,
+			create: (input) => writesEvents(events.create(input)),
+		},
+
+		// ===== KNOWLEDGE =====
+		knowledge: {
+			get: (id) =>
+				cached("knowledge", keyOf("get", id), () => knowledge.get(id)),
+			list: (listOptions) =>
+				cached("knowledge", keyOf("list", listOptions), () =>
+					knowledge.list(listOptions),
+				),
+			listPage: knowledge.listPage
+				? (listOptions, page) =>
+						cached("knowledge", keyOf("listPage", listOptions, page), () =>
+							knowledge.listPage!(listOptions, page),
+						)
+				: undefined,
+			create: (input) => writesKnowledge(knowledge.create(input)),
+			link: (thingId, knowledgeId, role) =>
+				writesKnowledge(knowledge.link(thingId, knowledgeId, role)),
+			// Embedding keys are large and rarely repeat: not worth caching
+			search: (embedding, searchOptions) =>
+				knowledge.search(embedding, searchOptions),
+		},
+
+		// ===== AUTH =====
+		auth: provider.auth,
+
+		// ===== CACHE CONTROL =====
+		cache: {
+			metrics: () => {
+				const snapshot = lru.snapshot();
+				const lookups = snapshot.hits + snapshot.misses;
+				return {
+					...snapshot,
+					coalesced,
+					invalidations,
+					hitRate: lookups > 0 ? snapshot.hits / lookups : 0,
+				};
+			},
+			invalidate: (resource?: CacheResource) =>
+				invalidate(...(resource ? [resource] : RESOURCES)),
+			clear: () => invalidate(...RESOURCES),
+		},
+	};
+};
+
+// ============================================================================
+// EFFECT LAYER
+// ============================================================================
+
+export const CachingProviderLive = (
+	provider: DataProvider,
+	options?: CachingProviderOptions,
+) => Layer.succeed(DataProviderService, makeCachingProvider(provider, options));
@@ -0,0 +1,174 @@
+/**
+ * LRUCache - bounded in-memory cache with TTL
+ *
+ * Map insertion order doubles as recency order: a hit re-inserts the entry
+ * at the end, eviction removes from the front. Entries are bounded both by
+ * count and by estimated size, so a few huge lists cannot pin the heap.
+ */
+
+export interface LRUCacheOptions {
+	maxEntries?: number; // Default 500
+	maxBytes?: number; // Default 5 MB (estimated, see sizeOf)
+	ttlMs?: number; // Default 60s; 0 = never expires
+	sizeOf?: (value: unknown) => number; // Default: JSON length
+}
+
+export interface LRUCacheMetrics {
+	hits: number;
+	misses: number;
+	expirations: number;
+	evictions: number;
+	entries: number;
+	bytes: number;
+}
+
+interface Entry<V> {
+	value: V;
+	size: number;
+	expiresAt: number;
+}
+
+export const DEFAULT_CACHE_ENTRIES = 500;
+export const DEFAULT_CACHE_BYTES = 5 * 1024 * 1024;
+export const DEFAULT_CACHE_TTL_MS = 60_000;
+
+/**
+ * Rough byte size of a JSON-able value (UTF-16: 2 bytes per char)
+ */
+export function estimateSize(value: unknown): number {
+	if (value === undefined) return 0;
+	try {
+		return (JSON.stringify(value)?.length ?? 0) * 2;
+	} catch {
+		return 0;
+	}
+}
+
+export class LRUCache<V> {
+	private entries = new Map<string, Entry<V>>();
+	private bytes = 0;
+	private readonly maxEntries: number;
+	private readonly maxBytes: number;
+	private readonly ttlMs: number;
+	private readonly sizeOf: (value: unknown) => number;
+
+	readonly metrics = {
+		hits: 0,
+		misses: 0,
+		expirations: 0,
+		evictions: 0,
+	};
+
+	constructor(options: LRUCacheOptions = {}) {
+		this.maxEntries = Math.max(1, options.maxEntries ?? DEFAULT_CACHE_ENTRIES);
+		this.maxBytes = Math.max(1, options.maxBytes ?? DEFAULT_CACHE_BYTES);
+		this.ttlMs = options.ttlMs ?? DEFAULT_CACHE_TTL_MS;
+		this.sizeOf = options.sizeOf ?? estimateSize;
+	}
+
+	get size(): number {
+		return this.entries.size;
+	}
+
+	/**
+	 * Live entry (bumped to most recently used), or undefined
+	 */
+	get(key: string, now = Date.now()): V | undefined {
+		const entry = this.entries.get(key);
+		if (!entry) {
+			this.metrics.misses++;
+			return undefined;
+		}
+
+		if (entry.expiresAt <= now) {
+			this.remove(key, entry);
+			this.metrics.expirations++;
+			this.metrics.misses++;
+			return undefined;
+		}
+
+		this.entries.delete(key);
+		this.entries.set(key, entry);
+		this.metrics.hits++;
+		return entry.value;
+	}
+
+	/**
+	 * Entry even if expired, without touching recency or metrics
+	 *
+	 * HTTP revalidation needs the stale body and validators after the TTL.
+	 */
+	peek(key: string): V | undefined {
+		return this.entries.get(key)?.value;
+	}
+
+	/**
+	 * Store a value; returns false if it alone exceeds maxBytes
+	 */
+	set(key: string, value: V, ttlMs = this.ttlMs, now = Date.now()): boolean {
+		const existing = this.entries.get(key);
+		if (existing) {
+			this.remove(key, existing);
+		}
+
+		const size = this.sizeOf(value);
+		if (size > this.maxBytes) {
+			return false;
+		}
+
+		this.entries.set(key, {
+			value,
+			size,
+			expiresAt: ttlMs > 0 ? now + ttlMs : Number.POSITIVE_INFINITY,
+		});
+		this.bytes += size;
+
+		// Evict least recently used until both bounds hold
+		while (this.entries.size > this.maxEntries || this.bytes > this.maxBytes) {
+			const oldest = this.entries.keys().next().value as string;
+			this.remove(oldest, this.entries.get(oldest)!);
+			this.metrics.evictions++;
+		}
+
+		return true;
+	}
+
+	delete(key: string): boolean {
+		const entry = this.entries.get(key);
+		if (!entry) return false;
+		this.remove(key, entry);
+		return true;
+	}
+
+	/**
+	 * Drop every key starting with prefix; returns how many were removed
+	 */
+	deletePrefix(prefix: string): number {
+		let removed = 0;
+		for (const [key, entry] of this.entries) {
+			if (key.startsWith(prefix)) {
+				this.remove(key, entry);
+				removed++;
+			}
+		}
+		return removed;
+	}
+
+	clear(): void {
+		this.entries.clear();
+		this.bytes = 0;
+	}
+
+	snapshot(): LRUCacheMetrics {
+		return {
+			...this.metrics,
+			entries: this.entries.size,
+			bytes: this.bytes,
+		};
+	}
+
+	private remove(key: string, entry: Entry<V>): void {
+		this.entries.delete(key);
+		this.bytes -= entry.size;
+	}
+}
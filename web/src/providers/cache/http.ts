@@ -0,0 +1,228 @@
+/**
+ * HTTP helpers for external providers (WordPress, Notion)
+ *
+ * - HttpCache: JSON GETs with ETag / If-Modified-Since revalidation and
+ *   coalescing of identical in-flight requests. A 304 reuses the cached
+ *   body, so an unchanged resource costs one round trip and no payload.
+ * - mapWithConcurrency: Promise.all with a bound, for per-item fetches
+ *   (ACF fields, Notion relation properties) that must not fan out
+ *   unbounded against a rate-limited API.
+ * - makeCachedLoader: LRU + coalescing for SDK calls that are not plain
+ *   GETs (Notion).
+ *
+ * Cache keys are URLs only: use one HttpCache per set of credentials.
+ */
+
+import { LRUCache, type LRUCacheOptions } from "./LRUCache";
+
+export interface HttpCacheOptions extends LRUCacheOptions {
+	// Serve a cached body without revalidating for this long (default 0:
+	// always revalidate). Entries stay stored for ttlMs (default 10 min).
+	maxAgeMs?: number;
+	fetch?: typeof fetch;
+}
+
+export interface HttpCacheMetrics {
+	requests: number; // Network requests sent
+	fresh: number; // Served within maxAgeMs, no request
+	notModified: number; // 304 responses (revalidated)
+	coalesced: number; // Joined an identical in-flight request
+	entries: number;
+	bytes: number;
+	evictions: number;
+}
+
+interface CachedResponse {
+	body: unknown;
+	etag?: string;
+	lastModified?: string;
+	fetchedAt: number;
+}
+
+export const DEFAULT_HTTP_CACHE_TTL_MS = 10 * 60_000;
+export const DEFAULT_FETCH_CONCURRENCY = 4;
+
+export class HttpCache {
+	private readonly cache: LRUCache<CachedResponse>;
+	private readonly inFlight = new Map<string, Promise<unknown>>();
+	private readonly maxAgeMs: number;
+	private readonly fetchFn: typeof fetch;
+
+	readonly metrics = {
+		requests: 0,
+		fresh: 0,
+		notModified: 0,
+		coalesced: 0,
+	};
+
+	constructor(options: HttpCacheOptions = {}) {
+		this.cache = new LRUCache<CachedResponse>({
+			...options,
+			ttlMs: options.ttlMs ?? DEFAULT_HTTP_CACHE_TTL_MS,
+			sizeOf: options.sizeOf
+				? (entry) => options.sizeOf!((entry as CachedResponse).body)
+				: undefined,
+		});
+		this.maxAgeMs = options.maxAgeMs ?? 0;
+		this.fetchFn = options.fetch ?? ((input, init) => fetch(input, init));
+	}
+
+	/**
+	 * GET url as JSON, revalidating any cached copy
+	 *
+	 * Throws Error("<status> <statusText> - <body>") on non-2xx responses.
+	 */
+	async getJSON<T = unknown>(url: string, init: RequestInit = {}): Promise<T> {
+		const pending = this.inFlight.get(url);
+		if (pending) {
+			this.metrics.coalesced++;
+			return pending as Promise<T>;
+		}
+
+		const request = this.fetchJSON(url, init).finally(() => {
+			this.inFlight.delete(url);
+		});
+		this.inFlight.set(url, request);
+		return request as Promise<T>;
+	}
+
+	/**
+	 * Forget a URL (call after writing to the resource)
+	 */
+	invalidate(url: string): void {
+		this.cache.delete(url);
+	}
+
+	invalidatePrefix(prefix: string): void {
+		this.cache.deletePrefix(prefix);
+	}
+
+	clear(): void {
+		this.cache.clear();
+	}
+
+	snapshot(): HttpCacheMetrics {
+		const { entries, bytes, evictions } = this.cache.snapshot();
+		return { ...this.metrics, entries, bytes, evictions };
+	}
+
+	private async fetchJSON(url: string, init: RequestInit): Promise<unknown> {
+		const now = Date.now();
+		// peek, not get: get drops entries past their TTL, and with them the
+		// validators a conditional request needs
+		const cached = this.cache.peek(url);
+
+		// 1. FRESH: NO REQUEST (get bumps recency and checks the TTL)
+		if (
+			cached &&
+			now - cached.fetchedAt < this.maxAgeMs &&
+			this.cache.get(url, now)
+		) {
+			this.metrics.fresh++;
+			return cached.body;
+		}
+
+		// 2. CONDITIONAL REQUEST WITH STORED VALIDATORS
+		const headers = new Headers(init.headers);
+		if (cached?.etag) headers.set("If-None-Match", cached.etag);
+		if (cached?.lastModified) {
+			headers.set("If-Modified-Since", cached.lastModified);
+		}
+
+		this.metrics.requests++;
+		const response = await this.fetchFn(url, {
+			...init,
+			method: "GET",
+			headers,
+		});
+
+		// 3. NOT MODIFIED: REUSE BODY
+		if (response.status === 304 && cached) {
+			this.metrics.notModified++;
+			this.cache.set(url, { ...cached, fetchedAt: now });
+			return cached.body;
+		}
+
+		if (!response.ok) {
+			const errorText = await response.text();
+			throw new Error(
+				`${response.status} ${response.statusText} - ${errorText}`,
+			);
+		}
+
+		const body = await response.json();
+		const etag = response.headers.get("ETag") ?? undefined;
+		const lastModified = response.headers.get("Last-Modified") ?? undefined;
+
+		// Only keep what can be revalidated (or served fresh)
+		if (etag || lastModified || this.maxAgeMs > 0) {
+			this.cache.set(url, { body, etag, lastModified, fetchedAt: now });
+		} else {
+			this.cache.delete(url);
+		}
+
+		return body;
+	}
+}
+
+/**
+ * Map items through fn with at most `limit` calls in flight
+ *
+ * Results keep input order. The first rejection rejects the whole call
+ * (like Promise.all); callers that tolerate per-item failures catch in fn.
+ */
+export async function mapWithConcurrency<T, R>(
+	items: readonly T[],
+	limit: number,
+	fn: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+	const results = new Array<R>(items.length);
+	let next = 0;
+
+	const worker = async () => {
+		while (next < items.length) {
+			const index = next++;
+			results[index] = await fn(items[index], index);
+		}
+	};
+
+	const workers = Math.min(Math.max(1, limit), items.length);
+	await Promise.all(Array.from({ length: workers }, worker));
+	return results;
+}
+
+/**
+ * Wrap an async loader with an LRU and in-flight coalescing
+ *
+ * For SDK calls that are not plain GETs (Notion). Put a version in the key
+ * (e.g. last_edited_time) and cached values never need revalidating.
+ */
+export function makeCachedLoader<V>(
+	cache: LRUCache<V>,
+	load: (key: string) => Promise<V>,
+): (key: string) => Promise<V> {
+	const inFlight = new Map<string, Promise<V>>();
+
+	return (key) => {
+		const hit = cache.get(key);
+		if (hit !== undefined) {
+			return Promise.resolve(hit);
+		}
+
+		const pending = inFlight.get(key);
+		if (pending) {
+			return pending;
+		}
+
+		const request = load(key)
+			.then((value) => {
+				cache.set(key, value);
+				return value;
+			})
+			.finally(() => {
+				inFlight.delete(key);
+			});
+		inFlight.set(key, request);
+		return request;
+	};
+}
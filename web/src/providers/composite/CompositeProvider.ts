@@ -8,6 +8,9 @@
  * - Auth/courses in Convex, blog in WordPress, products in Shopify
  * - Development data in local Convex, production analytics in Supabase
  * - Public content in WordPress, private data in Convex
+ *
+ * Merged lists query all routes concurrently. Routes with `cache` set are
+ * wrapped in a CachingProvider (see ../cache/CachingProvider.ts).
  */
 
 import { Effect, Layer } from "effect";
@@ -33,6 +36,10 @@ import type {
 	UpdateThingInput,
 } from "../DataProvider";
 import { DataProviderService } from "../DataProvider";
+import {
+	type CachingProviderOptions,
+	makeCachingProvider,
+} from "../cache/CachingProvider";
 
 // ============================================================================
 // CONFIG
@@ -47,6 +54,8 @@ export interface ProviderRoute {
 	idPrefix?: string;
 	// Is this the default/fallback provider?
 	isDefault?: boolean;
+	// Read-through cache in front of this provider (true = defaults)
+	cache?: boolean | CachingProviderOptions;
 }
 
 export interface CompositeProviderConfig {
@@ -60,8 +69,21 @@ export interface CompositeProviderConfig {
 export const makeCompositeProvider = (
 	config: CompositeProviderConfig,
 ): DataProvider => {
+	// Wrap routes that opt into caching (e.g. remote WordPress/Notion)
+	const routes = config.routes.map((route) =>
+		route.cache
+			? {
+					...route,
+					provider: makeCachingProvider(
+						route.provider,
+						route.cache === true ? {} : route.cache,
+					),
+				}
+			: route,
+	);
+
 	// Find default provider
-	const defaultProvider = config.routes.find((r) => r.isDefault)?.provider;
+	const defaultProvider = routes.find((r) => r.isDefault)?.provider;
 
 	if (!defaultProvider) {
 		throw new Error("CompositeProvider requires at least one default provider");
@@ -69,7 +91,7 @@ export const makeCompositeProvider = (
 
 	// Route by thing ID
 	const routeById = (id: string): DataProvider => {
-		for (const route of config.routes) {
+		for (const route of routes) {
 			if (route.idPrefix && id.startsWith(route.idPrefix)) {
 				return route.provider;
 			}
@@ -79,7 +101,7 @@ export const makeCompositeProvider = (
 
 	// Route by thing type
 	const routeByType = (type: string): DataProvider => {
-		for (const route of config.routes) {
+		for (const route of routes) {
 			if (route.thingTypes?.includes(type)) {
 				return route.provider;
 			}
@@ -87,6 +109,16 @@ export const makeCompositeProvider = (
 		return defaultProvider;
 	};
 
+	// Query every route at once: a merged list waits for the slowest
+	// backend, not the sum of all of them
+	const fanOut = <T, E>(
+		query: (provider: DataProvider) => Effect.Effect<T[], E>,
+	): Effect.Effect<T[], E> =>
+		Effect.all(
+			routes.map((route) => query(route.provider)),
+			{ concurrency: "unbounded" },
+		).pipe(Effect.map((lists) => lists.flat()));
+
 	return {
 		// ===== GROUPS =====
 		groups: {
@@ -105,12 +137,9 @@ export const makeCompositeProvider = (
 			list: (options?: ListGroupsOptions) =>
 				Effect.gen(function* () {
 					// Query all providers and merge results
-					const results: Group[] = [];
-
-					for (const route of config.routes) {
-						const groups = yield* route.provider.groups.list(options);
-						results.push(...groups);
-					}
+					const results: Group[] = yield* fanOut((provider) =>
+						provider.groups.list(options),
+					);
 
 					// Sort by createdAt descending
 					results.sort((a, b) => b.createdAt - a.createdAt);
@@ -159,12 +188,9 @@ export const makeCompositeProvider = (
 					}
 
 					// Query all providers and merge results
-					const results: Thing[] = [];
-
-					for (const route of config.routes) {
-						const things = yield* route.provider.things.list(options);
-						results.push(...things);
-					}
+					const results: Thing[] = yield* fanOut((provider) =>
+						provider.things.list(options),
+					);
 
 					// Sort by createdAt descending
 					results.sort((a, b) => b.createdAt - a.createdAt);
@@ -218,12 +244,9 @@ export const makeCompositeProvider = (
 					}
 
 					// Query all providers and merge
-					const results: Connection[] = [];
-
-					for (const route of config.routes) {
-						const connections = yield* route.provider.connections.list(options);
-						results.push(...connections);
-					}
+					const results: Connection[] = yield* fanOut((provider) =>
+						provider.connections.list(options),
+					);
 
 					results.sort((a, b) => b.createdAt - a.createdAt);
 
@@ -270,12 +293,9 @@ export const makeCompositeProvider = (
 					}
 
 					// Query all providers and merge
-					const results: Event[] = [];
-
-					for (const route of config.routes) {
-						const events = yield* route.provider.events.list(options);
-						results.push(...events);
-					}
+					const results: Event[] = yield* fanOut((provider) =>
+						provider.events.list(options),
+					);
 
 					results.sort((a, b) => b.timestamp - a.timestamp);
 
@@ -311,12 +331,9 @@ export const makeCompositeProvider = (
 					}
 
 					// Query all providers and merge
-					const results: Knowledge[] = [];
-
-					for (const route of config.routes) {
-						const knowledge = yield* route.provider.knowledge.list(options);
-						results.push(...knowledge);
-					}
+					const results: Knowledge[] = yield* fanOut((provider) =>
+						provider.knowledge.list(options),
+					);
 
 					results.sort((a, b) => b.createdAt - a.createdAt);
 
@@ -359,15 +376,9 @@ export const makeCompositeProvider = (
 					}
 
 					// Query all providers and merge
-					const results: Knowledge[] = [];
-
-					for (const route of config.routes) {
-						const knowledge = yield* route.provider.knowledge.search(
-							embedding,
-							options,
-						);
-						results.push(...knowledge);
-					}
+					const results: Knowledge[] = yield* fanOut((provider) =>
+						provider.knowledge.search(embedding, options),
+					);
 
 					// Sort by relevance (assuming first results are most relevant)
 					if (options?.limit) {
@@ -420,6 +431,7 @@ const provider = compositeProvider([
     provider: wordPressProvider("https://blog.example.com/wp-json/wp/v2"),
     thingTypes: ["blog_post"],
     idPrefix: "wp-",
+    cache: { ttlMs: 60_000 }, // Remote API: serve repeat reads from memory
   },
 ]);
 
@@ -24,6 +24,7 @@ import type {
 	ListEventsOptions,
 	ListGroupsOptions,
 	ListThingsOptions,
+	PageOptions,
 	SearchKnowledgeOptions,
 	Thing,
 	ThingKnowledge,
@@ -43,6 +44,7 @@ import {
 	ThingNotFoundError,
 	ThingUpdateError,
 } from "../DataProvider";
+import { DEFAULT_PAGE_SIZE, fromConvexPage } from "../pagination";
 
 // ============================================================================
 // CONFIG
@@ -200,6 +202,26 @@ export const makeConvexProvider = (
 					catch: (error) => new QueryError("Failed to list things", error),
 				}),
 
+			listPage: (options?: ListThingsOptions, page?: PageOptions) =>
+				Effect.tryPromise({
+					try: async () => {
+						const result = await client.query(
+							"queries/things:listPaginated" as any,
+							{
+								groupId: options?.groupId as Id<"groups">,
+								type: options?.type,
+								status: options?.status,
+								paginationOpts: {
+									cursor: page?.cursor ?? null,
+									numItems: page?.numItems ?? DEFAULT_PAGE_SIZE,
+								},
+							},
+						);
+						return fromConvexPage<Thing>(result);
+					},
+					catch: (error) => new QueryError("Failed to list things", error),
+				}),
+
 			create: (input: CreateThingInput) =>
 				Effect.tryPromise({
 					try: async () => {
@@ -384,6 +406,27 @@ export const makeConvexProvider = (
 					catch: (error) => new QueryError("Failed to list events", error),
 				}),
 
+			listPage: (options?: ListEventsOptions, page?: PageOptions) =>
+				Effect.tryPromise({
+					try: async () => {
+						const result = await client.query(
+							"queries/events:listPaginated" as any,
+							{
+								groupId: options?.groupId as Id<"groups">,
+								eventType: options?.type,
+								actorId: options?.actorId as Id<"entities"> | undefined,
+								targetId: options?.targetId as Id<"entities"> | undefined,
+								paginationOpts: {
+									cursor: page?.cursor ?? null,
+									numItems: page?.numItems ?? DEFAULT_PAGE_SIZE,
+								},
+							},
+						);
+						return fromConvexPage<Event>(result);
+					},
+					catch: (error) => new QueryError("Failed to list events", error),
+				}),
+
 			create: (input: CreateEventInput) =>
 				Effect.tryPromise({
 					try: async () => {
@@ -440,6 +483,28 @@ export const makeConvexProvider = (
 					catch: (error) => new QueryError("Failed to list knowledge", error),
 				}),
 
+			listPage: (options?: SearchKnowledgeOptions, page?: PageOptions) =>
+				Effect.tryPromise({
+					try: async () => {
+						const result = await client.query(
+							"queries/knowledge:listPaginated" as any,
+							{
+								groupId: options?.groupId as Id<"groups">,
+								knowledgeType: options?.knowledgeType,
+								sourceThingId: options?.sourceThingId as
+									| Id<"entities">
+									| undefined,
+								paginationOpts: {
+									cursor: page?.cursor ?? null,
+									numItems: page?.numItems ?? DEFAULT_PAGE_SIZE,
+								},
+							},
+						);
+						return fromConvexPage<Knowledge>(result);
+					},
+					catch: (error) => new QueryError("Failed to list knowledge", error),
+				}),
+
 			create: (input: CreateKnowledgeInput) =>
 				Effect.tryPromise({
 					try: async () => {
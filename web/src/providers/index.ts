@@ -39,6 +39,8 @@ export type {
 	LoginArgs,
 	MagicLinkArgs,
 	NetworkError,
+	Page,
+	PageOptions,
 	PasswordResetArgs,
 	PasswordResetCompleteArgs,
 	QueryError,
@@ -65,6 +67,21 @@ export type {
 } from "./DataProvider";
 // Effect.ts service tag
 export { DataProviderService } from "./DataProvider";
+// Read-through cache decorator
+export type {
+	CacheResource,
+	CachingDataProvider,
+	CachingProviderMetrics,
+	CachingProviderOptions,
+} from "./cache/CachingProvider";
+export {
+	CachingProviderLive,
+	makeCachingProvider,
+} from "./cache/CachingProvider";
+export { HttpCache, mapWithConcurrency } from "./cache/http";
+export { LRUCache } from "./cache/LRUCache";
+// Cursor pagination (native or offset fallback)
+export { DEFAULT_PAGE_SIZE, listPage, offsetPage } from "./pagination";
 export type { ProviderConfig, ProviderType } from "./factory";
 // Factory pattern
 export {
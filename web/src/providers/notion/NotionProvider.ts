@@ -15,6 +15,13 @@
 import { Client } from "@notionhq/client";
 import type { PageObjectResponse } from "@notionhq/client/build/src/api-endpoints";
 import { Effect, Layer } from "effect";
+import {
+	DEFAULT_FETCH_CONCURRENCY,
+	DEFAULT_HTTP_CACHE_TTL_MS,
+	makeCachedLoader,
+	mapWithConcurrency,
+} from "../cache/http";
+import { LRUCache } from "../cache/LRUCache";
 
 import type {
 	Connection,
@@ -60,6 +67,8 @@ export interface NotionProviderConfig {
 	organizationId: string; // ONE organization ID
 	databaseIds: Record<string, string>; // thing type → database ID mapping
 	convexUrl?: string; // For hybrid event/knowledge storage
+	baseUrl?: string; // Notion API base URL (tests point this at a mock server)
+	propertyConcurrency?: number; // Parallel property fetches (default 4)
 }
 
 // ============================================================================
@@ -86,7 +95,9 @@ type NotionPropertyValue =
 export const makeNotionProvider = (
 	config: NotionProviderConfig,
 ): DataProvider => {
-	const notion = new Client({ auth: config.auth });
+	const notion = new Client({ auth: config.auth, baseUrl: config.baseUrl });
+	const propertyConcurrency =
+		config.propertyConcurrency ?? DEFAULT_FETCH_CONCURRENCY;
 
 	// ===== ID CONVERTERS =====
 
@@ -240,6 +251,88 @@ export const makeNotionProvider = (
 		return extracted;
 	};
 
+	// ===== TRUNCATED RELATIONS =====
+	// Page objects carry at most 25 relation items (has_more: true beyond
+	// that); the rest come from the paginated property endpoint, one call
+	// per page and property. Keyed by last_edited_time, so an unchanged page
+	// is never fetched twice and edits can't serve stale relations.
+
+	const loadRelation = makeCachedLoader(
+		new LRUCache<{ id: string }[]>({ ttlMs: DEFAULT_HTTP_CACHE_TTL_MS }),
+		async (key) => {
+			const [pageId, propertyId] = key.split("|");
+			const relation: { id: string }[] = [];
+			let cursor: string | undefined;
+
+			do {
+				const response: any = await notion.pages.properties.retrieve({
+					page_id: pageId,
+					property_id: propertyId,
+					start_cursor: cursor,
+				});
+				for (const item of response.results ?? []) {
+					if (item.relation?.id) {
+						relation.push({ id: item.relation.id });
+					}
+				}
+				cursor = response.has_more ? response.next_cursor : undefined;
+			} while (cursor);
+
+			return relation;
+		},
+	);
+
+	const completeRelations = async (
+		pages: PageObjectResponse[],
+	): Promise<PageObjectResponse[]> => {
+		// Collect every truncated relation across all pages, then fetch them
+		// together with a concurrency limit (not N pages x M properties at once)
+		const truncated: { page: number; name: string; key: string }[] = [];
+		pages.forEach((page, index) => {
+			for (const [name, value] of Object.entries((page as any).properties)) {
+				const prop = value as any;
+				if (prop.type === "relation" && prop.has_more) {
+					truncated.push({
+						page: index,
+						name,
+						key: `${page.id}|${prop.id}|${page.last_edited_time}`,
+					});
+				}
+			}
+		});
+
+		if (truncated.length === 0) return pages;
+
+		const relations = await mapWithConcurrency(
+			truncated,
+			propertyConcurrency,
+			({ key }) => loadRelation(key),
+		);
+
+		const completed = pages.map((page) => ({
+			...page,
+			properties: { ...(page as any).properties },
+		}));
+		truncated.forEach(({ page, name }, i) => {
+			completed[page].properties[name] = {
+				...completed[page].properties[name],
+				relation: relations[i],
+				has_more: false,
+			};
+		});
+
+		return completed as PageObjectResponse[];
+	};
+
+	const retrievePage = async (pageId: string): Promise<PageObjectResponse> => {
+		const response = await notion.pages.retrieve({ page_id: pageId });
+		if (!("properties" in response)) {
+			throw new Error("Not a page");
+		}
+		const [page] = await completeRelations([response]);
+		return page;
+	};
+
 	// ===== MAPPERS =====
 
 	const mapNotionPageToThing = async (
@@ -466,11 +559,7 @@ export const makeNotionProvider = (
 				Effect.tryPromise({
 					try: async () => {
 						const notionId = oneIdToNotionId(id);
-						const response = await notion.pages.retrieve({ page_id: notionId });
-
-						if (!("properties" in response)) {
-							throw new Error("Not a page");
-						}
+						const response = await retrievePage(notionId);
 
 						const databaseId = (response.parent as any).database_id;
 						const type = findTypeByDatabaseId(databaseId);
@@ -513,17 +602,18 @@ export const makeNotionProvider = (
 							page_size: options.limit || 10,
 						});
 
+						const pages = response.results.map((page: any) => {
+							if (!("properties" in page)) {
+								throw new Error("Not a page");
+							}
+							return page as PageObjectResponse;
+						});
+
 						// Transform all pages
 						const things = await Promise.all(
-							response.results.map((page: any) => {
-								if (!("properties" in page)) {
-									throw new Error("Not a page");
-								}
-								return mapNotionPageToThing(
-									page as PageObjectResponse,
-									options.type!,
-								);
-							}),
+							(await completeRelations(pages)).map((page) =>
+								mapNotionPageToThing(page, options.type!),
+							),
 						);
 
 						return things;
@@ -652,11 +742,7 @@ export const makeNotionProvider = (
 						const notionId = oneIdToNotionId(fromId);
 
 						// Get the source page
-						const page = await notion.pages.retrieve({ page_id: notionId });
-
-						if (!("properties" in page)) {
-							throw new Error("Not a page");
-						}
+						const page = await retrievePage(notionId);
 
 						const props = (page as any).properties;
 						const connections: Connection[] = [];
@@ -704,11 +790,8 @@ export const makeNotionProvider = (
 							input.relationshipType,
 						);
 
-						// Get existing relations
-						const page = await notion.pages.retrieve({ page_id: fromNotionId });
-						if (!("properties" in page)) {
-							throw new Error("Not a page");
-						}
+						// Get existing relations (all of them: the update replaces the list)
+						const page = await retrievePage(fromNotionId);
 
 						const existingRelations =
 							(page as any).properties[propertyName]?.relation || [];
@@ -749,11 +832,8 @@ export const makeNotionProvider = (
 						const propertyName =
 							mapRelationshipToNotionProperty(relationshipType);
 
-						// Get existing relations
-						const page = await notion.pages.retrieve({ page_id: fromNotionId });
-						if (!("properties" in page)) {
-							throw new Error("Not a page");
-						}
+						// Get existing relations (all of them: the update replaces the list)
+						const page = await retrievePage(fromNotionId);
 
 						const existingRelations =
 							(page as any).properties[propertyName]?.relation || [];
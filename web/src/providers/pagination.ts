@@ -0,0 +1,85 @@
+/**
+ * Cursor pagination for DataProvider lists
+ *
+ * Providers with native cursors (Convex) implement listPage directly.
+ * Everyone else gets offset emulation on top of list(): the cursor is the
+ * number of items already returned. Only `limit` is forwarded, so the
+ * fallback is correct even for providers that ignore `offset`.
+ */
+
+import { Effect } from "effect";
+import type { Page, PageOptions, QueryError } from "./DataProvider";
+
+export const DEFAULT_PAGE_SIZE = 50;
+
+interface PaginatedResource<T, O> {
+	list: (options?: O) => Effect.Effect<T[], QueryError>;
+	listPage?: (
+		options?: O,
+		page?: PageOptions,
+	) => Effect.Effect<Page<T>, QueryError>;
+}
+
+/**
+ * Emulate a cursor page with list({ limit })
+ *
+ * Fetches one extra item to know whether another page exists.
+ */
+export function offsetPage<T, O extends { limit?: number }>(
+	list: (options?: O) => Effect.Effect<T[], QueryError>,
+	options?: O,
+	page?: PageOptions,
+): Effect.Effect<Page<T>, QueryError> {
+	const numItems = page?.numItems ?? DEFAULT_PAGE_SIZE;
+	const offset = page?.cursor ? Number.parseInt(page.cursor, 10) || 0 : 0;
+
+	return list({ ...options, limit: offset + numItems + 1 } as O).pipe(
+		Effect.map((items) => {
+			const isDone = items.length <= offset + numItems;
+			return {
+				page: items.slice(offset, offset + numItems),
+				isDone,
+				continueCursor: isDone ? null : String(offset + numItems),
+			};
+		}),
+	);
+}
+
+/**
+ * Fetch one page from a provider resource (things, events, knowledge)
+ *
+ * @example
+ * ```typescript
+ * const first = await Effect.runPromise(
+ *   listPage(provider.things, { type: "course" }, { numItems: 20 }),
+ * );
+ * const next = await Effect.runPromise(
+ *   listPage(provider.things, { type: "course" }, { cursor: first.continueCursor }),
+ * );
+ * ```
+ */
+export function listPage<T, O extends { limit?: number }>(
+	resource: PaginatedResource<T, O>,
+	options?: O,
+	page?: PageOptions,
+): Effect.Effect<Page<T>, QueryError> {
+	if (resource.listPage) {
+		return resource.listPage(options, page);
+	}
+	return offsetPage((o?: O) => resource.list(o), options, page);
+}
+
+/**
+ * Map a Convex PaginationResult to a Page (null cursor once done)
+ */
+export function fromConvexPage<T>(result: {
+	page: T[];
+	isDone: boolean;
+	continueCursor: string;
+}): Page<T> {
+	return {
+		page: result.page,
+		isDone: result.isDone,
+		continueCursor: result.isDone ? null : result.continueCursor,
+	};
+}
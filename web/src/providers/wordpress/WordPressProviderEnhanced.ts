@@ -13,6 +13,11 @@
  */
 
 import { Effect, Layer } from "effect";
+import {
+	DEFAULT_FETCH_CONCURRENCY,
+	HttpCache,
+	mapWithConcurrency,
+} from "../cache/http";
 import type {
 	Connection,
 	CreateConnectionInput,
@@ -58,6 +63,8 @@ export interface WordPressProviderConfig {
 	username?: string; // WP username for auth
 	organizationId: string; // ONE organization ID
 	customPostTypes?: string[]; // Custom post types to support
+	acfConcurrency?: number; // Parallel ACF requests when posts lack `acf` (default 4)
+	httpCache?: HttpCache | false; // ETag revalidation (default: one per provider)
 }
 
 // ============================================================================
@@ -68,17 +75,44 @@ class WordPressAPI {
 	private baseUrl: string;
 	private apiKey: string;
 	private username: string;
-
-	constructor(url: string, apiKey: string, username = "admin") {
+	private cache?: HttpCache;
+
+	constructor(
+		url: string,
+		apiKey: string,
+		username = "admin",
+		cache?: HttpCache,
+	) {
 		this.baseUrl = `${url}/wp-json`;
 		this.apiKey = apiKey;
 		this.username = username;
+		this.cache = cache;
 	}
 
 	async get(path: string): Promise<Response> {
 		return this.request("GET", path);
 	}
 
+	/**
+	 * GET as JSON through the HTTP cache: identical concurrent requests are
+	 * coalesced and cached bodies revalidated with ETag/If-Modified-Since
+	 */
+	async getJSON<T = any>(path: string): Promise<T> {
+		if (!this.cache) {
+			const response = await this.get(path);
+			return response.json();
+		}
+
+		try {
+			return await this.cache.getJSON<T>(`${this.baseUrl}${path}`, {
+				headers: this.headers(),
+			});
+		} catch (error) {
+			const message = error instanceof Error ? error.message : String(error);
+			throw new Error(`WordPress API error: ${message}`);
+		}
+	}
+
 	async post(path: string, body?: any): Promise<Response> {
 		return this.request("POST", path, body);
 	}
@@ -94,15 +128,9 @@ class WordPressAPI {
 	): Promise<Response> {
 		const url = `${this.baseUrl}${path}`;
 
-		const credentials = btoa(`${this.username}:${this.apiKey}`);
-		const headers: HeadersInit = {
-			Authorization: `Basic ${credentials}`,
-			"Content-Type": "application/json",
-		};
-
 		const options: RequestInit = {
 			method,
-			headers,
+			headers: this.headers(),
 		};
 
 		if (body) {
@@ -118,8 +146,21 @@ class WordPressAPI {
 			);
 		}
 
+		// Any write may change posts, ACF fields and lists: drop cached bodies
+		if (method !== "GET") {
+			this.cache?.clear();
+		}
+
 		return response;
 	}
+
+	private headers(): Record<string, string> {
+		const credentials = btoa(`${this.username}:${this.apiKey}`);
+		return {
+			Authorization: `Basic ${credentials}`,
+			"Content-Type": "application/json",
+		};
+	}
 }
 
 // ============================================================================
@@ -141,6 +182,7 @@ interface WPPost {
 	categories: number[];
 	tags: number[];
 	meta?: Record<string, any>; // ACF fields
+	acf?: Record<string, any>; // Inline ACF fields (ACF 5.11+ with show_in_rest)
 }
 
 interface WPUser {
@@ -197,7 +239,17 @@ interface WPKnowledge {
 export const makeWordPressProvider = (
 	config: WordPressProviderConfig,
 ): DataProvider => {
-	const api = new WordPressAPI(config.url, config.apiKey, config.username);
+	const httpCache =
+		config.httpCache === false
+			? undefined
+			: (config.httpCache ?? new HttpCache());
+	const api = new WordPressAPI(
+		config.url,
+		config.apiKey,
+		config.username,
+		httpCache,
+	);
+	const acfConcurrency = config.acfConcurrency ?? DEFAULT_FETCH_CONCURRENCY;
 
 	// ===== ID CONVERTERS =====
 
@@ -283,19 +335,28 @@ export const makeWordPressProvider = (
 
 	// ===== MAPPERS =====
 
-	const mapWPPostToThing = async (
-		post: WPPost,
-		thingType: string,
-	): Promise<Thing> => {
-		// Get ACF fields if available
-		let acfFields = {};
+	// Get ACF fields if available: inline on the post when ACF exposes them
+	// to REST, otherwise one (cached, revalidated) request per post
+	const fetchACFFields = async (post: WPPost): Promise<Record<string, any>> => {
+		if (post.acf && typeof post.acf === "object") {
+			return post.acf;
+		}
+
 		try {
-			const acfResponse = await api.get(`/acf/v3/posts/${post.id}`);
-			const acfData = await acfResponse.json();
-			acfFields = acfData.acf || {};
+			const acfData = await api.getJSON(`/acf/v3/posts/${post.id}`);
+			return acfData.acf || {};
 		} catch (e) {
 			// ACF not available or no fields
+			return {};
 		}
+	};
+
+	const mapWPPostToThing = async (
+		post: WPPost,
+		thingType: string,
+		prefetchedACF?: Record<string, any>,
+	): Promise<Thing> => {
+		const acfFields = prefetchedACF ?? (await fetchACFFields(post));
 
 		return {
 			_id: wpIdToOneId(post.type, post.id),
@@ -473,12 +534,12 @@ export const makeWordPressProvider = (
 						const { wpId, postType } = parseOneId(id);
 
 						if (postType === "user") {
-							const response = await api.get(`/wp/v2/users/${wpId}`);
-							const user = await response.json();
+							const user = await api.getJSON(`/wp/v2/users/${wpId}`);
 							return mapWPUserToThing(user);
 						} else {
-							const response = await api.get(`/wp/v2/${postType}/${wpId}`);
-							const post = await response.json();
+							const post = await api.getJSON<WPPost>(
+								`/wp/v2/${postType}/${wpId}?acf_format=standard`,
+							);
 							return mapWPPostToThing(post, mapWPTypeToOntology(postType));
 						}
 					},
@@ -506,16 +567,25 @@ export const makeWordPressProvider = (
 							params.append("status", mapOntologyStatusToWP(options.status));
 						}
 
+						// Ask for ACF fields inline (ignored where unsupported)
+						params.append("acf_format", "standard");
+
 						// Make API request
-						const response = await api.get(
+						const wpPosts = await api.getJSON<WPPost[]>(
 							`/wp/v2/${postType}?${params.toString()}`,
 						);
-						const wpPosts = await response.json();
+
+						// ACF fields for posts without inline `acf`: bounded, not N at once
+						const acfFields = await mapWithConcurrency(
+							wpPosts,
+							acfConcurrency,
+							fetchACFFields,
+						);
 
 						// Transform all posts
 						return Promise.all(
-							wpPosts.map((post: WPPost) =>
-								mapWPPostToThing(post, options.type!),
+							wpPosts.map((post, i) =>
+								mapWPPostToThing(post, options.type!, acfFields[i]),
 							),
 						);
 					},
@@ -585,8 +655,9 @@ export const makeWordPressProvider = (
 				Effect.tryPromise({
 					try: async () => {
 						const wpId = oneIdToWpId(id);
-						const response = await api.get(`/one/v1/connections/${wpId}`);
-						const conn: WPConnection = await response.json();
+						const conn = await api.getJSON<WPConnection>(
+							`/one/v1/connections/${wpId}`,
+						);
 
 						return {
 							_id: id,
@@ -612,10 +683,9 @@ export const makeWordPressProvider = (
 							per_page: String(options?.limit || 10),
 						});
 
-						const response = await api.get(
+						const wpConnections: WPConnection[] = await api.getJSON(
 							`/one/v1/connections?${params.toString()}`,
 						);
-						const wpConnections: WPConnection[] = await response.json();
 
 						return wpConnections.map((conn) => ({
 							_id: wpIdToOneId("connection", conn.id),
@@ -671,8 +741,9 @@ export const makeWordPressProvider = (
 				Effect.tryPromise({
 					try: async () => {
 						const wpId = oneIdToWpId(id);
-						const response = await api.get(`/one/v1/events/${wpId}`);
-						const event: WPEvent = await response.json();
+						const event = await api.getJSON<WPEvent>(
+							`/one/v1/events/${wpId}`,
+						);
 
 						return {
 							_id: id,
@@ -698,10 +769,9 @@ export const makeWordPressProvider = (
 							per_page: String(options?.limit || 10),
 						});
 
-						const response = await api.get(
+						const wpEvents: WPEvent[] = await api.getJSON(
 							`/one/v1/events?${params.toString()}`,
 						);
-						const wpEvents: WPEvent[] = await response.json();
 
 						return wpEvents.map((event) => ({
 							_id: wpIdToOneId("event", event.id),
@@ -744,8 +814,9 @@ export const makeWordPressProvider = (
 				Effect.tryPromise({
 					try: async () => {
 						const wpId = oneIdToWpId(id);
-						const response = await api.get(`/one/v1/knowledge/${wpId}`);
-						const k: WPKnowledge = await response.json();
+						const k = await api.getJSON<WPKnowledge>(
+							`/one/v1/knowledge/${wpId}`,
+						);
 
 						return {
 							_id: id,
@@ -777,10 +848,9 @@ export const makeWordPressProvider = (
 							params.append("labels", options.query);
 						}
 
-						const response = await api.get(
+						const wpKnowledge: WPKnowledge[] = await api.getJSON(
 							`/one/v1/knowledge?${params.toString()}`,
 						);
-						const wpKnowledge: WPKnowledge[] = await response.json();
 
 						return wpKnowledge.map((k) => ({
 							_id: wpIdToOneId("knowledge", k.id),
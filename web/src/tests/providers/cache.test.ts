@@ -0,0 +1,524 @@
+/**
+ * Provider Cache Tests
+ *
+ * Tests the LRU, the read-through CachingProvider decorator, and HTTP
+ * revalidation/batching against local mock WordPress and Notion servers.
+ */
+
+import { createServer, type IncomingMessage, type Server } from "node:http";
+import type { AddressInfo } from "node:net";
+import { Effect } from "effect";
+import { afterEach, describe, expect, it, vi } from "vitest";
+import { makeCachingProvider } from "@/providers/cache/CachingProvider";
+import { HttpCache, mapWithConcurrency } from "@/providers/cache/http";
+import { LRUCache } from "@/providers/cache/LRUCache";
+import type { DataProvider, Thing } from "@/providers/DataProvider";
+import { ThingNotFoundError } from "@/providers/DataProvider";
+import { makeNotionProvider } from "@/providers/notion/NotionProvider";
+import { makeWordPressProvider } from "@/providers/wordpress/WordPressProviderEnhanced";
+
+// ============================================================================
+// MOCK SERVER
+// ============================================================================
+
+type Handler = (
+	req: IncomingMessage,
+	url: URL,
+) => { status?: number; headers?: Record<string, string>; body?: unknown };
+
+interface MockServer {
+	url: string;
+	requests: string[];
+	maxInFlight: number;
+	close: () => Promise<void>;
+}
+
+const servers: MockServer[] = [];
+
+afterEach(async () => {
+	await Promise.all(servers.splice(0).map((server) => server.close()));
+});
+
+// Responds after delayMs so concurrent requests overlap
+const startServer = async (
+	handler: Handler,
+	delayMs = 10,
+): Promise<MockServer> => {
+	let inFlight = 0;
+	const mock: MockServer = {
+		url: "",
+		requests: [],
+		maxInFlight: 0,
+		close: async () => {},
+	};
+
+	const server: Server = createServer((req, res) => {
+		const url = new URL(req.url ?? "/", "http://localhost");
+		mock.requests.push(`${req.method} ${url.pathname}`);
+		inFlight++;
+		mock.maxInFlight = Math.max(mock.maxInFlight, inFlight);
+
+		setTimeout(() => {
+			inFlight--;
+			const { status = 200, headers = {}, body } = handler(req, url);
+			res.writeHead(status, { "Content-Type": "application/json", ...headers });
+			res.end(body === undefined ? undefined : JSON.stringify(body));
+		}, delayMs);
+	});
+
+	await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+	mock.url = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+	mock.close = () =>
+		new Promise<void>((resolve) => server.close(() => resolve()));
+	servers.push(mock);
+	return mock;
+};
+
+const count = (server: MockServer, prefix: string) =>
+	server.requests.filter((request) => request.startsWith(prefix)).length;
+
+// ============================================================================
+// FIXTURES
+// ============================================================================
+
+const makeThing = (id: string): Thing => ({
+	_id: id,
+	type: "course",
+	name: `Course ${id}`,
+	properties: {},
+	status: "active",
+	createdAt: 0,
+	updatedAt: 0,
+});
+
+// Only the methods the decorator tests touch; delay makes calls overlap
+const makeCountingProvider = (delayMs = 5) => {
+	let version = 0;
+	const get = vi.fn((id: string) =>
+		id === "missing"
+			? Effect.fail(new ThingNotFoundError(id))
+			: Effect.sleep(delayMs).pipe(
+					Effect.as({ ...makeThing(id), name: `v${version}` }),
+				),
+	);
+	const list = vi.fn(() =>
+		Effect.sleep(delayMs).pipe(Effect.as([makeThing(`v${version}`)])),
+	);
+	const update = vi.fn(() =>
+		Effect.sleep(delayMs).pipe(
+			Effect.tap(() =>
+				Effect.sync(() => {
+					version++;
+				}),
+			),
+			Effect.asVoid,
+		),
+	);
+
+	const provider = {
+		things: { get, list, update },
+		groups: {},
+		connections: {},
+		events: {},
+		knowledge: {},
+		auth: {},
+	} as unknown as DataProvider;
+
+	return { provider, get, list, update };
+};
+
+// ============================================================================
+// LRU
+// ============================================================================
+
+describe("LRUCache", () => {
+	it("expires entries after their TTL", () => {
+		const cache = new LRUCache<string>({ ttlMs: 100 });
+		cache.set("a", "1", undefined, 1000);
+
+		expect(cache.get("a", 1050)).toBe("1");
+		expect(cache.get("a", 1100)).toBeUndefined();
+		expect(cache.snapshot()).toMatchObject({
+			hits: 1,
+			misses: 1,
+			expirations: 1,
+		});
+	});
+
+	it("evicts the least recently used entry when full", () => {
+		const cache = new LRUCache<string>({ maxEntries: 2 });
+		cache.set("a", "1");
+		cache.set("b", "2");
+		cache.get("a"); // b is now least recently used
+		cache.set("c", "3");
+
+		expect(cache.peek("a")).toBe("1");
+		expect(cache.peek("b")).toBeUndefined();
+		expect(cache.snapshot().evictions).toBe(1);
+	});
+
+	it("evicts by size and rejects entries larger than the budget", () => {
+		const cache = new LRUCache<string>({
+			maxBytes: 10,
+			sizeOf: (value) => (value as string).length,
+		});
+		cache.set("a", "aaaa");
+		cache.set("b", "bbbb");
+		cache.set("c", "cccc"); // 12 bytes: a goes
+
+		expect(cache.peek("a")).toBeUndefined();
+		expect(cache.snapshot().bytes).toBe(8);
+		expect(cache.set("huge", "x".repeat(11))).toBe(false);
+		expect(cache.size).toBe(2);
+	});
+});
+
+// ============================================================================
+// CACHING PROVIDER
+// ============================================================================
+
+describe("makeCachingProvider", () => {
+	it("serves repeat reads from cache", async () => {
+		const { provider, get } = makeCountingProvider();
+		const cached = makeCachingProvider(provider);
+
+		await Effect.runPromise(cached.things.get("t1"));
+		await Effect.runPromise(cached.things.get("t1"));
+
+		expect(get).toHaveBeenCalledTimes(1);
+		expect(cached.cache.metrics()).toMatchObject({
+			hits: 1,
+			misses: 1,
+			hitRate: 0.5,
+		});
+	});
+
+	it("coalesces concurrent identical reads into one upstream call", async () => {
+		const { provider, list } = makeCountingProvider(20);
+		const cached = makeCachingProvider(provider);
+
+		const results = await Effect.runPromise(
+			Effect.all(
+				Array.from({ length: 10 }, () => cached.things.list({ type: "course" })),
+				{ concurrency: "unbounded" },
+			),
+		);
+
+		expect(list).toHaveBeenCalledTimes(1);
+		expect(results.every((things) => things[0]._id === "v0")).toBe(true);
+		expect(cached.cache.metrics().coalesced).toBe(9);
+	});
+
+	it("does not cache failures", async () => {
+		const { provider, get } = makeCountingProvider();
+		const cached = makeCachingProvider(provider);
+
+		for (let i = 0; i < 2; i++) {
+			const exit = await Effect.runPromiseExit(cached.things.get("missing"));
+			expect(exit._tag).toBe("Failure");
+		}
+		expect(get).toHaveBeenCalledTimes(2);
+	});
+
+	it("invalidates reads after a write", async () => {
+		const { provider, list } = makeCountingProvider();
+		const cached = makeCachingProvider(provider);
+
+		const before = await Effect.runPromise(cached.things.list());
+		await Effect.runPromise(cached.things.update("t1", { name: "x" }));
+		const after = await Effect.runPromise(cached.things.list());
+
+		expect(before[0]._id).toBe("v0");
+		expect(after[0]._id).toBe("v1");
+		expect(list).toHaveBeenCalledTimes(2);
+	});
+
+	it("does not store a read that raced a write", async () => {
+		const { provider, get } = makeCountingProvider(20);
+		const cached = makeCachingProvider(provider);
+
+		// Read starts, write lands while it is in flight
+		const racing = Effect.runPromise(cached.things.get("t1"));
+		await Effect.runPromise(cached.things.update("t1", {}));
+		await racing;
+
+		const fresh = await Effect.runPromise(cached.things.get("t1"));
+		expect(fresh.name).toBe("v1");
+		expect(get).toHaveBeenCalledTimes(2);
+	});
+
+	it("expires entries per resource TTL", async () => {
+		const { provider, get } = makeCountingProvider(0);
+		const cached = makeCachingProvider(provider, { ttl: { things: 1 } });
+
+		await Effect.runPromise(cached.things.get("t1"));
+		await new Promise((resolve) => setTimeout(resolve, 5));
+		await Effect.runPromise(cached.things.get("t1"));
+
+		expect(get).toHaveBeenCalledTimes(2);
+		expect(cached.cache.metrics().expirations).toBe(1);
+	});
+});
+
+// ============================================================================
+// HTTP REVALIDATION
+// ============================================================================
+
+describe("HttpCache", () => {
+	it("revalidates with ETag and reuses the body on 304", async () => {
+		const server = await startServer((req) =>
+			req.headers["if-none-match"] === '"v1"'
+				? { status: 304 }
+				: { headers: { ETag: '"v1"' }, body: { value: 42 } },
+		);
+		const cache = new HttpCache();
+
+		const first = await cache.getJSON(`${server.url}/item`);
+		const second = await cache.getJSON(`${server.url}/item`);
+
+		expect(first).toEqual({ value: 42 });
+		expect(second).toEqual({ value: 42 });
+		expect(cache.snapshot()).toMatchObject({ requests: 2, notModified: 1 });
+	});
+
+	it("revalidates with If-Modified-Since", async () => {
+		const modified = "Wed, 01 Jan 2025 00:00:00 GMT";
+		const server = await startServer((req) =>
+			req.headers["if-modified-since"] === modified
+				? { status: 304 }
+				: { headers: { "Last-Modified": modified }, body: [1, 2, 3] },
+		);
+		const cache = new HttpCache();
+
+		await cache.getJSON(`${server.url}/list`);
+		expect(await cache.getJSON(`${server.url}/list`)).toEqual([1, 2, 3]);
+		expect(cache.snapshot().notModified).toBe(1);
+	});
+
+	it("revalidates entries past their TTL instead of refetching", async () => {
+		const server = await startServer((req) =>
+			req.headers["if-none-match"] === '"v1"'
+				? { status: 304 }
+				: { headers: { ETag: '"v1"' }, body: { value: 42 } },
+		);
+		const cache = new HttpCache({ ttlMs: 1 });
+
+		await cache.getJSON(`${server.url}/item`);
+		await new Promise((resolve) => setTimeout(resolve, 5));
+
+		expect(await cache.getJSON(`${server.url}/item`)).toEqual({ value: 42 });
+		expect(cache.snapshot()).toMatchObject({ requests: 2, notModified: 1 });
+	});
+
+	it("coalesces identical in-flight requests", async () => {
+		const server = await startServer(() => ({ body: { ok: true } }), 20);
+		const cache = new HttpCache();
+
+		await Promise.all(
+			Array.from({ length: 5 }, () => cache.getJSON(`${server.url}/same`)),
+		);
+
+		expect(server.requests).toHaveLength(1);
+		expect(cache.snapshot().coalesced).toBe(4);
+	});
+
+	it("surfaces non-2xx responses as errors", async () => {
+		const server = await startServer(() => ({ status: 500, body: "boom" }));
+		const cache = new HttpCache();
+
+		await expect(cache.getJSON(`${server.url}/fail`)).rejects.toThrow(/500/);
+	});
+});
+
+describe("mapWithConcurrency", () => {
+	it("keeps order and never exceeds the limit", async () => {
+		let active = 0;
+		let peak = 0;
+
+		const results = await mapWithConcurrency(
+			Array.from({ length: 20 }, (_, i) => i),
+			3,
+			async (n) => {
+				active++;
+				peak = Math.max(peak, active);
+				await new Promise((resolve) => setTimeout(resolve, 2));
+				active--;
+				return n * 2;
+			},
+		);
+
+		expect(results).toEqual(Array.from({ length: 20 }, (_, i) => i * 2));
+		expect(peak).toBe(3);
+	});
+});
+
+// ============================================================================
+// WORDPRESS (MOCK SERVER)
+// ============================================================================
+
+const wpPost = (id: number, acf?: Record<string, unknown>) => ({
+	id,
+	date: "2025-01-01T00:00:00",
+	modified: "2025-01-02T00:00:00",
+	slug: `post-${id}`,
+	status: "publish",
+	type: "post",
+	title: { rendered: `Post ${id}` },
+	content: { rendered: "" },
+	excerpt: { rendered: "" },
+	author: 1,
+	featured_media: 0,
+	categories: [],
+	tags: [],
+	...(acf ? { acf } : {}),
+});
+
+describe("WordPress provider ACF fetches", () => {
+	const startWordPress = (inlineACF: boolean) =>
+		startServer((req, url) => {
+			const acfMatch = url.pathname.match(/^\/wp-json\/acf\/v3\/posts\/(\d+)$/);
+			if (acfMatch) {
+				const etag = `"acf-${acfMatch[1]}"`;
+				return req.headers["if-none-match"] === etag
+					? { status: 304 }
+					: {
+							headers: { ETag: etag },
+							body: { acf: { price: Number(acfMatch[1]) } },
+						};
+			}
+			if (url.pathname === "/wp-json/wp/v2/post") {
+				return {
+					body: Array.from({ length: 12 }, (_, i) =>
+						wpPost(i + 1, inlineACF ? { price: i + 1 } : undefined),
+					),
+				};
+			}
+			return { status: 404, body: { code: "rest_no_route" } };
+		});
+
+	it("uses inline ACF fields without per-post requests", async () => {
+		const server = await startWordPress(true);
+		const provider = makeWordPressProvider({
+			url: server.url,
+			apiKey: "key",
+			organizationId: "org",
+		});
+
+		const things = await Effect.runPromise(
+			provider.things.list({ type: "blog_post", limit: 12 }),
+		);
+
+		expect(things).toHaveLength(12);
+		expect(things[4].properties.price).toBe(5);
+		expect(count(server, "GET /wp-json/acf")).toBe(0);
+		expect(server.requests[0]).toBe("GET /wp-json/wp/v2/post");
+	});
+
+	it("bounds per-post ACF requests and revalidates them", async () => {
+		const server = await startWordPress(false);
+		const httpCache = new HttpCache();
+		const provider = makeWordPressProvider({
+			url: server.url,
+			apiKey: "key",
+			organizationId: "org",
+			acfConcurrency: 3,
+			httpCache,
+		});
+
+		const things = await Effect.runPromise(
+			provider.things.list({ type: "blog_post", limit: 12 }),
+		);
+		expect(things.map((thing) => thing.properties.price)).toEqual(
+			Array.from({ length: 12 }, (_, i) => i + 1),
+		);
+		expect(count(server, "GET /wp-json/acf")).toBe(12);
+		expect(server.maxInFlight).toBeLessThanOrEqual(3);
+
+		// Second list: every ACF request answered 304
+		await Effect.runPromise(
+			provider.things.list({ type: "blog_post", limit: 12 }),
+		);
+		expect(httpCache.snapshot().notModified).toBe(12);
+	});
+});
+
+// ============================================================================
+// NOTION (MOCK SERVER)
+// ============================================================================
+
+describe("Notion provider relation fetches", () => {
+	const pageId = "11111111-2222-3333-4444-555555555555";
+	const related = Array.from(
+		{ length: 30 },
+		(_, i) => `aaaaaaaa-0000-0000-0000-${String(i).padStart(12, "0")}`,
+	);
+
+	const startNotion = () =>
+		startServer((_req, url) => {
+			if (url.pathname === `/v1/pages/${pageId}`) {
+				return {
+					body: {
+						object: "page",
+						id: pageId,
+						created_time: "2025-01-01T00:00:00.000Z",
+						last_edited_time: "2025-01-02T00:00:00.000Z",
+						url: "https://notion.so/page",
+						parent: { type: "database_id", database_id: "db-courses" },
+						properties: {
+							Name: {
+								id: "title",
+								type: "title",
+								title: [{ text: { content: "Course" } }],
+							},
+							Lessons: {
+								id: "rel1",
+								type: "relation",
+								relation: related.slice(0, 25).map((id) => ({ id })),
+								has_more: true,
+							},
+						},
+					},
+				};
+			}
+			if (url.pathname === `/v1/pages/${pageId}/properties/rel1`) {
+				// Two pages of 15 relation items
+				const start = url.searchParams.get("start_cursor") === "p2" ? 15 : 0;
+				return {
+					body: {
+						object: "list",
+						results: related.slice(start, start + 15).map((id) => ({
+							object: "property_item",
+							type: "relation",
+							relation: { id },
+						})),
+						has_more: start === 0,
+						next_cursor: start === 0 ? "p2" : null,
+					},
+				};
+			}
+			return { status: 404, body: { object: "error", code: "object_not_found" } };
+		});
+
+	it("fetches truncated relations once per page version", async () => {
+		const server = await startNotion();
+		const provider = makeNotionProvider({
+			auth: "secret",
+			organizationId: "org",
+			databaseIds: { course: "db-courses" },
+			baseUrl: server.url,
+		});
+		const id = `notion_${pageId.replace(/-/g, "")}`;
+
+		const thing = await Effect.runPromise(provider.things.get(id));
+		await Effect.runPromise(provider.things.get(id));
+
+		expect(thing.type).toBe("course");
+		expect(thing.properties.lessons).toHaveLength(30);
+		// Page retrieved twice, relation pages (2) fetched only the first time
+		const retrieves = server.requests.filter(
+			(request) => request === `GET /v1/pages/${pageId}`,
+		);
+		expect(retrieves).toHaveLength(2);
+		expect(count(server, `GET /v1/pages/${pageId}/properties`)).toBe(2);
+	});
+});
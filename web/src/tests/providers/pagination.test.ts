@@ -0,0 +1,136 @@
+/**
+ * Pagination Tests
+ *
+ * Tests cursor paging over DataProvider lists (native listPage and the
+ * offset fallback used by providers without cursors).
+ */
+
+import { Effect } from "effect";
+import { describe, expect, it, vi } from "vitest";
+import type { Page, PageOptions, Thing } from "@/providers/DataProvider";
+import {
+	fromConvexPage,
+	listPage,
+	offsetPage,
+} from "@/providers/pagination";
+
+// ============================================================================
+// FIXTURES
+// ============================================================================
+
+const makeThings = (count: number): Thing[] =>
+	Array.from({ length: count }, (_, i) => ({
+		_id: `thing-${i}`,
+		type: "course",
+		name: `Course ${i}`,
+		properties: {},
+		status: "active",
+		createdAt: i,
+		updatedAt: i,
+	}));
+
+// Ignores offset on purpose: the fallback must not rely on it
+const makeList = (items: Thing[]) =>
+	vi.fn((options?: { limit?: number }) =>
+		Effect.succeed(items.slice(0, options?.limit ?? items.length)),
+	);
+
+// ============================================================================
+// OFFSET FALLBACK
+// ============================================================================
+
+describe("offsetPage", () => {
+	it("returns the first page and a cursor when more items exist", async () => {
+		const list = makeList(makeThings(5));
+
+		const page = await Effect.runPromise(
+			offsetPage(list, {}, { numItems: 2 }),
+		);
+
+		expect(page.page.map((t) => t._id)).toEqual(["thing-0", "thing-1"]);
+		expect(page.isDone).toBe(false);
+		expect(page.continueCursor).toBe("2");
+		expect(list).toHaveBeenCalledWith({ limit: 3 });
+	});
+
+	it("walks every item exactly once", async () => {
+		const list = makeList(makeThings(5));
+		const seen: string[] = [];
+		let cursor: string | null = null;
+		let isDone = false;
+
+		while (!isDone) {
+			const page: Page<Thing> = await Effect.runPromise(
+				offsetPage(list, {}, { cursor, numItems: 2 }),
+			);
+			seen.push(...page.page.map((t) => t._id));
+			cursor = page.continueCursor;
+			isDone = page.isDone;
+		}
+
+		expect(seen).toEqual([
+			"thing-0",
+			"thing-1",
+			"thing-2",
+			"thing-3",
+			"thing-4",
+		]);
+		expect(cursor).toBeNull();
+	});
+
+	it("is done when the list fits in one page", async () => {
+		const page = await Effect.runPromise(
+			offsetPage(makeList(makeThings(2)), {}, { numItems: 2 }),
+		);
+
+		expect(page.page).toHaveLength(2);
+		expect(page.isDone).toBe(true);
+		expect(page.continueCursor).toBeNull();
+	});
+});
+
+// ============================================================================
+// NATIVE CURSORS
+// ============================================================================
+
+describe("listPage", () => {
+	it("prefers the provider's native listPage", async () => {
+		const native = vi.fn((_options?: { limit?: number }, page?: PageOptions) =>
+			Effect.succeed({
+				page: makeThings(1),
+				isDone: false,
+				continueCursor: `after-${page?.cursor ?? "start"}`,
+			}),
+		);
+		const list = makeList(makeThings(5));
+
+		const page = await Effect.runPromise(
+			listPage({ list, listPage: native }, {}, { cursor: "abc" }),
+		);
+
+		expect(page.continueCursor).toBe("after-abc");
+		expect(list).not.toHaveBeenCalled();
+	});
+
+	it("falls back to offset paging without listPage", async () => {
+		const page = await Effect.runPromise(
+			listPage({ list: makeList(makeThings(3)) }, {}, { numItems: 2 }),
+		);
+
+		expect(page.page).toHaveLength(2);
+		expect(page.continueCursor).toBe("2");
+	});
+});
+
+describe("fromConvexPage", () => {
+	it("drops the cursor once the result is done", () => {
+		expect(
+			fromConvexPage({ page: [], isDone: true, continueCursor: "end" })
+				.continueCursor,
+		).toBeNull();
+		expect(
+			fromConvexPage({ page: [], isDone: false, continueCursor: "next" })
+				.continueCursor,
+		).toBe("next");
+	});
+});
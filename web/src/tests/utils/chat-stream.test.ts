@@ -0,0 +1,290 @@
+/**
+ * Chat Stream Tests
+ *
+ * Tests the line-buffered SSE parser, incremental generative UI extraction,
+ * and the pull-based chat stream (pass-through, backpressure, cancellation,
+ * metrics).
+ */
+
+import { describe, expect, it, vi } from "vitest";
+import {
+	type ChatStreamMetrics,
+	createChatStream,
+	GenerativeUIExtractor,
+	parseGenerativeUI,
+	SSEParser,
+} from "@/lib/chat-stream";
+
+// ============================================================================
+// HELPERS
+// ============================================================================
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+const delta = (content: string) =>
+	`data: ${JSON.stringify({ choices: [{ delta: { content } }] })}\n\n`;
+
+// Upstream that yields the given chunks, counting pulls and cancels
+const makeUpstream = (chunks: (string | Uint8Array)[]) => {
+	const stats = { pulls: 0, cancelled: false };
+	let index = 0;
+	const stream = new ReadableStream<Uint8Array>(
+		{
+			pull(controller) {
+				stats.pulls++;
+				if (index >= chunks.length) {
+					controller.close();
+					return;
+				}
+				const chunk = chunks[index++];
+				controller.enqueue(
+					typeof chunk === "string" ? encoder.encode(chunk) : chunk,
+				);
+			},
+			cancel() {
+				stats.cancelled = true;
+			},
+		},
+		{ highWaterMark: 0 },
+	);
+	return { stream, stats };
+};
+
+// Split text into fixed-size byte chunks (cuts through lines and JSON)
+const splitBytes = (text: string, size: number): Uint8Array[] => {
+	const bytes = encoder.encode(text);
+	const chunks: Uint8Array[] = [];
+	for (let i = 0; i < bytes.length; i += size) {
+		chunks.push(bytes.slice(i, i + size));
+	}
+	return chunks;
+};
+
+const readAll = async (stream: ReadableStream<Uint8Array>) => {
+	let text = "";
+	const reader = stream.getReader();
+	for (;;) {
+		const { done, value } = await reader.read();
+		if (done) return text + decoder.decode();
+		text += decoder.decode(value, { stream: true });
+	}
+};
+
+const dataOf = (text: string) =>
+	new SSEParser()
+		.push(text)
+		.map((event) => event.data)
+		.filter((data): data is string => data !== null);
+
+const contentOf = (text: string) =>
+	dataOf(text)
+		.filter((data) => data !== "[DONE]")
+		.map((data) => JSON.parse(data))
+		.map((parsed) => parsed.choices?.[0]?.delta?.content ?? "")
+		.join("");
+
+// ============================================================================
+// SSE PARSER
+// ============================================================================
+
+describe("SSEParser", () => {
+	it("buffers partial lines across pushes", () => {
+		const parser = new SSEParser();
+
+		expect(parser.push('data: {"a":')).toEqual([]);
+		expect(parser.idle).toBe(false);
+		const events = parser.push('1}\n\ndata: [DONE]\n\n');
+
+		expect(events.map((e) => e.data)).toEqual(['{"a":1}', "[DONE]"]);
+		expect(events[0].raw).toBe('data: {"a":1}\n\n');
+		expect(parser.idle).toBe(true);
+	});
+
+	it("handles CRLF, multi-line data and comments", () => {
+		const parser = new SSEParser();
+		const events = parser.push(
+			": OPENROUTER PROCESSING\r\n\r\ndata: line1\r\ndata:line2\r\n\r\n",
+		);
+
+		expect(events.map((e) => e.data)).toEqual([null, "line1\nline2"]);
+	});
+
+	it("flushes a final event without a blank line", () => {
+		const parser = new SSEParser();
+		parser.push("data: tail");
+
+		expect(parser.flush()).toEqual([{ data: "tail", raw: "data: tail\n\n" }]);
+		expect(parser.flush()).toEqual([]);
+	});
+});
+
+// ============================================================================
+// GENERATIVE UI
+// ============================================================================
+
+describe("GenerativeUIExtractor", () => {
+	it("emits a block only once it closes", () => {
+		const extractor = new GenerativeUIExtractor();
+
+		expect(extractor.push("Here you go:\n``")).toEqual([]);
+		expect(extractor.push('`ui-chart\n{"title":')).toEqual([]);
+		const messages = extractor.push('"Sales"}\n```\nDone.');
+
+		expect(messages).toEqual([
+			{ type: "ui", payload: { component: "chart", data: { title: "Sales" } } },
+		]);
+		expect(extractor.extracted).toBe(1);
+	});
+
+	it("skips unknown components and invalid JSON", () => {
+		const errors = vi.spyOn(console, "error").mockImplementation(() => {});
+		const messages = parseGenerativeUI(
+			"```ui-unknown\n{}\n```\n```ui-table\n{bad\n```\n```ui-card\n{\"a\":1}\n```",
+		);
+
+		expect(messages.map((m) => m.payload.component)).toEqual(["card"]);
+		expect(errors).toHaveBeenCalledTimes(1);
+		errors.mockRestore();
+	});
+
+	it("returns components in document order", () => {
+		const messages = parseGenerativeUI(
+			'```ui-table\n{"t":1}\n```\ntext\n```ui-chart\n{"c":1}\n```',
+		);
+
+		expect(messages.map((m) => m.payload.component)).toEqual([
+			"table",
+			"chart",
+		]);
+	});
+});
+
+// ============================================================================
+// CHAT STREAM
+// ============================================================================
+
+describe("createChatStream", () => {
+	const words = Array.from({ length: 50 }, (_, i) => `word${i} `);
+	const upstreamText = `${words.map(delta).join("")}data: [DONE]\n\n`;
+
+	it("keeps every event when chunks split lines and JSON", async () => {
+		for (const size of [1, 7, 64]) {
+			const { stream } = makeUpstream(splitBytes(upstreamText, size));
+			const output = await readAll(createChatStream(stream));
+
+			expect(contentOf(output)).toBe(words.join(""));
+			expect(dataOf(output).at(-1)).toBe("[DONE]");
+		}
+	});
+
+	it("passes whole-event chunks through unchanged", async () => {
+		const { stream } = makeUpstream([...words.map(delta), "data: [DONE]\n\n"]);
+		const output = await readAll(createChatStream(stream));
+
+		// Original bytes, then the metrics comment, then [DONE]
+		const [body, rest] = output.split(": metrics ");
+		expect(body).toBe(words.map(delta).join(""));
+		expect(rest.endsWith("\n\ndata: [DONE]\n\n")).toBe(true);
+	});
+
+	it("sends UI components as soon as their block closes", async () => {
+		const chunks = [
+			delta("Chart:\n```ui-chart\n"),
+			delta('{"title":"Revenue"}'),
+			delta("\n```\n"),
+			delta("More text after the chart"),
+			"data: [DONE]\n\n",
+		];
+		const { stream } = makeUpstream(splitBytes(chunks.join(""), 5));
+		const output = await readAll(
+			createChatStream(stream, { enableGenerativeUI: true }),
+		);
+
+		const data = dataOf(output);
+		const uiIndex = data.findIndex((d) => d.startsWith('{"type":"ui"'));
+		const laterText = data.findIndex((d) => d.includes("More text"));
+
+		expect(JSON.parse(data[uiIndex]).payload).toEqual({
+			component: "chart",
+			data: { title: "Revenue" },
+		});
+		expect(uiIndex).toBeLessThan(laterText);
+		expect(data.at(-1)).toBe("[DONE]");
+	});
+
+	it("reads upstream only as fast as the client pulls", async () => {
+		const { stream, stats } = makeUpstream(words.map(delta));
+		const reader = createChatStream(stream).getReader();
+
+		await reader.read();
+		await new Promise((resolve) => setTimeout(resolve, 10));
+
+		// One chunk delivered, at most one more buffered
+		expect(stats.pulls).toBeLessThanOrEqual(2);
+		await reader.cancel();
+	});
+
+	it("cancels the upstream when the client disconnects", async () => {
+		const { stream, stats } = makeUpstream(words.map(delta));
+		let metrics: ChatStreamMetrics | undefined;
+		const reader = createChatStream(stream, {
+			onMetrics: (m) => {
+				metrics = m;
+			},
+		}).getReader();
+
+		await reader.read();
+		await reader.cancel("client gone");
+
+		expect(stats.cancelled).toBe(true);
+		expect(metrics?.cancelled).toBe(true);
+	});
+
+	it("reports time to first token and tokens per second", async () => {
+		let clock = 0;
+		const now = () => clock;
+		const chunks = words.map(delta);
+		const { stream } = makeUpstream([...chunks, "data: [DONE]\n\n"]);
+		let metrics: ChatStreamMetrics | undefined;
+
+		const reader = createChatStream(stream, {
+			startedAt: 0,
+			now,
+			onMetrics: (m) => {
+				metrics = m;
+			},
+		}).getReader();
+
+		clock = 200; // First token after 200ms
+		for (;;) {
+			const { done } = await reader.read();
+			if (done) break;
+			clock += 10;
+		}
+
+		expect(metrics?.ttftMs).toBe(200);
+		expect(metrics?.tokens).toBe(50);
+		expect(metrics?.tokensPerSecond).toBeGreaterThan(0);
+		expect(metrics?.cancelled).toBe(false);
+	});
+
+	it("prefers upstream usage counts over delta counts", async () => {
+		const usage = `data: ${JSON.stringify({
+			choices: [{ delta: {} }],
+			usage: { completion_tokens: 120 },
+		})}\n\n`;
+		const { stream } = makeUpstream([delta("hi"), usage, "data: [DONE]\n\n"]);
+		let metrics: ChatStreamMetrics | undefined;
+
+		await readAll(
+			createChatStream(stream, {
+				onMetrics: (m) => {
+					metrics = m;
+				},
+			}),
+		);
+
+		expect(metrics?.tokens).toBe(120);
+	});
+});